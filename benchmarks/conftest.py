@@ -0,0 +1,170 @@
+# -*- coding: utf8 -*-
+"""
+Benchmarks of the framework's hot paths, see docs/unit_tests.md. The
+commands are answered by a fake oc, so no cluster is needed.
+
+Run them like::
+
+    $ python -m pytest -c pytest_unittests.ini benchmarks \\
+        --benchmark-save .benchmarks --benchmark-compare .benchmarks
+
+"""
+import re
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.framework.logger_factory import set_log_record_factory
+from ocs_ci.utility import benchmark as benchmark_lib
+from ocs_ci.utility import utils
+
+
+def pytest_configure(config):
+    # the log format of pytest_unittests.ini needs the cluster context
+    set_log_record_factory()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-rounds",
+        type=int,
+        default=benchmark_lib.DEFAULT_ROUNDS,
+        help="Number of measured rounds of every benchmark",
+    )
+    group.addoption(
+        "--benchmark-save",
+        metavar="DIR",
+        help="Store the results to DIR/<machine>/<commit>.json",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        metavar="DIR",
+        help="Compare the results with the latest results stored in DIR for "
+        "this machine",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=benchmark_lib.DEFAULT_TOLERANCE,
+        help="Allowed relative slowdown against the baseline (default: 0.2)",
+    )
+    group.addoption(
+        "--benchmark-fail",
+        action="store_true",
+        help="Fail the run when some benchmark regressed",
+    )
+
+
+@pytest.fixture(scope="session")
+def benchmark_session():
+    return benchmark_lib.BenchmarkSession()
+
+
+@pytest.fixture
+def benchmark(request, benchmark_session):
+    """
+    Function which measures the function given as its argument, the name of
+    the test is used as name of the benchmark
+    """
+    rounds = request.config.getoption("--benchmark-rounds")
+    request.config._benchmark_session = benchmark_session
+
+    def run(func, *args, **kwargs):
+        kwargs.setdefault("rounds", rounds)
+        return benchmark_session.run(request.node.name, func, *args, **kwargs)
+
+    return run
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    benchmark_session = getattr(config, "_benchmark_session", None)
+    if benchmark_session is None:
+        return
+    baseline = None
+    regressions = []
+    compare_dir = config.getoption("--benchmark-compare")
+    if compare_dir:
+        baseline = benchmark_lib.load_baseline(
+            compare_dir,
+            machine=benchmark_session.machine,
+            exclude_commit=benchmark_session.commit,
+        )
+        regressions = benchmark_session.compare(
+            baseline, config.getoption("--benchmark-tolerance")
+        )
+    save_dir = config.getoption("--benchmark-save")
+    saved_path = benchmark_session.save(save_dir) if save_dir else None
+    config._benchmark_summary = (baseline, regressions, saved_path)
+    if regressions and config.getoption("--benchmark-fail"):
+        session.exitstatus = 1
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    benchmark_session = getattr(config, "_benchmark_session", None)
+    if benchmark_session is None:
+        return
+    baseline, regressions, saved_path = config._benchmark_summary
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(benchmark_session.get_report(baseline))
+    for name, baseline_median, median, ratio in regressions:
+        terminalreporter.write_line(
+            f"REGRESSION {name}: {baseline_median * 1000:.3f}ms -> "
+            f"{median * 1000:.3f}ms ({ratio:.2f}x)",
+            red=True,
+        )
+    if saved_path:
+        terminalreporter.write_line(f"Benchmark results stored to {saved_path}")
+
+
+class FakeOC(object):
+    """
+    Stand-in of the oc client for subprocess.run in exec_cmd, every command
+    is answered by the first registered response whose pattern matches the
+    command line
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.calls = 0
+
+    def add(self, pattern, stdout, returncode=0, stderr=""):
+        """
+        Register a response
+
+        Args:
+            pattern (str): Regular expression searched in the command line
+            stdout (str or function): Output, or function returning the output
+                for the match object of the pattern
+            returncode (int): Return code of the command
+            stderr (str): Error output
+
+        """
+        self.responses.append((re.compile(pattern), stdout, returncode, stderr))
+
+    def __call__(self, cmd, **kwargs):
+        self.calls += 1
+        cmd_line = " ".join(cmd) if isinstance(cmd, list) else cmd
+        for pattern, stdout, returncode, stderr in self.responses:
+            match = pattern.search(cmd_line)
+            if match:
+                if callable(stdout):
+                    stdout = stdout(match)
+                return subprocess.CompletedProcess(
+                    cmd, returncode, stdout.encode(), stderr.encode()
+                )
+        return subprocess.CompletedProcess(
+            cmd, 1, b"", f"FakeOC: no response for {cmd_line}".encode()
+        )
+
+
+@pytest.fixture
+def fake_oc():
+    """
+    Fake oc client answering the commands executed by exec_cmd
+    """
+    oc = FakeOC()
+    with patch.object(utils.subprocess, "run", oc):
+        yield oc
@@ -0,0 +1,115 @@
+# -*- coding: utf8 -*-
+"""
+Benchmarks of getting resources via OCP, with the oc answered by FakeOC
+"""
+import tempfile
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.resources.pod import get_all_pods
+
+NAMESPACE = "openshift-storage"
+
+
+def make_pods(count):
+    """
+    Generate pods of the storage namespace
+
+    Args:
+        count (int): Number of the pods
+
+    Returns:
+        list: Pod dicts
+
+    """
+    apps = ["rook-ceph-osd", "rook-ceph-mon", "csi-rbdplugin", "noobaa", "app"]
+    return [
+        {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": f"pod-{i}",
+                "namespace": NAMESPACE,
+                "labels": {"app": apps[i % len(apps)]},
+            },
+            "spec": {
+                "nodeName": f"worker-{i % 3}",
+                "containers": [{"name": "main", "image": "quay.io/ocs/image:1"}],
+            },
+            "status": {"phase": "Running", "podIP": f"10.128.{i // 250}.{i % 250}"},
+        }
+        for i in range(count)
+    ]
+
+
+def pod_list_yaml(count):
+    """
+    Args:
+        count (int): Number of the pods
+
+    Returns:
+        str: YAML of the pod List as printed by oc get -o yaml
+
+    """
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(
+        {"apiVersion": "v1", "kind": "List", "items": make_pods(count)},
+        Dumper=dumper,
+    )
+
+
+def pod_table(match):
+    return (
+        "NAME     READY   STATUS    RESTARTS   AGE\n"
+        f"{match.group(1)}   1/1     Running   0          5m\n"
+    )
+
+
+@pytest.fixture
+def cluster(fake_oc, tmp_path):
+    """
+    Fake cluster with the pods, the temporary files created for the pod
+    objects are kept in the test directory
+    """
+    with patch.dict(
+        config.ENV_DATA,
+        {
+            "cluster_path": str(tmp_path),
+            "http_proxy": "",
+            "https_proxy": "",
+            "no_proxy": "",
+        },
+    ), patch.object(tempfile, "tempdir", str(tmp_path)):
+        yield fake_oc
+
+
+def test_ocp_get_5k_pods(benchmark, cluster):
+    cluster.add(r"get Pod -n \S+ -o yaml$", pod_list_yaml(5000))
+    ocp_pod = OCP(kind=constants.POD, namespace=NAMESPACE)
+    result = benchmark(ocp_pod.get, rounds=3, warmup=0)
+    assert len(result["items"]) == 5000
+
+
+def test_get_all_pods_5k(benchmark, cluster):
+    cluster.add(r"get Pod -n \S+ -o yaml$", pod_list_yaml(5000))
+    pods = benchmark(get_all_pods, NAMESPACE, rounds=3, warmup=0)
+    assert len(pods) == 5000
+
+
+def test_wait_for_resource_1k_pods(benchmark, cluster):
+    cluster.add(r"get Pod -n \S+ -o yaml$", pod_list_yaml(1000))
+    cluster.add(r"get Pod (pod-\d+) -n \S+$", pod_table)
+    ocp_pod = OCP(kind=constants.POD, namespace=NAMESPACE)
+    assert benchmark(
+        ocp_pod.wait_for_resource,
+        condition=constants.STATUS_RUNNING,
+        resource_count=1000,
+        timeout=60,
+        sleep=0,
+        rounds=3,
+    )
@@ -0,0 +1,99 @@
+# -*- coding: utf8 -*-
+"""
+Benchmarks of parsing the logs and metrics collected by the tests
+"""
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from ocs_ci.helpers import performance_lib
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.pillowfight import PillowFight
+from ocs_ci.utility import prometheus
+
+PVC_COUNT = 50
+
+
+def make_csi_logs(pvcs):
+    """
+    Generate provisioner and CSI plugin logs of creation and deletion of
+    the PVCs
+
+    Args:
+        pvcs (list): Objects with name and backed_pv of the PVCs
+
+    Returns:
+        tuple: Lines of the provisioner log and of the CSI plugin log
+
+    """
+    prov_log = []
+    csi_log = []
+    for i, pvc in enumerate(pvcs):
+        second = i % 60
+        prov_log.extend(
+            [
+                f"I0101 10:00:{second:02d}.100000 1 controller.go:1 "
+                f'"msg"="provision" "PVC"="ns/{pvc.name}" started',
+                f"I0101 10:00:{second:02d}.900000 1 controller.go:1 "
+                f'"msg"="provision" "PVC"="ns/{pvc.name}" succeeded',
+                f'I0101 10:01:{second:02d}.100000 1 controller.go:1 delete "{pvc.backed_pv}": started',
+                f'I0101 10:01:{second:02d}.800000 1 controller.go:1 delete "{pvc.backed_pv}": succeeded',
+            ]
+        )
+        csi_log.extend(
+            [
+                f"I0101 10:00:{second:02d}.200000 1 utils.go:1 ID: {i} Req-ID: {pvc.backed_pv} GRPC call: ",
+                f"I0101 10:00:{second:02d}.800000 1 utils.go:1 ID: {i} Req-ID: {pvc.backed_pv} GRPC response: ",
+            ]
+        )
+    return [prov_log], [csi_log]
+
+
+def test_get_pvc_provision_times(benchmark):
+    pvcs = [
+        SimpleNamespace(name=f"pvc-{i}", backed_pv=f"pvc-{i:08d}-pv")
+        for i in range(PVC_COUNT)
+    ]
+    prov_logs, csi_logs = make_csi_logs(pvcs)
+    with patch.object(
+        performance_lib, "get_logfile_names", return_value=["provisioner-0"]
+    ), patch.object(
+        performance_lib, "read_csi_logs", side_effect=[prov_logs, csi_logs] * 10
+    ), patch.object(
+        performance_lib, "logger"
+    ):
+        results = benchmark(
+            performance_lib.get_pvc_provision_times,
+            constants.CEPHBLOCKPOOL,
+            pvcs,
+            "2023-01-01T10:00:00Z",
+        )
+    assert len(results) == PVC_COUNT
+    assert results["pvc-0"]["create"]["time"] == 0.8
+
+
+def test_parse_pillowfight_log(benchmark):
+    lines = ["Running. Press Ctrl-C to terminate..."]
+    lines.extend(f"OPS/SEC: {2000 + i % 1000}" for i in range(20000))
+    lines.extend(f"[{i} - {i + 10} ]us |### - {i * 3}" for i in range(100, 5000, 10))
+    pf = PillowFight.__new__(PillowFight)
+    pf.log_raw_output = False
+    data = benchmark(pf.parse_pillowfight_log, "\n".join(lines))
+    assert len(data["opspersec"]) == 20000
+
+
+def test_check_query_range_result_enum(benchmark):
+    # a day of 30s samples of 12 OSDs
+    result = [
+        {
+            "metric": {"__name__": "ceph_osd_up", "ceph_daemon": f"osd.{osd}"},
+            "values": [[1600000000 + 30 * i, "1"] for i in range(2880)],
+        }
+        for osd in range(12)
+    ]
+    with patch.object(prometheus, "logger"):
+        assert benchmark(
+            prometheus.check_query_range_result_enum,
+            result,
+            good_values=[1],
+            exp_metric_num=12,
+        )
@@ -0,0 +1,55 @@
+# -*- coding: utf8 -*-
+"""
+Benchmarks of the framework utilities used by almost every test
+"""
+import itertools
+
+from ocs_ci.ocs import constants
+from ocs_ci.utility import templating
+from ocs_ci.utility.utils import TimeoutSampler
+
+SAMPLES = 1000
+
+
+def make_pvcs(count):
+    return [
+        {
+            "apiVersion": "v1",
+            "kind": "PersistentVolumeClaim",
+            "metadata": {"name": f"pvc-{i}", "namespace": "namespace-test"},
+            "spec": {
+                "accessModes": [constants.ACCESS_MODE_RWO],
+                "resources": {"requests": {"storage": "1Gi"}},
+                "storageClassName": constants.DEFAULT_STORAGECLASS_RBD,
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def consume_samples(count):
+    sampler = TimeoutSampler(60, 0, lambda: True)
+    return sum(1 for _ in itertools.islice(sampler, count))
+
+
+def test_timeout_sampler_1k_samples(benchmark):
+    assert benchmark(consume_samples, SAMPLES) == SAMPLES
+
+
+def test_load_yaml_cached(benchmark):
+    data = benchmark(templating.load_yaml, constants.STORAGE_CLUSTER_YAML)
+    assert data["kind"] == "StorageCluster"
+
+
+def test_load_yaml_uncached(benchmark):
+    def load_yaml():
+        templating.clear_yaml_cache()
+        return templating.load_yaml(constants.STORAGE_CLUSTER_YAML)
+
+    assert benchmark(load_yaml)["kind"] == "StorageCluster"
+
+
+def test_dump_data_to_temp_yaml_1k_pvcs(benchmark, tmp_path):
+    pvcs = make_pvcs(1000)
+    path = str(tmp_path / "pvcs.yaml")
+    assert benchmark(templating.dump_data_to_temp_yaml, pvcs, path, log_data=False)
@@ -26,6 +26,7 @@ from ocs_ci.deployment.helpers.mcg_helpers import (
 from ocs_ci.deployment.acm import Submariner
 from ocs_ci.deployment.helpers.lso_helpers import setup_local_storage
 from ocs_ci.deployment.disconnected import prepare_disconnected_ocs_deployment
+from ocs_ci.deployment.phases import deployment_phases, report_deployment_phases
 from ocs_ci.framework import config, merge_dict
 from ocs_ci.ocs import constants, ocp, defaults, registry
 from ocs_ci.ocs.cluster import (
@@ -75,6 +76,7 @@ from ocs_ci.ocs.resources.storage_cluster import (
     setup_ceph_debug,
 )
 from ocs_ci.ocs.uninstall import uninstall_ocs
+from ocs_ci.ocs.watch import ResourceWatch
 from ocs_ci.ocs.utils import (
     get_non_acm_cluster_config,
     get_primary_cluster_config,
@@ -260,8 +262,21 @@ class Deployment(object):
 
         Args:
             log_cli_level (str): log level for installer (default: DEBUG)
+
+        Timing of the deployment phases is logged and stored to
+        deployment_phases.json in the log directory, see
+        :py:mod:`ocs_ci.deployment.phases`.
+
         """
-        self.do_deploy_ocp(log_cli_level)
+        deployment_phases.reset()
+        try:
+            self._deploy_cluster(log_cli_level)
+        finally:
+            report_deployment_phases()
+
+    def _deploy_cluster(self, log_cli_level):
+        with deployment_phases.phase("ocp_deployment"):
+            self.do_deploy_ocp(log_cli_level)
         # Deployment of network split scripts via machineconfig API happens
         # before OCS deployment.
         if config.DEPLOYMENT.get("network_split_setup"):
@@ -283,19 +298,25 @@ class Deployment(object):
             # ocs-deployment, not just here in this particular case
             tmp_path = Path(tempfile.mkdtemp(prefix="ocs-ci-deployment-"))
             logger.debug("created temporary directory %s", tmp_path)
-            setup_netsplit(
-                tmp_path, master_zones, worker_zones, x_addr_list, arbiter_zone
-            )
+            with deployment_phases.phase("network_split_setup"):
+                setup_netsplit(
+                    tmp_path, master_zones, worker_zones, x_addr_list, arbiter_zone
+                )
         ocp_version = version.get_semantic_ocp_version_from_config()
         if (
             config.ENV_DATA.get("deploy_acm_hub_cluster")
             and ocp_version >= version.VERSION_4_9
         ):
-            self.deploy_acm_hub()
-        self.do_deploy_lvmo()
-        self.do_deploy_submariner()
-        self.do_deploy_ocs()
-        self.do_deploy_rdr()
+            with deployment_phases.phase("acm_hub_deployment"):
+                self.deploy_acm_hub()
+        with deployment_phases.phase("lvmo_deployment"):
+            self.do_deploy_lvmo()
+        with deployment_phases.phase("submariner_deployment"):
+            self.do_deploy_submariner()
+        with deployment_phases.phase("ocs_deployment"):
+            self.do_deploy_ocs()
+        with deployment_phases.phase("rdr_deployment"):
+            self.do_deploy_rdr()
 
     def get_rdr_conf(self):
         """
@@ -523,6 +544,34 @@ class Deployment(object):
         logger.info("Sleeping for 30 seconds after CSV created")
         time.sleep(30)
 
+    def wait_for_resource_by_name(self, kind, name_pattern, timeout=300):
+        """
+        Wait for a resource with the name pattern to appear. The resources
+        are watched, so the wait ends as soon as the resource is created.
+
+        Args:
+            kind (str): Kind of the resource, e.g. csv
+            name_pattern (str): Name pattern, part of the resource name
+            timeout (int): Time in seconds to wait
+
+        Returns:
+            str: Name of the found resource
+
+        Raises:
+            TimeoutExpiredError: In case the resource doesn't appear in time
+
+        """
+        with ResourceWatch(kind, namespace=self.namespace) as watch:
+            for event_type, resource, _ in watch.events(timeout=timeout):
+                found_name = resource.get("metadata", {}).get("name", "")
+                if event_type != "DELETED" and name_pattern in found_name:
+                    logger.info(f"{kind} found: {found_name}")
+                    return found_name
+                logger.debug(f"Still waiting for the {kind}: {name_pattern}")
+        raise TimeoutExpiredError(
+            timeout, f"{kind} {name_pattern} didn't appear in {timeout} seconds"
+        )
+
     def wait_for_subscription(self, subscription_name):
         """
         Wait for the subscription to appear
@@ -531,19 +580,7 @@ class Deployment(object):
             subscription_name (str): Subscription name pattern
 
         """
-        ocp.OCP(kind="subscription", namespace=self.namespace)
-        for sample in TimeoutSampler(
-            300, 10, ocp.OCP, kind="subscription", namespace=self.namespace
-        ):
-            subscriptions = sample.get().get("items", [])
-            for subscription in subscriptions:
-                found_subscription_name = subscription.get("metadata", {}).get(
-                    "name", ""
-                )
-                if subscription_name in found_subscription_name:
-                    logger.info(f"Subscription found: {found_subscription_name}")
-                    return
-                logger.debug(f"Still waiting for the subscription: {subscription_name}")
+        self.wait_for_resource_by_name("subscription", subscription_name)
 
     def wait_for_csv(self, csv_name):
         """
@@ -553,17 +590,7 @@ class Deployment(object):
             csv_name (str): CSV name pattern
 
         """
-        ocp.OCP(kind="subscription", namespace=self.namespace)
-        for sample in TimeoutSampler(
-            300, 10, ocp.OCP, kind="csv", namespace=self.namespace
-        ):
-            csvs = sample.get().get("items", [])
-            for csv in csvs:
-                found_csv_name = csv.get("metadata", {}).get("name", "")
-                if csv_name in found_csv_name:
-                    logger.info(f"CSV found: {found_csv_name}")
-                    return
-                logger.debug(f"Still waiting for the CSV: {csv_name}")
+        self.wait_for_resource_by_name("csv", csv_name)
 
     def get_arbiter_location(self):
         """
@@ -617,13 +644,16 @@ class Deployment(object):
             return
         else:
             logger.info("Deployment of OCS via OCS operator")
-            self.label_and_taint_nodes()
 
+        # labels and taints of the nodes don't matter for the catalog source
+        steps = [("node_labels", self.label_and_taint_nodes)]
         if not live_deployment:
-            create_catalog_source(image)
+            steps.append(("catalog_source", lambda: create_catalog_source(image)))
+        deployment_phases.run_parallel(steps)
 
         if config.DEPLOYMENT.get("local_storage"):
-            setup_local_storage(storageclass=self.DEFAULT_STORAGECLASS_LSO)
+            with deployment_phases.phase("local_storage"):
+                setup_local_storage(storageclass=self.DEFAULT_STORAGECLASS_LSO)
 
         logger.info("Creating namespace and operator group.")
         run_cmd(f"oc create -f {constants.OLM_YAML}")
@@ -673,7 +703,8 @@ class Deployment(object):
         ):
             self.deploy_odf_addon()
             return
-        self.subscribe_ocs()
+        with deployment_phases.phase("subscription"):
+            self.subscribe_ocs()
         operator_selector = get_selector_for_ocs_operator()
         subscription_plan_approval = config.DEPLOYMENT.get("subscription_plan_approval")
         ocs_version = version.get_semantic_ocs_version_from_config()
@@ -701,26 +732,27 @@ class Deployment(object):
         is_ibm_sa_linked = False
 
         for ocs_operator_name in ocs_operator_names:
-            package_manifest = PackageManifest(
-                resource_name=ocs_operator_name,
-                selector=operator_selector,
-                subscription_plan_approval=subscription_plan_approval,
-            )
-            package_manifest.wait_for_resource(timeout=300)
-            csv_name = package_manifest.get_current_csv(channel=channel)
-            csv = CSV(resource_name=csv_name, namespace=self.namespace)
-            if (
-                config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
-                and not live_deployment
-            ):
-                if not is_ibm_sa_linked:
-                    logger.info("Sleeping for 60 seconds before applying SA")
-                    time.sleep(60)
-                    link_all_sa_and_secret_and_delete_pods(
-                        constants.OCS_SECRET, self.namespace
-                    )
-                    is_ibm_sa_linked = True
-            csv.wait_for_phase("Succeeded", timeout=720)
+            with deployment_phases.phase(f"csv_{ocs_operator_name}"):
+                package_manifest = PackageManifest(
+                    resource_name=ocs_operator_name,
+                    selector=operator_selector,
+                    subscription_plan_approval=subscription_plan_approval,
+                )
+                package_manifest.wait_for_resource(timeout=300)
+                csv_name = package_manifest.get_current_csv(channel=channel)
+                csv = CSV(resource_name=csv_name, namespace=self.namespace)
+                if (
+                    config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
+                    and not live_deployment
+                ):
+                    if not is_ibm_sa_linked:
+                        logger.info("Sleeping for 60 seconds before applying SA")
+                        time.sleep(60)
+                        link_all_sa_and_secret_and_delete_pods(
+                            constants.OCS_SECRET, self.namespace
+                        )
+                        is_ibm_sa_linked = True
+                csv.wait_for_phase("Succeeded", timeout=720)
         # create storage system
         if ocs_version >= version.VERSION_4_9:
             exec_cmd(f"oc apply -f {constants.STORAGE_SYSTEM_ODF_YAML}")
@@ -765,11 +797,13 @@ class Deployment(object):
 
         # creating StorageCluster
         if config.DEPLOYMENT.get("kms_deployment"):
-            kms = KMS.get_kms_deployment()
-            kms.deploy()
+            with deployment_phases.phase("kms_deployment"):
+                kms = KMS.get_kms_deployment()
+                kms.deploy()
 
         if config.ENV_DATA["mcg_only_deployment"]:
-            mcg_only_deployment()
+            with deployment_phases.phase("mcg_only_deployment"):
+                mcg_only_deployment()
             return
 
         cluster_data = templating.load_yaml(constants.STORAGE_CLUSTER_YAML)
@@ -991,7 +1025,8 @@ class Deployment(object):
             mode="w+", prefix="cluster_storage", delete=False
         )
         templating.dump_data_to_temp_yaml(cluster_data, cluster_data_yaml.name)
-        run_cmd(f"oc create -f {cluster_data_yaml.name}", timeout=1200)
+        with deployment_phases.phase("storage_cluster_creation"):
+            run_cmd(f"oc create -f {cluster_data_yaml.name}", timeout=1200)
         if config.DEPLOYMENT["infra_nodes"]:
             _ocp = ocp.OCP(kind="node")
             _ocp.exec_oc_cmd(
@@ -1125,108 +1160,153 @@ class Deployment(object):
         if config.DEPLOYMENT.get("disconnected") and not config.DEPLOYMENT.get(
             "disconnected_env_skip_image_mirroring"
         ):
-            image = prepare_disconnected_ocs_deployment()
+            with deployment_phases.phase("disconnected_preparation"):
+                image = prepare_disconnected_ocs_deployment()
 
         if config.DEPLOYMENT["external_mode"]:
-            self.deploy_with_external_mode()
+            with deployment_phases.phase("external_mode_deployment"):
+                self.deploy_with_external_mode()
         else:
-            self.deploy_ocs_via_operator(image)
+            with deployment_phases.phase("operator_deployment"):
+                self.deploy_ocs_via_operator(image)
             if config.ENV_DATA["mcg_only_deployment"]:
-                mcg_only_post_deployment_checks()
+                with deployment_phases.phase("mcg_only_checks"):
+                    mcg_only_post_deployment_checks()
                 return
 
             pod = ocp.OCP(kind=constants.POD, namespace=self.namespace)
-            cfs = ocp.OCP(kind=constants.CEPHFILESYSTEM, namespace=self.namespace)
             # Check for Ceph pods
-            mon_pod_timeout = 900
-            assert pod.wait_for_resource(
-                condition="Running",
-                selector="app=rook-ceph-mon",
-                resource_count=3,
-                timeout=mon_pod_timeout,
-            )
-            assert pod.wait_for_resource(
-                condition="Running", selector="app=rook-ceph-mgr", timeout=600
-            )
-            assert pod.wait_for_resource(
-                condition="Running",
-                selector="app=rook-ceph-osd",
-                resource_count=3,
-                timeout=600,
-            )
+            with deployment_phases.phase("ceph_pods_running"):
+                mon_pod_timeout = 900
+                assert pod.wait_for_resource(
+                    condition="Running",
+                    selector="app=rook-ceph-mon",
+                    resource_count=3,
+                    timeout=mon_pod_timeout,
+                )
+                assert pod.wait_for_resource(
+                    condition="Running", selector="app=rook-ceph-mgr", timeout=600
+                )
+                assert pod.wait_for_resource(
+                    condition="Running",
+                    selector="app=rook-ceph-osd",
+                    resource_count=3,
+                    timeout=600,
+                )
 
-            # validate ceph mon/osd volumes are backed by pvc
-            validate_cluster_on_pvc()
+            with deployment_phases.phase("cluster_validation"):
+                # validate ceph mon/osd volumes are backed by pvc
+                validate_cluster_on_pvc()
 
-            # validate PDB creation of MON, MDS, OSD pods
-            validate_pdb_creation()
+                # validate PDB creation of MON, MDS, OSD pods
+                validate_pdb_creation()
 
-            # check for odf-console
+            # odf-console and toolbox don't depend on each other
+            steps = [("toolbox", self.setup_toolbox)]
             ocs_version = version.get_semantic_ocs_version_from_config()
             if ocs_version >= version.VERSION_4_9:
-                assert pod.wait_for_resource(
-                    condition="Running", selector="app=odf-console", timeout=600
+                steps.append(
+                    (
+                        "odf_console",
+                        lambda: pod.wait_for_resource(
+                            condition="Running", selector="app=odf-console", timeout=600
+                        ),
+                    )
                 )
+            results = deployment_phases.run_parallel(steps)
+            assert all(results), "odf-console pod is not running"
 
-            # Creating toolbox pod
-            setup_ceph_toolbox()
+        # The post deployment steps are independent of each other
+        deployment_phases.run_parallel(self.get_post_deployment_steps())
 
-            assert pod.wait_for_resource(
-                condition=constants.STATUS_RUNNING,
-                selector="app=rook-ceph-tools",
-                resource_count=1,
-                timeout=600,
-            )
+        # Verify health of ceph cluster
+        logger.info("Done creating rook resources, waiting for HEALTH_OK")
+        with deployment_phases.phase("ceph_health_check"):
+            try:
+                ceph_health_check(namespace=self.namespace, tries=30, delay=10)
+            except CephHealthException as ex:
+                err = str(ex)
+                logger.warning(f"Ceph health check failed with {err}")
+                if "clock skew detected" in err:
+                    logger.info(
+                        f"Changing NTP on compute nodes to" f" {constants.RH_NTP_CLOCK}"
+                    )
+                    if self.platform == constants.VSPHERE_PLATFORM:
+                        update_ntp_compute_nodes()
+                    assert ceph_health_check(
+                        namespace=self.namespace, tries=60, delay=10
+                    )
 
-            if not config.COMPONENTS["disable_cephfs"]:
-                # Check for CephFilesystem creation in ocp
-                cfs_data = cfs.get()
-                cfs_name = cfs_data["items"][0]["metadata"]["name"]
+    def setup_toolbox(self):
+        """
+        Create the toolbox pod and check the CephFilesystem, which is
+        validated via the toolbox
 
-                if helpers.validate_cephfilesystem(cfs_name):
-                    logger.info("MDS deployment is successful!")
-                    defaults.CEPHFILESYSTEM_NAME = cfs_name
-                else:
-                    logger.error("MDS deployment Failed! Please check logs!")
+        Returns:
+            bool: True when the toolbox pod is running
+
+        """
+        setup_ceph_toolbox()
+
+        pod = ocp.OCP(kind=constants.POD, namespace=self.namespace)
+        assert pod.wait_for_resource(
+            condition=constants.STATUS_RUNNING,
+            selector="app=rook-ceph-tools",
+            resource_count=1,
+            timeout=600,
+        )
+
+        if not config.COMPONENTS["disable_cephfs"]:
+            # Check for CephFilesystem creation in ocp
+            cfs = ocp.OCP(kind=constants.CEPHFILESYSTEM, namespace=self.namespace)
+            cfs_data = cfs.get()
+            cfs_name = cfs_data["items"][0]["metadata"]["name"]
+
+            if helpers.validate_cephfilesystem(cfs_name):
+                logger.info("MDS deployment is successful!")
+                defaults.CEPHFILESYSTEM_NAME = cfs_name
+            else:
+                logger.error("MDS deployment Failed! Please check logs!")
+        return True
+
+    def get_post_deployment_steps(self):
+        """
+        Get the steps done after the storage cluster is created, they don't
+        depend on each other, so they can run concurrently
+
+        Returns:
+            list: Tuples of the step name and the function to run
 
+        """
+        steps = []
         # Change monitoring backend to OCS
         if config.ENV_DATA.get("monitoring_enabled") and config.ENV_DATA.get(
             "persistent-monitoring"
         ):
-            setup_persistent_monitoring()
+            steps.append(("persistent_monitoring", setup_persistent_monitoring))
         elif config.ENV_DATA.get("monitoring_enabled") and config.ENV_DATA.get(
             "telemeter_server_url"
         ):
             # Create configmap cluster-monitoring-config to reconfigure
             # telemeter server url when 'persistent-monitoring' is False
-            create_configmap_cluster_monitoring_pod(
-                telemeter_server_url=config.ENV_DATA["telemeter_server_url"]
+            steps.append(
+                (
+                    "telemeter_configuration",
+                    lambda: create_configmap_cluster_monitoring_pod(
+                        telemeter_server_url=config.ENV_DATA["telemeter_server_url"]
+                    ),
+                )
             )
 
         if not config.COMPONENTS["disable_cephfs"]:
             # Change registry backend to OCS CEPHFS RWX PVC
-            registry.change_registry_backend_to_ocs()
-
-        # Enable console plugin
-        enable_console_plugin()
+            steps.append(("registry_backend", registry.change_registry_backend_to_ocs))
 
-        # Verify health of ceph cluster
-        logger.info("Done creating rook resources, waiting for HEALTH_OK")
-        try:
-            ceph_health_check(namespace=self.namespace, tries=30, delay=10)
-        except CephHealthException as ex:
-            err = str(ex)
-            logger.warning(f"Ceph health check failed with {err}")
-            if "clock skew detected" in err:
-                logger.info(
-                    f"Changing NTP on compute nodes to" f" {constants.RH_NTP_CLOCK}"
-                )
-                if self.platform == constants.VSPHERE_PLATFORM:
-                    update_ntp_compute_nodes()
-                assert ceph_health_check(namespace=self.namespace, tries=60, delay=10)
+        steps.append(("console_plugin", enable_console_plugin))
 
         # patch gp2/thin storage class as 'non-default'
-        self.patch_default_sc_to_non_default()
+        steps.append(("default_sc_patch", self.patch_default_sc_to_non_default))
+        return steps
 
     def deploy_lvmo(self):
         """
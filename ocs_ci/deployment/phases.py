@@ -0,0 +1,247 @@
+"""
+Timing of deployment phases, so it's known where the install time goes and
+deploy time regressions can be tracked across builds.
+
+Every phase of the deployment is recorded with its start, duration and
+result. Independent steps can be run concurrently, each of them is recorded
+as a sub phase of the current phase. The report of all phases is logged and
+stored as deployment_phases.json in the log directory when the deployment
+ends.
+
+Example::
+
+    with deployment_phases.phase("ocs_operator_install"):
+        ...
+    deployment_phases.run_parallel(
+        [("toolbox", setup_ceph_toolbox), ("console_plugin", enable_console_plugin)]
+    )
+
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from ocs_ci.framework import config
+
+log = logging.getLogger(__name__)
+
+PHASES_REPORT_FILE = "deployment_phases.json"
+
+PASSED = "passed"
+FAILED = "failed"
+RUNNING = "running"
+
+
+class PhaseTimeline(object):
+    """
+    Timeline of the deployment phases, it can be shared by several threads
+    """
+
+    def __init__(self):
+        self._records = []
+        self._lock = threading.Lock()
+        # name of the phase the current thread is in, used as parent of the
+        # phases it starts
+        self._local = threading.local()
+
+    @property
+    def current_phase(self):
+        """
+        str: Name of the phase of the current thread, None if there is none
+        """
+        return getattr(self._local, "phase", None)
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Context manager which records the phase, the exception raised in the
+        phase is recorded and re-raised
+
+        Args:
+            name (str): Name of the phase
+
+        Yields:
+            dict: Record of the phase
+
+        """
+        parent = self.current_phase
+        full_name = f"{parent}/{name}" if parent else name
+        record = {
+            "phase": full_name,
+            "parent": parent,
+            "cluster": config.ENV_DATA.get("cluster_name"),
+            "start": time.time(),
+            "duration": None,
+            "status": RUNNING,
+            "error": None,
+        }
+        with self._lock:
+            self._records.append(record)
+        log.info(f"Deployment phase {full_name} started")
+        self._local.phase = full_name
+        try:
+            yield record
+        except BaseException as ex:
+            record["status"] = FAILED
+            record["error"] = f"{type(ex).__name__}: {ex}"
+            raise
+        else:
+            record["status"] = PASSED
+        finally:
+            self._local.phase = parent
+            record["duration"] = round(time.time() - record["start"], 3)
+            log.info(
+                f"Deployment phase {full_name} {record['status']} after "
+                f"{record['duration']}s"
+            )
+
+    def run_parallel(self, steps, max_workers=None):
+        """
+        Run independent steps concurrently in the current cluster context,
+        each step is recorded as a sub phase of the current phase. All the
+        steps are run to the end even if some of them fail. The steps are run
+        one by one if DEPLOYMENT['parallel_deployment_steps'] is disabled.
+
+        Args:
+            steps (list): Tuples of the phase name and the function to run
+            max_workers (int): Maximal number of steps run at once, all of
+                them if None
+
+        Returns:
+            list: Results of the functions in order of the steps
+
+        Raises:
+            Exception: The exception of the first failed step
+
+        """
+        if not steps:
+            return []
+        if not config.DEPLOYMENT.get("parallel_deployment_steps", True):
+            results = []
+            for name, func in steps:
+                with self.phase(name):
+                    results.append(func())
+            return results
+
+        cluster_index = config.cur_index
+        parent = self.current_phase
+
+        def run_step(name, func):
+            with config.cluster_context(cluster_index):
+                self._local.phase = parent
+                with self.phase(name):
+                    return func()
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or len(steps),
+            thread_name_prefix="DeploymentStep",
+        ) as executor:
+            futures = [executor.submit(run_step, name, func) for name, func in steps]
+        results = []
+        errors = []
+        for (name, _), future in zip(steps, futures):
+            error = future.exception()
+            if error is not None:
+                log.error(f"Deployment step {name} failed: {error}")
+                errors.append(error)
+                results.append(None)
+            else:
+                results.append(future.result())
+        if errors:
+            raise errors[0]
+        return results
+
+    def to_records(self):
+        """
+        Returns:
+            list: Copies of the records of the phases in order of their start
+
+        """
+        with self._lock:
+            return sorted(
+                (dict(record) for record in self._records),
+                key=lambda record: record["start"],
+            )
+
+    def get_report(self):
+        """
+        Get human readable table of the phases
+
+        Returns:
+            str: The report
+
+        """
+        records = self.to_records()
+        if not records:
+            return "No deployment phases recorded"
+        first_start = records[0]["start"]
+        name_width = max(len(record["phase"]) for record in records)
+        lines = [
+            f"{'PHASE':<{name_width}}  {'OFFSET':>9}  {'DURATION':>9}  STATUS",
+        ]
+        for record in records:
+            duration = record["duration"]
+            duration = "-" if duration is None else f"{duration:.1f}s"
+            lines.append(
+                f"{record['phase']:<{name_width}}  "
+                f"{record['start'] - first_start:>8.1f}s  "
+                f"{duration:>9}  {record['status']}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """
+        Store the report of the phases to a JSON file together with metadata
+        identifying the build, so the reports of different builds can be
+        compared
+
+        Args:
+            path (str): Path to the file, deployment_phases.json in the log
+                directory if not provided
+
+        Returns:
+            str: Path to the file
+
+        """
+        if path is None:
+            log_dir = os.path.expanduser(config.RUN["log_dir"])
+            path = os.path.join(log_dir, PHASES_REPORT_FILE)
+        report = {
+            "run_id": config.RUN.get("run_id"),
+            "platform": config.ENV_DATA.get("platform"),
+            "ocp_version": config.DEPLOYMENT.get("installer_version"),
+            "ocs_version": config.ENV_DATA.get("ocs_version"),
+            "ocs_registry_image": config.DEPLOYMENT.get("ocs_registry_image"),
+            "phases": self.to_records(),
+        }
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        return path
+
+    def reset(self):
+        """
+        Forget all the recorded phases
+        """
+        with self._lock:
+            self._records = []
+
+
+deployment_phases = PhaseTimeline()
+
+
+def report_deployment_phases():
+    """
+    Log the report of the recorded deployment phases and store it to the log
+    directory
+    """
+    log.info(f"Deployment phases:\n{deployment_phases.get_report()}")
+    try:
+        path = deployment_phases.dump()
+    except OSError as ex:
+        log.error(f"Failed to store report of deployment phases: {ex}")
+        return
+    log.info(f"Report of deployment phases stored to {path}")
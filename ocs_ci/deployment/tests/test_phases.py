@@ -0,0 +1,67 @@
+# -*- coding: utf8 -*-
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.deployment import phases
+
+
+@pytest.fixture
+def timeline():
+    with patch.object(phases, "log"):
+        yield phases.PhaseTimeline()
+
+
+def test_run_parallel(timeline):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def step(value):
+        # both steps have to run at once to pass the barrier
+        barrier.wait()
+        return value
+
+    with timeline.phase("deployment"):
+        results = timeline.run_parallel(
+            [("a", lambda: step(1)), ("b", lambda: step(2))]
+        )
+    assert results == [1, 2]
+    records = {record["phase"]: record for record in timeline.to_records()}
+    assert set(records) == {"deployment", "deployment/a", "deployment/b"}
+    assert records["deployment/a"]["parent"] == "deployment"
+    assert all(record["status"] == phases.PASSED for record in records.values())
+
+
+def test_run_parallel_failure(timeline):
+    done = []
+
+    def fail():
+        raise ValueError("step failed")
+
+    with pytest.raises(ValueError):
+        timeline.run_parallel([("fail", fail), ("ok", lambda: done.append(1))])
+    assert done == [1]
+    records = {record["phase"]: record for record in timeline.to_records()}
+    assert records["fail"]["status"] == phases.FAILED
+    assert records["fail"]["error"] == "ValueError: step failed"
+    assert records["ok"]["status"] == phases.PASSED
+
+
+def test_run_sequential(timeline):
+    with patch.dict(phases.config.DEPLOYMENT, {"parallel_deployment_steps": False}):
+        threads = timeline.run_parallel(
+            [("a", threading.current_thread), ("b", threading.current_thread)]
+        )
+    assert threads == [threading.current_thread()] * 2
+
+
+def test_dump(timeline, tmp_path):
+    with timeline.phase("ocp_deployment"):
+        pass
+    path = timeline.dump(str(tmp_path / "phases.json"))
+    with open(path) as report_file:
+        report = json.load(report_file)
+    assert [record["phase"] for record in report["phases"]] == ["ocp_deployment"]
+    assert "ocp_deployment" in timeline.get_report()
@@ -12,6 +12,10 @@ import os
 import yaml
 import logging
 from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from functools import lru_cache
 from dataclasses import dataclass, field, fields
 from ocs_ci.ocs.exceptions import ClusterNotFoundException
 
@@ -20,6 +24,27 @@ DEFAULT_CONFIG_PATH = os.path.join(THIS_DIR, "conf/default_config.yaml")
 
 logger = logging.getLogger(__name__)
 
+# Index of the cluster activated by MultiClusterConfig.cluster_context(),
+# None means the global context is used
+_ACTIVE_CLUSTER_INDEX = ContextVar("active_cluster_index", default=None)
+
+
+@lru_cache(maxsize=None)
+def load_default_config():
+    """
+    Parse the default configuration file, it's parsed only once, so the
+    result must not be modified (use Config.get_defaults() for a copy)
+
+    Returns:
+        dict: The default configuration
+
+    """
+    with open(DEFAULT_CONFIG_PATH) as file_stream:
+        return {
+            k: (v if v is not None else {})
+            for (k, v) in yaml.safe_load(file_stream).items()
+        }
+
 
 @dataclass
 class Config:
@@ -52,11 +77,7 @@ class Config:
         """
         Return a fresh copy of the default configuration
         """
-        with open(DEFAULT_CONFIG_PATH) as file_stream:
-            return {
-                k: (v if v is not None else {})
-                for (k, v) in yaml.safe_load(file_stream).items()
-            }
+        return deepcopy(load_default_config())
 
     def update(self, user_dict: dict):
         """
@@ -85,6 +106,9 @@ class Config:
         return {name: getattr(self, name) for name in field_names}
 
 
+CONFIG_SECTIONS = frozenset(f.name for f in fields(Config))
+
+
 def merge_dict(orig: dict, new: dict) -> dict:
     """
     Update a dict recursively, with values from 'new' being merged into 'orig'.
@@ -127,15 +151,16 @@ def merge_dict(orig: dict, new: dict) -> dict:
 
 class MultiClusterConfig:
     # This class wraps Config() objects so that we can handle
-    # multiple cluster contexts
+    # multiple cluster contexts. The config sections (ENV_DATA, RUN, ...)
+    # are resolved against the active cluster on every access, so switching
+    # the context is just a change of the active index.
     def __init__(self):
         # Holds all cluster's Config() object
         self.clusters = list()
-        # This member always points to current cluster's Config() object
-        self.cluster_ctx = None
         self.nclusters = 1
-        # Index for current cluster in context
-        self.cur_index = 0
+        # Index for current cluster in context (global for all threads which
+        # didn't enter cluster_context())
+        self._cur_index = 0
         self.multicluster = False
         # A list of lists which holds CLI args clusterwise
         self.multicluster_args = list()
@@ -146,9 +171,35 @@ class MultiClusterConfig:
         self.single_cluster_default = True
         self._single_cluster_init_cluster_configs()
 
+    def __getattr__(self, name):
+        # Called only when the attribute is not found the regular way, config
+        # sections are resolved against the active cluster on every access.
+        # Assigning a section (e.g. by mock.patch.object) overrides it for all
+        # the clusters until the attribute is deleted again.
+        if name in CONFIG_SECTIONS:
+            return getattr(self.cluster_ctx, name)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    @property
+    def cur_index(self):
+        """
+        int: Index of the active cluster in the current thread/context
+        """
+        index = _ACTIVE_CLUSTER_INDEX.get()
+        return self._cur_index if index is None else index
+
+    @property
+    def cluster_ctx(self):
+        """
+        Config: Config object of the active cluster
+        """
+        return self.clusters[self.cur_index]
+
     def _single_cluster_init_cluster_configs(self):
         self.clusters.insert(0, Config())
-        self.cluster_ctx = self.clusters[0]
+        self._cur_index = 0
         self.attr_init()
         self._refresh_ctx()
 
@@ -159,7 +210,7 @@ class MultiClusterConfig:
             for i in range(self.nclusters):
                 self.clusters.insert(i, Config())
                 self.clusters[i].MULTICLUSTER["multicluster_index"] = i
-            self.cluster_ctx = self.clusters[0]
+            self._cur_index = 0
             self.attr_init()
             self._refresh_ctx()
             self.single_cluster_default = False
@@ -178,26 +229,86 @@ class MultiClusterConfig:
     def get_defaults(self):
         return self.cluster_ctx.get_defaults()
 
+    def to_dict(self):
+        return self.cluster_ctx.to_dict()
+
     def reset_ctx(self):
-        self.cluster_ctx = self.clusters[0]
+        self._set_index(0)
         self._refresh_ctx()
 
     def _refresh_ctx(self):
-        [
-            self.__setattr__(attr, self.cluster_ctx.__getattribute__(attr))
-            for attr in self.attr_list
-        ]
-        self.to_dict = self.cluster_ctx.to_dict
-        if self.RUN.get("kubeconfig"):
-            os.environ["KUBECONFIG"] = self.RUN.get("kubeconfig")
+        # KUBECONFIG env variable is process wide, it follows only the global
+        # context, threads in cluster_context() pass kubeconfig explicitly
+        if _ACTIVE_CLUSTER_INDEX.get() is not None:
+            return
+        kubeconfig = self.RUN.get("kubeconfig")
+        if kubeconfig and os.environ.get("KUBECONFIG") != kubeconfig:
+            os.environ["KUBECONFIG"] = kubeconfig
+
+    def _set_index(self, index):
+        if _ACTIVE_CLUSTER_INDEX.get() is None:
+            self._cur_index = index
+        else:
+            _ACTIVE_CLUSTER_INDEX.set(index)
 
     def switch_ctx(self, index=0):
-        self.cluster_ctx = self.clusters[index]
-        self.cur_index = index
+        """
+        Switch the active cluster. Inside of cluster_context() only the
+        context of the current thread is switched, otherwise the global one.
+
+        Args:
+            index (int): Index of the cluster in self.clusters
+
+        """
+        # validate the index before switching
+        self.clusters[index]
+        self._set_index(index)
         self._refresh_ctx()
         # Log the switch after changing the current index
         logger.info(f"Switched to cluster: {self.current_cluster_name()}")
 
+    @contextmanager
+    def cluster_context(self, index):
+        """
+        Context manager which makes the cluster active only in the current
+        thread (or asyncio task), other threads still see the global context.
+        Useful for running operations against several clusters concurrently.
+
+        Args:
+            index (int): Index of the cluster in self.clusters
+
+        Yields:
+            Config: Config object of the cluster
+
+        Example::
+
+            def get_nodes(index):
+                with config.cluster_context(index):
+                    return OCP(kind="node").get()
+
+            with ThreadPoolExecutor() as executor:
+                nodes = list(executor.map(get_nodes, range(config.nclusters)))
+
+        """
+        token = _ACTIVE_CLUSTER_INDEX.set(index)
+        try:
+            yield self.clusters[index]
+        finally:
+            _ACTIVE_CLUSTER_INDEX.reset(token)
+
+    def get_kubeconfig(self):
+        """
+        Get kubeconfig which should be used for the active cluster
+
+        Returns:
+            str: Path to the kubeconfig, KUBECONFIG env variable is used
+                outside of cluster_context() (None if not set)
+
+        """
+        if _ACTIVE_CLUSTER_INDEX.get() is None:
+            return os.getenv("KUBECONFIG")
+        return self.RUN.get("kubeconfig")
+
     def switch_acm_ctx(self):
         self.switch_ctx(self.get_acm_index())
 
@@ -31,15 +31,19 @@ from ocs_ci.ocs.exceptions import (
 from ocs_ci.ocs.cluster import check_clusters
 from ocs_ci.ocs.resources.ocs import get_version_info
 from ocs_ci.ocs.utils import collect_ocs_logs, collect_prometheus_metrics
+from ocs_ci.utility import cmd_trace, telemetry
+from ocs_ci.utility.artifact_collector import artifact_collector
 from ocs_ci.utility.utils import (
     dump_config_to_file,
     get_ceph_version,
     get_cluster_name,
     get_cluster_version,
+    get_cmd_output_stats,
     get_csi_versions,
     get_ocs_build_number,
     get_testrun_name,
     load_config_file,
+    ocsci_log_path,
 )
 
 __all__ = [
@@ -210,6 +214,46 @@ def pytest_addoption(parser):
         action="store_true",
         help="Enable logging of cluster utilization metrics every 10 seconds",
     )
+    parser.addoption(
+        "--fork-budget",
+        dest="fork_budget",
+        type=int,
+        help=(
+            "Maximal number of commands (forks) which a test (setup and call) "
+            "can execute, see --fork-budget-action"
+        ),
+    )
+    parser.addoption(
+        "--fork-budget-action",
+        dest="fork_budget_action",
+        choices=["warn", "fail"],
+        default="warn",
+        help="Warn or fail the test which exceeded --fork-budget (default: warn)",
+    )
+    parser.addoption(
+        "--cmd-trace-record",
+        dest="cmd_trace_record",
+        metavar="PATH",
+        help="Record the executed commands with their outputs to the trace file",
+    )
+    parser.addoption(
+        "--cmd-trace-replay",
+        dest="cmd_trace_replay",
+        metavar="PATH",
+        help=(
+            "Don't execute any command, answer the commands from the trace file "
+            "recorded via --cmd-trace-record"
+        ),
+    )
+    parser.addoption(
+        "--cmd-trace-time-scale",
+        dest="cmd_trace_time_scale",
+        type=float,
+        help=(
+            "Multiplier of the recorded durations of the replayed commands, "
+            "0 for no delay (default: 1.0)"
+        ),
+    )
     parser.addoption(
         "--upgrade-ocs-version",
         dest="upgrade_ocs_version",
@@ -348,6 +392,7 @@ def pytest_configure(config):
 
         if not (config.getoption("--help") or config.getoption("collectonly")):
             process_cluster_cli_params(config)
+            cmd_trace.start_from_config()
             config_file = os.path.expanduser(
                 os.path.join(
                     ocsci_config.RUN["log_dir"],
@@ -527,6 +572,20 @@ def process_cluster_cli_params(config):
     log_utilization = get_cli_param(config, "log_cluster_utilization")
     if log_utilization:
         ocsci_config.RUN["log_utilization"] = True
+    fork_budget = get_cli_param(config, "fork_budget")
+    if fork_budget:
+        ocsci_config.RUN["fork_budget"] = fork_budget
+        ocsci_config.RUN["fork_budget_action"] = get_cli_param(
+            config, "fork_budget_action", default="warn"
+        )
+    for mode in (cmd_trace.RECORD, cmd_trace.REPLAY):
+        cmd_trace_file = get_cli_param(config, f"cmd_trace_{mode}")
+        if cmd_trace_file:
+            ocsci_config.RUN["cmd_trace_mode"] = mode
+            ocsci_config.RUN["cmd_trace_file"] = cmd_trace_file
+    cmd_trace_time_scale = get_cli_param(config, "cmd_trace_time_scale")
+    if cmd_trace_time_scale is not None:
+        ocsci_config.RUN["cmd_trace_time_scale"] = cmd_trace_time_scale
     upgrade_ocs_version = get_cli_param(config, "upgrade_ocs_version")
     if upgrade_ocs_version:
         ocsci_config.UPGRADE["upgrade_ocs_version"] = upgrade_ocs_version
@@ -650,10 +709,50 @@ def pytest_collection_modifyitems(session, config, items):
             )
 
 
+def pytest_runtest_logstart(nodeid, location):
+    """
+    Attribute telemetry of the commands and API calls to the test
+    """
+    telemetry.set_current_test(nodeid)
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    """
+    Attribute telemetry recorded after the test to the session
+    """
+    telemetry.set_current_test(None)
+
+
+def check_fork_budget(item, rep):
+    """
+    Warn or fail the test (according to RUN['fork_budget_action']) when it
+    executed more commands than RUN['fork_budget'] during setup and call
+
+    Args:
+        item (pytest.Item): Test item
+        rep (TestReport): Report of the call phase of the test
+
+    """
+    fork_budget = ocsci_config.RUN.get("fork_budget")
+    if not fork_budget or rep.when != "call" or not rep.passed:
+        return
+    forks = telemetry.get_test_summary(item.nodeid)["forks"]
+    if forks <= fork_budget:
+        return
+    msg = f"Test executed {forks} commands, fork budget is {fork_budget}"
+    if ocsci_config.RUN.get("fork_budget_action") == "fail":
+        rep.outcome = "failed"
+        rep.longrepr = msg
+    else:
+        item.warn(pytest.PytestWarning(msg))
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
+    telemetry.add_test_duration(item.nodeid, rep.duration)
+    check_fork_budget(item, rep)
     # we only look at actual failing test calls, not setup/teardown
     if rep.failed and ocsci_config.RUN.get("cli_params").get("collect-logs"):
         test_case_name = item.name
@@ -670,16 +769,16 @@ def pytest_runtest_makereport(item, call):
         mcg_logs_collection = (
             True if any(x in item.location[0] for x in ["mcg", "ecosystem"]) else False
         )
-        try:
-            if not ocsci_config.RUN.get("is_ocp_deployment_failed"):
-                collect_ocs_logs(
-                    dir_name=test_case_name,
-                    ocp=ocp_logs_collection,
-                    ocs=ocs_logs_collection,
-                    mcg=mcg_logs_collection,
-                )
-        except Exception:
-            log.exception("Failed to collect OCS logs")
+        if not ocsci_config.RUN.get("is_ocp_deployment_failed"):
+            artifact_collector.submit(
+                "ocs_logs",
+                collect_ocs_logs,
+                nodeid=item.nodeid,
+                dir_name=test_case_name,
+                ocp=ocp_logs_collection,
+                ocs=ocs_logs_collection,
+                mcg=mcg_logs_collection,
+            )
 
     # Collect Prometheus metrics if specified in gather_metrics_on_fail marker
     if (
@@ -688,12 +787,15 @@ def pytest_runtest_makereport(item, call):
         and item.get_closest_marker("gather_metrics_on_fail")
     ):
         metrics = item.get_closest_marker("gather_metrics_on_fail").args
-        try:
-            collect_prometheus_metrics(
-                metrics, f"{item.name}-{call.when}", call.start, call.stop
-            )
-        except Exception:
-            log.exception("Failed to collect prometheus metrics")
+        artifact_collector.submit(
+            "prometheus_metrics",
+            collect_prometheus_metrics,
+            metrics,
+            f"{item.name}-{call.when}",
+            call.start,
+            call.stop,
+            nodeid=item.nodeid,
+        )
 
     # Get the performance metrics when tests fails for scale or performance tag
     from ocs_ci.helpers.helpers import collect_performance_stats
@@ -703,11 +805,43 @@ def pytest_runtest_makereport(item, call):
         and rep.failed
         and (item.get_closest_marker("scale") or item.get_closest_marker("performance"))
     ):
-        test_case_name = item.name
-        try:
-            collect_performance_stats(test_case_name)
-        except Exception:
-            log.exception("Failed to collect performance stats")
+        artifact_collector.submit(
+            "performance_stats",
+            collect_performance_stats,
+            item.name,
+            nodeid=item.nodeid,
+        )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Wait for collection of artifacts of failed tests and dump telemetry
+    summary of the session next to the JUnit report (or to the log directory
+    if there is no JUnit report)
+    """
+    try:
+        artifact_collector.drain(
+            timeout=ocsci_config.RUN.get("failure_artifacts_drain_timeout")
+        )
+    except Exception:
+        log.exception("Failed to drain background artifact collectors")
+    trace = cmd_trace.get_active()
+    if trace:
+        trace.stop()
+    xmlpath = getattr(session.config.option, "xmlpath", None)
+    if xmlpath:
+        summary_file = f"{os.path.splitext(xmlpath)[0]}_telemetry.json"
+    elif ocsci_config.RUN.get("run_id"):
+        summary_file = os.path.join(ocsci_log_path(), "telemetry.json")
+    else:
+        return
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(summary_file)), exist_ok=True)
+        telemetry.dump_summary(
+            summary_file, extra={"cmd_output": get_cmd_output_stats()}
+        )
+    except Exception:
+        log.exception("Failed to dump telemetry summary")
 
 
 def set_log_level(config):
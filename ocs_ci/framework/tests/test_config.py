@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from pytest import fixture
 
 from ocs_ci import framework
@@ -100,6 +103,35 @@ class TestConfig(object):
             )
         framework.config.reset_ctx()
 
+    def test_multicluster_thread_ctx(self):
+        framework.config.nclusters = 3
+        framework.config.init_cluster_configs()
+        for i in range(framework.config.nclusters):
+            framework.config.switch_ctx(i)
+            framework.config.update(dict(ENV_DATA=dict(cluster_name=f"cluster{i}")))
+        framework.config.switch_ctx(0)
+
+        barrier = threading.Barrier(framework.config.nclusters)
+
+        def get_cluster_name(index):
+            with framework.config.cluster_context(index):
+                # all the threads are in their own context at the same time
+                barrier.wait(timeout=10)
+                return framework.config.current_cluster_name()
+
+        with ThreadPoolExecutor(max_workers=framework.config.nclusters) as executor:
+            names = list(
+                executor.map(get_cluster_name, range(framework.config.nclusters))
+            )
+        assert names == ["cluster0", "cluster1", "cluster2"]
+        assert framework.config.current_cluster_name() == "cluster0"
+
+        with framework.config.cluster_context(1):
+            framework.config.switch_ctx(2)
+            assert framework.config.cur_index == 2
+        assert framework.config.cur_index == 0
+        framework.config.reset_ctx()
+
 
 class TestMergeDict:
     def test_merge_dict(self):
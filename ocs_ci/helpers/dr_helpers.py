@@ -8,7 +8,7 @@ from ocs_ci.ocs import constants, ocp
 from ocs_ci.ocs.resources.pod import get_all_pods
 from ocs_ci.ocs.resources.pvc import get_all_pvc_objs
 from ocs_ci.ocs.utils import get_non_acm_cluster_config
-from ocs_ci.utility.utils import TimeoutSampler
+from ocs_ci.utility.utils import TimeoutSampler, run_func_multicluster
 
 logger = logging.getLogger(__name__)
 
@@ -122,7 +122,7 @@ def check_mirroring_status_ok(replaying_images=None):
 def wait_for_mirroring_status_ok(replaying_images=None, timeout=300):
     """
     Wait for mirroring status to reach health OK and expected number of replaying
-    images for each of the ODF cluster
+    images for each of the ODF cluster. All the clusters are checked in parallel.
 
     Args:
         replaying_images (int): Expected number of images in replaying state
@@ -135,21 +135,42 @@ def wait_for_mirroring_status_ok(replaying_images=None, timeout=300):
         AssertionError: In case of unexpected mirroring status
 
     """
-    for cluster in get_non_acm_cluster_config():
-        config.switch_ctx(cluster.MULTICLUSTER["multicluster_index"])
-        logger.info(
-            f"Validating mirroring status on cluster {cluster.ENV_DATA['cluster_name']}"
-        )
-        sample = TimeoutSampler(
-            timeout=timeout,
-            sleep=5,
-            func=check_mirroring_status_ok,
-            replaying_images=replaying_images,
-        )
-        assert sample.wait_for_func_status(result=True), (
-            "The mirroring status does not have expected values within the time"
-            f" limit on cluster {cluster.ENV_DATA['cluster_name']}"
-        )
+    run_func_multicluster(
+        _wait_for_mirroring_status_ok,
+        indexes=[
+            cluster.MULTICLUSTER["multicluster_index"]
+            for cluster in get_non_acm_cluster_config()
+        ],
+        replaying_images=replaying_images,
+        timeout=timeout,
+    )
+    return True
+
+
+def _wait_for_mirroring_status_ok(replaying_images=None, timeout=300):
+    """
+    Wait for mirroring status OK on the cluster of the current context
+
+    Args:
+        replaying_images (int): Expected number of images in replaying state
+        timeout (int): time in seconds to wait for mirroring status reach OK
+
+    Raises:
+        AssertionError: In case of unexpected mirroring status
+
+    """
+    cluster_name = config.current_cluster_name()
+    logger.info(f"Validating mirroring status on cluster {cluster_name}")
+    sample = TimeoutSampler(
+        timeout=timeout,
+        sleep=5,
+        func=check_mirroring_status_ok,
+        replaying_images=replaying_images,
+    )
+    assert sample.wait_for_func_status(result=True), (
+        "The mirroring status does not have expected values within the time"
+        f" limit on cluster {cluster_name}"
+    )
 
 
 def get_all_vrs(namespace):
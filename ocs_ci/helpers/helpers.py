@@ -2588,9 +2588,11 @@ def collect_performance_stats(dir_name):
     Performance stats include:
         IOPs and throughput percentage of cluster
         CPU, memory consumption of each nodes
+        table of node metrics (usage, requests and limits of each node), which
+        is also appended to node_metrics.jsonl time series file
 
     """
-    from ocs_ci.ocs.cluster import CephCluster
+    from ocs_ci.ocs.node_metrics import NodeMetricsSampler
 
     log_dir_path = os.path.join(
         os.path.expanduser(config.RUN["log_dir"]),
@@ -2601,51 +2603,40 @@ def collect_performance_stats(dir_name):
         logger.info(f"Creating directory {log_dir_path}")
         os.makedirs(log_dir_path)
 
-    performance_stats = {}
     external = config.DEPLOYMENT["external_mode"]
     if external:
         # Skip collecting performance_stats for external mode RHCS cluster
         logger.info("Skipping status collection for external mode")
-    else:
-        ceph_obj = CephCluster()
 
-        # Get iops and throughput percentage of cluster
-        iops_percentage = ceph_obj.get_iops_percentage()
-        throughput_percentage = ceph_obj.get_throughput_percentage()
+    # All the sources (metrics API, nodes, pods and ceph status) are queried
+    # concurrently, once for all the nodes
+    sample = NodeMetricsSampler(ceph=not external).sample()
 
-        performance_stats["iops_percentage"] = iops_percentage
-        performance_stats["throughput_percentage"] = throughput_percentage
+    performance_stats = {}
+    if not external:
+        performance_stats["iops_percentage"] = sample.ceph.get("iops_percentage")
+        performance_stats["throughput_percentage"] = sample.ceph.get(
+            "throughput_percentage"
+        )
 
     # ToDo: Get iops and throughput percentage of each nodes
 
-    # Get the cpu and memory of each nodes from adm top
-    master_node_utilization_from_adm_top = (
-        node.get_node_resource_utilization_from_adm_top(node_type="master")
-    )
-    worker_node_utilization_from_adm_top = (
-        node.get_node_resource_utilization_from_adm_top(node_type="worker")
-    )
-
-    # Get the cpu and memory from describe of nodes
-    master_node_utilization_from_oc_describe = (
-        node.get_node_resource_utilization_from_oc_describe(node_type="master")
-    )
-    worker_node_utilization_from_oc_describe = (
-        node.get_node_resource_utilization_from_oc_describe(node_type="worker")
-    )
-
-    performance_stats["master_node_utilization"] = master_node_utilization_from_adm_top
-    performance_stats["worker_node_utilization"] = worker_node_utilization_from_adm_top
-    performance_stats[
-        "master_node_utilization_from_oc_describe"
-    ] = master_node_utilization_from_oc_describe
-    performance_stats[
-        "worker_node_utilization_from_oc_describe"
-    ] = worker_node_utilization_from_oc_describe
+    # cpu and memory usage of nodes (as reported by adm top) and the requested
+    # cpu and memory (as reported by describe of nodes)
+    for node_type in (constants.MASTER_MACHINE, constants.WORKER_MACHINE):
+        performance_stats[f"{node_type}_node_utilization"] = sample.utilization(
+            role=node_type
+        )
+        performance_stats[
+            f"{node_type}_node_utilization_from_oc_describe"
+        ] = sample.utilization(role=node_type, source="requests")
+    performance_stats["node_metrics"] = sample.to_dict()
 
     file_name = os.path.join(log_dir_path, "performance")
     with open(file_name, "w") as outfile:
         json.dump(performance_stats, outfile)
+    with open(os.path.join(log_dir_path, "node_metrics.jsonl"), "a") as outfile:
+        sample.dump_records(outfile)
 
 
 def validate_pod_oomkilled(
@@ -7,9 +7,6 @@ import os
 import shlex
 from uuid import uuid4
 
-import boto3
-from botocore.handlers import disable_signing
-
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants
 from ocs_ci.ocs.exceptions import TimeoutExpiredError, UnexpectedBehaviour
@@ -151,6 +148,9 @@ def retrieve_anon_s3_resource():
         boto3.resource(): An anonymous S3 resource
 
     """
+    import boto3
+    from botocore.handlers import disable_signing
+
     anon_s3_resource = boto3.resource("s3")
     anon_s3_resource.meta.client.meta.events.register(
         "choose-signer.s3.*", disable_signing
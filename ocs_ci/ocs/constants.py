@@ -604,6 +604,10 @@ FIO_IO_PARAMS_YAML = os.path.join(TEMPLATE_FIO_DIR, "workload_io.yaml")
 FIO_IO_RW_PARAMS_YAML = os.path.join(TEMPLATE_FIO_DIR, "workload_io_rw.yaml")
 FIO_IO_FILLUP_PARAMS_YAML = os.path.join(TEMPLATE_FIO_DIR, "workload_io_fillup.yaml")
 FIO_DC_YAML = os.path.join(TEMPLATE_FIO_DIR, "fio_dc.yaml")
+# Path where the static fio binary is copied to inside the app pods
+FIO_STATIC_BINARY_POD_PATH = "/tmp/fio"
+# Path prefix of fio bw/iops/lat logs inside the app pods
+FIO_TIMESERIES_LOG_PREFIX = "/tmp/fio_timeseries"
 
 # fio configuration files
 FIO_S3 = os.path.join(TEMPLATE_FIO_DIR, "config_s3.fio")
@@ -56,6 +56,9 @@ IPMI_INTERFACE_TYPE = "lanplus"
 IPMI_RMCP_PORT = 623
 IPMI_IPMB_ADDRESS = 0x20
 
+# Maximum number of pods running workload (FIO) at once by WorkLoadOrchestrator
+WORKLOAD_ORCHESTRATOR_MAX_WORKERS = 50
+
 # Background load FIO pod name
 BG_LOAD_NAMESPACE = "bg-fio-load"
 
@@ -65,6 +68,10 @@ MAX_BYTES_IN_POOL_AFTER_DATA_DELETE = 250000
 # Elastic search parameters
 ELASTICSEARCH_DEV_IP = "10.0.144.103"
 ELASTICSEARCE_PORT = 9200
+# Bulk loading of dumped data into the Elastic search server
+ES_BULK_CHUNK_SIZE = 500
+ES_BULK_THREAD_COUNT = 4
+ES_LOAD_MAX_WORKERS = 4
 
 # Local storage namespace
 LOCAL_STORAGE_NAMESPACE = "openshift-local-storage"
@@ -137,3 +144,24 @@ HPCS_CSI_CONNECTION_CONF = {
 # Must-gather:
 MUST_GATHER_UPSTREAM_IMAGE = "quay.io/ocs-dev/ocs-must-gather"
 MUST_GATHER_UPSTREAM_TAG = "latest"
+
+# Telemetry of commands and API calls (see ocs_ci.utility.telemetry)
+TELEMETRY_RING_SIZE = 10000
+TELEMETRY_TOP_N = 20
+
+# Recorder of prometheus metrics and alerts (see ocs_ci.utility.metrics_recorder)
+METRICS_RECORDER_INTERVAL = 3
+METRICS_RECORDER_QUERIES = {
+    "throughput": constants.THROUGHPUT_QUERY,
+    "latency": constants.LATENCY_QUERY,
+    "iops": constants.IOPS_QUERY,
+    "used_space": constants.USED_SPACE_QUERY,
+}
+
+# vSphere inventory (see ocs_ci.utility.vsphere.VSPHERE.get_inventory)
+VSPHERE_INVENTORY_CACHE_TTL = 120
+VSPHERE_INVENTORY_PROPERTIES = ["name", "parent"]
+
+# AWS EC2 API (see ocs_ci.utility.aws.AWS)
+AWS_DESCRIBE_CACHE_TTL = 5
+AWS_MAX_WORKERS = 10
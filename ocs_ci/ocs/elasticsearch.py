@@ -11,6 +11,8 @@ import json
 import logging
 import os
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # 3rd party modules
 from elasticsearch import Elasticsearch, helpers, exceptions as esexp
@@ -19,7 +21,7 @@ from subprocess import run, CalledProcessError
 # Local modules
 from ocs_ci.helpers.helpers import create_pvc, wait_for_resource_state
 from ocs_ci.helpers.performance_lib import run_command
-from ocs_ci.ocs import constants
+from ocs_ci.ocs import constants, defaults
 from ocs_ci.ocs.exceptions import (
     CommandFailed,
     ResourceWrongStatusException,
@@ -36,49 +38,112 @@ es_log = logging.getLogger("elasticsearch")
 es_log.setLevel(logging.CRITICAL)
 
 
-def elasticsearch_load(connection, target_path):
+def get_data_from_text_file(json_file):
     """
-    Load all data from target_path/results into an elasticsearch (es) server.
+    This function will return the docs stored in a text file (one json doc
+    per line). The function is working as a generator, the file is read
+    lazily and the records are returned one at a time, so the memory usage
+    does not depend on the size of the file.
 
     Args:
-        connection (obj): an elasticsearch connection object
-        target_path (str): the path where data was dumped into
+        json_file (str): the file name to look for docs in
 
-    Returns:
-        bool: True if loading data succeed, False otherwise
+    Yields:
+        dict : document as json dict
 
     """
-
-    # define a function that will load a text file
-    def get_data_from_text_file(json_file):
-        """
-        This function will return a list of docs stored in a text file.
-        the function is working as a generator, and return the records
-        one at a time.
-
-        Args:
-            json_file (str): the file name to look for docs in
-
-        Returns:
-             list : list of documents as json dicts
-
-        """
-
-        docs = [
-            l.strip() for l in open(str(json_file), encoding="utf8", errors="ignore")
-        ]
-        log.info(f"String docs length: {len(docs)}")
-
-        for num, doc in enumerate(docs):
+    with open(str(json_file), encoding="utf8", errors="ignore") as data_file:
+        for num, line in enumerate(data_file):
+            doc = line.strip()
+            if not doc:
+                continue
             try:
-                dict_doc = json.loads(doc)
-                yield dict_doc
+                yield json.loads(doc)
             except json.decoder.JSONDecodeError as err:
                 # print the errors
                 log.error(
                     f"ERROR for num: {num} -- JSONDecodeError: {err} for doc: {doc}"
                 )
 
+
+def load_index_file(
+    connection,
+    file_name,
+    ind_name,
+    chunk_size=defaults.ES_BULK_CHUNK_SIZE,
+    thread_count=defaults.ES_BULK_THREAD_COUNT,
+):
+    """
+    Stream one dumped index file into an elasticsearch (es) server by
+    parallel_bulk. Rejected documents are counted instead of failing the
+    whole load.
+
+    Args:
+        connection (obj): an elasticsearch connection object
+        file_name (str): the full path of the data file to load
+        ind_name (str): the index name to load the data into
+        chunk_size (int): number of documents to send in one bulk request
+        thread_count (int): number of threads used by parallel_bulk
+
+    Returns:
+        dict: loading statistics of the index - docs, rejected, time and
+            docs_per_sec
+
+    """
+    loaded = rejected = 0
+    start_time = time.time()
+    for success, info in helpers.parallel_bulk(
+        connection,
+        get_data_from_text_file(file_name),
+        index=ind_name,
+        chunk_size=chunk_size,
+        thread_count=thread_count,
+        raise_on_error=False,
+        raise_on_exception=False,
+    ):
+        if success:
+            loaded += 1
+        else:
+            rejected += 1
+            log.debug(f"Document rejected by the {ind_name} index : {info}")
+    duration = time.time() - start_time
+    stats = {
+        "docs": loaded,
+        "rejected": rejected,
+        "time": round(duration, 3),
+        "docs_per_sec": round(loaded / duration, 2) if duration else 0,
+    }
+    log.info(
+        f"Index {ind_name} loaded : {loaded} docs ({stats['docs_per_sec']} docs/sec), "
+        f"{rejected} docs rejected"
+    )
+    return stats
+
+
+def elasticsearch_load(
+    connection,
+    target_path,
+    chunk_size=defaults.ES_BULK_CHUNK_SIZE,
+    thread_count=defaults.ES_BULK_THREAD_COUNT,
+    max_workers=defaults.ES_LOAD_MAX_WORKERS,
+):
+    """
+    Load all data from target_path/results into an elasticsearch (es) server.
+
+    The data files are streamed into the server, so the memory usage stays flat
+    regardless of the dump size, and several index files are loaded concurrently.
+
+    Args:
+        connection (obj): an elasticsearch connection object
+        target_path (str): the path where data was dumped into
+        chunk_size (int): number of documents to send in one bulk request
+        thread_count (int): number of threads used by parallel_bulk per index
+        max_workers (int): number of index files to load concurrently
+
+    Returns:
+        bool: True if loading data succeed, False otherwise
+
+    """
     all_files = run_command(f"ls {target_path}/results/", out_format="list")
     if "Error in command" in all_files:
         log.error("There is No data to load into ES server")
@@ -88,19 +153,32 @@ def elasticsearch_load(connection, target_path):
             log.warning("There is no elasticsearch server to load data into")
             return False
         log.info(f"The ES connection is {connection}")
-        for ind in all_files:
-            if ".data." in ind:  # load only data files and not mapping info
-                file_name = f"{target_path}/results/{ind}"
-                ind_name = ind.split(".")[0]
-                log.info(f"Loading the {ind} data into the ES server")
+        futures = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for ind in all_files:
+                if ".data." in ind:  # load only data files and not mapping info
+                    file_name = f"{target_path}/results/{ind}"
+                    ind_name = ind.split(".")[0]
+                    log.info(f"Loading the {ind} data into the ES server")
+                    future = executor.submit(
+                        load_index_file,
+                        connection,
+                        file_name,
+                        ind_name,
+                        chunk_size=chunk_size,
+                        thread_count=thread_count,
+                    )
+                    futures[future] = ind_name
 
+            for future in as_completed(futures):
                 try:
-                    resp = helpers.bulk(
-                        connection, get_data_from_text_file(file_name), index=ind_name
-                    )
-                    log.info(f"helpers.bulk() RESPONSE: {resp}")
+                    resp = future.result()
+                    log.info(f"helpers.parallel_bulk() RESPONSE: {resp}")
                 except Exception as err:
-                    log.error(f"Elasticsearch helpers.bulk() ERROR:{err}")
+                    log.error(
+                        f"Elasticsearch helpers.parallel_bulk() ERROR for "
+                        f"{futures[future]}:{err}"
+                    )
         return True
 
 
@@ -0,0 +1,306 @@
+# -*- coding: utf8 -*-
+
+"""
+This module contains functions and classes for capturing per interval fio
+statistics (bandwidth, IOPS and latency logs) from app pods running fio via
+:py:meth:`ocs_ci.ocs.resources.pod.Pod.run_io` and for analysing them, e.g.
+to find IO stalls during disruptions like node reboot or OSD kill.
+
+Example::
+
+    pod_obj.run_io(storage_type="fs", size="1G", runtime=600, log_timeseries=True)
+    # ... disruptive operation ...
+    disruption_ts = time.time()
+    timeseries = FioTimeSeries(pod_obj)
+    timeseries.collect()  # can be called repeatedly while fio is running
+    summary = timeseries.wait_for_results()
+    times, iops = timeseries.get("iops", direction="write")
+    stalls = detect_stalls(times, iops, min_duration=5)
+    relative_times = align_to_timestamp(times, disruption_ts)
+
+All timestamps are unix epoch in seconds (fio logs them in msec, because
+the logs are written with ``log_unix_epoch`` enabled).
+"""
+
+import logging
+import os
+from collections import defaultdict
+
+import numpy as np
+
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.exceptions import CommandFailed
+
+
+logger = logging.getLogger(__name__)
+
+# fio log file suffixes and the metric they represent, e.g. the bandwidth log
+# of the first job is named <prefix>_bw.1.log
+FIO_LOG_METRICS = ("bw", "iops", "lat", "clat", "slat")
+# data direction column of fio log
+FIO_LOG_DIRECTIONS = {0: "read", 1: "write", 2: "trim"}
+
+
+def get_timeseries_params(log_prefix, log_avg_msec=1000):
+    """
+    Get fio parameters which enable per interval logging of bandwidth, IOPS
+    and latency.
+
+    Args:
+        log_prefix (str): Path prefix of the log files on the pod
+        log_avg_msec (int): Averaging interval of the log samples in msec
+
+    Returns:
+        dict: fio parameters
+
+    """
+    return {
+        "write_bw_log": log_prefix,
+        "write_iops_log": log_prefix,
+        "write_lat_log": log_prefix,
+        "log_avg_msec": log_avg_msec,
+        "log_unix_epoch": 1,
+    }
+
+
+def parse_fio_log(log_content):
+    """
+    Parse content of fio log file. Each line of the log has format:
+    ``time (msec), value, data direction, block size, offset[, priority]``
+
+    Args:
+        log_content (str): Content of the fio log file
+
+    Returns:
+        dict: numpy array of shape (N, 2) with time (sec) and value columns
+            for each data direction, e.g. {"read": array, "write": array}
+
+    """
+    if not log_content.strip():
+        return {}
+    data = np.loadtxt(
+        log_content.splitlines(), delimiter=",", usecols=(0, 1, 2), ndmin=2
+    )
+    result = {}
+    for direction_id, direction in FIO_LOG_DIRECTIONS.items():
+        rows = data[data[:, 2] == direction_id]
+        if rows.size:
+            samples = rows[:, :2].copy()
+            samples[:, 0] /= 1000
+            result[direction] = samples
+    return result
+
+
+def detect_stalls(times, values, threshold=0, min_duration=2, interval=1):
+    """
+    Find time windows where the value (e.g. IOPS or bandwidth) was at or
+    below threshold for at least min_duration seconds. Missing samples
+    (gaps longer than interval) are considered as a stall as well.
+
+    Args:
+        times (numpy.ndarray): Timestamps of the samples in seconds
+        values (numpy.ndarray): Values of the samples
+        threshold (float): Value at or below which the IO is stalled
+        min_duration (float): Minimal duration of the stall in seconds
+        interval (float): Expected interval between samples in seconds
+
+    Returns:
+        list: List of (start, end) tuples of the stalls
+
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if not times.size:
+        return []
+    order = np.argsort(times)
+    times, values = times[order], values[order]
+    stalled = values <= threshold
+    stalls = []
+    start = None
+    for index in range(times.size):
+        gap = index and times[index] - times[index - 1] > interval * 1.5
+        if gap:
+            # no samples in the gap, the stall lasts at least during the gap
+            if start is None:
+                start = times[index - 1]
+            if not stalled[index]:
+                stalls.append((start, times[index]))
+                start = None
+            continue
+        if stalled[index] and start is None:
+            start = times[index]
+        elif not stalled[index] and start is not None:
+            stalls.append((start, times[index]))
+            start = None
+    if start is not None:
+        stalls.append((start, times[-1]))
+    return [(s, e) for s, e in stalls if e - s >= min_duration]
+
+
+def window_percentile(times, values, start, end, percentile=50):
+    """
+    Compute percentile of values in the time window <start, end>
+
+    Args:
+        times (numpy.ndarray): Timestamps of the samples in seconds
+        values (numpy.ndarray): Values of the samples
+        start (float): Start of the window in seconds
+        end (float): End of the window in seconds
+        percentile (float or list): Percentile(s) to compute, 0-100
+
+    Returns:
+        float or numpy.ndarray: The percentile(s), None if there are no
+            samples in the window
+
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    selected = values[(times >= start) & (times <= end)]
+    if not selected.size:
+        return None
+    return np.percentile(selected, percentile)
+
+
+def align_to_timestamp(times, timestamp):
+    """
+    Align timestamps of the samples to given event (e.g. disruption start)
+
+    Args:
+        times (numpy.ndarray): Timestamps of the samples in seconds
+        timestamp (float): Unix timestamp of the event in seconds
+
+    Returns:
+        numpy.ndarray: Time of the samples relative to the event in seconds
+            (negative values are samples before the event)
+
+    """
+    return np.asarray(times, dtype=float) - timestamp
+
+
+class FioTimeSeries(object):
+    """
+    Per interval fio statistics of one pod. The samples are stored as numpy
+    arrays per fio job, metric and data direction.
+    """
+
+    def __init__(self, pod_obj, log_prefix=constants.FIO_TIMESERIES_LOG_PREFIX):
+        """
+        Args:
+            pod_obj (Pod): Pod object on which fio runs with log_timeseries
+            log_prefix (str): Path prefix of the fio log files on the pod
+
+        """
+        self.pod_obj = pod_obj
+        self.log_prefix = log_prefix
+        # {log file name: number of lines already collected}
+        self._offsets = defaultdict(int)
+        # {(job, metric): {direction: numpy array (N, 2)}}
+        self.samples = {}
+        self.summary = None
+
+    def list_log_files(self):
+        """
+        List fio log files on the pod
+
+        Returns:
+            list: Paths of the fio log files
+
+        """
+        try:
+            out = self.pod_obj.exec_cmd_on_pod(
+                f"sh -c 'ls {self.log_prefix}_*.log'", out_yaml_format=False
+            )
+        except CommandFailed:
+            logger.debug(f"No fio logs found on pod {self.pod_obj.name} yet")
+            return []
+        return out.split()
+
+    def collect(self):
+        """
+        Fetch new lines of all fio logs from the pod and append them to the
+        stored samples. Only the lines which were not collected yet are
+        transferred, so this can be called periodically while fio runs.
+
+        """
+        for log_file in self.list_log_files():
+            name = os.path.basename(log_file)[len(os.path.basename(self.log_prefix)) :]
+            # e.g. _bw.1.log -> metric "bw", job 1
+            metric, job = name.lstrip("_").split(".")[:2]
+            if metric not in FIO_LOG_METRICS:
+                continue
+            offset = self._offsets[log_file]
+            content = self.pod_obj.exec_cmd_on_pod(
+                f"tail -n +{offset + 1} {log_file}", out_yaml_format=False
+            )
+            lines = content.splitlines()
+            # the last line may be incomplete while fio is still writing
+            if lines and not content.endswith("\n"):
+                lines = lines[:-1]
+            if not lines:
+                continue
+            self._offsets[log_file] = offset + len(lines)
+            stored = self.samples.setdefault((int(job), metric), {})
+            for direction, samples in parse_fio_log("\n".join(lines)).items():
+                if direction in stored:
+                    stored[direction] = np.concatenate((stored[direction], samples))
+                else:
+                    stored[direction] = samples
+        logger.info(
+            f"Collected fio time series of pod {self.pod_obj.name} from "
+            f"{len(self._offsets)} log files"
+        )
+
+    def wait_for_results(self, timeout=600):
+        """
+        Wait for fio to finish, collect the rest of the logs and store the
+        final fio summary
+
+        Args:
+            timeout (int): Time in seconds to wait for fio
+
+        Returns:
+            dict: The final fio summary
+
+        """
+        from ocs_ci.ocs.fiojob import fio_to_dict
+
+        output = self.pod_obj.fio_thread.result(timeout)
+        self.summary = fio_to_dict(output)
+        self.collect()
+        return self.summary
+
+    def get(self, metric, direction="write", job=None):
+        """
+        Get time series of the metric
+
+        Args:
+            metric (str): One of FIO_LOG_METRICS, e.g. iops
+            direction (str): read, write or trim
+            job (int): Number of fio job, if not provided, samples of all the
+                jobs are summed up per timestamp (for bw and iops) or averaged
+                (for latencies)
+
+        Returns:
+            tuple: numpy arrays of timestamps (sec) and values
+
+        """
+        if job is not None:
+            samples = self.samples.get((job, metric), {}).get(direction)
+            if samples is None:
+                return np.empty(0), np.empty(0)
+            return samples[:, 0], samples[:, 1]
+
+        arrays = [
+            samples[direction]
+            for (_, sample_metric), samples in self.samples.items()
+            if sample_metric == metric and direction in samples
+        ]
+        if not arrays:
+            return np.empty(0), np.empty(0)
+        merged = np.concatenate(arrays)
+        # samples of jobs are aligned to the log interval (rounded to seconds)
+        times, inverse = np.unique(np.round(merged[:, 0]), return_inverse=True)
+        values = np.bincount(inverse, weights=merged[:, 1])
+        if metric not in ("bw", "iops"):
+            values = values / np.bincount(inverse)
+        return times, values
@@ -1,5 +1,6 @@
 import copy
 import logging
+import queue
 import re
 import time
 from prettytable import PrettyTable
@@ -15,10 +16,10 @@ from ocs_ci.framework import config
 from ocs_ci.ocs.exceptions import (
     TimeoutExpiredError,
     NotAllNodesCreated,
-    CommandFailed,
     ResourceNotFoundError,
 )
 from ocs_ci.ocs.ocp import OCP
+from ocs_ci.ocs.watch import ResourceWatch
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.ocs import constants, exceptions, ocp, defaults
 from ocs_ci.utility import version
@@ -66,7 +67,7 @@ def get_node_objs(node_names=None):
     return nodes
 
 
-def get_nodes(node_type=constants.WORKER_MACHINE, num_of_nodes=None):
+def get_nodes(node_type=constants.WORKER_MACHINE, num_of_nodes=None, inventory=None):
     """
     Get cluster's nodes according to the node type (e.g. worker, master) and the
     number of requested nodes from that type
@@ -74,30 +75,15 @@ def get_nodes(node_type=constants.WORKER_MACHINE, num_of_nodes=None):
     Args:
         node_type (str): The node type (e.g. worker, master)
         num_of_nodes (int): The number of nodes to be returned
+        inventory (NodeInventory): Snapshot of the nodes to use, the nodes
+            are listed if not provided
 
     Returns:
         list: The nodes OCP instances
 
     """
-    if (
-        config.ENV_DATA["platform"].lower() in constants.MANAGED_SERVICE_PLATFORMS
-        and node_type == constants.WORKER_MACHINE
-    ):
-        typed_nodes = [
-            node
-            for node in get_node_objs()
-            if node_type
-            in node.ocp.get_resource(resource_name=node.name, column="ROLES")
-            and constants.INFRA_MACHINE
-            not in node.ocp.get_resource(resource_name=node.name, column="ROLES")
-        ]
-    else:
-        typed_nodes = [
-            node
-            for node in get_node_objs()
-            if node_type
-            in node.ocp.get_resource(resource_name=node.name, column="ROLES")
-        ]
+    inventory = inventory or NodeInventory()
+    typed_nodes = inventory.get_node_objs(inventory.get_node_names(node_type))
     if num_of_nodes:
         typed_nodes = typed_nodes[:num_of_nodes]
     return typed_nodes
@@ -116,6 +102,312 @@ def get_all_nodes():
     return [node["metadata"]["name"] for node in node_items]
 
 
+class NodeInventory(object):
+    """
+    Snapshot of the cluster nodes and pods with in-memory indexes, so the node
+    helpers don't need to list the nodes and pods again for every lookup.
+    The nodes are listed by one command, the pods by one command per
+    namespace when they are needed for the first time. Call refresh() to drop
+    the snapshot, the resources are listed again by the next lookup.
+
+    Example::
+
+        inventory = NodeInventory()
+        for node_name in inventory.get_node_names(constants.WORKER_MACHINE):
+            zone = inventory.get_zone(node_name)
+            osd_ids = inventory.get_osd_ids(node_name)
+
+    """
+
+    def __init__(self, namespace=None):
+        """
+        Args:
+            namespace (str): Namespace of the Ceph pods, the cluster namespace
+                if not provided
+
+        """
+        self.namespace = namespace or config.ENV_DATA["cluster_namespace"]
+        self.refresh()
+
+    def refresh(self):
+        """
+        Drop the snapshot of the nodes and pods
+        """
+        self._nodes = None
+        self._roles = None
+        # namespace -> list of pod dicts
+        self._pods = {}
+        # namespace -> {pod name: node name}
+        self._pod_nodes = {}
+        # node name -> {daemon type: [daemon ids]}
+        self._daemons = None
+
+    @property
+    def nodes(self):
+        """
+        dict: Node name -> node resource dict, in order of the node list
+        """
+        if self._nodes is None:
+            node_dicts = OCP(kind=constants.NODE).get()["items"]
+            self._nodes = {node["metadata"]["name"]: node for node in node_dicts}
+        return self._nodes
+
+    def get_pods(self, namespace=None):
+        """
+        Get pod resources of the namespace
+
+        Args:
+            namespace (str): The namespace, the namespace of the Ceph pods if
+                not provided
+
+        Returns:
+            list: Pod resource dicts
+
+        """
+        namespace = namespace or self.namespace
+        if namespace not in self._pods:
+            pod_dicts = OCP(kind=constants.POD, namespace=namespace).get()["items"]
+            self._pods[namespace] = pod_dicts
+            self._pod_nodes[namespace] = {
+                pod_dict["metadata"]["name"]: pod_dict["spec"].get("nodeName")
+                for pod_dict in pod_dicts
+            }
+        return self._pods[namespace]
+
+    def get_pod_node_name(self, pod_name, namespace=None):
+        """
+        Get name of the node the pod is scheduled to
+
+        Args:
+            pod_name (str): Name of the pod
+            namespace (str): Namespace of the pod, the namespace of the Ceph
+                pods if not provided
+
+        Returns:
+            str: The node name, None if the pod is not scheduled yet
+
+        Raises:
+            ResourceNotFoundError: If the pod is not in the snapshot
+
+        """
+        namespace = namespace or self.namespace
+        self.get_pods(namespace)
+        try:
+            return self._pod_nodes[namespace][pod_name]
+        except KeyError:
+            raise ResourceNotFoundError(
+                f"Pod {pod_name} not found in namespace {namespace}"
+            )
+
+    def get_roles(self, node_name):
+        """
+        Get roles of the node from its node-role.kubernetes.io labels, the
+        same roles as shown in the ROLES column of 'oc get nodes'
+
+        Args:
+            node_name (str): The node name
+
+        Returns:
+            set: Roles of the node
+
+        """
+        if self._roles is None:
+            self._roles = {}
+            for name, node in self.nodes.items():
+                roles = set()
+                for label, value in node["metadata"].get("labels", {}).items():
+                    if label.startswith("node-role.kubernetes.io/"):
+                        roles.add(label.split("/", 1)[1])
+                    elif label == "kubernetes.io/role" and value:
+                        roles.add(value)
+                self._roles[name] = roles
+        return self._roles.get(node_name, set())
+
+    def get_node_names(self, node_type=None):
+        """
+        Get names of the nodes with the role. Infra nodes are not considered
+        worker nodes on managed service platforms.
+
+        Args:
+            node_type (str): The node role (e.g. worker, master), all the nodes
+                if not provided
+
+        Returns:
+            list: The node names
+
+        """
+        if node_type is None:
+            return list(self.nodes)
+        exclude_infra = (
+            config.ENV_DATA["platform"].lower() in constants.MANAGED_SERVICE_PLATFORMS
+            and node_type == constants.WORKER_MACHINE
+        )
+        return [
+            name
+            for name in self.nodes
+            if node_type in self.get_roles(name)
+            and not (exclude_infra and constants.INFRA_MACHINE in self.get_roles(name))
+        ]
+
+    def get_node_objs(self, node_names=None):
+        """
+        Get node objects of the snapshot
+
+        Args:
+            node_names (list): The node names, all the nodes if None
+
+        Returns:
+            list: Node OCS objects, in order of the node list
+
+        """
+        return [
+            OCS(**copy.deepcopy(node))
+            for name, node in self.nodes.items()
+            if node_names is None or name in node_names
+        ]
+
+    def get_label(self, node_name, label):
+        """
+        Args:
+            node_name (str): The node name
+            label (str): The label key
+
+        Returns:
+            str: Value of the node label, None if the node doesn't have it
+
+        """
+        return self.nodes[node_name]["metadata"].get("labels", {}).get(label)
+
+    def get_zone(self, node_name):
+        """
+        Args:
+            node_name (str): The node name
+
+        Returns:
+            str: Zone of the node
+
+        """
+        return self.get_label(node_name, "failure-domain.beta.kubernetes.io/zone")
+
+    def get_rack(self, node_name):
+        """
+        Args:
+            node_name (str): The node name
+
+        Returns:
+            str: Rack of the node
+
+        """
+        return self.get_label(node_name, "topology.rook.io/rack")
+
+    def get_zone_dict(self, node_type=constants.WORKER_MACHINE):
+        """
+        Args:
+            node_type (str): The node role
+
+        Returns:
+            dict: {"Node name": "Zone name"}
+
+        """
+        return {name: self.get_zone(name) for name in self.get_node_names(node_type)}
+
+    def get_rack_dict(self, node_type=constants.WORKER_MACHINE):
+        """
+        Args:
+            node_type (str): The node role
+
+        Returns:
+            dict: {"Node name": "Rack name"}
+
+        """
+        return {name: self.get_rack(name) for name in self.get_node_names(node_type)}
+
+    def get_nodes_by_zone(self, node_type=constants.WORKER_MACHINE):
+        """
+        Args:
+            node_type (str): The node role
+
+        Returns:
+            dict: {"Zone name": ["Node name", ...]}
+
+        """
+        nodes_by_zone = defaultdict(list)
+        for name in self.get_node_names(node_type):
+            nodes_by_zone[self.get_zone(name)].append(name)
+        return dict(nodes_by_zone)
+
+    def get_daemon_pods(self, daemon_type, node_name=None):
+        """
+        Get pods of the Ceph daemons of the type, from the pods labeled
+        app=rook-ceph-<daemon type>
+
+        Args:
+            daemon_type (str): The daemon type (e.g. osd, mon, mgr)
+            node_name (str): Only pods scheduled to the node if provided
+
+        Returns:
+            list: Pod resource dicts
+
+        """
+        app = f"rook-ceph-{daemon_type}"
+        return [
+            pod_dict
+            for pod_dict in self.get_pods()
+            if pod_dict["metadata"].get("labels", {}).get("app") == app
+            and (node_name is None or pod_dict["spec"].get("nodeName") == node_name)
+        ]
+
+    def get_daemons(self, node_name):
+        """
+        Get Ceph daemons hosted by the node
+
+        Args:
+            node_name (str): The node name
+
+        Returns:
+            dict: {"Daemon type": ["Daemon id", ...]}
+
+        """
+        if self._daemons is None:
+            self._daemons = defaultdict(lambda: defaultdict(list))
+            for daemon_type in ("osd", "mon", "mgr", "mds", "rgw"):
+                id_label = "ceph-osd-id" if daemon_type == "osd" else "ceph_daemon_id"
+                for pod_dict in self.get_daemon_pods(daemon_type):
+                    self._daemons[pod_dict["spec"].get("nodeName")][daemon_type].append(
+                        pod_dict["metadata"]["labels"].get(id_label)
+                    )
+        return {
+            daemon_type: list(ids)
+            for daemon_type, ids in self._daemons.get(node_name, {}).items()
+        }
+
+    def get_osd_ids(self, node_name):
+        """
+        Args:
+            node_name (str): The node name
+
+        Returns:
+            list: Ids of the OSDs hosted by the node
+
+        """
+        return self.get_daemons(node_name).get("osd", [])
+
+    def get_daemon_nodes(self, daemon_type):
+        """
+        Args:
+            daemon_type (str): The daemon type (e.g. osd, mon, mgr)
+
+        Returns:
+            list: Names of the nodes of the daemon pods, one per scheduled pod
+
+        """
+        return [
+            pod_dict["spec"]["nodeName"]
+            for pod_dict in self.get_daemon_pods(daemon_type)
+            if pod_dict["spec"].get("nodeName")
+        ]
+
+
 def wait_for_nodes_status(node_names=None, status=constants.NODE_READY, timeout=180):
     """
     Wait until all nodes are in the given status
@@ -160,6 +452,215 @@ def wait_for_nodes_status(node_names=None, status=constants.NODE_READY, timeout=
         raise exceptions.ResourceWrongStatusException(error_message)
 
 
+class NodeRebootTracker(object):
+    """
+    Tracks reboot of nodes from one watch of the nodes and one watch of the
+    Rebooted events of all the nodes, instead of polling every node. The
+    timeline of every node (unix times) is recorded:
+
+        reset: The reboot was issued, see reset_issued()
+        not_ready: The node was seen NotReady for the first time
+        ready: The node was seen Ready again, or the time of the reboot event
+            if it was never seen NotReady
+        reboot_event: A new Rebooted event of the node was seen
+
+    Example::
+
+        with NodeRebootTracker(node_names) as tracker:
+            restart_vms(vms)
+            tracker.reset_issued()
+            tracker.wait(timeout=300)
+        log.info(tracker.get_durations())
+
+    """
+
+    def __init__(self, node_names):
+        """
+        Args:
+            node_names (list): Names of the rebooted nodes
+
+        """
+        self.node_names = list(node_names)
+        self.timeline = {name: {} for name in self.node_names}
+        self._queue = queue.Queue()
+        self._watches = [
+            ResourceWatch(constants.NODE, events_queue=self._queue),
+            ResourceWatch(
+                "event",
+                all_namespaces=True,
+                field_selector="reason=Rebooted",
+                events_queue=self._queue,
+            ),
+        ]
+        self._ready = {}
+        # uid -> count of the Rebooted events seen before the reset
+        self._known_events = {}
+
+    def start(self):
+        """
+        Remember the existing Rebooted events and start the watches
+        """
+        events = OCP(kind="event", field_selector="reason=Rebooted").get(
+            all_namespaces=True
+        )["items"]
+        for event in events:
+            self._known_events[event["metadata"]["uid"]] = event.get("count") or 1
+        for watch in self._watches:
+            watch.start()
+
+    def stop(self):
+        """
+        Stop the watches
+        """
+        for watch in self._watches:
+            watch.stop()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def reset_issued(self, timestamp=None):
+        """
+        Record that reboot of the nodes was issued
+
+        Args:
+            timestamp (float): Unix time of the reset, now if not provided
+
+        """
+        timestamp = timestamp or time.time()
+        for name in self.node_names:
+            self.timeline[name]["reset"] = timestamp
+
+    def is_done(self, node_name):
+        """
+        Args:
+            node_name (str): The node name
+
+        Returns:
+            bool: True if the reboot event of the node was seen and the node
+                is Ready
+
+        """
+        return "reboot_event" in self.timeline[node_name] and self._ready.get(
+            node_name, False
+        )
+
+    def process(self, event_type, resource, received):
+        """
+        Update the timeline by an event of the watches
+
+        Args:
+            event_type (str): Type of the watch event
+            resource (dict): The node or event resource
+            received (float): Time when the event was received
+
+        """
+        if resource.get("kind") == constants.NODE:
+            name = resource["metadata"]["name"]
+            if name not in self.timeline or event_type == "DELETED":
+                return
+            ready = any(
+                condition["type"] == "Ready" and condition["status"] == "True"
+                for condition in resource.get("status", {}).get("conditions", [])
+            )
+            timeline = self.timeline[name]
+            if "reset" in timeline and not ready and "not_ready" not in timeline:
+                log.info(f"Node {name} is NotReady")
+                timeline["not_ready"] = received
+            if ready and "not_ready" in timeline and "ready" not in timeline:
+                log.info(f"Node {name} is Ready")
+                timeline["ready"] = received
+            self._ready[name] = ready
+        elif resource.get("kind") == "Event":
+            name = resource.get("involvedObject", {}).get("name")
+            if name not in self.timeline or "reboot_event" in self.timeline[name]:
+                return
+            uid = resource["metadata"]["uid"]
+            count = resource.get("count") or 1
+            if count > self._known_events.get(uid, 0):
+                log.info(f"Node {name} rebooted")
+                self.timeline[name]["reboot_event"] = received
+                self.timeline[name].setdefault("ready", received)
+
+    def wait(self, timeout=300, event_timeout=300):
+        """
+        Wait until all the nodes are Ready and their reboot events are seen
+
+        Args:
+            timeout (int): Time in seconds to wait for the nodes to reach
+                Ready state
+            event_timeout (int): Time in seconds to wait for the reboot events
+                after all the nodes are Ready
+
+        Raises:
+            ResourceWrongStatusException: In case some of the nodes haven't
+                reached Ready state
+            RebootEventNotFoundException: In case reboot event of some of the
+                nodes wasn't seen
+
+        """
+        start = time.time()
+        while not all(self.is_done(name) for name in self.node_names):
+            if all(self._ready.get(name) for name in self.node_names):
+                deadline = start + timeout + event_timeout
+            else:
+                deadline = start + timeout
+            try:
+                event_type, resource, received = self._queue.get(
+                    timeout=max(deadline - time.time(), 0)
+                )
+            except queue.Empty:
+                break
+            self.process(event_type, resource, received)
+
+        not_ready = [name for name in self.node_names if not self._ready.get(name)]
+        if not_ready:
+            log.error(f"The following nodes haven't reached status Ready: {not_ready}")
+            error_message = (
+                f"{not_ready}, {[n.describe() for n in get_node_objs(not_ready)]}"
+            )
+            raise exceptions.ResourceWrongStatusException(error_message)
+        not_rebooted = [name for name in self.node_names if not self.is_done(name)]
+        if not_rebooted:
+            log.error(f"Reboot event not found for nodes {not_rebooted}")
+            raise exceptions.RebootEventNotFoundException(
+                f"Reboot event not found on nodes {not_rebooted}"
+            )
+        log.info(f"Nodes {self.node_names} rebooted: {self.get_durations()}")
+
+    def get_durations(self):
+        """
+        Returns:
+            dict: Seconds from the reset to the other events of the timeline
+                of every node, e.g. {'compute-0': {'not_ready': 35.2, ...}}
+
+        """
+        durations = {}
+        for name, timeline in self.timeline.items():
+            reset = timeline.get("reset")
+            durations[name] = {
+                key: round(value - reset, 3)
+                for key, value in timeline.items()
+                if reset is not None and key != "reset"
+            }
+        return durations
+
+    def to_records(self):
+        """
+        Returns:
+            list: One dict per node with the timeline and durations
+
+        """
+        durations = self.get_durations()
+        return [
+            {"node": name, "timeline": timeline, "durations": durations[name]}
+            for name, timeline in self.timeline.items()
+        ]
+
+
 def unschedule_nodes(node_names):
     """
     Change nodes to be unscheduled
@@ -627,29 +1128,36 @@ def node_network_failure(node_names, wait=True):
     return True
 
 
-def get_osd_running_nodes():
+def get_osd_running_nodes(inventory=None):
     """
     Gets the osd running node names
 
+    Args:
+        inventory (NodeInventory): Snapshot of the nodes and pods to use
+
     Returns:
         list: OSD node names
 
     """
-    return list({pod.get_pod_node(osd_node).name for osd_node in pod.get_osd_pods()})
+    inventory = inventory or NodeInventory()
+    return list(set(inventory.get_daemon_nodes("osd")))
 
 
-def get_osds_per_node():
+def get_osds_per_node(inventory=None):
     """
     Gets the osd running pod names per node name
 
+    Args:
+        inventory (NodeInventory): Snapshot of the nodes and pods to use
+
     Returns:
         dict: {"Node name":["osd running pod name running on the node",..,]}
 
     """
+    inventory = inventory or NodeInventory()
     dic_node_osd = defaultdict(list)
-    osd_pods = pod.get_osd_pods()
-    for osd_pod in osd_pods:
-        dic_node_osd[osd_pod.data["spec"]["nodeName"]].append(osd_pod.name)
+    for osd_pod in inventory.get_daemon_pods("osd"):
+        dic_node_osd[osd_pod["spec"]["nodeName"]].append(osd_pod["metadata"]["name"])
     return dic_node_osd
 
 
@@ -1384,7 +1892,9 @@ def untaint_nodes(taint_label=None, nodes_to_untaint=None):
     return False
 
 
-def get_node_pods(node_name, pods_to_search=None, raise_pod_not_found_error=False):
+def get_node_pods(
+    node_name, pods_to_search=None, raise_pod_not_found_error=False, inventory=None
+):
     """
     Get all the pods of a specified node
 
@@ -1395,22 +1905,25 @@ def get_node_pods(node_name, pods_to_search=None, raise_pod_not_found_error=Fals
         raise_pod_not_found_error (bool): If True, it raises an exception, if one of the pods
             in the pod names are not found. If False, it ignores the case of pod not found and
             returns the pod objects of the rest of the pod nodes. The default value is False
+        inventory (NodeInventory): Snapshot of the pods to use, the pods of
+            the namespaces of the searched pods are listed if not provided
 
     Returns:
         list: list of all the pods of the specified node
 
     """
-    node_pods = []
-    pods_to_search = pods_to_search or pod.get_all_pods()
+    if not pods_to_search:
+        return [
+            p for p in pod.get_all_pods() if p.data["spec"].get("nodeName") == node_name
+        ]
 
+    node_pods = []
+    inventory = inventory or NodeInventory()
     for p in pods_to_search:
         try:
-            if pod.get_pod_node(p).name == node_name:
+            if inventory.get_pod_node_name(p.name, p.namespace) == node_name:
                 node_pods.append(p)
-        # Check if the command failed because the pod not found
-        except CommandFailed as ex:
-            if "not found" not in str(ex):
-                raise ex
+        except ResourceNotFoundError as ex:
             # Check the 2 cases of pod not found error
             pod_not_found_error_message = f"Failed to get the pod node of the pod {p.name} due to the exception {ex}"
             if raise_pod_not_found_error:
@@ -1710,47 +2223,51 @@ def get_nodes_in_statuses(statuses):
     return [n for n in nodes if n.ocp.get_resource_status(n.name) in statuses]
 
 
-def get_node_osd_ids(node_name):
+def get_node_osd_ids(node_name, inventory=None):
     """
     Get the node osd ids
 
     Args:
         node_name (str): The node name to get the osd ids
+        inventory (NodeInventory): Snapshot of the pods to use
 
     Returns:
         list: The list of the osd ids
 
     """
-    osd_pods = pod.get_osd_pods()
-    node_osd_pods = get_node_pods(node_name, pods_to_search=osd_pods)
-    return [pod.get_osd_pod_id(osd_pod) for osd_pod in node_osd_pods]
+    inventory = inventory or NodeInventory()
+    return inventory.get_osd_ids(node_name)
 
 
-def get_node_mon_ids(node_name):
+def get_node_mon_ids(node_name, inventory=None):
     """
     Get the node mon ids
 
     Args:
         node_name (str): The node name to get the mon ids
+        inventory (NodeInventory): Snapshot of the pods to use
 
     Returns:
         list: The list of the mon ids
 
     """
-    mon_pods = pod.get_mon_pods()
-    node_mon_pods = get_node_pods(node_name, pods_to_search=mon_pods)
-    return [pod.get_mon_pod_id(mon_pod) for mon_pod in node_mon_pods]
+    inventory = inventory or NodeInventory()
+    return inventory.get_daemons(node_name).get("mon", [])
 
 
-def get_mon_running_nodes():
+def get_mon_running_nodes(inventory=None):
     """
     Gets the mon running node names
 
+    Args:
+        inventory (NodeInventory): Snapshot of the pods to use
+
     Returns:
         list: MON node names
 
     """
-    return [pod.get_pod_node(mon_pod).name for mon_pod in pod.get_mon_pods()]
+    inventory = inventory or NodeInventory()
+    return inventory.get_daemon_nodes("mon")
 
 
 def get_nodes_where_ocs_pods_running():
@@ -1792,18 +2309,19 @@ def get_node_rack(node_obj):
     return node_obj.data["metadata"]["labels"].get("topology.rook.io/rack")
 
 
-def get_node_rack_dict():
+def get_node_rack_dict(inventory=None):
     """
     Get worker node rack
 
+    Args:
+        inventory (NodeInventory): Snapshot of the nodes to use
+
     Returns:
         dict: {"Node name":"Rack name"}
 
     """
-    worker_node_objs = get_nodes(node_type=constants.WORKER_MACHINE)
-    node_rack_dict = dict()
-    for worker_node_obj in worker_node_objs:
-        node_rack_dict[worker_node_obj.name] = get_node_rack(worker_node_obj)
+    inventory = inventory or NodeInventory()
+    node_rack_dict = inventory.get_rack_dict(constants.WORKER_MACHINE)
     log.info(f"node-rack dictinary {node_rack_dict}")
     return node_rack_dict
 
@@ -1824,18 +2342,19 @@ def get_node_zone(node_obj):
     )
 
 
-def get_node_zone_dict():
+def get_node_zone_dict(inventory=None):
     """
     Get worker node zone dictionary
 
+    Args:
+        inventory (NodeInventory): Snapshot of the nodes to use
+
     Returns:
         dict: {"Node name":"Zone name"}
 
     """
-    node_objs = get_nodes(node_type=constants.WORKER_MACHINE)
-    node_zone_dict = dict()
-    for node_obj in node_objs:
-        node_zone_dict[node_obj.name] = get_node_zone(node_obj)
+    inventory = inventory or NodeInventory()
+    node_zone_dict = inventory.get_zone_dict(constants.WORKER_MACHINE)
     log.info(f"node-zone dictionary {node_zone_dict}")
     return node_zone_dict
 
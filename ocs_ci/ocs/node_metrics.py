@@ -0,0 +1,520 @@
+# -*- coding: utf8 -*-
+
+"""
+This module contains a sampler of node resource utilization which gets the
+data of all the nodes of the cluster at once, instead of running
+``oc adm top`` and ``oc describe node`` for every node separately.
+
+One sample consists of:
+
+* usage of CPU and memory of every node, from the metrics API (one
+  ``oc get --raw`` call) or from Prometheus (one query per metric)
+* allocatable resources, roles and readiness of the nodes (one
+  ``oc get nodes`` call)
+* requests and limits allocated on the nodes, computed from one list of
+  the non terminated pods of all the namespaces
+* optionally IOPS and throughput percentage of the Ceph cluster (one
+  ``ceph status`` call)
+
+The sources are queried concurrently and the result is a flat table (list of
+dicts, one row per node) suitable for time series logging.
+
+Example::
+
+    sampler = NodeMetricsSampler()
+    sample = sampler.sample()
+    sample.utilization(role="worker")  # same format as adm top functions
+    with open("node_metrics.jsonl", "a") as f:
+        sample.dump_records(f)
+
+"""
+
+import json
+import logging
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.ocp import OCP
+
+
+logger = logging.getLogger(__name__)
+
+# source of usage of the node resources
+METRICS_API = "metrics_api"
+PROMETHEUS = "prometheus"
+USAGE_SOURCES = (METRICS_API, PROMETHEUS)
+
+NODE_METRICS_API = "/apis/metrics.k8s.io/v1beta1/nodes"
+# prometheus recording rules of node utilization (ratio 0-1) per instance
+PROMETHEUS_USAGE_QUERIES = {
+    "cpu_usage_percent": "instance:node_cpu_utilisation:rate1m",
+    "memory_usage_percent": "instance:node_memory_utilisation:ratio",
+}
+NODE_ROLE_LABEL_PREFIX = "node-role.kubernetes.io/"
+
+QUANTITY_SUFFIXES = {
+    "n": 1e-9,
+    "u": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+    "P": 1e15,
+    "E": 1e18,
+    "Ki": 2**10,
+    "Mi": 2**20,
+    "Gi": 2**30,
+    "Ti": 2**40,
+    "Pi": 2**50,
+    "Ei": 2**60,
+}
+QUANTITY_RE = re.compile(r"^([+-]?[0-9.]+(?:[eE][+-]?[0-9]+)?)([a-zA-Z]*)$")
+
+
+def parse_quantity(quantity):
+    """
+    Convert kubernetes resource quantity to number.
+
+    Args:
+        quantity (str): Quantity, e.g. '100m', '1500000n', '2', '512Mi'
+
+    Returns:
+        float: Value of the quantity in base units (cores, bytes)
+
+    Raises:
+        ValueError: when the quantity can't be parsed
+
+    """
+    match = QUANTITY_RE.match(str(quantity).strip())
+    if not match or match.group(2) not in QUANTITY_SUFFIXES and match.group(2):
+        raise ValueError(f"Invalid resource quantity: {quantity}")
+    number, suffix = match.groups()
+    return float(number) * QUANTITY_SUFFIXES.get(suffix, 1)
+
+
+def _percent(value, total):
+    if value is None or not total:
+        return None
+    return round(value / total * 100, 2)
+
+
+def _get_container_resource(container, kind, resource):
+    value = container.get("resources", {}).get(kind, {}).get(resource)
+    return parse_quantity(value) if value is not None else 0
+
+
+def get_pod_resources(pod_data):
+    """
+    Compute effective requests and limits of the pod the same way as the
+    scheduler (and ``oc describe node``) does it: the sum over the containers,
+    or the maximum over the init containers if it's bigger, plus the pod
+    overhead.
+
+    Args:
+        pod_data (dict): Pod resource
+
+    Returns:
+        dict: cpu (cores) and memory (bytes) requests and limits, e.g.
+            {"requests": {"cpu": 0.1, "memory": 104857600.0}, "limits": {...}}
+
+    """
+    spec = pod_data.get("spec", {})
+    result = {}
+    for kind in ("requests", "limits"):
+        resources = {}
+        for resource in ("cpu", "memory"):
+            total = sum(
+                _get_container_resource(container, kind, resource)
+                for container in spec.get("containers", [])
+            )
+            init = max(
+                [
+                    _get_container_resource(container, kind, resource)
+                    for container in spec.get("initContainers", [])
+                ],
+                default=0,
+            )
+            overhead = spec.get("overhead", {}).get(resource)
+            resources[resource] = max(total, init) + (
+                parse_quantity(overhead) if overhead else 0
+            )
+        result[kind] = resources
+    return result
+
+
+def get_node_roles(node_data):
+    """
+    Get roles of the node from its labels
+
+    Args:
+        node_data (dict): Node resource
+
+    Returns:
+        list: Sorted roles of the node, e.g. ['master', 'worker']
+
+    """
+    labels = node_data["metadata"].get("labels", {})
+    return sorted(
+        label[len(NODE_ROLE_LABEL_PREFIX) :]
+        for label in labels
+        if label.startswith(NODE_ROLE_LABEL_PREFIX)
+    )
+
+
+def is_node_ready(node_data):
+    """
+    Check Ready condition of the node
+
+    Args:
+        node_data (dict): Node resource
+
+    Returns:
+        bool: True if the node is Ready
+
+    """
+    for condition in node_data.get("status", {}).get("conditions", []):
+        if condition["type"] == constants.NODE_READY:
+            return condition["status"] == "True"
+    return False
+
+
+class NodeMetricsSample(object):
+    """
+    One sample of node utilization (and optionally of Ceph IO utilization)
+
+    Attributes:
+        timestamp (float): Unix time when the sample was taken
+        rows (list): One dict per node, see NodeMetricsSampler.COLUMNS
+        ceph (dict): IOPS and throughput percentage of the Ceph cluster,
+            empty if not sampled
+        errors (dict): Source name and error of the sources which failed
+
+    """
+
+    def __init__(self, timestamp, rows, ceph=None, errors=None):
+        self.timestamp = timestamp
+        self.rows = rows
+        self.ceph = ceph or {}
+        self.errors = errors or {}
+
+    def filter(self, role=None):
+        """
+        Get rows of the nodes with given role
+
+        Args:
+            role (str): Node role (e.g. master, worker), all nodes if None
+
+        Returns:
+            list: Rows of the nodes
+
+        """
+        if role is None:
+            return list(self.rows)
+        if (
+            role == constants.WORKER_MACHINE
+            and config.ENV_DATA["platform"].lower()
+            in constants.MANAGED_SERVICE_PLATFORMS
+        ):
+            return [
+                row
+                for row in self.rows
+                if role in row["roles"] and constants.INFRA_MACHINE not in row["roles"]
+            ]
+        return [row for row in self.rows if role in row["roles"]]
+
+    def utilization(self, role=None, source="usage"):
+        """
+        Get CPU and memory utilization of the nodes in the format of
+        :py:func:`ocs_ci.ocs.node.get_node_resource_utilization_from_adm_top`.
+
+        Args:
+            role (str): Node role (e.g. master, worker), all nodes if None
+            source (str): 'usage' for actual usage (as adm top reports it),
+                'requests' or 'limits' for allocated resources (as
+                oc describe node reports it)
+
+        Returns:
+            dict: Node name and its cpu and memory utilization in percentage
+
+        """
+        utilization = {}
+        for row in self.filter(role):
+            cpu = row[f"cpu_{source}_percent"]
+            memory = row[f"memory_{source}_percent"]
+            if cpu is None or memory is None:
+                continue
+            utilization[row["node"]] = {"cpu": int(cpu), "memory": int(memory)}
+        return utilization
+
+    def to_records(self):
+        """
+        Get rows of the sample with timestamp, usable for time series logs
+
+        Returns:
+            list: Rows of the nodes extended with the timestamp
+
+        """
+        return [dict(row, timestamp=self.timestamp) for row in self.rows]
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The sample as serializable dict
+
+        """
+        return {
+            "timestamp": self.timestamp,
+            "nodes": self.rows,
+            "ceph": self.ceph,
+            "errors": self.errors,
+        }
+
+    def dump_records(self, file_obj):
+        """
+        Write rows of the sample as JSON lines
+
+        Args:
+            file_obj (file): File opened for writing (appending)
+
+        """
+        for record in self.to_records():
+            file_obj.write(json.dumps(record) + "\n")
+
+
+class NodeMetricsSampler(object):
+    """
+    Sampler of utilization of all the nodes of the cluster
+    """
+
+    COLUMNS = (
+        "node",
+        "roles",
+        "ready",
+        "cpu_allocatable",
+        "memory_allocatable",
+        "cpu_usage",
+        "memory_usage",
+        "cpu_usage_percent",
+        "memory_usage_percent",
+        "cpu_requests",
+        "memory_requests",
+        "cpu_requests_percent",
+        "memory_requests_percent",
+        "cpu_limits",
+        "memory_limits",
+        "cpu_limits_percent",
+        "memory_limits_percent",
+        "pods",
+    )
+
+    def __init__(self, usage_source=METRICS_API, ceph=False, prometheus=None):
+        """
+        Args:
+            usage_source (str): Source of the node usage, one of USAGE_SOURCES
+            ceph (bool): True for sampling also IO utilization of Ceph cluster
+            prometheus (PrometheusAPI): Prometheus API object used for the
+                prometheus usage source, created when needed if not provided
+
+        """
+        if usage_source not in USAGE_SOURCES:
+            raise ValueError(
+                f"Unknown usage source {usage_source}, use one of {USAGE_SOURCES}"
+            )
+        self.usage_source = usage_source
+        self.ceph = ceph
+        self._prometheus = prometheus
+
+    def get_nodes(self):
+        """
+        Returns:
+            list: Node resources of all the nodes
+
+        """
+        return OCP(kind=constants.NODE).get()["items"]
+
+    def get_pods(self):
+        """
+        Returns:
+            list: Pod resources of the non terminated pods of all namespaces
+
+        """
+        return OCP(kind=constants.POD).get(
+            all_namespaces=True,
+            field_selector="status.phase!=Succeeded,status.phase!=Failed",
+        )["items"]
+
+    def get_usage(self):
+        """
+        Get usage of the node resources from the configured source
+
+        Returns:
+            dict: Node name and its cpu (cores) and memory (bytes) usage, or
+                its cpu_usage_percent and memory_usage_percent for prometheus
+
+        """
+        if self.usage_source == PROMETHEUS:
+            return self._get_usage_from_prometheus()
+        output = OCP().exec_oc_cmd(
+            f"get --raw {NODE_METRICS_API}", out_yaml_format=False
+        )
+        return {
+            item["metadata"]["name"]: {
+                "cpu": parse_quantity(item["usage"]["cpu"]),
+                "memory": parse_quantity(item["usage"]["memory"]),
+            }
+            for item in json.loads(output)["items"]
+        }
+
+    def _get_usage_from_prometheus(self):
+        if self._prometheus is None:
+            from ocs_ci.utility.prometheus import PrometheusAPI
+
+            self._prometheus = PrometheusAPI()
+        usage = defaultdict(dict)
+        for column, query in PROMETHEUS_USAGE_QUERIES.items():
+            for result in self._prometheus.query(query, mute_logs=True):
+                instance = result["metric"].get("instance")
+                usage[instance][column] = round(float(result["value"][1]) * 100, 2)
+        return dict(usage)
+
+    def get_ceph_utilization(self, osd_size=2):
+        """
+        Get IOPS and throughput percentage of the Ceph cluster from one
+        ``ceph status``, computed the same way as
+        :py:meth:`ocs_ci.ocs.cluster.CephCluster.get_iops_percentage` and
+        :py:meth:`ocs_ci.ocs.cluster.CephCluster.get_throughput_percentage`.
+
+        Args:
+            osd_size (int): Size of 1 OSD in Ti
+
+        Returns:
+            dict: iops_percentage and throughput_percentage of the cluster
+
+        """
+        from ocs_ci.ocs.cluster import count_cluster_osd
+        from ocs_ci.ocs.resources.pod import get_ceph_tools_pod
+
+        ceph_status = get_ceph_tools_pod().exec_ceph_cmd(ceph_cmd="ceph status")
+        pgmap = ceph_status["pgmap"]
+        iops = pgmap.get("read_op_per_sec", 0) + pgmap.get("write_op_per_sec", 0)
+        throughput = (
+            pgmap.get("read_bytes_sec", 0) + pgmap.get("write_bytes_sec", 0)
+        ) / (constants.GB / constants.GB2MB)
+        iops_limit = osd_size * constants.IOPS_FOR_1TiB_OSD * count_cluster_osd()
+        return {
+            "iops": iops,
+            "throughput": round(throughput, 3),
+            "iops_percentage": iops / iops_limit * 100,
+            "throughput_percentage": throughput / constants.THROUGHPUT_LIMIT_OSD * 100,
+        }
+
+    def sample(self):
+        """
+        Query all the sources concurrently and build the table of nodes
+
+        Returns:
+            NodeMetricsSample: The sample
+
+        Raises:
+            Exception: when the list of the nodes can't be obtained, failures
+                of the other sources are only recorded in the sample errors
+
+        """
+        sources = {
+            "nodes": self.get_nodes,
+            "pods": self.get_pods,
+            "usage": self.get_usage,
+        }
+        if self.ceph:
+            sources["ceph"] = self.get_ceph_utilization
+        timestamp = time.time()
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = {name: executor.submit(func) for name, func in sources.items()}
+        results = {}
+        errors = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as ex:
+                if name == "nodes":
+                    raise
+                logger.warning(f"Failed to get {name} for node metrics: {ex}")
+                errors[name] = str(ex)
+        rows = self.build_rows(
+            results["nodes"], results.get("pods"), results.get("usage")
+        )
+        return NodeMetricsSample(timestamp, rows, results.get("ceph"), errors)
+
+    def build_rows(self, nodes, pods=None, usage=None):
+        """
+        Build the table of nodes from the data of the sources
+
+        Args:
+            nodes (list): Node resources
+            pods (list): Pod resources, allocations are not computed if None
+            usage (dict): Usage of the nodes as returned by get_usage,
+                usage columns are empty if None
+
+        Returns:
+            list: One dict per node with the columns from COLUMNS
+
+        """
+        allocated = defaultdict(
+            lambda: {
+                "requests": {"cpu": 0, "memory": 0},
+                "limits": {"cpu": 0, "memory": 0},
+                "pods": 0,
+            }
+        )
+        for pod_data in pods or []:
+            node_name = pod_data.get("spec", {}).get("nodeName")
+            if not node_name:
+                continue
+            node_allocated = allocated[node_name]
+            node_allocated["pods"] += 1
+            for kind, resources in get_pod_resources(pod_data).items():
+                for resource, value in resources.items():
+                    node_allocated[kind][resource] += value
+
+        rows = []
+        for node_data in nodes:
+            name = node_data["metadata"]["name"]
+            allocatable = node_data.get("status", {}).get("allocatable", {})
+            row = dict.fromkeys(self.COLUMNS)
+            row.update(
+                node=name,
+                roles=get_node_roles(node_data),
+                ready=is_node_ready(node_data),
+                cpu_allocatable=parse_quantity(allocatable.get("cpu", 0)),
+                memory_allocatable=parse_quantity(allocatable.get("memory", 0)),
+            )
+            node_usage = (usage or {}).get(name, {})
+            if "cpu" in node_usage:
+                row["cpu_usage"] = node_usage["cpu"]
+                row["memory_usage"] = node_usage["memory"]
+                row["cpu_usage_percent"] = _percent(
+                    node_usage["cpu"], row["cpu_allocatable"]
+                )
+                row["memory_usage_percent"] = _percent(
+                    node_usage["memory"], row["memory_allocatable"]
+                )
+            else:
+                row["cpu_usage_percent"] = node_usage.get("cpu_usage_percent")
+                row["memory_usage_percent"] = node_usage.get("memory_usage_percent")
+            if pods is not None:
+                node_allocated = allocated[name]
+                row["pods"] = node_allocated["pods"]
+                for kind in ("requests", "limits"):
+                    for resource in ("cpu", "memory"):
+                        value = node_allocated[kind][resource]
+                        row[f"{resource}_{kind}"] = value
+                        row[f"{resource}_{kind}_percent"] = _percent(
+                            value, row[f"{resource}_allocatable"]
+                        )
+            rows.append(row)
+        return rows
@@ -19,6 +19,7 @@ from ocs_ci.ocs.exceptions import (
     ResourceNameNotSpecifiedException,
     TimeoutExpiredError,
 )
+from ocs_ci.utility import telemetry
 from ocs_ci.utility.proxy import update_kubeconfig_with_proxy_url_for_client
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import TimeoutSampler
@@ -106,6 +107,40 @@ class OCP(object):
         """
         self._data = self.get()
 
+    def get_oc_cmd(self, command):
+        """
+        Get the full 'oc' command line with the kubeconfig and namespace of
+        this object, e.g. for commands which are not run by exec_oc_cmd
+
+        Args:
+            command (str): The command without the initial 'oc'
+
+        Returns:
+            str: The command line
+
+        """
+        oc_cmd = "oc "
+        env_kubeconfig = config.get_kubeconfig()
+        kubeconfig_path = (
+            self.cluster_kubeconfig if os.path.exists(self.cluster_kubeconfig) else None
+        )
+
+        if kubeconfig_path or not env_kubeconfig or not os.path.exists(env_kubeconfig):
+            cluster_dir_kubeconfig = kubeconfig_path or os.path.join(
+                config.ENV_DATA["cluster_path"], config.RUN.get("kubeconfig_location")
+            )
+            if os.path.exists(cluster_dir_kubeconfig):
+                oc_cmd += f"--kubeconfig {cluster_dir_kubeconfig} "
+        elif env_kubeconfig != os.getenv("KUBECONFIG"):
+            # cluster activated only for this thread by config.cluster_context()
+            oc_cmd += f"--kubeconfig {env_kubeconfig} "
+
+        if self.namespace:
+            oc_cmd += f"-n {self.namespace} "
+
+        oc_cmd += command
+        return oc_cmd
+
     def exec_oc_cmd(
         self,
         command,
@@ -135,23 +170,8 @@ class OCP(object):
             str: If out_yaml_format is False.
 
         """
-        oc_cmd = "oc "
-        env_kubeconfig = os.getenv("KUBECONFIG")
-        kubeconfig_path = (
-            self.cluster_kubeconfig if os.path.exists(self.cluster_kubeconfig) else None
-        )
-
-        if kubeconfig_path or not env_kubeconfig or not os.path.exists(env_kubeconfig):
-            cluster_dir_kubeconfig = kubeconfig_path or os.path.join(
-                config.ENV_DATA["cluster_path"], config.RUN.get("kubeconfig_location")
-            )
-            if os.path.exists(cluster_dir_kubeconfig):
-                oc_cmd += f"--kubeconfig {cluster_dir_kubeconfig} "
-
-        if self.namespace:
-            oc_cmd += f"-n {self.namespace} "
-
-        oc_cmd += command
+        oc_cmd = self.get_oc_cmd(command)
+        start = time.perf_counter()
         out = run_cmd(
             cmd=oc_cmd,
             secrets=secrets,
@@ -160,6 +180,13 @@ class OCP(object):
             threading_lock=self.threading_lock,
             **kwargs,
         )
+        verb = command.split(maxsplit=1)[0] if command else ""
+        telemetry.record(
+            telemetry.OC,
+            f"{verb} {self.kind}" if self.kind else verb,
+            time.perf_counter() - start,
+            len(out),
+        )
 
         try:
             if out.startswith("hints = "):
@@ -295,7 +322,9 @@ class OCP(object):
             command += f" --selector={selector}"
         return self.exec_oc_cmd(command, out_yaml_format=False)
 
-    def create(self, yaml_file=None, resource_name="", out_yaml_format=True):
+    def create(
+        self, yaml_file=None, resource_name="", out_yaml_format=True, yaml_data=None
+    ):
         """
         Creates a new resource
 
@@ -305,24 +334,32 @@ class OCP(object):
             resource_name (str): Name of the resource you want to create
             out_yaml_format (bool): Determines if the output should be
                 formatted to a yaml like string
+            yaml_data (str): yaml passed to 'oc create -f -' via stdin, no
+                file is needed
 
         Returns:
             dict: Dictionary represents a returned yaml file
         """
-        if not (yaml_file or resource_name):
+        if not (yaml_file or resource_name or yaml_data):
             raise CommandFailed(
-                "At least one of resource_name or yaml_file have to " "be provided"
+                "At least one of resource_name, yaml_file or yaml_data have to "
+                "be provided"
             )
         command = "create "
-        if yaml_file:
+        kwargs = {}
+        if yaml_data:
+            command += "-f -"
+            kwargs["input"] = yaml_data.encode()
+        elif yaml_file:
             command += f"-f {yaml_file}"
         elif resource_name:
             # e.g "oc namespace my-project"
             command += f"{self.kind} {resource_name}"
         if out_yaml_format:
             command += " -o yaml"
-        output = self.exec_oc_cmd(command)
-        log.debug(f"{yaml.dump(output)}")
+        output = self.exec_oc_cmd(command, **kwargs)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"{yaml.dump(output)}")
         return output
 
     def delete(self, yaml_file=None, resource_name="", wait=True, force=False):
@@ -361,17 +398,21 @@ class OCP(object):
             command += " --wait=false"
         return self.exec_oc_cmd(command)
 
-    def apply(self, yaml_file):
+    def apply(self, yaml_file=None, yaml_data=None):
         """
         Applies configuration changes to a resource
 
         Args:
             yaml_file (str): Path to a yaml file to use in 'oc apply -f
                 file.yaml
+            yaml_data (str): yaml passed to 'oc apply -f -' via stdin instead
+                of the file
 
         Returns:
             dict: Dictionary represents a returned yaml file
         """
+        if yaml_data:
+            return self.exec_oc_cmd("apply -f -", input=yaml_data.encode())
         command = f"apply -f {yaml_file}"
         return self.exec_oc_cmd(command)
 
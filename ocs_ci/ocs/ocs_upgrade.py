@@ -39,6 +39,7 @@ from ocs_ci.ocs.resources.storage_cluster import (
     get_osd_count,
     ocs_install_verification,
 )
+from ocs_ci.ocs.upgrade_monitor import CSV_KIND, UpgradeMonitor
 from ocs_ci.ocs.utils import setup_ceph_toolbox
 from ocs_ci.utility import version
 from ocs_ci.utility.reporting import update_live_must_gather_image
@@ -50,7 +51,6 @@ from ocs_ci.utility.utils import (
     get_next_version_available_for_upgrade,
     get_ocs_version_from_image,
     load_config_file,
-    TimeoutSampler,
 )
 from ocs_ci.utility.secret import link_all_sa_and_secret_and_delete_pods
 from ocs_ci.utility.templating import dump_data_to_temp_yaml
@@ -116,7 +116,9 @@ def get_upgrade_image_info(old_csv_images, new_csv_images):
     )
 
 
-def verify_image_versions(old_images, upgrade_version, version_before_upgrade):
+def verify_image_versions(
+    old_images, upgrade_version, version_before_upgrade, monitor=None
+):
     """
     Verify if all the images of OCS objects got upgraded
 
@@ -124,11 +126,16 @@ def verify_image_versions(old_images, upgrade_version, version_before_upgrade):
         old_images (set): set with old images
         upgrade_version (packaging.version.Version): version of OCS
         version_before_upgrade (float): version of OCS before upgrade
+        monitor (UpgradeMonitor): Running monitor of the upgrade, the pods
+            are polled if not provided
 
     """
+    wait_for_pods_upgraded = (
+        monitor.wait_for_pods_upgraded if monitor else verify_pods_upgraded
+    )
     number_of_worker_nodes = len(get_nodes())
-    verify_pods_upgraded(old_images, selector=constants.OCS_OPERATOR_LABEL)
-    verify_pods_upgraded(old_images, selector=constants.OPERATOR_LABEL)
+    wait_for_pods_upgraded(old_images, selector=constants.OCS_OPERATOR_LABEL)
+    wait_for_pods_upgraded(old_images, selector=constants.OPERATOR_LABEL)
     default_noobaa_pods = 3
     noobaa_pods = default_noobaa_pods
     if upgrade_version >= parse_version("4.7"):
@@ -141,7 +148,7 @@ def verify_image_versions(old_images, upgrade_version, version_before_upgrade):
         )
         noobaa_pods = default_noobaa_pods + min_endpoints
     try:
-        verify_pods_upgraded(
+        wait_for_pods_upgraded(
             old_images,
             selector=constants.NOOBAA_APP_LABEL,
             count=noobaa_pods,
@@ -153,7 +160,7 @@ def verify_image_versions(old_images, upgrade_version, version_before_upgrade):
                 f"Exception: {ex}"
             )
             noobaa_pods = default_noobaa_pods + max_endpoints
-            verify_pods_upgraded(
+            wait_for_pods_upgraded(
                 old_images,
                 selector=constants.NOOBAA_APP_LABEL,
                 count=noobaa_pods,
@@ -161,29 +168,29 @@ def verify_image_versions(old_images, upgrade_version, version_before_upgrade):
             )
         else:
             raise
-    verify_pods_upgraded(
+    wait_for_pods_upgraded(
         old_images,
         selector=constants.CSI_CEPHFSPLUGIN_LABEL,
         count=number_of_worker_nodes,
     )
-    verify_pods_upgraded(
+    wait_for_pods_upgraded(
         old_images, selector=constants.CSI_CEPHFSPLUGIN_PROVISIONER_LABEL, count=2
     )
-    verify_pods_upgraded(
+    wait_for_pods_upgraded(
         old_images,
         selector=constants.CSI_RBDPLUGIN_LABEL,
         count=number_of_worker_nodes,
     )
-    verify_pods_upgraded(
+    wait_for_pods_upgraded(
         old_images, selector=constants.CSI_RBDPLUGIN_PROVISIONER_LABEL, count=2
     )
     if not config.DEPLOYMENT.get("external_mode"):
-        verify_pods_upgraded(
+        wait_for_pods_upgraded(
             old_images,
             selector=constants.MON_APP_LABEL,
             count=3,
         )
-        verify_pods_upgraded(old_images, selector=constants.MGR_APP_LABEL)
+        wait_for_pods_upgraded(old_images, selector=constants.MGR_APP_LABEL)
         osd_timeout = 600 if upgrade_version >= parse_version("4.5") else 750
         osd_count = get_osd_count()
         # In the debugging issue:
@@ -191,26 +198,32 @@ def verify_image_versions(old_images, upgrade_version, version_before_upgrade):
         # Noticed that it's taking about 1 more minute from previous check till actual
         # OSD pods getting restarted.
         # Hence adding sleep here for 120 seconds to be sure, OSD pods upgrade started.
-        log.info("Waiting for 2 minutes before start checking OSD pods")
-        time.sleep(120)
-        verify_pods_upgraded(
+        # The monitor reacts to the restarts, the time is only added to its
+        # timeout.
+        osd_timeout_extra = 0
+        if monitor:
+            osd_timeout_extra = 120
+        else:
+            log.info("Waiting for 2 minutes before start checking OSD pods")
+            time.sleep(120)
+        wait_for_pods_upgraded(
             old_images,
             selector=constants.OSD_APP_LABEL,
             count=osd_count,
-            timeout=osd_timeout * osd_count,
+            timeout=osd_timeout * osd_count + osd_timeout_extra,
         )
-        verify_pods_upgraded(old_images, selector=constants.MDS_APP_LABEL, count=2)
+        wait_for_pods_upgraded(old_images, selector=constants.MDS_APP_LABEL, count=2)
         if config.ENV_DATA.get("platform") in constants.ON_PREM_PLATFORMS:
             rgw_count = get_rgw_count(
                 upgrade_version.base_version, True, version_before_upgrade
             )
-            verify_pods_upgraded(
+            wait_for_pods_upgraded(
                 old_images,
                 selector=constants.RGW_APP_LABEL,
                 count=rgw_count,
             )
     if upgrade_version >= parse_version("4.6"):
-        verify_pods_upgraded(old_images, selector=constants.OCS_METRICS_EXPORTER)
+        wait_for_pods_upgraded(old_images, selector=constants.OCS_METRICS_EXPORTER)
 
 
 class OCSUpgrade(object):
@@ -416,19 +429,27 @@ class OCSUpgrade(object):
         )
         subscription.exec_oc_cmd(patch_subscription_cmd, out_yaml_format=False)
 
-    def check_if_upgrade_completed(self, channel, csv_name_pre_upgrade):
+    def check_if_upgrade_completed(
+        self, channel, csv_name_pre_upgrade, csv_phases=None
+    ):
         """
         Checks if OCS operator finishes it's upgrade
 
         Args:
             channel: (str): OCS subscription channel
             csv_name_pre_upgrade: (str): OCS operator name
+            csv_phases: (dict): Phases of the CSVs already known e.g. from
+                UpgradeMonitor, they are fetched if not provided
 
         Returns:
             bool: True if upgrade completed, False otherwise
 
         """
-        if not check_all_csvs_are_succeeded(self.namespace):
+        if csv_phases is None:
+            csvs_succeeded = check_all_csvs_are_succeeded(self.namespace)
+        else:
+            csvs_succeeded = all(phase == "Succeeded" for phase in csv_phases.values())
+        if not csvs_succeeded:
             log.warning("One of CSV is still not upgraded!")
             return False
         operator_selector = get_selector_for_ocs_operator()
@@ -445,7 +466,9 @@ class OCSUpgrade(object):
             log.info(f"CSV now upgraded to: {csv_name_post_upgrade}")
             return True
 
-    def get_images_post_upgrade(self, channel, pre_upgrade_images, upgrade_version):
+    def get_images_post_upgrade(
+        self, channel, pre_upgrade_images, upgrade_version, monitor=None
+    ):
         """
         Checks if all images of OCS cluster upgraded,
             and return list of all images if upgrade success
@@ -454,6 +477,8 @@ class OCSUpgrade(object):
             channel: (str): OCS subscription channel
             pre_upgrade_images: (dict): Contains all OCS cluster images
             upgrade_version: (str): version to be upgraded
+            monitor: (UpgradeMonitor): Running monitor of the upgrade, the
+                CSV is polled if not provided
 
         Returns:
             set: Contains full path of OCS cluster old images
@@ -481,7 +506,15 @@ class OCSUpgrade(object):
             timeout = 200
         else:
             timeout = 200 * get_osd_count()
-        csv_post_upgrade.wait_for_phase("Succeeded", timeout=timeout)
+        if monitor:
+            monitor.wait(
+                lambda: monitor.csvs.get(csv_name_post_upgrade) == "Succeeded",
+                timeout,
+                kinds=[CSV_KIND],
+                message=f"CSV {csv_name_post_upgrade} to be in Succeeded phase",
+            )
+        else:
+            csv_post_upgrade.wait_for_phase("Succeeded", timeout=timeout)
 
         post_upgrade_images = get_images(csv_post_upgrade.get())
         old_images, _, _ = get_upgrade_image_info(
@@ -592,108 +625,115 @@ def run_ocs_upgrade(operation=None, *operation_args, **operation_kwargs):
         )
         log.info(f"Disconnected upgrade - new image: {upgrade_ocs.ocs_registry_image}")
 
-    with CephHealthMonitor(ceph_cluster):
-        channel = upgrade_ocs.set_upgrade_channel()
-        upgrade_ocs.set_upgrade_images()
-        live_deployment = config.DEPLOYMENT["live_deployment"]
-        disable_addon = config.DEPLOYMENT.get("ibmcloud_disable_addon")
-        if (
-            config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
-            and live_deployment
-            and not disable_addon
-        ):
-            clustername = config.ENV_DATA.get("cluster_name")
-            cmd = f"ibmcloud ks cluster addon disable openshift-data-foundation --cluster {clustername} -f"
-            run_ibmcloud_cmd(cmd)
-            time.sleep(120)
-            cmd = (
-                f"ibmcloud ks cluster addon enable openshift-data-foundation --cluster {clustername} -f --version "
-                f"{upgrade_version}.0 --param ocsUpgrade=true"
-            )
-            run_ibmcloud_cmd(cmd)
-            time.sleep(120)
-        else:
-            ui_upgrade_supported = False
-            if config.UPGRADE.get("ui_upgrade"):
-                if (
-                    version.get_semantic_ocp_version_from_config()
-                    == version.VERSION_4_9
-                    and original_ocs_version == "4.8"
-                    and upgrade_version == "4.9"
-                ):
-                    ui_upgrade_supported = True
-                else:
-                    log.warning(
-                        "UI upgrade combination is not supported. It will fallback to CLI upgrade"
-                    )
-            if ui_upgrade_supported:
-                ocs_odf_upgrade_ui()
+    # CSVs, deployments and pods are watched from the start of the upgrade,
+    # the progress report is logged and stored when the monitor stops
+    with UpgradeMonitor(config.ENV_DATA["cluster_namespace"]) as upgrade_monitor:
+        with CephHealthMonitor(ceph_cluster):
+            channel = upgrade_ocs.set_upgrade_channel()
+            upgrade_ocs.set_upgrade_images()
+            live_deployment = config.DEPLOYMENT["live_deployment"]
+            disable_addon = config.DEPLOYMENT.get("ibmcloud_disable_addon")
+            if (
+                config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
+                and live_deployment
+                and not disable_addon
+            ):
+                clustername = config.ENV_DATA.get("cluster_name")
+                cmd = f"ibmcloud ks cluster addon disable openshift-data-foundation --cluster {clustername} -f"
+                run_ibmcloud_cmd(cmd)
+                time.sleep(120)
+                cmd = (
+                    f"ibmcloud ks cluster addon enable openshift-data-foundation --cluster {clustername} -f --version "
+                    f"{upgrade_version}.0 --param ocsUpgrade=true"
+                )
+                run_ibmcloud_cmd(cmd)
+                time.sleep(120)
             else:
-                if (
-                    config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
-                ) and not (upgrade_in_current_source):
-                    create_ocs_secret(config.ENV_DATA["cluster_namespace"])
-                if upgrade_version != "4.9":
-                    # In the case of upgrade to ODF 4.9, the ODF operator should upgrade
-                    # OCS automatically.
-                    upgrade_ocs.update_subscription(channel)
-                if original_ocs_version == "4.8" and upgrade_version == "4.9":
-                    deployment = Deployment()
-                    deployment.subscribe_ocs()
-                else:
-                    # In the case upgrade is not from 4.8 to 4.9 and we have manual approval strategy
-                    # we need to wait and approve install plan, otherwise it's approved in the
-                    # subscribe_ocs method.
-                    subscription_plan_approval = config.DEPLOYMENT.get(
-                        "subscription_plan_approval"
-                    )
-                    if subscription_plan_approval == "Manual":
-                        wait_for_install_plan_and_approve(
-                            config.ENV_DATA["cluster_namespace"]
+                ui_upgrade_supported = False
+                if config.UPGRADE.get("ui_upgrade"):
+                    if (
+                        version.get_semantic_ocp_version_from_config()
+                        == version.VERSION_4_9
+                        and original_ocs_version == "4.8"
+                        and upgrade_version == "4.9"
+                    ):
+                        ui_upgrade_supported = True
+                    else:
+                        log.warning(
+                            "UI upgrade combination is not supported. It will fallback to CLI upgrade"
                         )
-                if (
-                    config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
-                ) and not (upgrade_in_current_source):
-                    for attempt in range(2):
-                        # We need to do it twice, because some of the SA are updated
-                        # after the first load of OCS pod after upgrade. So we need to
-                        # link updated SA again.
-                        log.info(
-                            f"Sleep 1 minute before attempt: {attempt + 1}/2 "
-                            "of linking secret/SAs"
-                        )
-                        time.sleep(60)
-                        link_all_sa_and_secret_and_delete_pods(
-                            constants.OCS_SECRET, config.ENV_DATA["cluster_namespace"]
+                if ui_upgrade_supported:
+                    ocs_odf_upgrade_ui()
+                else:
+                    if (
+                        config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
+                    ) and not (upgrade_in_current_source):
+                        create_ocs_secret(config.ENV_DATA["cluster_namespace"])
+                    if upgrade_version != "4.9":
+                        # In the case of upgrade to ODF 4.9, the ODF operator should upgrade
+                        # OCS automatically.
+                        upgrade_ocs.update_subscription(channel)
+                    if original_ocs_version == "4.8" and upgrade_version == "4.9":
+                        deployment = Deployment()
+                        deployment.subscribe_ocs()
+                    else:
+                        # In the case upgrade is not from 4.8 to 4.9 and we have manual approval strategy
+                        # we need to wait and approve install plan, otherwise it's approved in the
+                        # subscribe_ocs method.
+                        subscription_plan_approval = config.DEPLOYMENT.get(
+                            "subscription_plan_approval"
                         )
-        if operation:
-            log.info(f"Calling test function: {operation}")
-            _ = operation(*operation_args, **operation_kwargs)
-            # Workaround for issue #2531
-            time.sleep(30)
-            # End of workaround
-
-        for sample in TimeoutSampler(
-            timeout=725,
-            sleep=5,
-            func=upgrade_ocs.check_if_upgrade_completed,
-            channel=channel,
-            csv_name_pre_upgrade=csv_name_pre_upgrade,
-        ):
+                        if subscription_plan_approval == "Manual":
+                            wait_for_install_plan_and_approve(
+                                config.ENV_DATA["cluster_namespace"]
+                            )
+                    if (
+                        config.ENV_DATA["platform"] == constants.IBMCLOUD_PLATFORM
+                    ) and not (upgrade_in_current_source):
+                        for attempt in range(2):
+                            # We need to do it twice, because some of the SA are updated
+                            # after the first load of OCS pod after upgrade. So we need to
+                            # link updated SA again.
+                            log.info(
+                                f"Sleep 1 minute before attempt: {attempt + 1}/2 "
+                                "of linking secret/SAs"
+                            )
+                            time.sleep(60)
+                            link_all_sa_and_secret_and_delete_pods(
+                                constants.OCS_SECRET,
+                                config.ENV_DATA["cluster_namespace"],
+                            )
+            if operation:
+                log.info(f"Calling test function: {operation}")
+                _ = operation(*operation_args, **operation_kwargs)
+                # Workaround for issue #2531
+                time.sleep(30)
+                # End of workaround
+
+            # the upgrade is checked whenever a CSV changes instead of polling
             try:
-                if sample:
-                    log.info("Upgrade success!")
-                    break
+                upgrade_monitor.wait(
+                    lambda: upgrade_ocs.check_if_upgrade_completed(
+                        channel,
+                        csv_name_pre_upgrade,
+                        csv_phases=upgrade_monitor.get_csv_phases(),
+                    ),
+                    timeout=725,
+                    kinds=[CSV_KIND],
+                    message="new CSV after upgrade",
+                )
             except TimeoutException:
                 raise TimeoutException("No new CSV found after upgrade!")
-        old_image = upgrade_ocs.get_images_post_upgrade(
-            channel, pre_upgrade_images, upgrade_version
+            log.info("Upgrade success!")
+            old_image = upgrade_ocs.get_images_post_upgrade(
+                channel, pre_upgrade_images, upgrade_version, monitor=upgrade_monitor
+            )
+        verify_image_versions(
+            old_image,
+            upgrade_ocs.get_parsed_versions()[1],
+            upgrade_ocs.version_before_upgrade,
+            monitor=upgrade_monitor,
         )
-    verify_image_versions(
-        old_image,
-        upgrade_ocs.get_parsed_versions()[1],
-        upgrade_ocs.version_before_upgrade,
-    )
 
     # update external secrets
     if config.DEPLOYMENT["external_mode"]:
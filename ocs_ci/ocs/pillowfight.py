@@ -2,11 +2,16 @@
 Pillowfight Class to run various workloads and scale tests
 """
 import logging
+import os
 import tempfile
 import re
+import subprocess
 from os import listdir
 from os.path import join
 from shutil import rmtree
+
+import numpy as np
+
 from ocs_ci.utility.spreadsheet.spreadsheet_api import GoogleSpreadSheetAPI
 
 from ocs_ci.ocs.ocp import OCP
@@ -18,6 +23,110 @@ from ocs_ci.utility import utils, templating
 
 log = logging.getLogger(__name__)
 
+# Line of the response time histogram in the pillowfight log, e.g.
+# "[10 - 20 ]ms |####### - 1234"
+RESP_HIST_LINE = re.compile(r"^\[(\d+) +- (\d+) *\]([um]s) \|#* - (\d+)")
+
+
+class PillowFightLogParser(object):
+    """
+    Incremental parser of the pillowfight log. Lines are fed one at a time, so
+    the log never has to be held in memory as a single string.
+
+    The data in the couchbase logs is kind of abnormal. It contains histograms
+    with invalid unicode charaters and it also seems to write a block of text
+    inside another block at an unpredictable location. So what's used from
+    the log is a list of OPS/SEC values and a histogram of response times.
+
+    """
+
+    def __init__(self):
+        self._ops_per_sec = []
+        self.resp_hist = {}
+
+    def feed(self, dline):
+        """
+        Parse one line of the log
+
+        Args:
+            dline (str): line of the pillowfight log
+
+        """
+        dline = dline.replace("\x00", "").rstrip("\n")
+        try:
+            if dline.startswith("OPS/SEC"):
+                self._ops_per_sec.append(int(dline.split(" ")[-1].strip()))
+                return
+            match = RESP_HIST_LINE.match(dline)
+            if match:
+                i1, i2, unit, number = match.groups()
+                i1, i2 = int(i1), int(i2)
+                if unit == "ms":
+                    i1 *= 1000
+                    i2 *= 1000
+                self.resp_hist[i2] = {"minindx": i1, "number": int(number)}
+        except ValueError:
+            log.info(f"{dline} -- contains invalid data")
+
+    @property
+    def ops_per_sec(self):
+        """
+        numpy.ndarray: OPS/SEC values reported in the log
+        """
+        return np.array(self._ops_per_sec, dtype=np.int64)
+
+    def get_data(self):
+        """
+        Returns:
+            dict: ops per sec and response time information, see
+                PillowFight.parse_pillowfight_log()
+
+        """
+        return {"opspersec": self.ops_per_sec, "resptimes": self.resp_hist}
+
+
+def merge_resp_histograms(histograms):
+    """
+    Merge response time histograms of several pillowfight replicas
+
+    Args:
+        histograms (list): response time histograms (the 'resptimes' values
+            returned by PillowFight.parse_pillowfight_log())
+
+    Returns:
+        dict: merged histogram, the counts of the same ranges are summed up
+
+    """
+    merged = {}
+    for histogram in histograms:
+        for max_resp, bucket in histogram.items():
+            merged_bucket = merged.setdefault(
+                max_resp, {"minindx": bucket["minindx"], "number": 0}
+            )
+            merged_bucket["number"] += bucket["number"]
+    return dict(sorted(merged.items()))
+
+
+def resp_time_percentile(histogram, percentile):
+    """
+    Get upper bound of response time percentile from the histogram
+
+    Args:
+        histogram (dict): response time histogram
+        percentile (float): percentile, 0-100
+
+    Returns:
+        int: maximal response time (usec) of the range where the percentile
+            falls, None for empty histogram
+
+    """
+    if not histogram:
+        return None
+    max_resps = np.array(sorted(histogram))
+    counts = np.cumsum([histogram[max_resp]["number"] for max_resp in max_resps])
+    index = np.searchsorted(counts, counts[-1] * percentile / 100)
+    return int(max_resps[min(index, len(max_resps) - 1)])
+
 
 class PillowFight(object):
     """
@@ -56,6 +165,9 @@ class PillowFight(object):
         self.ocp = OCP()
         self.up_check = OCP(namespace=constants.COUCHBASE_OPERATOR)
         self.logs = tempfile.mkdtemp(prefix="pf_logs_")
+        # dump the whole raw pillowfight log into the test log
+        self.log_raw_output = self.args.get("log_raw_output", False)
+        self.log_streams = {}
 
     def run_pillowfights(
         self, replicas=1, num_items=None, num_threads=None, timeout=1800
@@ -94,57 +206,159 @@ class PillowFight(object):
             lpillowfight.create()
         self.pods_info = {}
 
-        for pillowfight_pods in TimeoutSampler(
-            timeout,
-            9,
-            get_pod_name_by_pattern,
-            "pillowfight",
-            constants.COUCHBASE_OPERATOR,
-        ):
-            try:
-                counter = 0
-                for pf_pod in pillowfight_pods:
-                    pod_info = self.up_check.exec_oc_cmd(f"get pods {pf_pod} -o json")
-                    pf_status = pod_info["status"]["containerStatuses"][0]["state"]
-                    if "terminated" in pf_status:
-                        pf_completion_info = pf_status["terminated"]["reason"]
-                        if pf_completion_info == constants.STATUS_COMPLETED:
-                            counter += 1
-                            self.pods_info.update({pf_pod: pf_completion_info})
-                    elif "running" in pf_status:
-                        pass
-                if counter == self.replicas:
-                    break
-            except IndexError:
-                log.info("Pillowfight not yet completed")
-
-        log.info(self.pods_info)
-        for pod, pf_completion_info in self.pods_info.items():
-            if pf_completion_info == "Completed":
-                pf_endlog = f"{pod}.log"
-                pf_log = join(self.logs, pf_endlog)
-                data_from_log = ocp_local.exec_oc_cmd(
-                    f"logs -f {pod} --ignore-errors", out_yaml_format=False
-                )
-                data_from_log = data_from_log.replace("\x00", "")
-                with open(pf_log, "w") as fd:
-                    fd.write(data_from_log)
-
-            elif pf_completion_info == "Error":
-                raise Exception("Pillowfight failed to complete")
+        try:
+            for pillowfight_pods in TimeoutSampler(
+                timeout,
+                9,
+                get_pod_name_by_pattern,
+                "pillowfight",
+                constants.COUCHBASE_OPERATOR,
+            ):
+                try:
+                    counter = 0
+                    for pf_pod in pillowfight_pods:
+                        pod_info = self.up_check.exec_oc_cmd(
+                            f"get pods {pf_pod} -o json"
+                        )
+                        pf_status = pod_info["status"]["containerStatuses"][0]["state"]
+                        if "running" in pf_status or "terminated" in pf_status:
+                            self.stream_log(pf_pod)
+                        if "terminated" in pf_status:
+                            pf_completion_info = pf_status["terminated"]["reason"]
+                            if pf_completion_info == constants.STATUS_COMPLETED:
+                                counter += 1
+                                self.pods_info.update({pf_pod: pf_completion_info})
+                        elif "running" in pf_status:
+                            pass
+                    if counter == self.replicas:
+                        break
+                except IndexError:
+                    log.info("Pillowfight not yet completed")
+
+            log.info(self.pods_info)
+            for pod, pf_completion_info in self.pods_info.items():
+                if pf_completion_info == "Completed":
+                    pf_endlog = f"{pod}.log"
+                    pf_log = join(self.logs, pf_endlog)
+                    if self.wait_for_log_stream(pod):
+                        continue
+                    log.info(f"Log of {pod} was not streamed, fetching the whole log")
+                    data_from_log = ocp_local.exec_oc_cmd(
+                        f"logs -f {pod} --ignore-errors", out_yaml_format=False
+                    )
+                    data_from_log = data_from_log.replace("\x00", "")
+                    with open(pf_log, "w") as fd:
+                        fd.write(data_from_log)
+
+                elif pf_completion_info == "Error":
+                    raise Exception("Pillowfight failed to complete")
+        finally:
+            # streams of the pods which didn't complete (timeout, Error)
+            self.stop_log_streams()
+
+    def stream_log(self, pod):
+        """
+        Start streaming the log of the pillowfight pod into the file in
+        self.logs directory (by 'oc logs -f' running in background), if not
+        started yet.
+
+        Args:
+            pod (str): name of the pillowfight pod
+
+        """
+        if pod in self.log_streams:
+            return
+        ocp_local = OCP(namespace=self.namespace)
+        cmd = ["oc"]
+        if os.path.exists(ocp_local.cluster_kubeconfig):
+            cmd += ["--kubeconfig", ocp_local.cluster_kubeconfig]
+        cmd += ["-n", self.namespace, "logs", "-f", pod, "--ignore-errors"]
+        log.info(f"Streaming log of {pod} by: {' '.join(cmd)}")
+        log_file = open(join(self.logs, f"{pod}.log"), "w")
+        try:
+            proc = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.DEVNULL)
+        except OSError as ex:
+            log.warning(f"Failed to stream log of {pod}: {ex}")
+            log_file.close()
+            proc = None
+        self.log_streams[pod] = (proc, log_file)
+
+    def wait_for_log_stream(self, pod, timeout=120):
+        """
+        Wait for the log stream of completed pillowfight pod to finish
+
+        Args:
+            pod (str): name of the pillowfight pod
+            timeout (int): time in seconds to wait for the stream
+
+        Returns:
+            bool: True if the whole log was streamed into the file
+
+        """
+        proc, log_file = self.log_streams.pop(pod, (None, None))
+        if proc is None:
+            return False
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            log.warning(f"Log stream of {pod} did not finish in {timeout} seconds")
+            proc.kill()
+            proc.wait()
+        finally:
+            log_file.close()
+        return proc.returncode == 0
+
+    def stop_log_streams(self):
+        """
+        Kill all the remaining log streams and close their files
+
+        """
+        while self.log_streams:
+            pod, (proc, log_file) = self.log_streams.popitem()
+            if proc is not None and proc.poll() is None:
+                log.info(f"Stopping log stream of {pod}")
+                proc.kill()
+                proc.wait()
+            log_file.close()
 
     def analyze_all(self):
         """
         Analyze the data extracted into self.logs files
 
         """
+        histograms = []
         for path in listdir(self.logs):
             full_path = join(self.logs, path)
             log.info(f"Analyzing {full_path}")
-            with open(full_path, "r") as fdesc:
-                data_from_log = fdesc.read()
-            log_data = self.parse_pillowfight_log(data_from_log)
+            log_data = self.parse_pillowfight_log_file(full_path)
+            histograms.append(log_data["resptimes"])
             self.sanity_check(log_data)
+        self.resp_hist = merge_resp_histograms(histograms)
+        log.info(
+            "Response time percentiles of all replicas (usec): "
+            f"50%: {resp_time_percentile(self.resp_hist, 50)}, "
+            f"99%: {resp_time_percentile(self.resp_hist, 99)}"
+        )
+
+    def parse_pillowfight_log_file(self, log_file):
+        """
+        Parse the pillowfight log file line by line, see
+        parse_pillowfight_log()
+
+        Args:
+            log_file (str): path to the log file
+
+        Returns:
+            dict: ops per sec and response time information
+
+        """
+        parser = PillowFightLogParser()
+        with open(log_file, "r", errors="replace") as fdesc:
+            for dline in fdesc:
+                if self.log_raw_output:
+                    log.info(dline.rstrip("\n"))
+                parser.feed(dline)
+        return parser.get_data()
 
     def sanity_check(self, stats):
         """
@@ -166,7 +380,7 @@ class PillowFight(object):
         and generate a summary of the results.
 
         The dictionary returned has two values; 'opspersec' and 'resptimes'.
-        opspersec is a list of ops per second numbers reported.'
+        opspersec is a numpy array of ops per second numbers reported.'
         resptimes is a dictionary index by the max response time of a range.
         Each entry in resptimes contains a minimum response time for that range,
         and a count of how many messages fall within that range.
@@ -188,30 +402,12 @@ class PillowFight(object):
         # So what's left is a list of OPS/SEC values and a histogram of
         # response times.  This routine organizes that data.
 
-        ops_per_sec = []
-        resp_hist = {}
-        log.info("*******Couchbase raw output log*********\n" f"{data_from_log}")
-        lines = data_from_log.split("\n")
-        for dline in lines:
-            try:
-                if dline.startswith("OPS/SEC"):
-                    dfields = dline.split(" ")
-                    dnumb = int(dfields[-1].strip())
-                    ops_per_sec.append(dnumb)
-                if re.match("^\\[\\d+ +- \\d+ *\\][um]s \\|#* - \\d+", dline):
-                    for element in ["[", "]", "|", "-", "#"]:
-                        dline = dline.replace(element, " ")
-                    parts = dline.split()
-                    i1 = int(parts[0])
-                    i2 = int(parts[1])
-                    if parts[2] == "ms":
-                        i1 *= 1000
-                        i2 *= 1000
-                    resp_hist[i2] = {"minindx": i1, "number": int(parts[3])}
-            except ValueError:
-                log.info(f"{dline} -- contains invalid data")
-        ret_data = {"opspersec": ops_per_sec, "resptimes": resp_hist}
-        return ret_data
+        if self.log_raw_output:
+            log.info("*******Couchbase raw output log*********\n" f"{data_from_log}")
+        parser = PillowFightLogParser()
+        for dline in data_from_log.split("\n"):
+            parser.feed(dline)
+        return parser.get_data()
 
     def export_pfoutput_to_googlesheet(self, sheet_name, sheet_index):
         """
@@ -227,14 +423,13 @@ class PillowFight(object):
         log.info("Exporting pf data to google spreadsheet")
         for path in listdir(self.logs):
             full_path = join(self.logs, path)
-            with open(full_path, "r") as fdesc:
-                data_from_log = fdesc.read()
-            log_data = self.parse_pillowfight_log(data_from_log)
+            log_data = self.parse_pillowfight_log_file(full_path)
 
             g_sheet.insert_row(
                 [
                     f"{path}",
-                    min(log_data["opspersec"]),
+                    # numpy integers are not JSON serializable for gspread
+                    int(min(log_data["opspersec"])),
                     max(log_data["resptimes"].keys()) / 1000,
                 ],
                 2,
@@ -257,4 +452,5 @@ class PillowFight(object):
         Remove pillowfight pods and temp files
 
         """
+        self.stop_log_streams()
         rmtree(self.logs)
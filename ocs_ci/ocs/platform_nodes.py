@@ -19,7 +19,6 @@ from ocs_ci.deployment.vmware import (
 from ocs_ci.ocs.exceptions import (
     TimeoutExpiredError,
     NotAllNodesCreated,
-    RebootEventNotFoundException,
 )
 from ocs_ci.framework import config, merge_dict
 from ocs_ci.utility import templating
@@ -32,6 +31,7 @@ from ocs_ci.ocs.node import (
     get_node_objs,
     get_typed_worker_nodes,
     get_nodes,
+    NodeRebootTracker,
 )
 from ocs_ci.ocs.resources.pvc import get_deviceset_pvs
 from ocs_ci.ocs.resources import pod
@@ -213,6 +213,8 @@ class VMWareNodes(NodesBase):
         self.datacenter = config.ENV_DATA["vsphere_datacenter"]
         self.datastore = config.ENV_DATA["vsphere_datastore"]
         self.vsphere = vsphere.VSPHERE(self.server, self.user, self.password)
+        # timeline of the last restart_nodes, see NodeRebootTracker.to_records
+        self.reboot_timeline = []
 
     def get_vms(self, nodes):
         """
@@ -225,14 +227,20 @@ class VMWareNodes(NodesBase):
             list: vSphere vm objects list
 
         """
-        vms_in_pool = self.vsphere.get_all_vms_in_pool(
-            self.cluster_name, self.datacenter, self.cluster
-        )
         node_names = [node.name for node in nodes]
-        vms = []
-        for node in node_names:
-            node_vms = [vm for vm in vms_in_pool if vm.name in node]
-            vms.extend(node_vms)
+        # the cached VM names are refreshed if some node VM is not found
+        for refresh in (False, True):
+            vms_in_pool = self.vsphere.get_pool_vm_names(
+                self.cluster_name, self.datacenter, self.cluster, refresh=refresh
+            )
+            vms = []
+            for node in node_names:
+                node_vms = [
+                    vm for vm, vm_name in vms_in_pool.items() if vm_name in node
+                ]
+                vms.extend(node_vms)
+            if len(vms) >= len(node_names):
+                break
         return vms
 
     def get_data_volumes(self, pvs=None):
@@ -308,52 +316,38 @@ class VMWareNodes(NodesBase):
             wait (bool): True if need to wait till the restarted OCP node
                 reaches READY state. False otherwise
 
+        Raises:
+            ResourceWrongStatusException: In case some of the nodes haven't
+                reached READY state
+            RebootEventNotFoundException: In case reboot event of some of the
+                nodes wasn't found
+
+        The timeline of the reboot of every node is kept in reboot_timeline
+        and appended to node_reboots.jsonl in the log directory.
+
         """
         vms = self.get_vms(nodes)
         assert vms, f"Failed to get VM objects for nodes {[n.name for n in nodes]}"
 
-        num_events_pre_reboot = self.get_reboot_events(nodes)
-
-        self.vsphere.restart_vms(vms, force=force)
-
-        if wait:
-            """
-            When reboot is initiated on a VM from the VMware, the VM
-            stays at "Running" state throughout the reboot operation.
-
-            When the reboot operation is completed and the VM is reachable the
-            OCP node reaches status Ready and a Reboot event is logged.
-            """
-            nodes_names = [n.name for n in nodes]
-
-            wait_for_nodes_status(
-                node_names=nodes_names, status=constants.NODE_READY, timeout=timeout
-            )
-            for node in nodes:
-                reboot_events_cmd = (
-                    "get events -A --field-selector involvedObject.name="
-                    f"{node.name},reason=Rebooted -o yaml"
-                )
-                try:
-                    for node_reboot_events in TimeoutSampler(
-                        timeout=300, sleep=3, func=self.get_reboot_events, nodes=[node]
-                    ):
-                        if (
-                            node_reboot_events[node.name]
-                            != num_events_pre_reboot[node.name]
-                        ):
-                            break
-                except TimeoutExpiredError:
-                    logger.error(
-                        f"{node.name}: reboot events before reboot are {num_events_pre_reboot[node.name]} and "
-                        f"reboot events after reboot are {node_reboot_events[node.name]}"
-                    )
-                    raise RebootEventNotFoundException
-
-                assert num_events_pre_reboot[node.name] < len(
-                    node.ocp.exec_oc_cmd(reboot_events_cmd)["items"]
-                ), f"Reboot event not found on node {node.name}"
-                logger.info(f"Node {node.name} rebooted")
+        if not wait:
+            self.vsphere.restart_vms(vms, force=force)
+            return
+
+        # When reboot is initiated on a VM from the VMware, the VM stays at
+        # "Running" state throughout the reboot operation. When the reboot
+        # operation is completed and the VM is reachable the OCP node reaches
+        # status Ready and a Reboot event is logged.
+        with NodeRebootTracker([n.name for n in nodes]) as tracker:
+            self.vsphere.restart_vms(vms, force=force)
+            tracker.reset_issued()
+            try:
+                tracker.wait(timeout=timeout)
+            finally:
+                self.reboot_timeline = tracker.to_records()
+                log_dir = os.path.expanduser(config.RUN["log_dir"])
+                with open(os.path.join(log_dir, "node_reboots.jsonl"), "a") as f:
+                    for record in self.reboot_timeline:
+                        f.write(json.dumps(record) + "\n")
 
     def get_reboot_events(self, nodes):
         """
@@ -525,9 +519,7 @@ class AWSNodes(NodesBase):
         ), f"EBS Volume {volume.id} is not attached to any EC2 instance"
         instance_id = instance_ids[0]
         all_nodes = get_node_objs()
-        nodes = [
-            n for n in all_nodes if instance_id in n.get().get("spec").get("providerID")
-        ]
+        nodes = [n for n in all_nodes if instance_id in n.data["spec"]["providerID"]]
         assert nodes, f"Failed to find the OCS object for EC2 instance {instance_id}"
         return nodes[0]
 
@@ -575,48 +567,23 @@ class AWSNodes(NodesBase):
                 and 'ready' state.
 
         """
-        num_events_pre_reboot = {}
         instances = self.get_ec2_instances(nodes)
         assert instances, (
             f"Failed to get the EC2 instances for " f"nodes {[n.name for n in nodes]}"
         )
 
-        for node in nodes:
-            reboot_events_cmd = (
-                "get events -A --field-selector involvedObject.name="
-                f"{node.name},reason=Rebooted -o yaml"
-            )
-            num_events_pre_reboot[node.name] = len(
-                node.ocp.exec_oc_cmd(reboot_events_cmd)["items"]
-            )
-
-        self.aws.restart_ec2_instances(instances=instances)
-
-        if wait:
-            """
-            When reboot is initiated on an instance from the AWS, the
-            instance stays at "Running" state throughout the reboot operation.
+        if not wait:
+            self.aws.restart_ec2_instances(instances=instances)
+            return
 
-            When the reboot operation is complete and the instance is reachable
-            the OCP node reaches status Ready and a Reboot event is logged.
-            """
-            logger.info("Waiting for 60 seconds for reboot to complete...")
-            time.sleep(60)
-
-            nodes_names = [n.name for n in nodes]
-            logger.info(f"Waiting for nodes: {nodes_names} to reach ready state")
-            wait_for_nodes_status(
-                node_names=nodes_names, status=constants.NODE_READY, timeout=timeout
-            )
-            for node in nodes:
-                reboot_events_cmd = (
-                    "get events -A --field-selector involvedObject.name="
-                    f"{node.name},reason=Rebooted -o yaml"
-                )
-                assert num_events_pre_reboot[node.name] < len(
-                    node.ocp.exec_oc_cmd(reboot_events_cmd)["items"]
-                ), f"Reboot event not found on node {node.name}"
-                logger.info(f"Node {node.name} rebooted")
+        # When reboot is initiated on an instance from the AWS, the instance
+        # stays at "Running" state throughout the reboot operation. When the
+        # reboot operation is complete and the instance is reachable the OCP
+        # node reaches status Ready and a Reboot event is logged.
+        with NodeRebootTracker([n.name for n in nodes]) as tracker:
+            self.aws.restart_ec2_instances(instances=instances)
+            tracker.reset_issued()
+            tracker.wait(timeout=timeout)
 
     def restart_nodes_by_stop_and_start(self, nodes, wait=True, force=True):
         """
@@ -734,10 +701,11 @@ class AWSNodes(NodesBase):
             "and wait for them to get to status 'stopped', "
             "so it will be possible to start them"
         )
+        instances_status = self.aws.get_instances_status(list(ec2_instances))
         stopping_instances = {
             key: val
             for key, val in ec2_instances.items()
-            if self.aws.get_instances_status_by_id(key) == constants.INSTANCE_STOPPING
+            if instances_status.get(key) == constants.INSTANCE_STOPPING
         }
 
         logger.info(
@@ -745,13 +713,12 @@ class AWSNodes(NodesBase):
             "(if there are any) to reach 'stopped'"
         )
         if stopping_instances:
-            for stopping_instance in stopping_instances:
-                instance = self.aws.get_ec2_instance(stopping_instance.key())
-                instance.wait_until_stopped()
+            self.aws.wait_for_instances(list(stopping_instances), "instance_stopped")
+            instances_status = self.aws.get_instances_status(list(ec2_instances))
         stopped_instances = {
             key: val
             for key, val in ec2_instances.items()
-            if self.aws.get_instances_status_by_id(key) == constants.INSTANCE_STOPPED
+            if instances_status.get(key) == constants.INSTANCE_STOPPED
         }
 
         # Start the instances
@@ -2667,16 +2634,13 @@ class VMWareIPINodes(VMWareNodes):
             list: vSphere vm objects list in the Datacenter
 
         """
-        vms_in_dc = self.vsphere.get_all_vms_in_dc(self.datacenter)
         node_names = set([node.name for node in nodes])
-        vms = []
-        for vm in vms_in_dc:
-            try:
-                vm_name = vm.name
-                if vm_name in node_names:
-                    vms.append(vm)
-            except Exception as e:
-                logger.info(f"Failed to get the vm name due to exception: {e}")
+        # the cached VM names are refreshed if some node VM is not found
+        for refresh in (False, True):
+            vms_in_dc = self.vsphere.get_dc_vm_names(self.datacenter, refresh=refresh)
+            vms = [vm for vm, vm_name in vms_in_dc.items() if vm_name in node_names]
+            if len(vms) >= len(nodes):
+                break
 
         if len(vms) < len(nodes):
             logger.warning("Didn't find all the VM objects for all the nodes")
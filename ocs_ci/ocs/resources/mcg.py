@@ -4,6 +4,7 @@ import logging
 import os
 import stat
 import tempfile
+import time
 from time import sleep
 
 import boto3
@@ -29,7 +30,7 @@ from ocs_ci.ocs.exceptions import (
 from ocs_ci.ocs.ocp import OCP
 from ocs_ci.ocs.resources.pod import cal_md5sum
 from ocs_ci.ocs.resources.pod import get_pods_having_label, Pod
-from ocs_ci.utility import templating, version
+from ocs_ci.utility import telemetry, templating, version
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import TimeoutSampler, exec_cmd, get_attr_chain
 from ocs_ci.helpers.helpers import (
@@ -338,11 +339,19 @@ class MCG:
             "params": params,
             "auth_token": self.noobaa_token,
         }
-        return requests.post(
+        start = time.perf_counter()
+        response = requests.post(
             url=self.mgmt_endpoint,
             data=json.dumps(payload),
             verify=retrieve_verification_mode(),
         )
+        telemetry.record(
+            telemetry.MCG_RPC,
+            f"{api}.{method}",
+            time.perf_counter() - start,
+            len(response.content),
+        )
+        return response
 
     def check_data_reduction(self, bucketname, expected_reduction_in_bytes):
         """
@@ -111,8 +111,9 @@ class OCS(object):
 
     def create(self, do_reload=True):
         log.info(f"Adding {self.kind} with name {self.name}")
-        templating.dump_data_to_temp_yaml(self.data, self.temp_yaml)
-        status = self.ocp.create(yaml_file=self.temp_yaml)
+        # the manifest is passed to oc via stdin, no temporary file is written
+        yaml_data = templating.dump_data_to_yaml(self.data)
+        status = self.ocp.create(yaml_data=yaml_data)
         if do_reload:
             self.reload()
         return status
@@ -41,6 +41,7 @@ from ocs_ci.utility.utils import (
 )
 from ocs_ci.utility.utils import check_if_executable_in_path
 from ocs_ci.utility.retry import retry
+from ocs_ci.utility.workloads import fio
 
 logger = logging.getLogger(__name__)
 FIO_TIMEOUT = 600
@@ -139,6 +140,9 @@ class Pod(OCS):
         logger.info(f"Waiting for FIO results from pod {self.name}")
         try:
             result = self.fio_thread.result(timeout)
+            if result and "status-interval" in getattr(self, "io_params", {}):
+                # fio prints interim json reports, the last one is final
+                return fio.parse_results(result)
             if result:
                 return yaml.safe_load(result)
             raise CommandFailed(f"FIO execution results: {result}.")
@@ -311,6 +315,8 @@ class Pod(OCS):
         direct=0,
         verify=False,
         fio_installed=False,
+        status_interval=None,
+        log_timeseries=False,
     ):
         """
         Execute FIO on a pod
@@ -347,6 +353,10 @@ class Pod(OCS):
             direct(int): If value is 1, use non-buffered I/O. This is usually O_DIRECT. Fio default is 0.
             verify (bool): This method verifies file contents after each iteration of the job. e.g. crc32c, md5
             fio_installed (bool): True if fio is already installed on the pod
+            status_interval (int): If set, fio prints interim json report
+                every status_interval seconds
+            log_timeseries (bool): If True, fio writes per second bw, iops
+                and latency logs, see ocs_ci.ocs.fio_timeseries.FioTimeSeries
 
         """
         if not self.wl_setup_done:
@@ -385,6 +395,14 @@ class Pod(OCS):
             self.io_params["end_fsync"] = end_fsync
         if verify:
             self.io_params["verify"] = config.RUN["io_verification_method"]
+        if status_interval:
+            self.io_params["status-interval"] = status_interval
+        if log_timeseries:
+            from ocs_ci.ocs.fio_timeseries import get_timeseries_params
+
+            self.io_params.update(
+                get_timeseries_params(constants.FIO_TIMESERIES_LOG_PREFIX)
+            )
         self.fio_thread = self.wl_obj.run(**self.io_params)
 
     def fillup_fs(self, size, fio_filename=None):
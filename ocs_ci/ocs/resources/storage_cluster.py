@@ -7,8 +7,6 @@ import re
 import tempfile
 import yaml
 
-from jsonschema import validate
-
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants, defaults, ocp, managedservice
 from ocs_ci.ocs.exceptions import (
@@ -416,6 +414,8 @@ def ocs_install_verification(
         else:
             deviceset_pvcs = [pvc.name for pvc in get_deviceset_pvcs()]
 
+        from jsonschema import validate
+
         osd_tree = ct_pod.exec_ceph_cmd(ceph_cmd="ceph osd tree", format="json")
         schemas = {
             "root": constants.OSD_TREE_ROOT,
@@ -0,0 +1,91 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from ocs_ci.ocs import fio_timeseries
+
+
+def fio_log(start_ms, values, direction=1):
+    """
+    Content of fio log with one sample per second.
+    """
+    return "".join(
+        f"{start_ms + i * 1000}, {value}, {direction}, 4096, 0\n"
+        for i, value in enumerate(values)
+    )
+
+
+def test_parse_fio_log():
+    content = fio_log(1600000000000, [10, 20]) + fio_log(1600000000000, [5], 0)
+    samples = fio_timeseries.parse_fio_log(content)
+    assert set(samples) == {"read", "write"}
+    np.testing.assert_array_equal(
+        samples["write"], [[1600000000.0, 10], [1600000001.0, 20]]
+    )
+    np.testing.assert_array_equal(samples["read"], [[1600000000.0, 5]])
+
+
+def test_parse_fio_log_empty():
+    assert fio_timeseries.parse_fio_log("") == {}
+
+
+def test_detect_stalls():
+    times = np.arange(20)
+    values = np.full(20, 100)
+    values[5:10] = 0
+    values[15] = 0
+    assert fio_timeseries.detect_stalls(times, values, min_duration=2) == [(5, 10)]
+
+
+def test_detect_stalls_missing_samples():
+    times = np.array([0, 1, 2, 8, 9])
+    values = np.array([100, 100, 100, 100, 100])
+    assert fio_timeseries.detect_stalls(times, values) == [(2, 8)]
+
+
+def test_window_percentile_and_align():
+    times = np.arange(100, 110)
+    values = np.arange(10)
+    assert fio_timeseries.window_percentile(times, values, 100, 104, 50) == 2
+    assert fio_timeseries.window_percentile(times, values, 200, 300) is None
+    np.testing.assert_array_equal(
+        fio_timeseries.align_to_timestamp(times, 105)[:2], [-5, -4]
+    )
+
+
+def test_collect_incremental():
+    logs = {
+        "/tmp/fio_timeseries_iops.1.log": fio_log(1600000000000, [10, 20, 30]),
+        "/tmp/fio_timeseries_iops.2.log": fio_log(1600000000000, [1, 2, 3]),
+    }
+
+    def exec_cmd_on_pod(command, **kwargs):
+        if command.startswith("sh -c 'ls"):
+            return "\n".join(logs)
+        _, _, offset, log_file = command.split()
+        return "".join(logs[log_file].splitlines(True)[int(offset[1:]) - 1 :])
+
+    pod = Mock()
+    pod.exec_cmd_on_pod.side_effect = exec_cmd_on_pod
+    timeseries = fio_timeseries.FioTimeSeries(pod)
+    timeseries.collect()
+    logs["/tmp/fio_timeseries_iops.1.log"] += fio_log(1600000003000, [40])
+    timeseries.collect()
+
+    times, values = timeseries.get("iops", job=1)
+    np.testing.assert_array_equal(values, [10, 20, 30, 40])
+    times, values = timeseries.get("iops")
+    np.testing.assert_array_equal(times, 1600000000 + np.arange(4))
+    np.testing.assert_array_equal(values, [11, 22, 33, 40])
+    times, values = timeseries.get("bw")
+    assert not times.size and not values.size
+
+
+@pytest.mark.parametrize("metric", ["bw", "iops"])
+def test_get_timeseries_params(metric):
+    params = fio_timeseries.get_timeseries_params("/tmp/prefix")
+    assert params[f"write_{metric}_log"] == "/tmp/prefix"
+    assert params["log_unix_epoch"] == 1
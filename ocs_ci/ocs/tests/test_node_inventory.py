@@ -0,0 +1,96 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs import node
+from ocs_ci.ocs.exceptions import ResourceNotFoundError
+
+
+def node_dict(name, roles, zone):
+    labels = {f"node-role.kubernetes.io/{role}": "" for role in roles}
+    labels["failure-domain.beta.kubernetes.io/zone"] = zone
+    labels["topology.rook.io/rack"] = f"rack-{zone}"
+    return {"kind": "Node", "metadata": {"name": name, "labels": labels}}
+
+
+def pod_dict(name, node_name, labels):
+    return {
+        "kind": "Pod",
+        "metadata": {"name": name, "namespace": "openshift-storage", "labels": labels},
+        "spec": {"nodeName": node_name},
+    }
+
+
+NODES = [
+    node_dict("master-0", ["master"], "a"),
+    node_dict("worker-0", ["worker"], "a"),
+    node_dict("worker-1", ["worker", "infra"], "b"),
+]
+PODS = [
+    pod_dict("osd-0", "worker-0", {"app": "rook-ceph-osd", "ceph-osd-id": "0"}),
+    pod_dict("osd-1", "worker-1", {"app": "rook-ceph-osd", "ceph-osd-id": "1"}),
+    pod_dict("osd-2", "worker-1", {"app": "rook-ceph-osd", "ceph-osd-id": "2"}),
+    pod_dict("mon-a", "worker-1", {"app": "rook-ceph-mon", "ceph_daemon_id": "a"}),
+]
+
+
+@pytest.fixture
+def oc_get():
+    def get(ocp_obj, *args, **kwargs):
+        return {"items": NODES if ocp_obj.kind.lower() == "node" else PODS}
+
+    with patch.object(node.OCP, "get", autospec=True, side_effect=get) as oc_get:
+        yield oc_get
+
+
+@pytest.fixture
+def inventory(oc_get):
+    with patch.dict(
+        node.config.ENV_DATA,
+        {"cluster_namespace": "openshift-storage", "platform": "aws"},
+    ):
+        yield node.NodeInventory()
+
+
+def test_inventory_indexes(inventory, oc_get):
+    assert inventory.get_node_names("worker") == ["worker-0", "worker-1"]
+    assert inventory.get_zone_dict() == {"worker-0": "a", "worker-1": "b"}
+    assert inventory.get_nodes_by_zone() == {"a": ["worker-0"], "b": ["worker-1"]}
+    assert inventory.get_rack("master-0") == "rack-a"
+    assert inventory.get_daemons("worker-1") == {"osd": ["1", "2"], "mon": ["a"]}
+    assert node.get_node_osd_ids("worker-1", inventory=inventory) == ["1", "2"]
+    assert sorted(node.get_osd_running_nodes(inventory)) == ["worker-0", "worker-1"]
+    assert node.get_osds_per_node(inventory)["worker-1"] == ["osd-1", "osd-2"]
+    # one node list and one pod list
+    assert oc_get.call_count == 2
+
+    inventory.refresh()
+    assert inventory.get_osd_ids("worker-0") == ["0"]
+    assert oc_get.call_count == 3
+
+
+def test_inventory_managed_service_workers(inventory):
+    with patch.dict(node.config.ENV_DATA, {"platform": "rosa"}):
+        workers = node.get_nodes(inventory=inventory)
+    assert [worker.name for worker in workers] == ["worker-0"]
+
+
+def test_get_node_pods(inventory):
+    osd_pods = [node.OCS(**pod) for pod in PODS[:3]]
+    node_pods = node.get_node_pods("worker-1", osd_pods, inventory=inventory)
+    assert [p.name for p in node_pods] == ["osd-1", "osd-2"]
+
+    missing = node.OCS(**pod_dict("osd-3", "worker-0", {}))
+    with pytest.raises(ResourceNotFoundError):
+        node.get_node_pods(
+            "worker-0", [missing], raise_pod_not_found_error=True, inventory=inventory
+        )
+
+
+def test_get_nodes_of_missing_role(inventory):
+    # no node has the role, none of the nodes is returned
+    assert node.get_nodes(node_type="storage", inventory=inventory) == []
+    assert inventory.get_node_objs([]) == []
+    assert len(inventory.get_node_objs()) == len(NODES)
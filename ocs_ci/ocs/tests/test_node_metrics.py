@@ -0,0 +1,111 @@
+# -*- coding: utf8 -*-
+
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs import node_metrics
+
+
+def node(name, roles, cpu="4", memory="16Gi", ready="True"):
+    return {
+        "metadata": {
+            "name": name,
+            "labels": {f"node-role.kubernetes.io/{role}": "" for role in roles},
+        },
+        "status": {
+            "allocatable": {"cpu": cpu, "memory": memory},
+            "conditions": [{"type": "Ready", "status": ready}],
+        },
+    }
+
+
+def pod(node_name, containers, init_containers=()):
+    def container(requests, limits=None):
+        return {"resources": {"requests": requests, "limits": limits or {}}}
+
+    return {
+        "spec": {
+            "nodeName": node_name,
+            "containers": [container(*c) for c in containers],
+            "initContainers": [container(*c) for c in init_containers],
+        }
+    }
+
+
+NODES = [node("master-0", ["master"]), node("worker-0", ["worker"], ready="False")]
+PODS = [
+    pod("worker-0", [({"cpu": "500m", "memory": "1Gi"}, {"cpu": "1"})]),
+    pod(
+        "worker-0",
+        [({"cpu": "500m", "memory": "1Gi"},)],
+        init_containers=[({"cpu": "2", "memory": "1Mi"},)],
+    ),
+    # pending pod, not scheduled yet
+    pod(None, [({"cpu": "1"},)]),
+]
+USAGE = {
+    "master-0": {"cpu": 1.0, "memory": 4 * 2**30},
+    "worker-0": {"cpu": 0.2, "memory": 8 * 2**30},
+}
+
+
+@pytest.mark.parametrize(
+    "quantity,expected",
+    [
+        ("100m", 0.1),
+        ("1500000n", 0.0015),
+        ("2", 2),
+        ("512Mi", 512 * 2**20),
+        ("1G", 1e9),
+        ("1e3", 1000),
+    ],
+)
+def test_parse_quantity(quantity, expected):
+    assert node_metrics.parse_quantity(quantity) == pytest.approx(expected)
+
+
+def test_parse_quantity_invalid():
+    with pytest.raises(ValueError):
+        node_metrics.parse_quantity("10Xi")
+
+
+def test_build_rows():
+    sampler = node_metrics.NodeMetricsSampler()
+    rows = sampler.build_rows(NODES, PODS, USAGE)
+    assert [row["node"] for row in rows] == ["master-0", "worker-0"]
+    master, worker = rows
+    assert master["cpu_usage_percent"] == 25
+    assert master["pods"] == 0
+    assert master["cpu_requests_percent"] == 0
+    assert not worker["ready"]
+    assert worker["pods"] == 2
+    # init container request of the second pod is bigger than its containers
+    assert worker["cpu_requests"] == pytest.approx(2.5)
+    assert worker["cpu_limits"] == pytest.approx(1)
+    assert worker["memory_requests_percent"] == 12.5
+    assert worker["memory_usage_percent"] == 50
+
+
+def test_sample():
+    sampler = node_metrics.NodeMetricsSampler()
+    with patch.object(sampler, "get_nodes", return_value=NODES), patch.object(
+        sampler, "get_pods", return_value=PODS
+    ), patch.object(
+        sampler, "get_usage", side_effect=Exception("metrics not available")
+    ), patch.object(
+        node_metrics, "logger"
+    ):
+        sample = sampler.sample()
+    assert "usage" in sample.errors
+    assert sample.utilization(role="worker") == {}
+    assert sample.utilization(role="worker", source="requests") == {
+        "worker-0": {"cpu": 62, "memory": 12}
+    }
+    output = io.StringIO()
+    sample.dump_records(output)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [record["node"] for record in records] == ["master-0", "worker-0"]
+    assert records[0]["timestamp"] == sample.timestamp
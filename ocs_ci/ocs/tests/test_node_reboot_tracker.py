@@ -0,0 +1,92 @@
+# -*- coding: utf8 -*-
+
+import io
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ocs_ci.ocs import node
+from ocs_ci.ocs.exceptions import RebootEventNotFoundException
+from ocs_ci.ocs.watch import ResourceWatch
+
+
+def node_event(name, ready):
+    condition = {"type": "Ready", "status": "True" if ready else "Unknown"}
+    resource = {
+        "kind": "Node",
+        "metadata": {"name": name},
+        "status": {"conditions": [condition]},
+    }
+    return ("MODIFIED", resource)
+
+
+def reboot_event(name, uid, count=1):
+    resource = {
+        "kind": "Event",
+        "metadata": {"uid": uid},
+        "involvedObject": {"kind": "Node", "name": name},
+        "count": count,
+    }
+    return ("ADDED", resource)
+
+
+@pytest.fixture
+def tracker():
+    with patch.object(node, "log"):
+        tracker = node.NodeRebootTracker(["compute-0", "compute-1"])
+        # reboot event of a previous reboot of compute-1
+        tracker._known_events = {"uid-1": 1}
+        yield tracker
+
+
+def test_watch_parse_documents():
+    events = [
+        {"type": "ADDED", "object": {"kind": "Node", "metadata": {"name": "a"}}},
+        {"type": "MODIFIED", "object": {"kind": "Node", "metadata": {"name": "a"}}},
+    ]
+    stdout = "".join(json.dumps(event, indent=4) + "\n" for event in events)
+    watch = ResourceWatch("node")
+    watch._read(Mock(stdout=io.StringIO(stdout)))
+    received = list(watch.events(timeout=0.1))
+    assert [(e[0], e[1]) for e in received] == [
+        (event["type"], event["object"]) for event in events
+    ]
+
+
+def test_tracker_timeline(tracker):
+    tracker.reset_issued(100)
+    for received, (event_type, resource) in enumerate(
+        [
+            node_event("compute-0", True),
+            node_event("compute-1", True),
+            reboot_event("compute-1", "uid-1"),
+            node_event("compute-0", False),
+            node_event("compute-1", False),
+            node_event("compute-0", True),
+            reboot_event("compute-0", "uid-0"),
+            node_event("compute-1", True),
+            reboot_event("compute-1", "uid-1", count=2),
+        ],
+        start=101,
+    ):
+        tracker._queue.put((event_type, resource, received))
+    tracker.wait(timeout=1)
+    assert tracker.get_durations() == {
+        "compute-0": {"not_ready": 4, "ready": 6, "reboot_event": 7},
+        "compute-1": {"not_ready": 5, "ready": 8, "reboot_event": 9},
+    }
+
+
+def test_tracker_reboot_event_not_found(tracker):
+    tracker.reset_issued()
+    for event in (
+        node_event("compute-0", True),
+        node_event("compute-1", True),
+        reboot_event("compute-0", "uid-0"),
+        reboot_event("compute-1", "uid-1"),
+    ):
+        tracker._queue.put(event + (0,))
+    with pytest.raises(RebootEventNotFoundException):
+        tracker.wait(timeout=0.1, event_timeout=0.1)
+    assert "reboot_event" in tracker.timeline["compute-0"]
@@ -0,0 +1,96 @@
+# -*- coding: utf8 -*-
+
+import json
+import subprocess
+import sys
+import textwrap
+from unittest.mock import patch
+
+import numpy as np
+
+from ocs_ci.ocs import pillowfight
+
+
+PILLOWFIGHT_LOG = textwrap.dedent(
+    """
+    Running. Press Ctrl-C to terminate...
+    OPS/SEC: 2500
+    OPS/SEC: 3100
+    [####################################################]
+    OPS/SEC: \x002800
+    [100 - 200 ]us |############# - 1000
+    [200 - 300 ]us |## - 200
+    [1 - 2 ]ms |# - 10
+    [5 - 10 ]ms | - 2
+    """
+)
+
+
+def test_parse_pillowfight_log():
+    pf = pillowfight.PillowFight.__new__(pillowfight.PillowFight)
+    pf.log_raw_output = False
+    data = pf.parse_pillowfight_log(PILLOWFIGHT_LOG)
+    np.testing.assert_array_equal(data["opspersec"], [2500, 3100, 2800])
+    assert data["resptimes"] == {
+        200: {"minindx": 100, "number": 1000},
+        300: {"minindx": 200, "number": 200},
+        2000: {"minindx": 1000, "number": 10},
+        10000: {"minindx": 5000, "number": 2},
+    }
+
+
+def test_parse_pillowfight_log_file(tmp_path):
+    log_file = tmp_path / "pillowfight-rbd-simple0.log"
+    log_file.write_text(PILLOWFIGHT_LOG)
+    pf = pillowfight.PillowFight.__new__(pillowfight.PillowFight)
+    pf.log_raw_output = False
+    assert min(pf.parse_pillowfight_log_file(str(log_file))["opspersec"]) == 2500
+
+
+def test_merge_resp_histograms():
+    parser = pillowfight.PillowFightLogParser()
+    for line in PILLOWFIGHT_LOG.splitlines():
+        parser.feed(line)
+    merged = pillowfight.merge_resp_histograms(
+        [parser.resp_hist, {200: {"minindx": 100, "number": 5}}]
+    )
+    assert merged[200]["number"] == 1005
+    assert list(merged) == [200, 300, 2000, 10000]
+    assert pillowfight.resp_time_percentile(merged, 50) == 200
+    assert pillowfight.resp_time_percentile(merged, 99) == 300
+    assert pillowfight.resp_time_percentile(merged, 99.5) == 2000
+    assert pillowfight.resp_time_percentile({}, 99) is None
+
+
+def test_export_pfoutput_to_googlesheet(tmp_path):
+    (tmp_path / "pillowfight-rbd-simple0.log").write_text(PILLOWFIGHT_LOG)
+    pf = pillowfight.PillowFight.__new__(pillowfight.PillowFight)
+    pf.log_raw_output = False
+    pf.logs = str(tmp_path)
+    with patch.object(pillowfight, "GoogleSpreadSheetAPI") as sheet_api, patch.object(
+        pillowfight, "utils"
+    ), patch.object(pillowfight, "log"):
+        pf.export_pfoutput_to_googlesheet("sheet", 0)
+    rows = [call.args[0] for call in sheet_api.return_value.insert_row.call_args_list]
+    assert rows[0] == ["pillowfight-rbd-simple0.log", 2500, 10.0]
+    # gspread sends the rows as JSON
+    json.dumps(rows)
+
+
+def test_cleanup_stops_log_streams(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    pf = pillowfight.PillowFight.__new__(pillowfight.PillowFight)
+    pf.logs = str(logs)
+    # stream of the pod which never completed
+    log_file = open(logs / "pillowfight-rbd-simple0.log", "w")
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"], stdout=log_file
+    )
+    pf.log_streams = {"pillowfight-rbd-simple0": (proc, log_file)}
+    with patch.object(pillowfight, "log"):
+        pf.cleanup()
+    assert proc.poll() is not None
+    assert log_file.closed
+    assert pf.log_streams == {}
+    assert not logs.exists()
@@ -0,0 +1,122 @@
+# -*- coding: utf8 -*-
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs import upgrade_monitor
+from ocs_ci.ocs.exceptions import CommandFailed, TimeoutException
+
+OLD_IMAGE = "quay.io/ocs/rook:old"
+NEW_IMAGE = "quay.io/ocs/rook:new"
+
+
+def pod(name, image, ready=True, app="rook-ceph-osd"):
+    return {
+        "kind": "Pod",
+        "metadata": {"name": name, "labels": {"app": app}},
+        "spec": {"containers": [{"name": "osd", "image": image}]},
+        "status": {
+            "phase": "Running",
+            "conditions": [{"type": "Ready", "status": str(ready)}],
+        },
+    }
+
+
+def deployment(name, ready_replicas):
+    return {
+        "kind": "Deployment",
+        "metadata": {"name": name},
+        "spec": {"replicas": 1},
+        "status": {"readyReplicas": ready_replicas},
+    }
+
+
+@pytest.fixture
+def monitor():
+    with patch.object(upgrade_monitor, "log"):
+        monitor = upgrade_monitor.UpgradeMonitor("openshift-storage")
+        monitor.started = 100
+        yield monitor
+
+
+def test_pods_upgraded(monitor):
+    monitor.process("ADDED", pod("osd-0", OLD_IMAGE), 100)
+    monitor.process("ADDED", pod("osd-1", OLD_IMAGE), 100)
+    assert not monitor.check_pods_upgraded({OLD_IMAGE}, "app=rook-ceph-osd", 2)
+
+    monitor.process("DELETED", pod("osd-0", OLD_IMAGE), 110)
+    monitor.process("ADDED", pod("osd-0-new", NEW_IMAGE, ready=False), 115)
+    monitor.process("MODIFIED", pod("osd-0-new", NEW_IMAGE), 130)
+    monitor.process("DELETED", pod("osd-1", OLD_IMAGE), 140)
+    monitor.process("ADDED", pod("osd-1-new", NEW_IMAGE), 150)
+    assert monitor.check_pods_upgraded({OLD_IMAGE}, "app=rook-ceph-osd", 2)
+    times = monitor.components["app=rook-ceph-osd"]
+    assert times["time_to_new_image"] == 15
+    assert times["time_to_ready"] == 50
+    # pods of other components are not counted
+    monitor.process("ADDED", pod("mon-a", NEW_IMAGE, app="rook-ceph-mon"), 160)
+    assert monitor.check_pods_upgraded({OLD_IMAGE}, "app=rook-ceph-osd", 2)
+
+
+def test_wait_for_pods_upgraded(monitor):
+    monitor._queue.put(("ADDED", pod("osd-0", NEW_IMAGE), 120))
+    monitor.wait_for_pods_upgraded({OLD_IMAGE}, "app=rook-ceph-osd", timeout=1)
+    with pytest.raises(TimeoutException):
+        monitor.wait_for_pods_upgraded(
+            {OLD_IMAGE}, "app=rook-ceph-osd", count=2, timeout=0.1
+        )
+
+
+def test_time_to_ready_after_wait(monitor):
+    monitor._queue.put(("ADDED", pod("osd-0", NEW_IMAGE, ready=False), 120))
+    monitor.wait_for_pods_upgraded({OLD_IMAGE}, "app=rook-ceph-osd", timeout=1)
+    assert monitor.components["app=rook-ceph-osd"]["time_to_ready"] is None
+    # the pod gets ready after the wait, before the monitor context ends
+    monitor._queue.put(("MODIFIED", pod("osd-0", NEW_IMAGE), 160))
+    report = monitor.to_dict()
+    assert report["components"]["app=rook-ceph-osd"]["time_to_ready"] == 60
+
+
+def test_wait_retries_failed_condition(monitor):
+    results = [CommandFailed("catalog is refreshing"), True]
+
+    def condition():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    # no events come, the failed check is repeated after the retry interval
+    with patch.object(upgrade_monitor, "CONDITION_RETRY_INTERVAL", 0.05):
+        monitor.wait(condition, timeout=5, kinds=[upgrade_monitor.CSV_KIND])
+    assert not results
+
+    def failing():
+        raise CommandFailed("catalog is refreshing")
+
+    with patch.object(upgrade_monitor, "CONDITION_RETRY_INTERVAL", 0.05):
+        with pytest.raises(TimeoutException):
+            monitor.wait(failing, timeout=0.2)
+
+
+def test_disruption_windows(monitor, tmp_path):
+    monitor.process("ADDED", deployment("rook-ceph-mgr-a", 1), 100)
+    monitor.process("MODIFIED", deployment("rook-ceph-mgr-a", 0), 110)
+    monitor.process("MODIFIED", deployment("rook-ceph-mon-a", 0), 115)
+    monitor.process("MODIFIED", deployment("rook-ceph-mgr-a", 1), 130)
+    monitor.process("MODIFIED", deployment("rook-ceph-mon-a", 1), 140)
+    monitor.process("MODIFIED", deployment("rook-ceph-mon-b", 0), 200)
+    monitor.process("MODIFIED", deployment("rook-ceph-mon-b", 1), 205)
+    assert monitor.get_total_disruption() == 35
+
+    report_path = str(tmp_path / "upgrade.json")
+    monitor.report(report_path)
+    with open(report_path) as report_file:
+        report = json.load(report_file)
+    assert [window["workload"] for window in report["disruption_windows"]] == [
+        "Deployment/rook-ceph-mgr-a",
+        "Deployment/rook-ceph-mon-a",
+        "Deployment/rook-ceph-mon-b",
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import Mock
+
+from ocs_ci.ocs.workload import WorkLoad, WorkLoadOrchestrator
+
+
+def test_orchestrator_shutdown_detaches_workloads():
+    pod_obj = Mock(wl_setup_done=True, wl_obj=WorkLoad(work_load="fio"))
+    orchestrator = WorkLoadOrchestrator(max_workers=2)
+    orchestrator.setup([pod_obj])
+    orchestrator.setup([pod_obj])
+    assert pod_obj.wl_obj.thread_exec is orchestrator.executor
+    assert pod_obj.wl_obj.start_event is orchestrator.start_event
+    orchestrator.start_event.set()
+
+    orchestrator.shutdown()
+    assert pod_obj.wl_obj.thread_exec is None
+    assert pod_obj.wl_obj.start_event is None
+    assert not orchestrator.start_event.is_set()
+    # the workload runs in its own executor again
+    pod_obj.wl_obj.work_load_mod = Mock()
+    pod_obj.wl_obj.work_load_mod.run.return_value = "done"
+    assert pod_obj.wl_obj.run().result(timeout=10) == "done"
@@ -0,0 +1,494 @@
+"""
+Monitor of OCS upgrade progress. CSVs, deployments, daemon sets and pods of
+the storage namespace are watched in one stream of events (see
+:py:mod:`ocs_ci.ocs.watch`) instead of polling them on fixed intervals, so
+the upgrade checks end as soon as the rollout is complete.
+
+The monitor records for every checked component (pod selector):
+
+    time_to_new_image: Time from the start of the monitor until the first
+        pod with upgraded images appeared
+    time_to_ready: Time from the start of the monitor until all the pods of
+        the component had upgraded images and were ready, the pods are
+        watched (and the time evaluated) till the monitor context ends
+
+and the disruption windows of every deployment and daemon set, the periods
+when some of their replicas were unavailable.
+
+Example::
+
+    with UpgradeMonitor(namespace) as monitor:
+        update_subscription(channel)
+        monitor.wait(upgrade_completed, timeout=725, kinds=[CSV_KIND])
+        monitor.wait_for_pods_upgraded(old_images, "app=rook-ceph-osd", count=3)
+
+The report of the progress is logged and stored to upgrade_progress.json in
+the log directory when the monitor context ends.
+
+"""
+import json
+import logging
+import os
+import queue
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import TimeoutException
+from ocs_ci.ocs.ocp import get_images
+from ocs_ci.ocs.watch import ResourceWatch
+
+log = logging.getLogger(__name__)
+
+UPGRADE_REPORT_FILE = "upgrade_progress.json"
+
+CSV_KIND = "ClusterServiceVersion"
+DEPLOYMENT_KIND = "Deployment"
+DAEMONSET_KIND = "DaemonSet"
+POD_KIND = "Pod"
+
+# how often the progress of a wait is logged
+PROGRESS_LOG_INTERVAL = 30
+# how long to wait before a check which raised an exception is repeated
+CONDITION_RETRY_INTERVAL = 10
+
+
+def parse_selector(selector):
+    """
+    Parse equality based label selector
+
+    Args:
+        selector (str): Label selector, e.g. app=rook-ceph-osd,ceph-osd-id=1
+
+    Returns:
+        dict: Labels required by the selector
+
+    """
+    labels = {}
+    for requirement in selector.split(","):
+        key, _, value = requirement.partition("=")
+        labels[key.strip()] = value.strip()
+    return labels
+
+
+def is_pod_ready(pod):
+    """
+    Args:
+        pod (dict): Pod resource
+
+    Returns:
+        bool: True if the pod is running and its Ready condition is true
+
+    """
+    status = pod.get("status", {})
+    if status.get("phase") != "Running":
+        return False
+    for condition in status.get("conditions", []):
+        if condition.get("type") == "Ready":
+            return condition.get("status") == "True"
+    return False
+
+
+def is_workload_disrupted(resource):
+    """
+    Args:
+        resource (dict): Deployment or DaemonSet resource
+
+    Returns:
+        bool: True if some of the replicas of the workload are unavailable
+
+    """
+    status = resource.get("status", {})
+    if resource.get("kind") == DAEMONSET_KIND:
+        return status.get("numberUnavailable", 0) > 0
+    replicas = resource.get("spec", {}).get("replicas", 1)
+    return (
+        status.get("unavailableReplicas", 0) > 0
+        or status.get("readyReplicas", 0) < replicas
+    )
+
+
+class UpgradeMonitor(object):
+    """
+    Watches CSVs, deployments, daemon sets and pods of the namespace during
+    the upgrade and keeps their latest state and the timeline of the rollout
+    """
+
+    def __init__(self, namespace):
+        """
+        Args:
+            namespace (str): Namespace of the storage cluster
+
+        """
+        self.namespace = namespace
+        self.started = None
+        # name -> phase
+        self.csvs = {}
+        # name -> record with the pod resource, first_seen and ready times
+        self.pods = {}
+        # "kind/name" -> start of the open disruption window
+        self._disrupted = {}
+        # list of (kind/name, start, end) of closed disruption windows
+        self.disruptions = []
+        # selector -> times of the component
+        self.components = {}
+        # selector -> (old images, count) of the last check of the component
+        self._upgrade_checks = {}
+        self._queue = queue.Queue()
+        self._watches = [
+            ResourceWatch(kind, namespace=namespace, events_queue=self._queue)
+            for kind in ("csv", "deployment", "daemonset", "pod")
+        ]
+
+    def start(self):
+        """
+        Start watching the resources
+        """
+        self.started = time.time()
+        for watch in self._watches:
+            watch.start()
+
+    def stop(self):
+        """
+        Stop watching the resources, the events received so far are processed
+        """
+        for watch in self._watches:
+            watch.stop()
+        self.process_pending()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        self.report()
+
+    def process(self, event_type, resource, received):
+        """
+        Update the state by the watch event
+
+        Args:
+            event_type (str): ADDED, MODIFIED or DELETED
+            resource (dict): The resource
+            received (float): Time when the event was received
+
+        Returns:
+            str: Kind of the resource
+
+        """
+        kind = resource.get("kind")
+        name = resource.get("metadata", {}).get("name")
+        deleted = event_type == "DELETED"
+        if kind == CSV_KIND:
+            if deleted:
+                self.csvs.pop(name, None)
+            else:
+                self.csvs[name] = resource.get("status", {}).get("phase")
+        elif kind == POD_KIND:
+            if deleted or resource["metadata"].get("deletionTimestamp"):
+                self.pods.pop(name, None)
+            else:
+                record = self.pods.setdefault(
+                    name, {"first_seen": received, "ready": None}
+                )
+                record["pod"] = resource
+                if record["ready"] is None and is_pod_ready(resource):
+                    record["ready"] = received
+        elif kind in (DEPLOYMENT_KIND, DAEMONSET_KIND):
+            key = f"{kind}/{name}"
+            disrupted = not deleted and is_workload_disrupted(resource)
+            if disrupted and key not in self._disrupted:
+                self._disrupted[key] = received
+            elif not disrupted and key in self._disrupted:
+                self.disruptions.append((key, self._disrupted.pop(key), received))
+        return kind
+
+    def process_pending(self):
+        """
+        Process all the events which are already received
+
+        Returns:
+            set: Kinds of the processed resources
+
+        """
+        kinds = set()
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                return kinds
+            kinds.add(self.process(*event))
+
+    def wait(self, condition, timeout, kinds=None, message=None):
+        """
+        Wait until the condition is met. The condition is checked at the start
+        and then whenever the watched resources of given kinds change.
+
+        Args:
+            condition (function): Function without arguments which returns True
+                when the wait is over
+            timeout (int): Time in seconds to wait
+            kinds (list): Kinds of the resources (e.g. CSV_KIND) whose changes
+                trigger the check, changes of all the resources if None
+            message (str): Description of the wait for the log and exception
+
+        Raises:
+            TimeoutException: In case the condition isn't met in time, the
+                exceptions raised by the condition are logged and the check
+                is repeated
+
+        """
+        message = message or f"condition {condition}"
+        log.info(f"Waiting for {message}")
+        self.process_pending()
+        done, failed = self._check(condition, message)
+        if done:
+            return
+        deadline = time.time() + timeout
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            # the check which raised an exception is repeated even if the
+            # watched resources don't change
+            if failed:
+                remaining = min(remaining, CONDITION_RETRY_INTERVAL)
+            try:
+                event = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                changed = set()
+            else:
+                changed = {self.process(*event)} | self.process_pending()
+            if failed or kinds is None or changed.intersection(kinds):
+                done, failed = self._check(condition, message)
+                if done:
+                    return
+        # the last check, the resources could change without any event of
+        # the watched kinds, e.g. after a restart of a watch
+        done, _ = self._check(condition, message)
+        if not done:
+            raise TimeoutException(f"Timeout {timeout} reached! Error: {message}")
+
+    @staticmethod
+    def _check(condition, message):
+        """
+        Check the condition, exceptions raised by the condition (e.g. failed
+        oc command) are logged and the condition is considered not met
+
+        Returns:
+            tuple: True if the condition is met, True if it raised exception
+
+        """
+        try:
+            return bool(condition()), False
+        except Exception as ex:
+            log.exception(f"Exception raised during check of {message}: {ex}")
+            return False, True
+
+    def get_csv_phases(self):
+        """
+        Returns:
+            dict: Phase of every CSV of the namespace
+
+        """
+        self.process_pending()
+        return dict(self.csvs)
+
+    def get_pods(self, selector):
+        """
+        Get records of the pods matching the selector
+
+        Args:
+            selector (str): Label selector, e.g. app=rook-ceph-osd
+
+        Returns:
+            list: Records with the pod resource, first_seen and ready times
+
+        """
+        labels = parse_selector(selector)
+        pods = []
+        for record in self.pods.values():
+            pod_labels = record["pod"]["metadata"].get("labels") or {}
+            if all(pod_labels.get(key) == value for key, value in labels.items()):
+                pods.append(record)
+        return pods
+
+    def check_pods_upgraded(self, old_images, selector, count=1):
+        """
+        Check that the expected number of pods of the component exist, none
+        of them has any old image and all of them have the same images. The
+        times of the component are updated.
+
+        Args:
+            old_images (set): Images before the upgrade
+            selector (str): Label selector of the component
+            count (int): Expected number of pods
+
+        Returns:
+            bool: True if the pods of the component are upgraded
+
+        """
+        self._upgrade_checks[selector] = (old_images, count)
+        pods = self.get_pods(selector)
+        times = self.components.setdefault(
+            selector, {"time_to_new_image": None, "time_to_ready": None}
+        )
+        upgraded = []
+        first_images = None
+        same_images = True
+        for record in pods:
+            images = get_images(record["pod"])
+            if set(images.values()) & old_images:
+                continue
+            upgraded.append(record)
+            if first_images is None:
+                first_images = images
+            elif images != first_images:
+                same_images = False
+        if upgraded and times["time_to_new_image"] is None:
+            first_new = min(record["first_seen"] for record in upgraded)
+            times["time_to_new_image"] = max(first_new - self.started, 0)
+        done = len(pods) == count and len(upgraded) == count and same_images
+        if (
+            done
+            and times["time_to_ready"] is None
+            and all(record["ready"] for record in upgraded)
+        ):
+            last_ready = max(record["ready"] for record in upgraded)
+            times["time_to_ready"] = max(last_ready - self.started, 0)
+        times["upgraded_pods"] = len(upgraded)
+        times["pods"] = len(pods)
+        return done
+
+    def wait_for_pods_upgraded(self, old_images, selector, count=1, timeout=720):
+        """
+        Wait until the pods of the component are upgraded, see
+        check_pods_upgraded
+
+        Args:
+            old_images (set): Images before the upgrade
+            selector (str): Label selector of the component
+            count (int): Expected number of pods
+            timeout (int): Time in seconds to wait
+
+        Raises:
+            TimeoutException: If the pods didn't get upgraded in time
+
+        """
+        last_log = [time.time()]
+
+        def upgraded():
+            done = self.check_pods_upgraded(old_images, selector, count)
+            if not done and time.time() - last_log[0] > PROGRESS_LOG_INTERVAL:
+                last_log[0] = time.time()
+                times = self.components[selector]
+                log.info(
+                    f"{times['upgraded_pods']} of {times['pods']} pod(s) with "
+                    f"selector {selector} upgraded, expected: {count}"
+                )
+            return done
+
+        self.wait(
+            upgraded,
+            timeout,
+            kinds=[POD_KIND],
+            message=f"{count} pods with selector: {selector} to be upgraded",
+        )
+        log.info(f"All {count} pod(s) with selector: {selector} are upgraded")
+
+    def get_disruption_windows(self):
+        """
+        Get the periods when some replicas of a deployment or a daemon set
+        were unavailable, the windows still open end now
+
+        Returns:
+            list: Tuples of kind/name of the workload, start and end time
+
+        """
+        self.process_pending()
+        now = time.time()
+        windows = list(self.disruptions)
+        windows.extend((key, start, now) for key, start in self._disrupted.items())
+        return sorted(windows, key=lambda window: window[1])
+
+    def get_total_disruption(self):
+        """
+        Get the time when at least one workload was disrupted, overlapping
+        windows of different workloads are counted once
+
+        Returns:
+            float: Time in seconds
+
+        """
+        total = 0
+        current_start = current_end = None
+        for _, start, end in self.get_disruption_windows():
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        if current_end is not None:
+            total += current_end - current_start
+        return total
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Report of the upgrade progress
+
+        """
+        windows = self.get_disruption_windows()
+        # the pods usually get ready after the wait for the upgraded images
+        # is over, so the times of the components are updated by the latest
+        # state of the pods
+        for selector, (old_images, count) in list(self._upgrade_checks.items()):
+            self.check_pods_upgraded(old_images, selector, count)
+        return {
+            "started": self.started,
+            "duration": time.time() - self.started if self.started else None,
+            "csvs": self.get_csv_phases(),
+            "components": self.components,
+            "disruption_windows": [
+                {"workload": key, "start": start, "duration": end - start}
+                for key, start, end in windows
+            ],
+            "total_disruption": self.get_total_disruption(),
+            "watch_restarts": sum(watch.restarts for watch in self._watches),
+        }
+
+    def report(self, path=None):
+        """
+        Log the report of the upgrade progress and store it to a JSON file
+
+        Args:
+            path (str): Path to the file, upgrade_progress.json in the log
+                directory if not provided
+
+        Returns:
+            dict: The report
+
+        """
+        report = self.to_dict()
+        lines = []
+        for selector, times in sorted(report["components"].items()):
+            lines.append(
+                f"{selector}: time to new image: {times['time_to_new_image']}, "
+                f"time to ready: {times['time_to_ready']}"
+            )
+        workloads = {window["workload"] for window in report["disruption_windows"]}
+        lines.append(
+            f"Disruption of {len(workloads)} workload(s), total: "
+            f"{report['total_disruption']:.1f}s"
+        )
+        log.info("Upgrade progress:\n" + "\n".join(lines))
+        if path is None:
+            log_dir = os.path.expanduser(config.RUN["log_dir"])
+            path = os.path.join(log_dir, UPGRADE_REPORT_FILE)
+        try:
+            with open(path, "w") as report_file:
+                json.dump(report, report_file, indent=2)
+        except OSError as ex:
+            log.error(f"Failed to store upgrade progress report: {ex}")
+        return report
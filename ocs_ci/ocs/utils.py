@@ -9,21 +9,15 @@ import traceback
 from subprocess import TimeoutExpired
 
 import yaml
-from gevent import sleep
 from libcloud.common.exceptions import BaseHTTPError
 from libcloud.common.types import LibcloudError
 from libcloud.compute.providers import get_driver
 from libcloud.compute.types import Provider
-from paramiko.ssh_exception import SSHException
 
 from ocs_ci.framework import config as ocsci_config
 from ocs_ci.ocs import constants, defaults
-from ocs_ci.ocs.external_ceph import RolesContainer, Ceph, CephNode
-from ocs_ci.ocs.clients import WinNode
 from ocs_ci.ocs.exceptions import CommandFailed, ExternalClusterDetailsException
 from ocs_ci.ocs.ocp import OCP
-from ocs_ci.ocs.openstack import CephVMNode
-from ocs_ci.ocs.parallel import parallel
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.utility import templating, version
 from ocs_ci.utility.prometheus import PrometheusAPI
@@ -35,6 +29,9 @@ log = logging.getLogger(__name__)
 
 
 def create_ceph_nodes(cluster_conf, inventory, osp_cred, run_id, instances_name=None):
+    from ocs_ci.ocs.external_ceph import RolesContainer
+    from ocs_ci.ocs.parallel import parallel
+
     osp_glbs = osp_cred.get("globals")
     os_cred = osp_glbs.get("openstack-credentials")
     params = dict()
@@ -104,6 +101,8 @@ def create_ceph_nodes(cluster_conf, inventory, osp_cred, run_id, instances_name=
 
 
 def setup_vm_node(node, ceph_nodes, **params):
+    from ocs_ci.ocs.openstack import CephVMNode
+
     ceph_nodes[node] = CephVMNode(**params)
 
 
@@ -130,6 +129,10 @@ def get_openstack_driver(yaml):
 
 
 def cleanup_ceph_nodes(osp_cred, pattern=None, timeout=300):
+    from gevent import sleep
+
+    from ocs_ci.ocs.parallel import parallel
+
     user = os.getlogin()
     name = pattern if pattern else "-{user}-".format(user=user)
     driver = get_openstack_driver(osp_cred)
@@ -229,6 +232,7 @@ def check_ceph_healthly(ceph_mon, num_osds, num_mons, mon_container=None, timeou
         int: returns 0 when ceph is in healthy state otherwise returns 1
 
     """
+    from gevent import sleep
 
     timeout = datetime.timedelta(seconds=timeout)
     starttime = datetime.datetime.now()
@@ -281,10 +285,14 @@ def check_ceph_healthly(ceph_mon, num_osds, num_mons, mon_container=None, timeou
 
 
 def generate_repo_file(base_url, repos):
+    from ocs_ci.ocs.external_ceph import Ceph
+
     return Ceph.generate_repository_file(base_url, repos)
 
 
 def get_iso_file_url(base_url):
+    from ocs_ci.ocs.external_ceph import Ceph
+
     return Ceph.get_iso_file_url(base_url)
 
 
@@ -377,6 +385,8 @@ def setup_deb_cdn_repo(node, build=None):
 
 
 def setup_cdn_repos(ceph_nodes, build=None):
+    from ocs_ci.ocs.parallel import parallel
+
     repos_13x = [
         "rhel-7-server-rhceph-1.3-mon-rpms",
         "rhel-7-server-rhceph-1.3-osd-rpms",
@@ -604,6 +614,9 @@ def get_public_network():
 
 @retry(LibcloudError, tries=5, delay=15)
 def create_nodes(conf, inventory, osp_cred, run_id, instances_name=None):
+    from ocs_ci.ocs.clients import WinNode
+    from ocs_ci.ocs.external_ceph import Ceph, CephNode
+
     log.info("Destroying existing osp instances")
     cleanup_ceph_nodes(osp_cred, instances_name)
     ceph_cluster_dict = {}
@@ -979,6 +992,8 @@ def collect_ocs_logs(dir_name, ocp=True, ocs=True, mcg=False, status_failure=Tru
             allows better naming for folders under logs directory
 
     """
+    from gevent import sleep
+
     if not (
         "KUBECONFIG" in os.environ
         or os.path.exists(os.path.expanduser("~/.kube/config"))
@@ -1133,6 +1148,8 @@ def get_cluster_object(external_rhcs_info):
         external_ceph.ceph object
 
     """
+    from ocs_ci.ocs.external_ceph import Ceph, CephNode
+
     # List of CephNode objects
     node_list = []
     for node, node_info in external_rhcs_info.items():
@@ -1205,6 +1222,8 @@ def reboot_node(ceph_node, timeout=300):
     Raises:
         SSHException: if not able to connect through ssh
     """
+    from paramiko.ssh_exception import SSHException
+
     ceph_node.exec_command(
         cmd="reboot",
         check_ec=False,
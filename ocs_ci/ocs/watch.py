@@ -0,0 +1,211 @@
+"""
+Streams of resource changes from 'oc get --watch', so waiting for changes of
+many resources doesn't need to poll every resource separately.
+
+Example::
+
+    with ResourceWatch(constants.NODE) as watch:
+        for event_type, node, received in watch.events(timeout=300):
+            ...
+
+Several watches can share one queue of events, so one consumer can follow
+changes of resources of different kinds in the order they came.
+
+"""
+import json
+import logging
+import os
+import queue
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.ocp import OCP
+
+log = logging.getLogger(__name__)
+
+# how long to wait before the watch command is started again when it ends
+WATCH_RESTART_DELAY = 3
+
+
+class ResourceWatch(object):
+    """
+    Watch of resources of one kind. Every event is a tuple of the event type
+    (ADDED, MODIFIED, DELETED), the resource dict and the time when the event
+    was received. The current resources are reported as ADDED events when the
+    watch starts, and again when the watch command ends (e.g. the API server
+    closes the watch) and is started again, so the consumers have to handle
+    repeated events.
+    """
+
+    def __init__(
+        self,
+        kind,
+        namespace=None,
+        all_namespaces=False,
+        selector=None,
+        field_selector=None,
+        events_queue=None,
+    ):
+        """
+        Args:
+            kind (str): Kind of the resources, e.g. node
+            namespace (str): Namespace of the resources
+            all_namespaces (bool): Watch the resources in all namespaces
+            selector (str): Label selector
+            field_selector (str): Field selector, e.g. reason=Rebooted
+            events_queue (queue.Queue): Queue to put the events to, it can be
+                shared with other watches, a new one if not provided
+
+        """
+        self.kind = kind
+        self.namespace = namespace
+        command = f"get {kind} --watch --output-watch-events -o json"
+        if all_namespaces and not namespace:
+            command += " -A"
+        if selector:
+            command += f" --selector={selector}"
+        if field_selector:
+            command += f" --field-selector={field_selector}"
+        self.command = command
+        self.restarts = 0
+        self.events_queue = events_queue or queue.Queue()
+        self._process = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """
+        Start the watch in the current cluster context
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._watch,
+            args=(config.cur_index,),
+            name=f"ResourceWatch-{self.kind}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the watch
+        """
+        self._stop_event.set()
+        process = self._process
+        if process and process.poll() is None:
+            process.terminate()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _start_process(self, stderr_file):
+        cmd = OCP(namespace=self.namespace).get_oc_cmd(self.command)
+        log.info(f"Starting watch: {cmd}")
+        env = None
+        kubeconfig = config.get_kubeconfig()
+        if kubeconfig and kubeconfig != os.getenv("KUBECONFIG"):
+            env = dict(os.environ, KUBECONFIG=kubeconfig)
+        return subprocess.Popen(
+            shlex.split(cmd),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            universal_newlines=True,
+            env=env,
+        )
+
+    def _watch(self, cluster_index):
+        with config.cluster_context(cluster_index):
+            while not self._stop_event.is_set():
+                # stderr is not read until the command ends, a pipe could
+                # fill up and block the command
+                with tempfile.TemporaryFile(mode="w+") as stderr_file:
+                    try:
+                        self._process = self._start_process(stderr_file)
+                    except OSError as ex:
+                        log.error(f"Failed to start watch of {self.kind}: {ex}")
+                        return
+                    self._read(self._process)
+                    self._process.wait()
+                    if self._stop_event.is_set():
+                        break
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read().strip()
+                log.info(
+                    f"Watch of {self.kind} ended with return code "
+                    f"{self._process.returncode} {stderr}, starting it again"
+                )
+                self.restarts += 1
+                self._stop_event.wait(WATCH_RESTART_DELAY)
+
+    def _read(self, process):
+        """
+        Parse the stream of JSON documents, each document is printed on
+        several lines and its closing brace is the only line not indented
+        """
+        buffer = []
+        for line in process.stdout:
+            buffer.append(line)
+            if line.rstrip() != "}":
+                continue
+            document = "".join(buffer)
+            buffer = []
+            try:
+                event = json.loads(document)
+            except ValueError:
+                log.warning(f"Failed to parse watch event of {self.kind}")
+                continue
+            self.events_queue.put(
+                (event.get("type"), event.get("object") or {}, time.time())
+            )
+
+    def events(self, timeout=None):
+        """
+        Generate the events of the queue as they come
+
+        Args:
+            timeout (float): Time in seconds after which the generator ends,
+                wait forever if None
+
+        Yields:
+            tuple: Event type, the resource dict and the time when the event
+                was received
+
+        """
+        return get_events(self.events_queue, timeout)
+
+
+def get_events(events_queue, timeout=None):
+    """
+    Generate events of the queue of resource watches as they come
+
+    Args:
+        events_queue (queue.Queue): Queue of the watches
+        timeout (float): Time in seconds after which the generator ends, wait
+            forever if None
+
+    Yields:
+        tuple: Event type, the resource dict and the time when the event was
+            received
+
+    """
+    deadline = None if timeout is None else time.time() + timeout
+    while True:
+        remaining = None if deadline is None else deadline - time.time()
+        if remaining is not None and remaining <= 0:
+            return
+        try:
+            yield events_queue.get(timeout=remaining)
+        except queue.Empty:
+            return
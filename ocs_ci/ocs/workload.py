@@ -1,14 +1,25 @@
 import logging
 import importlib
+import threading
+import time
 import concurrent.futures
 
+from ocs_ci.ocs import defaults
+
 
 log = logging.getLogger(__name__)
 
 
 class WorkLoad(object):
     def __init__(
-        self, name=None, path=None, work_load=None, storage_type="fs", pod=None, jobs=1
+        self,
+        name=None,
+        path=None,
+        work_load=None,
+        storage_type="fs",
+        pod=None,
+        jobs=1,
+        executor=None,
     ):
         """
         Args:
@@ -23,6 +34,9 @@ class WorkLoad(object):
                 if type is 'block' we will interpret 'path' as a block device
             pod (Pod): Pod on which we want to run this workload
             jobs (int): Number of jobs to execute FIO
+            executor (concurrent.futures.Executor): Executor shared with other
+                workloads (see WorkLoadOrchestrator), if not provided, a
+                dedicated single thread executor is created on the first run
         """
         self.name = name
         self.path = path
@@ -45,7 +59,10 @@ class WorkLoad(object):
             log.error(ex)
             raise
 
-        self.thread_exec = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.thread_exec = executor
+        # Optional threading.Event the submitted run waits for before it
+        # starts the IO, used for time aligned start of several workloads
+        self.start_event = None
 
     def setup(self, **setup_conf):
         """
@@ -82,6 +99,175 @@ class WorkLoad(object):
         conf["path"] = self.path
         conf["type"] = self.storage_type
         conf["numjobs"] = self.jobs
-        future_obj = self.thread_exec.submit(self.work_load_mod.run, **conf)
+        if self.thread_exec is None:
+            self.thread_exec = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        future_obj = self.thread_exec.submit(self._run, **conf)
         log.info("Done submitting..")
         return future_obj
+
+    def _run(self, **conf):
+        """
+        Wait for the start event (if any) and run the workload module
+
+        Args:
+            **conf (dict): Run configuration passed to work_load_mod.run()
+
+        Returns:
+            result of work_load_mod.run()
+        """
+        if self.start_event is not None:
+            self.start_event.wait()
+        return self.work_load_mod.run(**conf)
+
+
+class WorkLoadOrchestrator(object):
+    """
+    Run workload on many pods from one shared and bounded executor.
+
+    All the pods share the same thread pool (so the number of running rsh
+    processes is bounded by max_workers), the submitted jobs are held by a
+    start barrier until all of them are submitted and released together, and
+    the results are collected as the jobs finish. Workload module may provide
+    parse_results() and aggregate_results() functions which are used to
+    process the collected output (see ocs_ci.utility.workloads.fio).
+
+    Example::
+
+        orchestrator = WorkLoadOrchestrator()
+        orchestrator.run_io(pod_objs, storage_type="fs", size="1G")
+        report = orchestrator.get_results()
+
+    """
+
+    def __init__(
+        self, work_load="fio", max_workers=defaults.WORKLOAD_ORCHESTRATOR_MAX_WORKERS
+    ):
+        """
+        Args:
+            work_load (str): Name of the workload module, e.g. fio
+            max_workers (int): Maximum number of workloads running at once
+        """
+        self.work_load = work_load
+        self.work_load_mod = importlib.import_module(
+            f"ocs_ci.utility.workloads.{self.work_load}"
+        )
+        self.max_workers = max_workers
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{work_load}-orchestrator"
+        )
+        self.start_event = threading.Event()
+        self.futures = {}
+        self.start_time = None
+        self.results = {}
+        self.errors = {}
+        # [(WorkLoad, its own executor, its own start event)] of the
+        # workloads attached to the shared executor
+        self.attached = []
+
+    def setup(self, pod_objs, storage_type="fs", jobs=1):
+        """
+        Do the workload setup on all the pods in parallel
+
+        Args:
+            pod_objs (list): List of Pod objects
+            storage_type (str): 'fs' or 'block'
+            jobs (int): Number of jobs to execute FIO
+
+        """
+        setup_futures = [
+            self.executor.submit(
+                pod_obj.workload_setup, storage_type=storage_type, jobs=jobs
+            )
+            for pod_obj in pod_objs
+            if not pod_obj.wl_setup_done
+        ]
+        for future in concurrent.futures.as_completed(setup_futures):
+            future.result()
+        for pod_obj in pod_objs:
+            wl_obj = pod_obj.wl_obj
+            if wl_obj.thread_exec is self.executor:
+                continue
+            self.attached.append((wl_obj, wl_obj.thread_exec, wl_obj.start_event))
+            wl_obj.thread_exec = self.executor
+            wl_obj.start_event = self.start_event
+
+    def run_io(self, pod_objs, storage_type="fs", **kwargs):
+        """
+        Submit Pod.run_io() on all the pods and release them together
+
+        Args:
+            pod_objs (list): List of Pod objects
+            storage_type (str): 'fs' or 'block'
+            **kwargs: Parameters passed to Pod.run_io()
+
+        """
+        if len(pod_objs) > self.max_workers:
+            log.warning(
+                f"Running {self.work_load} on {len(pod_objs)} pods with only "
+                f"{self.max_workers} workers, the jobs will be started in waves"
+            )
+        self.start_event.clear()
+        self.setup(pod_objs, storage_type=storage_type, jobs=kwargs.get("jobs", 1))
+        for pod_obj in pod_objs:
+            pod_obj.run_io(storage_type=storage_type, **kwargs)
+            self.futures[pod_obj.fio_thread] = pod_obj
+        self.start_time = time.time()
+        log.info(
+            f"Starting {self.work_load} on {len(pod_objs)} pods at {self.start_time}"
+        )
+        self.start_event.set()
+
+    def get_results(self, timeout=None):
+        """
+        Collect the results of all submitted jobs as they finish and merge
+        them into one aggregated report
+
+        Args:
+            timeout (int): Time in seconds to wait for all the jobs
+
+        Returns:
+            dict: The aggregated report, the output of aggregate_results() of
+                the workload module (if implemented), or dictionary of all
+                the results per pod name
+
+        """
+        parse_results = getattr(self.work_load_mod, "parse_results", None)
+        for future in concurrent.futures.as_completed(self.futures, timeout=timeout):
+            pod_obj = self.futures[future]
+            try:
+                output = future.result()
+                result = parse_results(output) if parse_results else output
+                self.results[pod_obj.name] = result
+                log.info(
+                    f"{self.work_load} finished on pod {pod_obj.name} after "
+                    f"{time.time() - self.start_time:.1f} seconds"
+                )
+            except Exception as ex:
+                log.error(f"{self.work_load} failed on pod {pod_obj.name}: {ex}")
+                self.errors[pod_obj.name] = ex
+        self.futures = {}
+
+        aggregate_results = getattr(self.work_load_mod, "aggregate_results", None)
+        if not aggregate_results:
+            return self.results
+        report = aggregate_results(list(self.results.values()))
+        report["failed_pods"] = list(self.errors)
+        log.info(f"Aggregated {self.work_load} report: {report}")
+        return report
+
+    def shutdown(self, wait=True):
+        """
+        Shutdown the shared executor and detach the workloads of the pods
+        from it, so the next Pod.run_io() runs in their own executor again
+
+        Args:
+            wait (bool): Wait for all the running jobs to finish
+
+        """
+        self.executor.shutdown(wait=wait)
+        for wl_obj, thread_exec, start_event in self.attached:
+            if wl_obj.thread_exec is self.executor:
+                wl_obj.thread_exec = thread_exec
+                wl_obj.start_event = start_event
+        self.attached = []
+        self.start_event.clear()
@@ -0,0 +1,79 @@
+# -*- coding: utf8 -*-
+"""
+Startup benchmark of run-ci entrypoint based on ``python -X importtime``.
+It checks that the slow optional dependencies (cloud SDKs, UI, ...) are not
+imported on startup, they should be imported only in the functions which
+use them.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# top level packages which must not be imported by ocs_ci.framework.main
+LAZY_PACKAGES = [
+    "azure",
+    "boto3",
+    "botocore",
+    "bs4",
+    "elasticsearch",
+    "gevent",
+    "git",
+    "google",
+    "hcl2",
+    "ibm_cloud_sdk_core",
+    "kubernetes",
+    "paramiko",
+    "pexpect",
+    "pyVmomi",
+    "scipy",
+    "selenium",
+]
+
+
+def get_import_times(module):
+    """
+    Import the module in a new interpreter and get import times of all the
+    modules it imports.
+
+    Args:
+        module (str): Name of the module to import
+
+    Returns:
+        dict: {module name: cumulative import time in microseconds}
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.fixture(scope="module")
+def main_import_times():
+    return get_import_times("ocs_ci.framework.main")
+
+
+def test_main_import_time(main_import_times):
+    slowest = sorted(main_import_times.items(), key=lambda item: -item[1])[:10]
+    print("Slowest imports of ocs_ci.framework.main (us):")
+    for name, cumulative in slowest:
+        print(f"{cumulative:>10} {name}")
+    assert "ocs_ci.framework.main" in main_import_times
+
+
+@pytest.mark.parametrize("package", LAZY_PACKAGES)
+def test_main_lazy_imports(main_import_times, package):
+    assert package not in main_import_times, (
+        f"{package} is imported on startup of run-ci, import it in the "
+        "function which uses it"
+    )
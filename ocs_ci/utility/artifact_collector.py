@@ -0,0 +1,209 @@
+"""
+Background collection of artifacts of failed tests (OCS logs, Prometheus
+metrics, performance stats, ...), so the next test doesn't have to wait for
+must-gather and other collectors of the failed one.
+
+The collectors run in session wide daemon worker threads with a bounded
+number of pending tasks. Each task runs in the cluster context which was
+active when the test failed and it's recorded (with nodeid of the test and
+the time of failure) in a manifest which is written when the collector is
+drained at the end of the session. Collectors which don't finish within the
+drain timeout are abandoned: the worker threads are daemons, so they don't
+block the exit of the interpreter (commands started by them, e.g. oc adm
+must-gather, aren't killed though). The collectors of a test which can't get
+a free slot within the submit timeout are skipped.
+
+Example::
+
+    artifact_collector.submit(
+        "ocs_logs", collect_ocs_logs, nodeid=item.nodeid, dir_name=item.name
+    )
+    ...
+    artifact_collector.drain(timeout=3600)
+
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+
+from ocs_ci.framework import config
+
+log = logging.getLogger(__name__)
+
+
+class ArtifactCollector(object):
+    """
+    Session wide pool of background artifact collectors
+    """
+
+    def __init__(self):
+        self._queue = None
+        self._workers = []
+        self._slots = None
+        self._lock = threading.Lock()
+        # [(record, future)] of all submitted collectors
+        self.tasks = []
+        # number of the tasks already waited for by drain
+        self._drained = 0
+
+    @property
+    def max_workers(self):
+        """
+        int: Number of collectors running in parallel, 0 means synchronous
+            collection
+        """
+        return config.RUN.get("failure_artifacts_workers") or 0
+
+    def _get_queue(self):
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue()
+                self._slots = threading.BoundedSemaphore(
+                    config.RUN.get("failure_artifacts_queue_size") or self.max_workers
+                )
+                # daemon threads (unlike ThreadPoolExecutor workers) don't
+                # block the exit of the interpreter when a collector hangs
+                self._workers = [
+                    threading.Thread(
+                        target=self._work,
+                        args=(self._queue,),
+                        name=f"ArtifactCollector_{index}",
+                        daemon=True,
+                    )
+                    for index in range(self.max_workers)
+                ]
+                for worker in self._workers:
+                    worker.start()
+            return self._queue
+
+    def _work(self, tasks_queue):
+        while True:
+            task = tasks_queue.get()
+            if task is None:
+                return
+            future, slots, record, func, args, kwargs, cluster_index = task
+            if not future.set_running_or_notify_cancel():
+                slots.release()
+                continue
+            self._run(record, func, args, kwargs, cluster_index, slots)
+            future.set_result(None)
+
+    def _run(self, record, func, args, kwargs, cluster_index, slots=None):
+        record["started"] = time.time()
+        try:
+            with config.cluster_context(cluster_index):
+                func(*args, **kwargs)
+            record["status"] = "done"
+        except Exception as ex:
+            record["status"] = f"failed: {ex}"
+            log.exception(f"Failed to collect {record['name']} for {record['nodeid']}")
+        finally:
+            record["finished"] = time.time()
+            # the slot is released to the semaphore it was taken from, the
+            # queue (and semaphore) is replaced when the collector is drained
+            if slots is not None:
+                slots.release()
+
+    def submit(self, name, func, *args, nodeid=None, **kwargs):
+        """
+        Run the collector in background. If there are too many pending
+        collectors, wait for a free slot first, the collector is skipped when
+        there isn't any within RUN['failure_artifacts_submit_timeout'].
+
+        Args:
+            name (str): Name of the artifact, e.g. ocs_logs
+            func (function): Collector, called as func(*args, **kwargs)
+            nodeid (str): Node ID of the failed test
+
+        """
+        record = {
+            "name": name,
+            "nodeid": nodeid,
+            "failed_at": time.time(),
+            "status": "pending",
+            "async": bool(self.max_workers),
+        }
+        cluster_index = config.cur_index
+        if not self.max_workers:
+            self.tasks.append((record, None))
+            self._run(record, func, args, kwargs, cluster_index)
+            return
+        tasks_queue = self._get_queue()
+        slots = self._slots
+        timeout = config.RUN.get("failure_artifacts_submit_timeout")
+        if not slots.acquire(timeout=timeout):
+            record["status"] = "skipped"
+            self.tasks.append((record, None))
+            log.warning(
+                f"Collection of {name} for {nodeid} skipped, no background "
+                f"collector finished in {timeout} seconds"
+            )
+            return
+        log.info(f"Collecting {name} for {nodeid} in background")
+        future = Future()
+        tasks_queue.put((future, slots, record, func, args, kwargs, cluster_index))
+        self.tasks.append((record, future))
+
+    def drain(self, timeout=None):
+        """
+        Wait for the collectors submitted since the last drain and write the
+        manifest of all the artifacts. The collectors which didn't finish in
+        time are abandoned, they keep running in daemon threads till the exit
+        of the interpreter.
+
+        Args:
+            timeout (int): Time in seconds to wait for the collectors
+
+        Returns:
+            list: Records of the collectors which didn't finish in time
+
+        """
+        tasks = self.tasks[self._drained :]
+        self._drained = len(self.tasks)
+        futures = [future for _, future in tasks if future]
+        if futures:
+            log.info(f"Waiting for {len(futures)} background artifact collectors")
+            _, not_done = wait(futures, timeout=timeout)
+        else:
+            not_done = set()
+        for future in not_done:
+            future.cancel()
+        if self._queue is not None:
+            # idle workers end, the hung ones are left behind
+            for _ in self._workers:
+                self._queue.put(None)
+            self._queue = None
+            self._workers = []
+        pending = [record for record, future in tasks if future in not_done]
+        for record in pending:
+            record["status"] = "abandoned" if "started" in record else "cancelled"
+            log.warning(
+                f"Collection of {record['name']} for {record['nodeid']} didn't "
+                f"finish in {timeout} seconds, it's {record['status']} (running "
+                f"collector is left in daemon thread which doesn't block exit)"
+            )
+        if self.tasks:
+            self.write_manifest()
+        return pending
+
+    def write_manifest(self):
+        """
+        Write records of all the collectors to artifacts.json in the directory
+        with logs of failed tests
+        """
+        manifest = os.path.join(
+            os.path.expanduser(config.RUN["log_dir"]),
+            f"failed_testcase_ocs_logs_{config.RUN['run_id']}",
+            "artifacts.json",
+        )
+        os.makedirs(os.path.dirname(manifest), exist_ok=True)
+        with open(manifest, "w") as fd:
+            json.dump([record for record, _ in self.tasks], fd, indent=2)
+        log.info(f"Manifest of failed tests artifacts written to {manifest}")
+
+
+artifact_collector = ArtifactCollector()
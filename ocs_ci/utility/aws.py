@@ -1,10 +1,14 @@
+import copy
+import json
 import os
 import logging
+import threading
 import time
 import boto3
 import random
 import traceback
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from botocore.exceptions import ClientError, NoCredentialsError
 
@@ -12,7 +16,6 @@ from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import get_infra_id
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants, defaults, exceptions
-from ocs_ci.ocs.parallel import parallel
 from ocs_ci.utility.templating import load_yaml
 from tempfile import NamedTemporaryFile
 
@@ -50,6 +53,9 @@ class AWS(object):
             region_name (str): Name of AWS region (default: us-east-2)
         """
         self._region_name = region_name or config.ENV_DATA["region"]
+        # (operation, arguments) -> (time, result) of recent describe calls
+        self._describe_cache = {}
+        self._describe_cache_lock = threading.Lock()
 
     @property
     def ec2_client(self):
@@ -127,6 +133,159 @@ class AWS(object):
             )
         return self._elb_client
 
+    def describe(self, operation, result_key, max_age=None, **kwargs):
+        """
+        Call an EC2 describe operation with a paginator, the results of all
+        pages are joined. The result is cached for a short time, so several
+        helpers working with the same instances or volumes share one call.
+
+        Args:
+            operation (str): The describe operation, e.g. describe_volumes
+            result_key (str): Key of the results in the responses, e.g.
+                Volumes
+            max_age (float): Maximal age in seconds of a cached result to use,
+                AWS_DESCRIBE_CACHE_TTL if not provided, 0 to not use the cache
+            kwargs: Arguments of the operation, e.g. Filters
+
+        Returns:
+            list: The results, copies of the cached ones
+
+        """
+        max_age = defaults.AWS_DESCRIBE_CACHE_TTL if max_age is None else max_age
+        key = (operation, json.dumps(kwargs, sort_keys=True))
+        with self._describe_cache_lock:
+            cached = self._describe_cache.get(key)
+        if cached is None or time.time() - cached[0] > max_age:
+            paginator = self.ec2_client.get_paginator(operation)
+            results = []
+            for page in paginator.paginate(**kwargs):
+                results.extend(page.get(result_key, []))
+            cached = (time.time(), results)
+            with self._describe_cache_lock:
+                self._describe_cache[key] = cached
+        return copy.deepcopy(cached[1])
+
+    def invalidate_describe_cache(self):
+        """
+        Drop the cached describe results, called after the state of instances
+        or volumes is changed
+        """
+        with self._describe_cache_lock:
+            self._describe_cache = {}
+
+    def describe_instances(self, instance_ids=None, filters=None, max_age=None):
+        """
+        Describe EC2 instances in few paginated calls
+
+        Args:
+            instance_ids (list): IDs of the instances, all if not provided
+            filters (list): Filters of the instances
+            max_age (float): Maximal age of a cached result, see describe()
+
+        Returns:
+            list: Instance dictionaries
+
+        """
+        kwargs = {}
+        if instance_ids:
+            kwargs["InstanceIds"] = sorted(instance_ids)
+        if filters:
+            kwargs["Filters"] = filters
+        reservations = self.describe(
+            "describe_instances", "Reservations", max_age=max_age, **kwargs
+        )
+        return [
+            instance
+            for reservation in reservations
+            for instance in reservation["Instances"]
+        ]
+
+    def describe_volumes(self, volume_ids=None, filters=None, max_age=None):
+        """
+        Describe EBS volumes in few paginated calls
+
+        Args:
+            volume_ids (list): IDs of the volumes, all if not provided
+            filters (list): Filters of the volumes
+            max_age (float): Maximal age of a cached result, see describe()
+
+        Returns:
+            list: Volume dictionaries
+
+        """
+        kwargs = {}
+        if volume_ids:
+            kwargs["VolumeIds"] = sorted(volume_ids)
+        if filters:
+            kwargs["Filters"] = filters
+        return self.describe("describe_volumes", "Volumes", max_age=max_age, **kwargs)
+
+    def get_instances_status(self, instance_ids, max_age=0):
+        """
+        Get status of several instances in one call
+
+        Args:
+            instance_ids (list): IDs of the instances
+            max_age (float): Maximal age of a cached result, see describe()
+
+        Returns:
+            dict: The instance IDs and their status codes
+
+        """
+        return {
+            instance["InstanceId"]: instance["State"]["Code"]
+            for instance in self.describe_instances(instance_ids, max_age=max_age)
+        }
+
+    def wait_for_instances(self, instance_ids, waiter_name):
+        """
+        Wait for several instances with one multi instance waiter
+
+        Args:
+            instance_ids (list): IDs of the instances
+            waiter_name (str): Name of the EC2 waiter, e.g. instance_stopped
+
+        """
+        self.ec2_client.get_waiter(waiter_name).wait(InstanceIds=list(instance_ids))
+        self.invalidate_describe_cache()
+
+    def wait_for_volumes_state(self, volume_ids, state, timeout=120, sleep=1):
+        """
+        Wait for several volumes to reach the state, all of them are checked
+        by one describe call per iteration
+
+        Args:
+            volume_ids (list): IDs of the volumes
+            state (str): The volume state, e.g. available
+            timeout (int): Timeout in seconds
+            sleep (int): Time in seconds between the checks
+
+        Raises:
+            AWSTimeoutException: If some of the volumes don't reach the state
+                in time
+
+        """
+        deadline = time.time() + timeout
+        while True:
+            states = {
+                volume["VolumeId"]: volume["State"]
+                for volume in self.describe_volumes(volume_ids, max_age=0)
+            }
+            logger.debug("Volumes status: %s", states)
+            not_in_state = {
+                volume_id: volume_state
+                for volume_id, volume_state in states.items()
+                if volume_state != state
+            }
+            if not not_in_state:
+                return
+            if time.time() > deadline:
+                raise AWSTimeoutException(
+                    f"Reached timeout {timeout}s for volumes to reach state "
+                    f"{state}, volumes state: {not_in_state}"
+                )
+            time.sleep(sleep)
+
     def get_ec2_instance(self, instance_id):
         """
         Get instance of ec2 Instance
@@ -164,14 +323,16 @@ class AWS(object):
             else:
                 pattern = "*"
 
-        instances_response = self.ec2_client.describe_instances(
+        instances_response = self.describe(
+            "describe_instances",
+            "Reservations",
             Filters=[
                 {
                     "Name": "tag:Name",
                     "Values": [pattern],
                 },
             ],
-        )["Reservations"]
+        )
 
         return instances_response
 
@@ -199,8 +360,12 @@ class AWS(object):
             pattern=pattern
         )
         instances = []
-        for instance in instances_response:
-            instance = instance["Instances"][0]
+        all_instances = [
+            instance
+            for reservation in instances_response
+            for instance in reservation["Instances"]
+        ]
+        for instance in all_instances:
             id = instance["InstanceId"]
             avz = instance["Placement"]["AvailabilityZone"]
             name = None
@@ -229,15 +394,7 @@ class AWS(object):
         Returns:
             str: The instance status
         """
-        return (
-            self.ec2_client.describe_instances(
-                InstanceIds=[instance_id],
-            )
-            .get("Reservations")[0]
-            .get("Instances")[0]
-            .get("State")
-            .get("Code")
-        )
+        return self.get_instances_status([instance_id])[instance_id]
 
     def get_vpc_id_by_instance_id(self, instance_id):
         """
@@ -313,20 +470,11 @@ class AWS(object):
             ],
         )
         logger.debug("Response of volume creation: %s", volume_response)
-        volume = self.ec2_resource.Volume(volume_response["VolumeId"])
-        for x in range(timeout):
-            volume.reload()
-            logger.debug("Volume id: %s has status: %s", volume.volume_id, volume.state)
-            if volume.state == "available":
-                break
-            if x == timeout - 1:
-                raise AWSTimeoutException(
-                    f"Reached timeout {timeout} for volume creation, volume "
-                    f"state is still: {volume.state} for volume ID: "
-                    f"{volume.volume_id}"
-                )
-            time.sleep(1)
-        return volume
+        self.invalidate_describe_cache()
+        self.wait_for_volumes_state(
+            [volume_response["VolumeId"]], "available", timeout=timeout
+        )
+        return self.ec2_resource.Volume(volume_response["VolumeId"])
 
     def attach_volume(self, volume, instance_id, device="/dev/sdx"):
         """
@@ -344,6 +492,7 @@ class AWS(object):
             InstanceId=instance_id,
         )
         logger.debug("Response of attaching volume: %s", attach_response)
+        self.invalidate_describe_cache()
 
     def create_volume_and_attach(
         self,
@@ -387,8 +536,8 @@ class AWS(object):
         Returns:
             list: Volume information like id and attachments
         """
-        volumes_response = self.ec2_client.describe_volumes(
-            Filters=[
+        volumes_response = self.describe_volumes(
+            filters=[
                 {
                     "Name": "tag:Name",
                     "Values": [pattern],
@@ -396,7 +545,7 @@ class AWS(object):
             ],
         )
         volumes = []
-        for volume in volumes_response["Volumes"]:
+        for volume in volumes_response:
             volumes.append(
                 dict(
                     id=volume["VolumeId"],
@@ -430,18 +579,8 @@ class AWS(object):
                 Force=True,
             )
             logger.debug("Detach response: %s", response_detach)
-        for x in range(timeout):
-            volume.reload()
-            logger.debug("Volume id: %s has status: %s", volume.volume_id, volume.state)
-            if volume.state == "available":
-                break
-            if x == timeout - 1:
-                raise AWSTimeoutException(
-                    f"Reached timeout {timeout}s for volume detach/delete for "
-                    f"volume ID: {volume.volume_id}, Volume state: "
-                    f"{volume.state}"
-                )
-            time.sleep(1)
+            self.invalidate_describe_cache()
+        self.wait_for_volumes_state([volume.volume_id], "available", timeout=timeout)
 
     def delete_volume(self, volume):
         """
@@ -456,6 +595,7 @@ class AWS(object):
         logger.debug(
             "Delete response for volume: %s is: %s", volume.volume_id, delete_response
         )
+        self.invalidate_describe_cache()
 
     def get_cluster_subnet_ids(self, cluster_name):
         """
@@ -510,13 +650,12 @@ class AWS(object):
                 f"Instance {instance.get('InstanceId')} status "
                 f"is {instance.get('CurrentState').get('Code')}"
             )
+        self.invalidate_describe_cache()
         if wait:
-            for instance_id, instance_name in instances.items():
-                logger.info(
-                    f"Waiting for instance {instance_name} to reach status stopped"
-                )
-                instance = self.get_ec2_instance(instance_id)
-                instance.wait_until_stopped()
+            logger.info(
+                f"Waiting for instances {instance_names} to reach status stopped"
+            )
+            self.wait_for_instances(instance_ids, "instance_stopped")
 
     def start_ec2_instances(self, instances, wait=False):
         """
@@ -540,13 +679,12 @@ class AWS(object):
                 f"Instance {instance.get('InstanceId')} status "
                 f"is {instance.get('CurrentState').get('Code')}"
             )
+        self.invalidate_describe_cache()
         if wait:
-            for instance_id, instance_name in instances.items():
-                logger.info(
-                    f"Waiting for instance {instance_name} to reach status running"
-                )
-                instance = self.get_ec2_instance(instance_id)
-                instance.wait_until_running()
+            logger.info(
+                f"Waiting for instances {instance_names} to reach status running"
+            )
+            self.wait_for_instances(instance_ids, "instance_running")
 
     def restart_ec2_instances_by_stop_and_start(
         self, instances, wait=False, force=True
@@ -577,6 +715,7 @@ class AWS(object):
         instance_ids, instance_names = zip(*instances.items())
         logger.info(f"Rebooting instances {instance_names}")
         self.ec2_client.reboot_instances(InstanceIds=instance_ids)
+        self.invalidate_describe_cache()
 
     def terminate_ec2_instances(self, instances, wait=True):
         """
@@ -600,14 +739,12 @@ class AWS(object):
                 f"Instance {instance.get('InstanceId')} status "
                 f"is {instance.get('CurrentState').get('Code')}"
             )
+        self.invalidate_describe_cache()
         if wait:
-            for instance_id, instance_name in instances.items():
-                logger.info(
-                    f"Waiting for instance {instance_name} to reach status "
-                    f"terminated"
-                )
-                instance = self.get_ec2_instance(instance_id)
-                instance.wait_until_terminated()
+            logger.info(
+                f"Waiting for instances {instance_names} to reach status terminated"
+            )
+            self.wait_for_instances(instance_ids, "instance_terminated")
 
     def get_ec2_instance_volumes(self, instance_id):
         """
@@ -1642,16 +1779,13 @@ def get_instances_ids_and_names(instances):
         dict: The ID keys and the name values of the instances
 
     """
-    return {
-        "i-"
-        + instance.get()
-        .get("spec")
-        .get("providerID")
-        .partition("i-")[-1]: instance.get()
-        .get("metadata")
-        .get("name")
-        for instance in instances
-    }
+    instances_ids_and_names = {}
+    for instance in instances:
+        # the node data are loaded already, provider ID and name don't change
+        data = instance.data if instance.data.get("spec") else instance.get()
+        instance_id = "i-" + data["spec"]["providerID"].partition("i-")[-1]
+        instances_ids_and_names[instance_id] = data["metadata"]["name"]
+    return instances_ids_and_names
 
 
 def get_data_volumes(deviceset_pvs):
@@ -1667,16 +1801,23 @@ def get_data_volumes(deviceset_pvs):
     """
     aws = AWS()
 
-    volume_ids = [
-        "vol-"
-        + pv.get()
-        .get("spec")
-        .get("awsElasticBlockStore")
-        .get("volumeID")
-        .partition("vol-")[-1]
-        for pv in deviceset_pvs
+    volume_ids = []
+    for pv in deviceset_pvs:
+        data = pv.data if pv.data.get("spec") else pv.get()
+        volume_id = data["spec"]["awsElasticBlockStore"]["volumeID"]
+        volume_ids.append("vol-" + volume_id.partition("vol-")[-1])
+    try:
+        # one describe call loads data of all the volumes
+        volumes = {
+            volume.volume_id: volume
+            for volume in aws.ec2_resource.volumes.filter(VolumeIds=volume_ids)
+        }
+    except ClientError as ex:
+        logger.warning(f"Failed to describe volumes {volume_ids}: {ex}")
+        volumes = {}
+    return [
+        volumes.get(vol_id) or aws.ec2_resource.Volume(vol_id) for vol_id in volume_ids
     ]
-    return [aws.ec2_resource.Volume(vol_id) for vol_id in volume_ids]
 
 
 def get_vpc_id_by_node_obj(aws_obj, instances):
@@ -1714,11 +1855,11 @@ def get_rhel_worker_instances(cluster_path):
     worker_pattern = get_infra_id(cluster_path) + "*rhel-worker*"
     worker_filter = [{"Name": "tag:Name", "Values": [worker_pattern]}]
 
-    response = aws.ec2_client.describe_instances(Filters=worker_filter)
-    if not response["Reservations"]:
+    instances = aws.describe_instances(filters=worker_filter, max_age=0)
+    if not instances:
         return
-    for worker in response["Reservations"]:
-        rhel_workers.append(worker["Instances"][0]["InstanceId"])
+    for worker in instances:
+        rhel_workers.append(worker["InstanceId"])
     return rhel_workers
 
 
@@ -1773,16 +1914,37 @@ def destroy_volumes(cluster_name):
         logger.debug(f"Finding volumes with pattern: {volume_pattern}")
         volumes = aws.get_volumes_by_name_pattern(volume_pattern)
         logger.debug(f"Found volumes: \n {volumes}")
-        for volume in volumes:
-            # skip root devices for deletion
-            # EBS root device volumes are automatically deleted when
-            # the instance terminates
-            if not check_root_volume(volume):
-                aws.detach_and_delete_volume(aws.ec2_resource.Volume(volume["id"]))
+        # skip root devices for deletion
+        # EBS root device volumes are automatically deleted when
+        # the instance terminates
+        volume_ids = [
+            volume["id"] for volume in volumes if not check_root_volume(volume)
+        ]
+        with ThreadPoolExecutor(max_workers=defaults.AWS_MAX_WORKERS) as executor:
+            for future in [
+                executor.submit(detach_and_delete_volume_by_id, volume_id)
+                for volume_id in volume_ids
+            ]:
+                future.result()
     except Exception:
         logger.error(traceback.format_exc())
 
 
+def detach_and_delete_volume_by_id(volume_id, region_name=None):
+    """
+    Detach volume if attached and then delete it from AWS. Boto3 resources
+    are not thread safe, so every call uses its own AWS object and it can run
+    concurrently with other calls.
+
+    Args:
+        volume_id (str): ID of the volume
+        region_name (str): Name of AWS region
+
+    """
+    aws = AWS(region_name)
+    aws.detach_and_delete_volume(aws.ec2_resource.Volume(volume_id))
+
+
 def check_root_volume(volume):
     """
     Checks whether given EBS volume is root device or not
@@ -1905,16 +2067,23 @@ def create_and_attach_ebs_volumes(
     region = config.ENV_DATA["region"]
     aws = AWS(region)
     worker_instances = aws.get_instances_by_name_pattern(worker_pattern)
-    with parallel() as p:
+
+    def create_volume_and_attach(worker):
+        # boto3 resources are not thread safe, every worker uses its own
+        AWS(region).create_volume_and_attach(
+            availability_zone=worker["avz"],
+            instance_id=worker["id"],
+            name=f"{worker['name']}_extra_volume",
+            size=size,
+        )
+
+    with ThreadPoolExecutor(max_workers=defaults.AWS_MAX_WORKERS) as executor:
+        futures = []
         for worker in worker_instances:
             logger.info(f"Creating and attaching {size} GB volume to {worker['name']}")
-            p.spawn(
-                aws.create_volume_and_attach,
-                availability_zone=worker["avz"],
-                instance_id=worker["id"],
-                name=f"{worker['name']}_extra_volume",
-                size=size,
-            )
+            futures.append(executor.submit(create_volume_and_attach, worker))
+        for future in futures:
+            future.result()
 
 
 def create_and_attach_volume_for_all_workers(device_size=None, worker_suffix="worker"):
@@ -0,0 +1,264 @@
+"""
+Measurement of the framework's own overhead, used by the benchmark suite in
+the benchmarks directory of the repository.
+
+Every benchmark runs a function several rounds and keeps the statistics of
+the durations. The results of a run are stored per commit and per machine,
+so the runs of different commits on the same machine can be compared and
+performance regressions of the hot paths are visible.
+
+Example::
+
+    session = BenchmarkSession()
+    session.run("load_yaml", templating.load_yaml, path, rounds=10)
+    session.save(".benchmarks")
+    baseline = load_baseline(".benchmarks", exclude_commit=session.commit)
+    regressions = session.compare(baseline, tolerance=0.2)
+
+"""
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+log = logging.getLogger(__name__)
+
+DEFAULT_ROUNDS = 5
+DEFAULT_TOLERANCE = 0.2
+
+
+def get_commit(path=None):
+    """
+    Get the abbreviated hash of the current commit of the repository
+
+    Args:
+        path (str): Path inside the repository, the current directory if None
+
+    Returns:
+        str: The commit hash, "unknown" if it can't be found
+
+    """
+    try:
+        completed_process = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        return "unknown"
+    commit = completed_process.stdout.decode().strip()
+    return commit if completed_process.returncode == 0 and commit else "unknown"
+
+
+def get_machine_id():
+    """
+    Returns:
+        str: Identification of the machine and python the benchmarks run on,
+            results of different machines are not comparable
+
+    """
+    return (
+        f"{platform.node()}-{platform.machine()}-"
+        f"py{'.'.join(platform.python_version_tuple()[:2])}"
+    )
+
+
+def measure(func, *args, rounds=DEFAULT_ROUNDS, warmup=1, **kwargs):
+    """
+    Measure durations of the function calls
+
+    Args:
+        func (function): Function to measure
+        args: Positional arguments of the function
+        rounds (int): Number of measured calls
+        warmup (int): Number of calls before the measurement, e.g. to fill
+            the caches which are part of the measured path
+        kwargs: Keyword arguments of the function
+
+    Returns:
+        tuple: Statistics of the durations in seconds (dict) and the result
+            of the last call
+
+    """
+    result = None
+    for _ in range(warmup):
+        result = func(*args, **kwargs)
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        durations.append(time.perf_counter() - start)
+    stats = {
+        "rounds": rounds,
+        "min": min(durations),
+        "max": max(durations),
+        "mean": statistics.mean(durations),
+        "median": statistics.median(durations),
+        "stddev": statistics.stdev(durations) if rounds > 1 else 0.0,
+    }
+    return stats, result
+
+
+class BenchmarkSession(object):
+    """
+    Results of one run of the benchmarks
+    """
+
+    def __init__(self, commit=None, machine=None):
+        """
+        Args:
+            commit (str): Commit the benchmarks run on, the current one if None
+            machine (str): Identification of the machine, see get_machine_id
+
+        """
+        self.commit = commit or get_commit()
+        self.machine = machine or get_machine_id()
+        self.results = {}
+
+    def run(self, name, func, *args, rounds=DEFAULT_ROUNDS, warmup=1, **kwargs):
+        """
+        Measure the function and keep the statistics under the name
+
+        Args:
+            name (str): Name of the benchmark
+            func (function): Function to measure
+            args: Positional arguments of the function
+            rounds (int): Number of measured calls
+            warmup (int): Number of calls before the measurement
+            kwargs: Keyword arguments of the function
+
+        Returns:
+            Result of the last call of the function
+
+        """
+        stats, result = measure(func, *args, rounds=rounds, warmup=warmup, **kwargs)
+        self.results[name] = stats
+        log.info(f"Benchmark {name}: median {stats['median'] * 1000:.3f} ms")
+        return result
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The results with metadata of the run
+
+        """
+        return {
+            "commit": self.commit,
+            "machine": self.machine,
+            "python": platform.python_version(),
+            "time": time.time(),
+            "benchmarks": self.results,
+        }
+
+    def save(self, directory):
+        """
+        Store the results to <directory>/<machine>/<commit>.json
+
+        Args:
+            directory (str): Directory of the stored results
+
+        Returns:
+            str: Path to the stored file
+
+        """
+        machine_dir = os.path.join(directory, self.machine)
+        os.makedirs(machine_dir, exist_ok=True)
+        path = os.path.join(machine_dir, f"{self.commit}.json")
+        with open(path, "w") as results_file:
+            json.dump(self.to_dict(), results_file, indent=2, sort_keys=True)
+        return path
+
+    def compare(self, baseline, tolerance=DEFAULT_TOLERANCE):
+        """
+        Compare the medians with the baseline
+
+        Args:
+            baseline (dict): Stored results, see load_baseline
+            tolerance (float): Allowed relative slowdown, e.g. 0.2 for 20%
+
+        Returns:
+            list: Regressions as tuples of the benchmark name, the baseline
+                median, the current median and their ratio
+
+        """
+        regressions = []
+        baseline_results = (baseline or {}).get("benchmarks", {})
+        for name, stats in sorted(self.results.items()):
+            if name not in baseline_results:
+                continue
+            baseline_median = baseline_results[name]["median"]
+            if not baseline_median:
+                continue
+            ratio = stats["median"] / baseline_median
+            if ratio > 1 + tolerance:
+                regressions.append((name, baseline_median, stats["median"], ratio))
+        return regressions
+
+    def get_report(self, baseline=None):
+        """
+        Get human readable table of the results
+
+        Args:
+            baseline (dict): Stored results to compare with
+
+        Returns:
+            str: The report
+
+        """
+        if not self.results:
+            return "No benchmarks run"
+        baseline_results = (baseline or {}).get("benchmarks", {})
+        name_width = max(len(name) for name in self.results)
+        header = f"{'BENCHMARK':<{name_width}}  {'MEDIAN':>11}  {'MIN':>11}"
+        if baseline:
+            header += f"  {'BASELINE':>11}  CHANGE ({baseline['commit']})"
+        lines = [header]
+        for name, stats in sorted(self.results.items()):
+            line = (
+                f"{name:<{name_width}}  {stats['median'] * 1000:>9.3f}ms"
+                f"  {stats['min'] * 1000:>9.3f}ms"
+            )
+            if name in baseline_results:
+                baseline_median = baseline_results[name]["median"]
+                change = (stats["median"] / baseline_median - 1) * 100
+                line += f"  {baseline_median * 1000:>9.3f}ms  {change:+.1f}%"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def load_baseline(directory, machine=None, commit=None, exclude_commit=None):
+    """
+    Load stored results of the machine
+
+    Args:
+        directory (str): Directory of the stored results
+        machine (str): Identification of the machine, the current one if None
+        commit (str): Commit of the results, the latest stored one if None
+        exclude_commit (str): Commit to skip when looking for the latest
+            results, e.g. the current one
+
+    Returns:
+        dict: The stored results, None if there are none
+
+    """
+    machine_dir = os.path.join(directory, machine or get_machine_id())
+    if commit:
+        paths = [os.path.join(machine_dir, f"{commit}.json")]
+    elif os.path.isdir(machine_dir):
+        paths = [
+            os.path.join(machine_dir, name)
+            for name in os.listdir(machine_dir)
+            if name.endswith(".json") and name != f"{exclude_commit}.json"
+        ]
+        paths.sort(key=os.path.getmtime, reverse=True)
+    else:
+        paths = []
+    for path in paths[:1]:
+        if os.path.exists(path):
+            with open(path) as results_file:
+                return json.load(results_file)
+    return None
@@ -0,0 +1,160 @@
+"""
+Session wide registry of cluster facts (versions, upgrade path, KMS, ...)
+which are needed repeatedly, e.g. for evaluation of skipif markers during
+test collection. Every fact is queried from the cluster only once, all of
+them are loaded in parallel by ClusterFacts.load().
+
+Example::
+
+    from ocs_ci.utility.cluster_facts import cluster_facts
+
+    cluster_facts.load()
+    if cluster_facts.ocp_version == "4.11":
+        ...
+
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ocs_ci.framework import config
+
+log = logging.getLogger(__name__)
+
+
+def _get_ocp_version():
+    from ocs_ci.utility.utils import get_running_ocp_version
+
+    return get_running_ocp_version()
+
+
+def _get_upgraded_from():
+    from ocs_ci.ocs.resources.ocs import get_ocs_csv
+
+    csv_info = get_ocs_csv().get()
+    return csv_info.get("spec").get("replaces", "")
+
+
+def _get_kms_enabled():
+    from ocs_ci.utility.kms import is_kms_enabled
+
+    return is_kms_enabled(dont_raise=True)
+
+
+class ClusterFacts(object):
+    """
+    Lazily loaded and memoized facts about the cluster
+    """
+
+    # fact name: function which queries the fact from the cluster
+    FACTS = {
+        "ocp_version": _get_ocp_version,
+        "upgraded_from": _get_upgraded_from,
+        "kms_enabled": _get_kms_enabled,
+    }
+
+    def __init__(self):
+        self._facts = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def load(self, facts=None):
+        """
+        Query all the facts (which are not loaded yet) in parallel
+
+        Args:
+            facts (list): names of the facts to load, all if not provided
+
+        """
+        to_load = [
+            fact
+            for fact in (facts or self.FACTS)
+            if fact not in self._facts and fact not in self._errors
+        ]
+        if not to_load:
+            return
+        log.info(f"Loading cluster facts: {to_load}")
+        with ThreadPoolExecutor(max_workers=len(to_load)) as executor:
+            futures = {fact: executor.submit(self.FACTS[fact]) for fact in to_load}
+        with self._lock:
+            for fact, future in futures.items():
+                try:
+                    self._facts[fact] = future.result()
+                except Exception as ex:
+                    self._errors[fact] = ex
+        for fact, ex in self._errors.items():
+            if fact in futures:
+                log.warning(f"Failed to get cluster fact {fact}: {ex}")
+
+    def get(self, fact):
+        """
+        Get value of the fact, it's queried from the cluster on first access
+
+        Args:
+            fact (str): name of the fact
+
+        Returns:
+            value of the fact
+
+        Raises:
+            Exception: the exception raised when querying the fact
+
+        """
+        if fact not in self._facts and fact not in self._errors:
+            self.load([fact])
+        if fact in self._errors:
+            raise self._errors[fact]
+        return self._facts[fact]
+
+    def reset(self):
+        """
+        Forget all the loaded facts, e.g. after upgrade of the cluster
+        """
+        with self._lock:
+            self._facts = {}
+            self._errors = {}
+
+    @property
+    def ocp_version(self):
+        """
+        str: running OCP version, e.g. 4.11
+        """
+        return self.get("ocp_version")
+
+    @property
+    def upgraded_from(self):
+        """
+        str: name of the OCS CSV which was replaced by the current one
+        """
+        return self.get("upgraded_from")
+
+    @property
+    def kms_enabled(self):
+        """
+        bool: True if KMS is configured in the StorageCluster
+        """
+        return self.get("kms_enabled")
+
+    @property
+    def ocs_version(self):
+        """
+        str: OCS version from the configuration
+        """
+        return config.ENV_DATA["ocs_version"]
+
+    @property
+    def lvm(self):
+        """
+        bool: value of RUN['lvm'] if set, None otherwise
+        """
+        return config.RUN.get("lvm")
+
+    @property
+    def platform(self):
+        """
+        str: platform of the cluster (lower case)
+        """
+        return config.ENV_DATA["platform"].lower()
+
+
+cluster_facts = ClusterFacts()
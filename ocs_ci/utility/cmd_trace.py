@@ -0,0 +1,291 @@
+"""
+Record and replay of the commands executed by exec_cmd, so the framework
+code (e.g. helpers of ocs_ci.ocs) can be profiled and benchmarked without a
+cluster, and slow paths seen in a real run can be reproduced
+deterministically.
+
+In the record mode every command is stored with its return code, outputs
+and duration to a trace file, one JSON object per line (gzip compressed if
+the file name ends with .gz). The secrets passed to exec_cmd are masked and
+the --kubeconfig option is dropped from the stored command, so the trace
+doesn't depend on the cluster directory.
+
+In the replay mode the commands are not executed at all, they are answered
+from the trace. When a command was executed more times, the recorded
+results are returned in the recorded order and the last one is repeated
+when they run out (e.g. a wait polls longer than in the recorded run).
+Commands not found in the trace fail. The durations of the commands are
+multiplied by time_scale and slept, 0 replays without any delay.
+
+Example::
+
+    with CommandTrace("run.trace.gz", RECORD):
+        get_all_pods(namespace)
+
+    with CommandTrace("run.trace.gz", REPLAY, time_scale=0):
+        get_all_pods(namespace)
+
+The trace of a whole run is recorded or replayed via RUN['cmd_trace_mode']
+and RUN['cmd_trace_file'] (--cmd-trace-record / --cmd-trace-replay).
+
+"""
+import gzip
+import json
+import logging
+import subprocess
+import threading
+import time
+from collections import defaultdict, deque
+
+from ocs_ci.framework import config
+
+log = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+TRACE_VERSION = 1
+# return code of the commands missing in the replayed trace
+MISSING_RETURNCODE = 127
+
+_active = None
+
+
+def get_active():
+    """
+    Returns:
+        CommandTrace: The trace which is recorded or replayed, None if there
+            isn't any
+
+    """
+    return _active
+
+
+def get_command_key(cmd):
+    """
+    Get the command as stored in the trace, without the kubeconfig option
+
+    Args:
+        cmd (list): Arguments of the command (with masked secrets)
+
+    Returns:
+        str: The command line
+
+    """
+    args = []
+    skip_next = False
+    for arg in cmd:
+        if skip_next:
+            skip_next = False
+        elif arg == "--kubeconfig":
+            skip_next = True
+        elif not arg.startswith("--kubeconfig="):
+            args.append(arg)
+    return " ".join(args)
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _decode(output):
+    if isinstance(output, bytes):
+        return output.decode("utf-8", errors="surrogateescape")
+    return output or ""
+
+
+def _encode(output):
+    return output.encode("utf-8", errors="surrogateescape")
+
+
+def load_trace(path):
+    """
+    Load the commands stored in the trace file
+
+    Args:
+        path (str): Path to the trace file
+
+    Returns:
+        tuple: Header of the trace (dict) and list of the commands (dicts with
+            cmd, returncode, stdout, stderr, duration and the time since the
+            start of the recording)
+
+    """
+    header = {}
+    entries = []
+    with _open(path, "r") as trace_file:
+        for line in trace_file:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "trace" in entry:
+                header = entry
+            else:
+                entries.append(entry)
+    return header, entries
+
+
+class CommandTrace(object):
+    """
+    Trace file which is recorded or replayed
+    """
+
+    def __init__(self, path, mode, time_scale=1.0):
+        """
+        Args:
+            path (str): Path to the trace file
+            mode (str): RECORD or REPLAY
+            time_scale (float): Multiplier of the recorded durations slept
+                in the replay mode
+
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown command trace mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        self.commands = 0
+        self.missing = 0
+        self._lock = threading.Lock()
+        self._file = None
+        self._started = None
+        # command key -> results of the command not replayed yet
+        self._results = defaultdict(deque)
+        # command key -> the last replayed result
+        self._last = {}
+
+    def start(self):
+        """
+        Open the trace file and make this trace the active one
+        """
+        global _active
+        self._started = time.time()
+        if self.mode == RECORD:
+            self._file = _open(self.path, "w")
+            header = {
+                "trace": TRACE_VERSION,
+                "started": self._started,
+                "run_id": config.RUN.get("run_id"),
+            }
+            self._file.write(json.dumps(header) + "\n")
+        else:
+            _, entries = load_trace(self.path)
+            for entry in entries:
+                self._results[entry["cmd"]].append(entry)
+        log.info(f"Command trace {self.path} started in {self.mode} mode")
+        _active = self
+
+    def stop(self):
+        """
+        Close the trace file, this trace is not active anymore
+        """
+        global _active
+        if _active is self:
+            _active = None
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        log.info(
+            f"Command trace {self.path} stopped, {self.commands} commands "
+            f"{self.mode}ed, {self.missing} commands not found in the trace"
+        )
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def record(self, cmd, completed_process, duration, secrets=None):
+        """
+        Store the executed command to the trace
+
+        Args:
+            cmd (list): Arguments of the command
+            completed_process (CompletedProcess): Result of the command
+            duration (float): Duration of the command in seconds
+            secrets (list): Secrets to mask in the command and its outputs
+
+        """
+        from ocs_ci.utility.utils import mask_secrets
+
+        entry = {
+            "time": round(time.time() - self._started, 3),
+            "cmd": get_command_key(mask_secrets(cmd, secrets)),
+            "returncode": completed_process.returncode,
+            "stdout": mask_secrets(_decode(completed_process.stdout), secrets),
+            "stderr": mask_secrets(_decode(completed_process.stderr), secrets),
+            "duration": round(duration, 4),
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file:
+                self._file.write(line)
+                self._file.flush()
+            self.commands += 1
+
+    def replay(self, cmd, secrets=None):
+        """
+        Answer the command from the trace
+
+        Args:
+            cmd (list): Arguments of the command
+            secrets (list): Secrets masked in the recorded command
+
+        Returns:
+            CompletedProcess: The recorded result of the command, failed one
+                if the command isn't in the trace
+
+        """
+        from ocs_ci.utility.utils import mask_secrets
+
+        key = get_command_key(mask_secrets(cmd, secrets))
+        with self._lock:
+            self.commands += 1
+            results = self._results.get(key)
+            if results:
+                entry = self._last[key] = results.popleft()
+            else:
+                entry = self._last.get(key)
+            if entry is None:
+                self.missing += 1
+        if entry is None:
+            log.warning(f"Command not found in the trace {self.path}: {key}")
+            return subprocess.CompletedProcess(
+                cmd,
+                MISSING_RETURNCODE,
+                b"",
+                f"Command not found in the trace {self.path}".encode(),
+            )
+        if self.time_scale > 0:
+            time.sleep(entry["duration"] * self.time_scale)
+        return subprocess.CompletedProcess(
+            cmd,
+            entry["returncode"],
+            _encode(entry["stdout"]),
+            _encode(entry["stderr"]),
+        )
+
+
+def start_from_config():
+    """
+    Start recording or replaying of the trace configured by
+    RUN['cmd_trace_mode'] and RUN['cmd_trace_file'], if there isn't any
+    active trace already
+
+    Returns:
+        CommandTrace: The started trace, None if no trace is configured
+
+    """
+    mode = config.RUN.get("cmd_trace_mode")
+    path = config.RUN.get("cmd_trace_file")
+    if _active or not (mode and path):
+        return _active
+    trace = CommandTrace(
+        path, mode, time_scale=config.RUN.get("cmd_trace_time_scale", 1.0)
+    )
+    trace.start()
+    return trace
@@ -0,0 +1,581 @@
+"""
+Small in-memory stand-in of the Kubernetes API server for get, list and
+watch of resources, so the code which reads the cluster state (oc get,
+oc get --watch, ResourceWatch) can be run and profiled without a cluster.
+
+The resources are loaded from YAML files, e.g. output of
+'oc get <kind> -A -o yaml' or must-gather, or added by the test. Changes
+made via add and delete are sent to the open watches, so slow paths of the
+waits can be reproduced deterministically. Only the read-only part of the
+API is served, with equality based label selectors and field selectors.
+
+Example::
+
+    with FakeAPIServer() as server:
+        server.load("pods.yaml")
+        server.write_kubeconfig(kubeconfig_path)
+        # oc --kubeconfig kubeconfig_path get pods -w -o json
+        server.add(pod)
+
+"""
+import copy
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+
+log = logging.getLogger(__name__)
+
+# number of the last changes kept for the watches which resume from an older
+# resource version
+EVENTS_HISTORY = 10000
+DEFAULT_WATCH_TIMEOUT = 300
+SERVER_VERSION = {"major": "1", "minor": "25", "gitVersion": "v1.25.0"}
+SHORT_NAMES = {
+    "ConfigMap": ["cm"],
+    "ClusterServiceVersion": ["csv", "csvs"],
+    "DaemonSet": ["ds"],
+    "Deployment": ["deploy"],
+    "Event": ["ev"],
+    "Namespace": ["ns"],
+    "Node": ["no"],
+    "PersistentVolume": ["pv"],
+    "PersistentVolumeClaim": ["pvc"],
+    "Pod": ["po"],
+    "Service": ["svc"],
+    "StorageClass": ["sc"],
+}
+
+
+def get_plural(kind):
+    """
+    Args:
+        kind (str): Kind of the resource, e.g. StorageClass
+
+    Returns:
+        str: Name of the resource in the API path, e.g. storageclasses
+
+    """
+    name = kind.lower()
+    if name.endswith("s"):
+        return f"{name}es"
+    if name.endswith("y"):
+        return f"{name[:-1]}ies"
+    return f"{name}s"
+
+
+def get_field(resource, path):
+    """
+    Args:
+        resource (dict): The resource
+        path (str): Dotted path to the field, e.g. status.phase
+
+    Returns:
+        str: Value of the field, empty string if it doesn't exist
+
+    """
+    value = resource
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return ""
+        value = value.get(key)
+    return "" if value is None else str(value)
+
+
+def match_label_selector(resource, selector):
+    """
+    Args:
+        resource (dict): The resource
+        selector (str): Equality based label selector, e.g. app=osd,!debug
+
+    Returns:
+        bool: True if the labels of the resource match the selector
+
+    """
+    labels = resource["metadata"].get("labels") or {}
+    for requirement in filter(None, selector.split(",")):
+        requirement = requirement.strip()
+        if "!=" in requirement:
+            key, value = requirement.split("!=", 1)
+            if labels.get(key.strip()) == value.strip():
+                return False
+        elif "=" in requirement:
+            key, value = requirement.replace("==", "=").split("=", 1)
+            if labels.get(key.strip()) != value.strip():
+                return False
+        elif requirement.startswith("!"):
+            if requirement[1:] in labels:
+                return False
+        elif requirement not in labels:
+            return False
+    return True
+
+
+def match_field_selector(resource, selector):
+    """
+    Args:
+        resource (dict): The resource
+        selector (str): Field selector, e.g. metadata.name=osd-0
+
+    Returns:
+        bool: True if the fields of the resource match the selector
+
+    """
+    for requirement in filter(None, selector.split(",")):
+        if "!=" in requirement:
+            path, value = requirement.split("!=", 1)
+            if get_field(resource, path.strip()) == value.strip():
+                return False
+        else:
+            path, value = requirement.replace("==", "=").split("=", 1)
+            if get_field(resource, path.strip()) != value.strip():
+                return False
+    return True
+
+
+class FakeAPIServer(object):
+    """
+    HTTP server serving get, list and watch of the resources kept in memory
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        """
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on, a free one if 0
+
+        """
+        self.host = host
+        self.port = port
+        self.watch_timeout = DEFAULT_WATCH_TIMEOUT
+        self.resource_version = 0
+        # (api_version, plural) -> dict with kind and namespaced
+        self.kinds = {}
+        # (api_version, plural, namespace, name) -> resource
+        self.resources = {}
+        # (resource_version, event type, resource) of the last changes
+        self.events = deque(maxlen=EVENTS_HISTORY)
+        self._changed = threading.Condition()
+        self._stopped = False
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        str: URL of the server
+        """
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """
+        Start serving the API in background thread
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        self.port = self._server.server_address[1]
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-api-server", daemon=True
+        )
+        self._thread.start()
+        log.info(f"Fake API server listening on {self.url}")
+
+    def stop(self):
+        """
+        Stop the server, the open watches are closed
+        """
+        with self._changed:
+            self._stopped = True
+            self._changed.notify_all()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def write_kubeconfig(self, path):
+        """
+        Write kubeconfig for oc pointing to this server
+
+        Args:
+            path (str): Path to the kubeconfig file
+
+        """
+        kubeconfig = {
+            "apiVersion": "v1",
+            "kind": "Config",
+            "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+            "users": [{"name": "fake", "user": {"token": "fake"}}],
+            "contexts": [
+                {"name": "fake", "context": {"cluster": "fake", "user": "fake"}}
+            ],
+            "current-context": "fake",
+        }
+        with open(path, "w") as kubeconfig_file:
+            yaml.safe_dump(kubeconfig, kubeconfig_file)
+
+    def register_kind(self, api_version, kind, namespaced=True):
+        """
+        Make the kind discoverable even if there isn't any resource of it
+
+        Args:
+            api_version (str): API version, e.g. v1 or apps/v1
+            kind (str): Kind of the resources, e.g. Pod
+            namespaced (bool): True if the resources are namespaced
+
+        Returns:
+            str: Name of the resources in the API path
+
+        """
+        plural = get_plural(kind)
+        self.kinds.setdefault(
+            (api_version, plural), {"kind": kind, "namespaced": namespaced}
+        )
+        return plural
+
+    def _key(self, resource):
+        metadata = resource["metadata"]
+        plural = self.register_kind(
+            resource["apiVersion"], resource["kind"], "namespace" in metadata
+        )
+        return (
+            resource["apiVersion"],
+            plural,
+            metadata.get("namespace", ""),
+            metadata["name"],
+        )
+
+    def _change(self, event_type, key, resource):
+        with self._changed:
+            self.resource_version += 1
+            resource["metadata"]["resourceVersion"] = str(self.resource_version)
+            if event_type == "DELETED":
+                self.resources.pop(key, None)
+            else:
+                self.resources[key] = resource
+            self.events.append((self.resource_version, event_type, resource))
+            self._changed.notify_all()
+
+    def add(self, resource):
+        """
+        Create or replace the resource, the watches get ADDED or MODIFIED
+        event
+
+        Args:
+            resource (dict): The resource, it's copied
+
+        """
+        resource = copy.deepcopy(resource)
+        metadata = resource.setdefault("metadata", {})
+        metadata.setdefault("uid", str(uuid.uuid4()))
+        metadata.setdefault(
+            "creationTimestamp", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        )
+        key = self._key(resource)
+        event_type = "MODIFIED" if key in self.resources else "ADDED"
+        self._change(event_type, key, resource)
+
+    def delete(self, resource):
+        """
+        Delete the resource, the watches get DELETED event
+
+        Args:
+            resource (dict): The resource, only apiVersion, kind and metadata
+                name and namespace are used
+
+        """
+        key = self._key(resource)
+        if key in self.resources:
+            self._change("DELETED", key, copy.deepcopy(self.resources[key]))
+
+    def load(self, path):
+        """
+        Add the resources from the YAML file, Lists and multiple documents
+        are supported
+
+        Args:
+            path (str): Path to the file
+
+        Returns:
+            int: Number of the added resources
+
+        """
+        count = 0
+        with open(path) as yaml_file:
+            for document in yaml.safe_load_all(yaml_file):
+                if not document:
+                    continue
+                if document.get("kind", "").endswith("List"):
+                    resources = document.get("items") or []
+                else:
+                    resources = [document]
+                for resource in resources:
+                    self.add(resource)
+                    count += 1
+        return count
+
+    def list(self, api_version, plural, namespace=None, labels=None, fields=None):
+        """
+        Get the resources of the kind
+
+        Args:
+            api_version (str): API version, e.g. v1
+            plural (str): Name of the resources in the API path, e.g. pods
+            namespace (str): Namespace of the resources, all if None
+            labels (str): Label selector
+            fields (str): Field selector
+
+        Returns:
+            list: The resources ordered by namespace and name
+
+        """
+        with self._changed:
+            resources = [
+                resource
+                for key, resource in sorted(self.resources.items())
+                if key[:2] == (api_version, plural)
+                and (namespace is None or key[2] == namespace)
+            ]
+        return [
+            resource
+            for resource in resources
+            if (not labels or match_label_selector(resource, labels))
+            and (not fields or match_field_selector(resource, fields))
+        ]
+
+    def get_discovery(self, path):
+        """
+        Get the response of the discovery endpoint
+
+        Args:
+            path (str): Path of the request, e.g. /api/v1
+
+        Returns:
+            dict: The response, None if the path isn't a discovery endpoint
+
+        """
+        group_versions = {api_version for api_version, _ in self.kinds}
+        if path == "/version":
+            return SERVER_VERSION
+        if path == "/api":
+            return {"kind": "APIVersions", "versions": ["v1"]}
+        if path == "/apis":
+            groups = {}
+            for group_version in sorted(group_versions):
+                if "/" in group_version:
+                    group, version = group_version.split("/", 1)
+                    groups.setdefault(group, []).append(
+                        {"groupVersion": group_version, "version": version}
+                    )
+            return {
+                "kind": "APIGroupList",
+                "apiVersion": "v1",
+                "groups": [
+                    {
+                        "name": group,
+                        "versions": versions,
+                        "preferredVersion": versions[-1],
+                    }
+                    for group, versions in groups.items()
+                ],
+            }
+        group_version = path[len("/api/") :] if path.startswith("/api/") else None
+        if path.startswith("/apis/"):
+            group_version = path[len("/apis/") :]
+        if group_version not in group_versions:
+            return None
+        return {
+            "kind": "APIResourceList",
+            "apiVersion": "v1",
+            "groupVersion": group_version,
+            "resources": [
+                {
+                    "name": plural,
+                    "singularName": info["kind"].lower(),
+                    "namespaced": info["namespaced"],
+                    "kind": info["kind"],
+                    "verbs": ["get", "list", "watch"],
+                    "shortNames": SHORT_NAMES.get(info["kind"], []),
+                }
+                for (api_version, plural), info in sorted(self.kinds.items())
+                if api_version == group_version
+            ],
+        }
+
+    def iter_events(self, api_version, plural, resource_version, timeout, match):
+        """
+        Get the changes of the resources of the kind
+
+        Args:
+            api_version (str): API version, e.g. v1
+            plural (str): Name of the resources in the API path, e.g. pods
+            resource_version (int): Changes after this version are returned
+            timeout (float): Time in seconds to wait for the changes
+            match (function): Function which returns True for the resources
+                of the watch
+
+        Yields:
+            tuple: Event type and the resource, ERROR event with 410 status if
+                the resource version is too old
+
+        """
+        deadline = time.time() + timeout
+        kind = self.kinds.get((api_version, plural), {}).get("kind")
+        while True:
+            with self._changed:
+                expired = self.events and resource_version < self.events[0][0] - 1
+                events = [event for event in self.events if event[0] > resource_version]
+                if not (events or expired):
+                    remaining = deadline - time.time()
+                    if self._stopped or remaining <= 0:
+                        return
+                    self._changed.wait(remaining)
+                    continue
+            if expired:
+                yield "ERROR", {
+                    "kind": "Status",
+                    "apiVersion": "v1",
+                    "status": "Failure",
+                    "reason": "Expired",
+                    "code": 410,
+                }
+                return
+            for version, event_type, resource in events:
+                resource_version = version
+                if resource["kind"] == kind and match(resource):
+                    yield event_type, resource
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Handler of the requests of the fake API server
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        log.debug(f"Fake API server: {format % args}")
+
+    def send_json(self, data, code=200):
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_status(self, code, reason, message):
+        self.send_json(
+            {
+                "kind": "Status",
+                "apiVersion": "v1",
+                "status": "Failure",
+                "reason": reason,
+                "message": message,
+                "code": code,
+            },
+            code,
+        )
+
+    def do_GET(self):
+        api = self.server.api
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/")
+        discovery = api.get_discovery(path)
+        if discovery is not None:
+            return self.send_json(discovery)
+        parts = path.strip("/").split("/")
+        if parts[0] == "api":
+            api_version, parts = parts[1], parts[2:]
+        elif parts[0] == "apis" and len(parts) > 2:
+            api_version, parts = "/".join(parts[1:3]), parts[3:]
+        else:
+            return self.send_status(404, "NotFound", f"Unknown path {url.path}")
+        namespace = None
+        if len(parts) > 2 and parts[0] == "namespaces":
+            namespace, parts = parts[1], parts[2:]
+        if len(parts) not in (1, 2) or (api_version, parts[0]) not in api.kinds:
+            return self.send_status(404, "NotFound", f"Unknown path {url.path}")
+        plural = parts[0]
+        fields = query.get("fieldSelector")
+        if len(parts) == 2:
+            name_selector = f"metadata.name={parts[1]}"
+            fields = f"{fields},{name_selector}" if fields else name_selector
+        if query.get("watch") in ("true", "1"):
+            return self.watch(api_version, plural, namespace, query, fields)
+        resources = api.list(
+            api_version, plural, namespace, query.get("labelSelector"), fields
+        )
+        if len(parts) == 2:
+            if not resources:
+                kind = api.kinds[(api_version, plural)]["kind"]
+                return self.send_status(
+                    404, "NotFound", f'{plural} "{parts[1]}" not found ({kind})'
+                )
+            return self.send_json(resources[0])
+        kind = api.kinds[(api_version, plural)]["kind"]
+        self.send_json(
+            {
+                "kind": f"{kind}List",
+                "apiVersion": api_version,
+                "metadata": {"resourceVersion": str(api.resource_version)},
+                "items": resources,
+            }
+        )
+
+    def watch(self, api_version, plural, namespace, query, fields):
+        api = self.server.api
+        labels = query.get("labelSelector")
+
+        def match(resource):
+            return (
+                (
+                    namespace is None
+                    or resource["metadata"].get("namespace") == namespace
+                )
+                and (not labels or match_label_selector(resource, labels))
+                and (not fields or match_field_selector(resource, fields))
+            )
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        resource_version = int(query.get("resourceVersion") or 0)
+        try:
+            if not resource_version:
+                # synthetic events of the current resources, as the API does
+                resource_version = api.resource_version
+                for resource in api.list(api_version, plural, namespace):
+                    if match(resource):
+                        self.send_event("ADDED", resource)
+            timeout = float(query.get("timeoutSeconds") or api.watch_timeout)
+            for event_type, resource in api.iter_events(
+                api_version, plural, resource_version, timeout, match
+            ):
+                self.send_event(event_type, resource)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            log.debug("Fake API server: watch closed by the client")
+        self.close_connection = True
+
+    def send_event(self, event_type, resource):
+        data = json.dumps({"type": event_type, "object": resource}).encode() + b"\n"
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
@@ -9,7 +9,6 @@ import yaml
 
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants
-from ocs_ci.utility.connection import Connection
 from ocs_ci.utility.version import get_semantic_version, VERSION_4_11
 
 logger = logging.getLogger(__name__)
@@ -76,6 +75,9 @@ def configure_allowed_domains_in_proxy():
     # import get_ocp_version here to avoid circular import
     from ocs_ci.utility.utils import get_ocp_version
 
+    # paramiko is slow to import and it's needed only here
+    from ocs_ci.utility.connection import Connection
+
     if get_semantic_version(get_ocp_version(), True) < VERSION_4_11:
         int_svc_user = constants.EC2_USER
     else:
@@ -5,7 +5,6 @@ import json
 import logging
 import os
 import shutil
-from distutils.version import LooseVersion
 
 import yaml
 
@@ -202,6 +201,8 @@ def get_lso_channel():
         str: local storage operator channel
 
     """
+    from distutils.version import LooseVersion
+
     ocp_version = get_ocp_version()
     # If OCP version is not GA, we will be using the Optional Operators CatalogSource
     # This means there are two PackageManifests with the name local-storage-operator
@@ -0,0 +1,343 @@
+"""
+Persistent store of measurements done by workload fixtures, see
+:py:func:`ocs_ci.utility.workloadfixture.measure_operation`.
+
+All measurements of a measurement directory share one JSON lines file.
+Every step of a measurement (start, new alerts, progress checkpoints, end of
+the operation, stop) is appended to the file as one event as soon as it
+happens, so an interrupted measurement is not lost and it can be resumed.
+The measurements are indexed by name of the workload fixture and id of the
+cluster, the file is parsed only once per process and then read
+incrementally.
+
+Example::
+
+    store = get_measurement_store(measurement_dir)
+    measurement = store.get("measure_stop_ceph_mgr")
+    if measurement and measurement.done:
+        results = measurement.results
+    else:
+        measurement = store.start("measure_stop_ceph_mgr", metadata={})
+        store.add_alerts(measurement, alerts)
+        store.operation_done(measurement, start_time, result)
+        store.stop(measurement, stop_time)
+
+"""
+import json
+import logging
+import os
+import threading
+import time
+from uuid import uuid4
+
+from ocs_ci.framework import config
+from ocs_ci.utility.metrics_recorder import get_alert_fingerprint
+
+log = logging.getLogger(__name__)
+
+MEASUREMENT_STORE_FILE = "measurements.jsonl"
+
+# events of a measurement in order of their occurrence
+START = "start"
+ALERTS = "alerts"
+PROGRESS = "progress"
+OPERATION_DONE = "operation_done"
+STOP = "stop"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_cluster_id():
+    """
+    Get id of the current cluster used for indexing of the measurements, the
+    clusterID from metadata.json of the cluster if available, the cluster name
+    otherwise. No command is executed against the cluster.
+
+    Returns:
+        str: Id of the cluster
+
+    """
+    from ocs_ci.utility.utils import get_cluster_id as get_metadata_cluster_id
+
+    cluster_path = config.ENV_DATA.get("cluster_path")
+    if cluster_path:
+        try:
+            return get_metadata_cluster_id(cluster_path)
+        except (OSError, ValueError, KeyError):
+            pass
+    return config.ENV_DATA.get("cluster_name") or ""
+
+
+class Measurement(object):
+    """
+    State of one measurement rebuilt from its events
+
+    Attributes:
+        name (str): Name of the measurement (workload fixture)
+        cluster_id (str): Id of the cluster
+        attempt (str): Id of the attempt, a new one is created when a
+            measurement interrupted during the operation is repeated
+        start (float): Start time of the measurement
+        stop (float): Stop time of the measurement, None if not stopped
+        result: Result of the measured operation
+        error (str): Error of the measured operation, None if it didn't fail
+        metadata (dict): Metadata of the measurement
+        alerts (list): Prometheus alerts in order of their first occurrence
+        progress (list): Progress checkpoints (dicts with time key)
+        extra (dict): Additional results stored with the stop event
+        fingerprints (set): Fingerprints of the stored alerts
+
+    """
+
+    def __init__(self, name, cluster_id, attempt, metadata=None):
+        self.name = name
+        self.cluster_id = cluster_id
+        self.attempt = attempt
+        self.metadata = metadata
+        self.started = None
+        self.start = None
+        self.stop = None
+        self.result = None
+        self.error = None
+        self.operation_done = False
+        self.alerts = []
+        self.progress = []
+        self.extra = {}
+        self.fingerprints = set()
+
+    @property
+    def done(self):
+        """
+        bool: True if the measurement is complete
+        """
+        return self.stop is not None
+
+    def apply(self, event):
+        """
+        Update the state by the event
+
+        Args:
+            event (dict): Event loaded from the store
+
+        """
+        kind = event["event"]
+        if kind == START:
+            self.started = event["time"]
+            self.metadata = event.get("metadata")
+        elif kind == ALERTS:
+            for alert in event["alerts"]:
+                fingerprint = get_alert_fingerprint(alert)
+                if fingerprint not in self.fingerprints:
+                    self.fingerprints.add(fingerprint)
+                    self.alerts.append(alert)
+        elif kind == PROGRESS:
+            self.progress.append(dict(event["data"], time=event["time"]))
+        elif kind == OPERATION_DONE:
+            # failed operation is not resumed, it's repeated by the next run
+            self.error = event.get("error")
+            self.operation_done = self.error is None
+            self.start = event["start"]
+            self.result = event.get("result")
+        elif kind == STOP:
+            self.stop = event["stop"]
+            self.extra = event.get("extra") or {}
+
+    @property
+    def results(self):
+        """
+        dict: Results in the format returned by measure_operation
+        """
+        results = {
+            "start": self.start,
+            "stop": self.stop,
+            "result": self.result,
+            "metadata": self.metadata,
+            "prometheus_alerts": list(self.alerts),
+        }
+        results.update(self.extra)
+        return results
+
+
+class MeasurementStore(object):
+    """
+    Append only JSON lines store of measurements
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path to the store file
+
+        """
+        self.path = path
+        # (name, cluster_id) -> latest Measurement
+        self._index = {}
+        self._offset = 0
+        self._lock = threading.RLock()
+
+    def reload(self):
+        """
+        Read events appended to the file since the last reload
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path) as store_file:
+                store_file.seek(self._offset)
+                while True:
+                    line = store_file.readline()
+                    # incomplete line of interrupted write is skipped
+                    if not line.endswith("\n"):
+                        break
+                    self._offset = store_file.tell()
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        log.warning(f"Skipping corrupted line in {self.path}")
+                        continue
+                    self._apply(event)
+
+    def _apply(self, event):
+        key = (event["name"], event["cluster_id"])
+        measurement = self._index.get(key)
+        if event["event"] == START:
+            measurement = Measurement(*key, attempt=event["attempt"])
+            self._index[key] = measurement
+        if measurement is None or measurement.attempt != event["attempt"]:
+            return
+        measurement.apply(event)
+
+    def _append(self, measurement, event, **data):
+        record = {
+            "name": measurement.name,
+            "cluster_id": measurement.cluster_id,
+            "attempt": measurement.attempt,
+            "event": event,
+            "time": time.time(),
+        }
+        record.update(data)
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            # events appended by other processes are read first
+            self.reload()
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self._offset:
+                # terminate incomplete line of interrupted write
+                line = "\n" + line
+            with open(self.path, "a") as store_file:
+                store_file.write(line)
+                store_file.flush()
+                self._offset = store_file.tell()
+            self._apply(record)
+
+    def get(self, name, cluster_id=None):
+        """
+        Get the latest measurement
+
+        Args:
+            name (str): Name of the measurement (workload fixture)
+            cluster_id (str): Id of the cluster, the current cluster if None
+
+        Returns:
+            Measurement: The measurement or None if there is no such one
+
+        """
+        self.reload()
+        if cluster_id is None:
+            cluster_id = get_cluster_id()
+        return self._index.get((name, cluster_id))
+
+    def start(self, name, metadata=None, cluster_id=None):
+        """
+        Start a new attempt of the measurement
+
+        Args:
+            name (str): Name of the measurement (workload fixture)
+            metadata (dict): Metadata of the measurement
+            cluster_id (str): Id of the cluster, the current cluster if None
+
+        Returns:
+            Measurement: The started measurement
+
+        """
+        if cluster_id is None:
+            cluster_id = get_cluster_id()
+        measurement = Measurement(name, cluster_id, uuid4().hex)
+        self._append(measurement, START, metadata=metadata)
+        return self._index[(name, cluster_id)]
+
+    def add_alerts(self, measurement, alerts):
+        """
+        Checkpoint alerts seen during the measurement, alerts which are
+        already stored are skipped
+
+        Args:
+            measurement (Measurement): The measurement
+            alerts (list): Prometheus alerts
+
+        """
+        new_alerts = {}
+        for alert in alerts:
+            fingerprint = get_alert_fingerprint(alert)
+            if fingerprint not in measurement.fingerprints:
+                new_alerts.setdefault(fingerprint, alert)
+        if new_alerts:
+            self._append(measurement, ALERTS, alerts=list(new_alerts.values()))
+
+    def checkpoint(self, measurement, **data):
+        """
+        Checkpoint progress of the measurement
+
+        Args:
+            measurement (Measurement): The measurement
+            data: Data describing the progress
+
+        """
+        self._append(measurement, PROGRESS, data=data)
+
+    def operation_done(self, measurement, start, result, error=None):
+        """
+        Record that the measured operation is finished
+
+        Args:
+            measurement (Measurement): The measurement
+            start (float): Start time of the measurement
+            result: Result of the operation, it has to be JSON serializable
+            error (str): Error of the operation if it failed
+
+        """
+        data = {"start": start, "result": result}
+        if error is not None:
+            data["error"] = error
+        self._append(measurement, OPERATION_DONE, **data)
+
+    def stop(self, measurement, stop, **extra):
+        """
+        Record that the measurement is complete
+
+        Args:
+            measurement (Measurement): The measurement
+            stop (float): Stop time of the measurement
+            extra: Additional results of the measurement
+
+        """
+        self._append(measurement, STOP, stop=stop, extra=extra)
+
+
+def get_measurement_store(measurement_dir):
+    """
+    Get the store of the measurement directory, the store is shared by all
+    its users in the process
+
+    Args:
+        measurement_dir (str): Path to the measurement directory
+
+    Returns:
+        MeasurementStore: The store
+
+    """
+    path = os.path.abspath(os.path.join(measurement_dir, MEASUREMENT_STORE_FILE))
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = MeasurementStore(path)
+        return _stores[path]
@@ -0,0 +1,417 @@
+"""
+Background recorder of Prometheus metrics and alerts, so the tests don't need
+to run their own polling threads. The recorder polls the configured PromQL
+queries (RUN['metrics_recorder_queries']) and the alerts every
+RUN['metrics_recorder_interval'] seconds and keeps the samples in memory.
+The tests then query windows of the recorded data.
+
+The recorder is shared by all its users, it's started by the first one and
+stopped when the last one leaves the recording() context.
+
+Example::
+
+    with metrics_recorder.recording():
+        start = time.time()
+        ...
+        stop = time.time()
+        alerts = metrics_recorder.get_alerts(start, stop)
+        times, values = metrics_recorder.get_values("iops", start, stop)
+
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import defaults
+
+log = logging.getLogger(__name__)
+
+
+def get_alert_fingerprint(alert):
+    """
+    Get fingerprint of the alert occurrence: the labels, the state and the
+    time when the alert became active, the value of the alert is ignored.
+
+    Args:
+        alert (dict): Alert as returned by Prometheus alerts API
+
+    Returns:
+        str: Fingerprint of the alert
+
+    """
+    key = json.dumps(
+        [alert.get("labels", {}), alert.get("state"), alert.get("activeAt")],
+        sort_keys=True,
+    )
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class SeriesStore(object):
+    """
+    Store of time series samples, times and values of each series are kept
+    in arrays of doubles in the order they were appended
+    """
+
+    def __init__(self):
+        # (name, labels) -> (times, values)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def append(self, name, labels, timestamp, value):
+        """
+        Append a sample to the series
+
+        Args:
+            name (str): Name of the series (metric)
+            labels (dict): Labels of the series
+            timestamp (float): Unix time of the sample
+            value (float): Value of the sample
+
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = (array("d"), array("d"))
+            times, values = self._series[key]
+            times.append(timestamp)
+            values.append(value)
+
+    def get_series(self, name, start=None, stop=None):
+        """
+        Get samples of all the series of the metric in the time window
+
+        Args:
+            name (str): Name of the series (metric)
+            start (float): Start of the window, beginning of the recording if
+                None
+            stop (float): End of the window, now if None
+
+        Returns:
+            dict: Labels (tuple of label items) and (times, values) lists
+
+        """
+        result = {}
+        with self._lock:
+            for (series_name, labels), (times, values) in self._series.items():
+                if series_name != name:
+                    continue
+                first = 0 if start is None else bisect_left(times, start)
+                last = len(times) if stop is None else bisect_right(times, stop)
+                result[labels] = (
+                    times[first:last].tolist(),
+                    values[first:last].tolist(),
+                )
+        return result
+
+    def get_values(self, name, start=None, stop=None):
+        """
+        Get samples of the metric in the time window, values of the series
+        with the same timestamp are summed up
+
+        Args:
+            name (str): Name of the series (metric)
+            start (float): Start of the window
+            stop (float): End of the window
+
+        Returns:
+            tuple: sorted list of times and list of values
+
+        """
+        summed = {}
+        for times, values in self.get_series(name, start, stop).values():
+            for timestamp, value in zip(times, values):
+                summed[timestamp] = summed.get(timestamp, 0) + value
+        times = sorted(summed)
+        return times, [summed[timestamp] for timestamp in times]
+
+    def names(self):
+        """
+        Returns:
+            set: Names of the recorded series
+
+        """
+        with self._lock:
+            return {name for name, _ in self._series}
+
+    def clear(self):
+        with self._lock:
+            self._series = {}
+
+
+class MetricsRecorder(object):
+    """
+    Session wide recorder of Prometheus metrics and alerts
+    """
+
+    def __init__(self):
+        self.store = SeriesStore()
+        # fingerprint -> {"alert", "first_seen", "last_seen"}, insertion
+        # ordered, so the alerts are kept in order of their first occurrence
+        self._alerts = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._users = 0
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._prometheus = None
+        self.errors = 0
+
+    @property
+    def interval(self):
+        """
+        float: Polling interval in seconds
+        """
+        return (
+            config.RUN.get("metrics_recorder_interval")
+            or defaults.METRICS_RECORDER_INTERVAL
+        )
+
+    @property
+    def queries(self):
+        """
+        dict: Name of the series and its PromQL query
+        """
+        queries = config.RUN.get("metrics_recorder_queries")
+        return defaults.METRICS_RECORDER_QUERIES if queries is None else queries
+
+    @property
+    def running(self):
+        """
+        bool: True if the recorder thread is running
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, prometheus=None):
+        """
+        Start the recorder thread, in the current cluster context, if it's not
+        running yet
+
+        Args:
+            prometheus (PrometheusAPI): API object to use, created in the
+                recorder thread if not provided
+
+        """
+        with self._lock:
+            self._users += 1
+            if self.running:
+                return
+            self._prometheus = prometheus
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._record,
+                args=(config.cur_index,),
+                name="MetricsRecorder",
+                daemon=True,
+            )
+            self._thread.start()
+        log.info(f"Recording of prometheus metrics {list(self.queries)} started")
+
+    def stop(self, force=False):
+        """
+        Stop the recorder thread when the last user stops it. The recorded
+        data are kept.
+
+        Args:
+            force (bool): Stop the thread regardless of other users
+
+        """
+        with self._lock:
+            self._users = 0 if force else max(self._users - 1, 0)
+            if self._users or self._thread is None:
+                return
+            thread = self._thread
+            self._thread = None
+            self._stop_event.set()
+        thread.join()
+        log.info("Recording of prometheus metrics stopped")
+
+    @contextmanager
+    def recording(self, prometheus=None):
+        """
+        Context manager which keeps the recorder running
+
+        Args:
+            prometheus (PrometheusAPI): API object to use if the recorder is
+                started
+
+        """
+        self.start(prometheus)
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def _record(self, cluster_index):
+        with config.cluster_context(cluster_index):
+            if self._prometheus is None:
+                from ocs_ci.utility.prometheus import PrometheusAPI
+
+                try:
+                    self._prometheus = PrometheusAPI()
+                except Exception as ex:
+                    log.error(f"Recording of prometheus metrics failed: {ex}")
+                    return
+            while not self._stop_event.is_set():
+                started = time.time()
+                self.poll()
+                self._stop_event.wait(max(self.interval - (time.time() - started), 0))
+
+    def poll(self):
+        """
+        Take one sample of all the queries and alerts
+        """
+        timestamp = time.time()
+        for name, query in self.queries.items():
+            try:
+                results = self._prometheus.query(query, mute_logs=True)
+            except Exception as ex:
+                self.errors += 1
+                log.warning(f"Failed to record {name} metric: {ex}")
+                continue
+            for result in results:
+                self.store.append(
+                    name, result["metric"], timestamp, float(result["value"][1])
+                )
+        try:
+            alerts_response = self._prometheus.get(
+                "alerts", payload={"silenced": False, "inhibited": False}
+            )
+            if not alerts_response.ok:
+                raise ValueError(f"Request {alerts_response.request.url} failed")
+            alerts = alerts_response.json().get("data").get("alerts")
+        except Exception as ex:
+            self.errors += 1
+            log.warning(f"Failed to record prometheus alerts: {ex}")
+            return
+        self.add_alerts(alerts, timestamp)
+
+    def add_alerts(self, alerts, timestamp):
+        """
+        Add alerts seen at given time, occurrences which are already recorded
+        only update their last_seen time
+
+        Args:
+            alerts (list): Alerts as returned by Prometheus alerts API
+            timestamp (float): Unix time when the alerts were seen
+
+        """
+        new_alerts = []
+        with self._lock:
+            for alert in alerts:
+                fingerprint = get_alert_fingerprint(alert)
+                record = self._alerts.get(fingerprint)
+                if record is None:
+                    log.info(f"Adding {alert} to alert list")
+                    self._alerts[fingerprint] = {
+                        "alert": alert,
+                        "first_seen": timestamp,
+                        "last_seen": timestamp,
+                    }
+                    new_alerts.append(alert)
+                else:
+                    record["last_seen"] = timestamp
+            listeners = list(self._listeners)
+        if new_alerts:
+            for listener in listeners:
+                try:
+                    listener(new_alerts, timestamp)
+                except Exception as ex:
+                    log.warning(f"Alert listener {listener} failed: {ex}")
+
+    def add_listener(self, listener):
+        """
+        Register a function called with the list of newly seen alerts and the
+        time when they were seen, e.g. for checkpointing of the alerts
+
+        Args:
+            listener (function): Function with arguments (alerts, timestamp)
+
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Unregister the function registered by add_listener
+
+        Args:
+            listener (function): The registered function
+
+        """
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def get_alerts(self, start=None, stop=None):
+        """
+        Get alerts seen in the time window, in order of their first occurrence
+
+        Args:
+            start (float): Start of the window
+            stop (float): End of the window
+
+        Returns:
+            list: Alerts as returned by Prometheus alerts API
+
+        """
+        with self._lock:
+            return [
+                record["alert"]
+                for record in self._alerts.values()
+                if (start is None or record["last_seen"] >= start)
+                and (stop is None or record["first_seen"] <= stop)
+            ]
+
+    def get_values(self, name, start=None, stop=None):
+        """
+        Get recorded samples of the series, see SeriesStore.get_values
+        """
+        return self.store.get_values(name, start, stop)
+
+    def get_series(self, name, start=None, stop=None):
+        """
+        Get recorded samples of the series, see SeriesStore.get_series
+        """
+        return self.store.get_series(name, start, stop)
+
+    def get_latest(self, query, max_age=None):
+        """
+        Get latest recorded value of the query, values of its series are
+        summed up
+
+        Args:
+            query (str): PromQL query
+            max_age (float): Maximal age of the sample in seconds, two
+                intervals if not provided
+
+        Returns:
+            float: The value or None if the query is not recorded or the
+                sample is too old
+
+        """
+        if not self.running:
+            return None
+        names = [name for name, expr in self.queries.items() if expr == query]
+        if not names:
+            return None
+        max_age = 2 * self.interval if max_age is None else max_age
+        times, values = self.store.get_values(names[0], time.time() - max_age)
+        return values[-1] if values else None
+
+    def reset(self):
+        """
+        Forget all the recorded data
+        """
+        self.store.clear()
+        with self._lock:
+            self._alerts = {}
+        self.errors = 0
+
+
+metrics_recorder = MetricsRecorder()
@@ -11,6 +11,7 @@ from ocs_ci.framework import config
 from ocs_ci.ocs import constants, defaults
 from ocs_ci.ocs.exceptions import AlertingError, AuthError
 from ocs_ci.ocs.ocp import OCP
+from ocs_ci.utility import telemetry
 from ocs_ci.utility.ssl_certs import get_root_ca_cert
 
 logger = logging.getLogger(name=__file__)
@@ -414,6 +415,7 @@ class PrometheusAPI(object):
         logger.debug(f"verify={self._cacert}")
         logger.debug(f"params={payload}")
 
+        start = time.perf_counter()
         response = requests.get(
             self._endpoint + pattern,
             headers=headers,
@@ -434,6 +436,12 @@ class PrometheusAPI(object):
                 verify=self._cacert,
                 params=payload,
             )
+        telemetry.record(
+            telemetry.PROMETHEUS,
+            resource,
+            time.perf_counter() - start,
+            len(response.content),
+        )
         return response
 
     def query(
@@ -17,8 +17,6 @@ from ocs_ci.ocs.exceptions import (
 )
 from ocs_ci.utility import openshift_dedicated as ocm
 from ocs_ci.utility import utils
-
-from ocs_ci.utility.aws import AWS as AWSUtil
 from ocs_ci.utility.managedservice import (
     remove_header_footer_from_key,
     generate_onboarding_token,
@@ -96,6 +94,9 @@ def create_cluster(cluster_name, version, region):
     elif cluster_type.lower() == "consumer" and config.ENV_DATA.get(
         "provider_name", ""
     ):
+        # boto3 is slow to import and it's needed only here
+        from ocs_ci.utility.aws import AWS as AWSUtil
+
         aws = AWSUtil()
         subnet_id = config.ENV_DATA.get("subnet_ids") or ",".join(
             aws.get_cluster_subnet_ids(provider_name)
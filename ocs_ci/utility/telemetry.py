@@ -0,0 +1,229 @@
+"""
+Session wide telemetry of external calls made by tests: local commands
+(forks of oc and other binaries), oc commands, Prometheus and MCG API
+queries and sleeps of TimeoutSampler. Every call is recorded with its
+duration, size of the response and the test which made it.
+
+The last calls are kept in an in-memory ring buffer, while the aggregated
+statistics per test are kept for the whole session and dumped as JSON
+summary at the end of the session (see ocscilib plugin).
+
+Example::
+
+    start = time.perf_counter()
+    response = requests.get(url)
+    telemetry.record(
+        "prometheus", "query", time.perf_counter() - start, len(response.content)
+    )
+
+"""
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from ocs_ci.ocs import defaults
+
+log = logging.getLogger(__name__)
+
+# Categories of the recorded calls
+CMD = "cmd"
+OC = "oc"
+PROMETHEUS = "prometheus"
+MCG_RPC = "mcg_rpc"
+SLEEP = "sleep"
+# Categories which are time spent out of the python code of the test, the oc
+# commands are not included because they are measured as cmd as well
+EXTERNAL_CATEGORIES = (CMD, PROMETHEUS, MCG_RPC, SLEEP)
+# Name of the test used for calls made out of any test
+SESSION = "session"
+
+# Last recorded calls: (timestamp, category, name, duration, size, test)
+CALLS = deque(maxlen=defaults.TELEMETRY_RING_SIZE)
+# {test: {(category, name): [calls, duration, size]}}
+_stats = {}
+# {test: wall time of the test (setup, call and teardown)}
+_test_durations = {}
+_current_test = None
+_lock = threading.Lock()
+
+
+def set_current_test(test):
+    """
+    Set test to which the recorded calls belong
+
+    Args:
+        test (str): Node ID of the test, None when out of any test
+
+    """
+    global _current_test
+    _current_test = test
+
+
+def get_current_test():
+    """
+    Get test to which the recorded calls belong
+
+    Returns:
+        str: Node ID of the current test, SESSION when out of any test
+
+    """
+    return _current_test or SESSION
+
+
+def record(category, name, duration, size=0):
+    """
+    Record one call
+
+    Args:
+        category (str): Category of the call, e.g. CMD
+        name (str): Name of the call within the category, e.g. "oc get"
+        duration (float): Duration of the call in seconds
+        size (int): Size of the response in bytes
+
+    """
+    test = get_current_test()
+    CALLS.append((time.time(), category, name, duration, size, test))
+    with _lock:
+        stats = _stats.setdefault(test, {}).setdefault((category, name), [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] += size
+
+
+def add_test_duration(test, duration):
+    """
+    Add wall time of the test phase (setup, call or teardown)
+
+    Args:
+        test (str): Node ID of the test
+        duration (float): Duration of the phase in seconds
+
+    """
+    with _lock:
+        _test_durations[test] = _test_durations.get(test, 0.0) + duration
+
+
+def _summarize(stats, wall_time=None, top=defaults.TELEMETRY_TOP_N):
+    """
+    Summarize aggregated statistics
+
+    Args:
+        stats (dict): {(category, name): [calls, duration, size]}
+        wall_time (float): Wall time of the test(s) in seconds
+        top (int): Number of the most expensive calls in the summary
+
+    Returns:
+        dict: summary of the calls
+
+    """
+    categories = {}
+    for (category, _), (calls, duration, size) in stats.items():
+        category_stats = categories.setdefault(
+            category, {"calls": 0, "duration": 0.0, "bytes": 0}
+        )
+        category_stats["calls"] += calls
+        category_stats["duration"] += duration
+        category_stats["bytes"] += size
+    external_time = sum(
+        categories.get(category, {}).get("duration", 0.0)
+        for category in EXTERNAL_CATEGORIES
+    )
+    summary = {
+        "forks": categories.get(CMD, {}).get("calls", 0),
+        "sleep": categories.get(SLEEP, {}).get("duration", 0.0),
+        "external_time": external_time,
+        "categories": categories,
+        "top": [
+            {
+                "category": category,
+                "name": name,
+                "calls": calls,
+                "duration": duration,
+                "bytes": size,
+            }
+            for (category, name), (calls, duration, size) in sorted(
+                stats.items(), key=lambda item: item[1][1], reverse=True
+            )[:top]
+        ],
+    }
+    if wall_time is not None:
+        summary["wall_time"] = wall_time
+        summary["python_time"] = max(wall_time - external_time, 0.0)
+    return summary
+
+
+def get_test_summary(test=None, top=defaults.TELEMETRY_TOP_N):
+    """
+    Get summary of the calls made by the test
+
+    Args:
+        test (str): Node ID of the test, the current test if not provided
+        top (int): Number of the most expensive calls in the summary
+
+    Returns:
+        dict: summary of the calls (forks, sleep, categories, top, ...)
+
+    """
+    test = test or get_current_test()
+    with _lock:
+        stats = {key: list(value) for key, value in _stats.get(test, {}).items()}
+        wall_time = _test_durations.get(test)
+    return _summarize(stats, wall_time, top)
+
+
+def get_session_summary(top=defaults.TELEMETRY_TOP_N):
+    """
+    Get summary of the calls made in the whole session and per test
+
+    Args:
+        top (int): Number of the most expensive calls in the summaries
+
+    Returns:
+        dict: summary of the session with "tests" key holding the summary
+            of each test
+
+    """
+    with _lock:
+        tests = list(_stats)
+        session_stats = {}
+        for test_stats in _stats.values():
+            for key, (calls, duration, size) in test_stats.items():
+                stats = session_stats.setdefault(key, [0, 0.0, 0])
+                stats[0] += calls
+                stats[1] += duration
+                stats[2] += size
+        wall_time = sum(_test_durations.values())
+    summary = _summarize(session_stats, wall_time, top)
+    summary["tests"] = {test: get_test_summary(test, top) for test in tests}
+    return summary
+
+
+def dump_summary(path, top=defaults.TELEMETRY_TOP_N, extra=None):
+    """
+    Dump session summary to JSON file
+
+    Args:
+        path (str): Path to the JSON file
+        top (int): Number of the most expensive calls in the summaries
+        extra (dict): Additional data to add to the summary
+
+    """
+    summary = get_session_summary(top)
+    summary.update(extra or {})
+    with open(path, "w") as fd:
+        json.dump(summary, fd, indent=2)
+    log.info(f"Telemetry summary dumped to {path}")
+
+
+def reset():
+    """
+    Forget all the recorded calls
+    """
+    global _current_test
+    with _lock:
+        CALLS.clear()
+        _stats.clear()
+        _test_durations.clear()
+        _current_test = None
@@ -1,15 +1,47 @@
 import json
 import logging
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import date
+from functools import lru_cache
 from jinja2 import Environment, FileSystemLoader, Template
 import yaml
 
 from copy import deepcopy
 
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
 from ocs_ci.ocs.constants import TEMPLATE_DIR
-from ocs_ci.utility.utils import censor_values, get_url_content
+from ocs_ci.utility.utils import get_url_content
 
 logger = logging.getLogger(__name__)
 
+# libyaml based loader and dumper are much faster, pure python ones are used
+# when PyYAML is built without libyaml
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# maximal number of parsed yaml files kept in the cache of load_yaml
+YAML_CACHE_SIZE = 512
+# (path, multi_document) -> (file stat key, parsed data)
+_yaml_cache = OrderedDict()
+_yaml_cache_lock = threading.Lock()
+# types of values loaded by safe loader which are immutable
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None), bytes, date)
+
+# line of block style yaml with a key, e.g. '  - name: value'
+YAML_KEY_LINE_RE = re.compile(
+    r"^(?P<prefix>(?: *- )* *)(?P<key>'[^']*'|\"[^\"]*\"|[^\s'\"#:-][^:#]*?):"
+    r"(?P<value>(?: .*)?)$"
+)
+# values which are not censored, they don't contain secret or they are
+# followed by nested data
+YAML_NOT_CENSORED_VALUES = ("", "null", "~", "{}", "[]")
+# number of resources listed in summary of yaml data
+YAML_SUMMARY_NAMES = 10
+
 
 def load_config_data(data_path):
     """
@@ -51,6 +83,25 @@ def to_nice_yaml(a, indent=2, *args, **kw):
     return transformed
 
 
+@lru_cache(maxsize=None)
+def get_jinja_environment(base_path):
+    """
+    Get jinja2 environment for the templates in base_path. The environment
+    is shared, so the templates are compiled only once (and recompiled when
+    they are changed).
+
+    Args:
+        base_path (str): path from which the jinja2 templates are read
+
+    Returns:
+        jinja2.Environment: environment with to_nice_yaml filter
+
+    """
+    j2_env = Environment(loader=FileSystemLoader(base_path), trim_blocks=True)
+    j2_env.filters["to_nice_yaml"] = to_nice_yaml
+    return j2_env
+
+
 class Templating:
     """
     Class which provides all functionality for templating
@@ -78,9 +129,7 @@ class Templating:
         Returns: rendered template
 
         """
-        j2_env = Environment(loader=FileSystemLoader(self._base_path), trim_blocks=True)
-        j2_env.filters["to_nice_yaml"] = to_nice_yaml
-        j2_template = j2_env.get_template(template_path)
+        j2_template = get_jinja_environment(self._base_path).get_template(template_path)
         return j2_template.render(**data)
 
     @property
@@ -121,7 +170,7 @@ def generate_yaml_from_jinja2_template_with_data(file_, **kwargs):
         data = stream.read()
     template = Template(data)
     out = template.render(**kwargs)
-    return yaml.safe_load(out)
+    return yaml.load(out, Loader=SafeLoader)
 
 
 def dump_to_temp_yaml(src_file, dst_file, **kwargs):
@@ -133,12 +182,73 @@ def dump_to_temp_yaml(src_file, dst_file, **kwargs):
     """
     data = generate_yaml_from_jinja2_template_with_data(src_file, **kwargs)
     with open(dst_file, "w") as yaml_file:
-        yaml.dump(data, yaml_file)
+        yaml.dump(data, yaml_file, Dumper=SafeDumper)
+
+
+def copy_yaml_data(data):
+    """
+    Deep copy of data loaded by safe yaml loader, much faster than deepcopy
+    for the nested dicts and lists of strings and numbers.
+
+    Args:
+        data: data loaded from yaml
+
+    Returns:
+        copy of the data
+
+    """
+    if isinstance(data, dict):
+        return {key: copy_yaml_data(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [copy_yaml_data(value) for value in data]
+    if isinstance(data, _IMMUTABLE_TYPES):
+        return data
+    return deepcopy(data)
+
+
+def _parse_yaml(content, multi_document):
+    if multi_document:
+        return list(yaml.load_all(content, Loader=SafeLoader))
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def _load_yaml_file(file, multi_document):
+    """
+    Parse yaml file, the parsed data are cached (by path, modification time
+    and size of the file) and copy of the cached data is returned.
+    """
+    path = os.path.abspath(file)
+    stat = os.stat(path)
+    stat_key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    cache_key = (path, multi_document)
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(cache_key)
+        if cached is not None and cached[0] == stat_key:
+            _yaml_cache.move_to_end(cache_key)
+            return copy_yaml_data(cached[1])
+    with open(path, "r") as fs:
+        data = _parse_yaml(fs.read(), multi_document)
+    with _yaml_cache_lock:
+        _yaml_cache[cache_key] = (stat_key, data)
+        _yaml_cache.move_to_end(cache_key)
+        while len(_yaml_cache) > YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)
+    return copy_yaml_data(data)
+
+
+def clear_yaml_cache():
+    """
+    Drop all the parsed yaml files cached by load_yaml
+    """
+    with _yaml_cache_lock:
+        _yaml_cache.clear()
 
 
 def load_yaml(file, multi_document=False):
     """
-    Load yaml file (local or from URL) and convert it to dictionary
+    Load yaml file (local or from URL) and convert it to dictionary.
+    Local files are parsed only once (till they are modified), every call
+    returns new copy of the data, so the caller can modify it.
 
     Args:
         file (str): Path to the file or URL address
@@ -151,12 +261,11 @@ def load_yaml(file, multi_document=False):
             iteration returns dict from one loaded document from a file.
 
     """
-    loader = yaml.safe_load_all if multi_document else yaml.safe_load
     if file.startswith("http"):
-        return loader(get_url_content(file))
+        data = _parse_yaml(get_url_content(file), multi_document)
     else:
-        with open(file, "r") as fs:
-            return loader(fs.read())
+        data = _load_yaml_file(file, multi_document)
+    return iter(data) if multi_document else data
 
 
 def get_n_document_from_yaml(yaml_generator, index=0):
@@ -181,7 +290,123 @@ def get_n_document_from_yaml(yaml_generator, index=0):
     raise IndexError(f"Passed yaml generator doesn't have index {index}")
 
 
-def dump_data_to_temp_yaml(data, temp_yaml):
+def censor_yaml(yaml_data):
+    """
+    Censor values of keys which match the patterns defined in
+    config_keys_patterns_to_censor in constants, in yaml dumped in block
+    style. It's a line based filter which doesn't need to load the yaml.
+
+    Args:
+        yaml_data (str): yaml to censor
+
+    Returns:
+        str: censored yaml
+
+    """
+    censored = []
+    # indentation of the censored key, lines indented more belong to its value
+    censored_indent = None
+    for line in yaml_data.splitlines():
+        if censored_indent is not None:
+            if not line.strip() or len(line) - len(line.lstrip(" ")) > censored_indent:
+                continue
+            censored_indent = None
+        match = YAML_KEY_LINE_RE.match(line)
+        if match:
+            key = match.group("key").strip("'\"").lower()
+            value = match.group("value").strip()
+            if value not in YAML_NOT_CENSORED_VALUES and any(
+                pattern in key for pattern in constants.config_keys_patterns_to_censor
+            ):
+                censored_indent = len(match.group("prefix"))
+                line = f"{match.group('prefix')}{match.group('key')}: '{'*' * 5}'"
+        censored.append(line)
+    return "\n".join(censored)
+
+
+def summarize_yaml_data(data):
+    """
+    Get short summary of the resources in the data: number of documents and
+    kinds and names of the resources
+
+    Args:
+        data (dict or list): dict or list (in case of multi_document) with
+            resources
+
+    Returns:
+        str: summary of the data
+
+    """
+    documents = [data] if isinstance(data, dict) else list(data)
+    resources = []
+    for document in documents:
+        if not isinstance(document, dict):
+            continue
+        if document.get("kind") == "List":
+            resources.extend(
+                item for item in document.get("items", []) if isinstance(item, dict)
+            )
+        else:
+            resources.append(document)
+    kinds = Counter(resource.get("kind") for resource in resources)
+    names = [
+        f"{resource.get('kind')}/{resource.get('metadata', {}).get('name')}"
+        for resource in resources[:YAML_SUMMARY_NAMES]
+    ]
+    if len(resources) > YAML_SUMMARY_NAMES:
+        names.append(f"... and {len(resources) - YAML_SUMMARY_NAMES} more")
+    return (
+        f"{len(documents)} document(s) with {len(resources)} resource(s) "
+        f"{dict(kinds)}: {', '.join(names)}"
+    )
+
+
+def log_yaml_data(yaml_data, data):
+    """
+    Log censored yaml, or its summary when the yaml is longer than
+    RUN['manifest_log_limit']
+
+    Args:
+        yaml_data (str): dumped data
+        data (dict or list): the data which were dumped
+
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    limit = config.RUN.get("manifest_log_limit")
+    if limit is None or len(yaml_data) <= limit:
+        logger.info(censor_yaml(yaml_data))
+    else:
+        logger.info(
+            f"Dumped {len(yaml_data)} bytes of yaml: {summarize_yaml_data(data)}"
+        )
+
+
+def dump_data_to_yaml(data, log_data=True):
+    """
+    Dump data to yaml string, e.g. for passing it to 'oc create -f -'
+
+    Args:
+        data (dict or list): dict or list (in case of multi_document) with
+            data to dump.
+        log_data (bool): False for not logging the dumped data
+
+    Returns:
+        str: dumped yaml data
+
+    """
+    dumper = yaml.dump if isinstance(data, dict) else yaml.dump_all
+    try:
+        yaml_data = dumper(data, Dumper=SafeDumper)
+    except yaml.representer.RepresenterError:
+        # data contain python objects which safe dumper can't represent
+        yaml_data = dumper(data)
+    if log_data:
+        log_yaml_data(yaml_data, data)
+    return yaml_data
+
+
+def dump_data_to_temp_yaml(data, temp_yaml, log_data=True):
     """
     Dump data to temporary yaml file
 
@@ -189,20 +414,15 @@ def dump_data_to_temp_yaml(data, temp_yaml):
         data (dict or list): dict or list (in case of multi_document) with
             data to dump to the yaml file.
         temp_yaml (str): file path of yaml file
+        log_data (bool): False for not logging the dumped data
 
     Returns:
         str: dumped yaml data
 
     """
-    dumper = yaml.dump if isinstance(data, dict) else yaml.dump_all
-    yaml_data = dumper(data)
+    yaml_data = dump_data_to_yaml(data, log_data=log_data)
     with open(temp_yaml, "w") as yaml_file:
         yaml_file.write(yaml_data)
-    if isinstance(data, dict):
-        yaml_data_censored = dumper(censor_values(deepcopy(data)))
-    else:
-        yaml_data_censored = [dumper(censor_values(deepcopy(doc))) for doc in data]
-    logger.info(yaml_data_censored)
     return yaml_data
 
 
@@ -0,0 +1,104 @@
+# -*- coding: utf8 -*-
+
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from ocs_ci import framework
+from ocs_ci.utility import artifact_collector as artifact_collector_module
+from ocs_ci.utility.artifact_collector import ArtifactCollector
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.setitem(framework.config.RUN, "log_dir", str(tmp_path))
+    monkeypatch.setitem(framework.config.RUN, "run_id", "1")
+    monkeypatch.setitem(framework.config.RUN, "failure_artifacts_workers", 2)
+    monkeypatch.setitem(framework.config.RUN, "failure_artifacts_queue_size", 2)
+    monkeypatch.setattr(artifact_collector_module, "log", Mock())
+    yield ArtifactCollector()
+
+
+def test_collect_in_background(collector, tmp_path):
+    release = threading.Event()
+    collected = []
+
+    def collect(name):
+        release.wait(10)
+        collected.append(name)
+
+    def fail():
+        raise ValueError("no cluster")
+
+    collector.submit("logs", collect, "test_a", nodeid="test.py::test_a")
+    collector.submit("metrics", fail, nodeid="test.py::test_a")
+    # the hook doesn't wait for the collectors
+    assert collected == []
+    release.set()
+    assert collector.drain(timeout=10) == []
+    assert collected == ["test_a"]
+
+    manifest = tmp_path / "failed_testcase_ocs_logs_1" / "artifacts.json"
+    records = json.loads(manifest.read_text())
+    assert [record["status"] for record in records] == ["done", "failed: no cluster"]
+    assert records[0]["nodeid"] == "test.py::test_a"
+    assert records[0]["failed_at"] <= records[0]["started"] <= records[0]["finished"]
+
+
+def test_drain_timeout(collector, monkeypatch):
+    monkeypatch.setitem(framework.config.RUN, "failure_artifacts_queue_size", 3)
+    release = threading.Event()
+    collector.submit("logs", release.wait, 10, nodeid="test.py::test_b")
+    collector.submit("metrics", release.wait, 10, nodeid="test.py::test_b")
+    collector.submit("perf", release.wait, 10, nodeid="test.py::test_b")
+    pending = collector.drain(timeout=0.1)
+    # the hung collectors don't block the exit of the interpreter
+    assert all(
+        thread.daemon
+        for thread in threading.enumerate()
+        if thread.name.startswith("ArtifactCollector")
+    )
+    release.set()
+    assert [record["name"] for record in pending] == ["logs", "metrics", "perf"]
+    assert [record["status"] for record in pending] == [
+        "abandoned",
+        "abandoned",
+        "cancelled",
+    ]
+
+
+def test_collect_synchronously(collector, monkeypatch):
+    monkeypatch.setitem(framework.config.RUN, "failure_artifacts_workers", 0)
+    collected = []
+    collector.submit("logs", collected.append, "test_c", nodeid="test.py::test_c")
+    assert collected == ["test_c"]
+
+
+def test_drain_again_after_timeout(collector):
+    release = threading.Event()
+    collector.submit("logs", release.wait, 10, nodeid="test.py::test_d")
+    assert len(collector.drain(timeout=0.1)) == 1
+    # the collector submitted after the drain gets a new queue, the abandoned
+    # one releases its slot to the old one
+    collector.submit("metrics", lambda: None, nodeid="test.py::test_d")
+    release.set()
+    # only the new collector is waited for
+    assert collector.drain(timeout=10) == []
+    assert collector.tasks[1][0]["status"] == "done"
+
+
+def test_submit_timeout(collector, monkeypatch):
+    monkeypatch.setitem(framework.config.RUN, "failure_artifacts_submit_timeout", 0.1)
+    release = threading.Event()
+    collector.submit("logs", release.wait, 10, nodeid="test.py::test_e")
+    collector.submit("metrics", release.wait, 10, nodeid="test.py::test_e")
+    collector.submit("perf", release.wait, 10, nodeid="test.py::test_e")
+    release.set()
+    assert collector.drain(timeout=10) == []
+    assert [record["status"] for record, _ in collector.tasks] == [
+        "done",
+        "done",
+        "skipped",
+    ]
@@ -0,0 +1,74 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from ocs_ci.utility import aws
+
+
+def reservation(*instances):
+    return {
+        "Instances": [
+            {"InstanceId": instance_id, "State": {"Code": code}}
+            for instance_id, code in instances
+        ]
+    }
+
+
+@pytest.fixture
+def aws_obj():
+    aws_obj = aws.AWS(region_name="us-east-2")
+    aws_obj._ec2_client = MagicMock()
+    return aws_obj
+
+
+def test_describe_instances_pages_and_cache(aws_obj):
+    paginator = aws_obj.ec2_client.get_paginator.return_value
+    paginator.paginate.return_value = [
+        {"Reservations": [reservation(("i-1", 16), ("i-2", 80))]},
+        {"Reservations": [reservation(("i-3", 64))]},
+    ]
+    instances = aws_obj.describe_instances(["i-3", "i-2", "i-1"])
+    assert [instance["InstanceId"] for instance in instances] == ["i-1", "i-2", "i-3"]
+    paginator.paginate.assert_called_once_with(InstanceIds=["i-1", "i-2", "i-3"])
+
+    # the cached result is used and it can't be changed by the callers
+    instances[0]["State"]["Code"] = 0
+    assert aws_obj.describe_instances(["i-1", "i-2", "i-3"])[0]["State"]["Code"] == 16
+    assert paginator.paginate.call_count == 1
+    assert aws_obj.get_instances_status(["i-1", "i-2", "i-3"]) == {
+        "i-1": 16,
+        "i-2": 80,
+        "i-3": 64,
+    }
+    assert paginator.paginate.call_count == 2
+
+
+def test_wait_for_volumes_state(aws_obj):
+    paginator = aws_obj.ec2_client.get_paginator.return_value
+    paginator.paginate.side_effect = [
+        [{"Volumes": [{"VolumeId": "vol-1", "State": "in-use"}]}],
+        [{"Volumes": [{"VolumeId": "vol-1", "State": "available"}]}],
+    ]
+    with patch.object(aws.time, "sleep"):
+        aws_obj.wait_for_volumes_state(["vol-1"], "available")
+    assert paginator.paginate.call_count == 2
+
+    paginator.paginate.side_effect = None
+    paginator.paginate.return_value = [
+        {"Volumes": [{"VolumeId": "vol-1", "State": "in-use"}]}
+    ]
+    with pytest.raises(aws.AWSTimeoutException):
+        aws_obj.wait_for_volumes_state(["vol-1"], "available", timeout=0)
+
+
+def test_get_instances_ids_and_names():
+    node = Mock(
+        data={
+            "metadata": {"name": "worker-0"},
+            "spec": {"providerID": "aws:///us-east-2a/i-0abc"},
+        }
+    )
+    assert aws.get_instances_ids_and_names([node]) == {"i-0abc": "worker-0"}
+    node.get.assert_not_called()
@@ -0,0 +1,28 @@
+# -*- coding: utf8 -*-
+
+import os
+
+from ocs_ci.utility import benchmark
+
+
+def test_measure():
+    stats, result = benchmark.measure(sum, [1, 2], rounds=3)
+    assert result == 3
+    assert stats["rounds"] == 3
+    assert stats["min"] <= stats["median"] <= stats["max"]
+
+
+def test_compare_with_baseline(tmp_path):
+    old = benchmark.BenchmarkSession(commit="aaa", machine="m")
+    old.results = {"fast": {"median": 1.0}, "slow": {"median": 1.0}}
+    old_path = old.save(str(tmp_path))
+    os.utime(old_path, (1, 1))
+    new = benchmark.BenchmarkSession(commit="bbb", machine="m")
+    new.results = {"fast": {"median": 1.1}, "slow": {"median": 1.5}}
+    new.save(str(tmp_path))
+
+    baseline = benchmark.load_baseline(str(tmp_path), machine="m", exclude_commit="bbb")
+    assert baseline["commit"] == "aaa"
+    assert new.compare(baseline, tolerance=0.2) == [("slow", 1.0, 1.5, 1.5)]
+    assert benchmark.load_baseline(str(tmp_path), machine="m")["commit"] == "bbb"
+    assert benchmark.load_baseline(str(tmp_path), machine="other") is None
@@ -0,0 +1,43 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ocs_ci.utility import cluster_facts as cluster_facts_module
+from ocs_ci.utility.cluster_facts import ClusterFacts
+
+
+@pytest.fixture
+def facts():
+    get_ocp_version = Mock(return_value="4.11")
+    get_kms_enabled = Mock(side_effect=KeyError("storagecluster"))
+    with patch.dict(
+        ClusterFacts.FACTS,
+        {"ocp_version": get_ocp_version, "kms_enabled": get_kms_enabled},
+    ), patch.object(cluster_facts_module, "log"):
+        yield ClusterFacts(), get_ocp_version, get_kms_enabled
+
+
+def test_facts_are_loaded_once(facts):
+    cluster_facts, get_ocp_version, _ = facts
+    cluster_facts.load(["ocp_version"])
+    assert cluster_facts.ocp_version == "4.11"
+    assert cluster_facts.ocp_version == "4.11"
+    get_ocp_version.assert_called_once()
+
+
+def test_fact_errors_are_memoized(facts):
+    cluster_facts, _, get_kms_enabled = facts
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            cluster_facts.kms_enabled
+    get_kms_enabled.assert_called_once()
+
+
+def test_reset(facts):
+    cluster_facts, get_ocp_version, _ = facts
+    assert cluster_facts.ocp_version == "4.11"
+    cluster_facts.reset()
+    assert cluster_facts.ocp_version == "4.11"
+    assert get_ocp_version.call_count == 2
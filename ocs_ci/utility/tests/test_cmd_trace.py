@@ -0,0 +1,57 @@
+# -*- coding: utf8 -*-
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility import cmd_trace, utils
+
+
+def fake_run(cmd, **kwargs):
+    return subprocess.CompletedProcess(cmd, 0, f"out of {cmd[-1]}".encode(), b"")
+
+
+def test_get_command_key():
+    cmd = ["oc", "--kubeconfig", "/cluster/auth/kubeconfig", "-n", "ns", "get", "pod"]
+    assert cmd_trace.get_command_key(cmd) == "oc -n ns get pod"
+    assert cmd_trace.get_command_key(["oc", "--kubeconfig=/k", "get", "pod"]) == (
+        "oc get pod"
+    )
+
+
+def test_record_and_replay(tmp_path):
+    trace_path = str(tmp_path / "commands.trace.gz")
+    with patch.object(utils.subprocess, "run", side_effect=fake_run) as run:
+        with cmd_trace.CommandTrace(trace_path, cmd_trace.RECORD) as trace:
+            utils.exec_cmd("oc --kubeconfig /a/kubeconfig get first")
+            utils.exec_cmd("oc get secret password", secrets=["password"])
+            utils.exec_cmd("oc get first")
+        assert cmd_trace.get_active() is None
+        assert trace.commands == 3
+        header, entries = cmd_trace.load_trace(trace_path)
+        assert header["trace"] == cmd_trace.TRACE_VERSION
+        assert [entry["cmd"] for entry in entries] == [
+            "oc get first",
+            "oc get secret *****",
+            "oc get first",
+        ]
+        assert entries[1]["stdout"] == "out of *****"
+        run.reset_mock()
+
+        with cmd_trace.CommandTrace(
+            trace_path, cmd_trace.REPLAY, time_scale=0
+        ) as trace:
+            out = utils.exec_cmd("oc --kubeconfig /b/kubeconfig get first").stdout
+            assert out == b"out of first"
+            # the last result is repeated when the recorded ones run out
+            for _ in range(2):
+                assert utils.exec_cmd("oc get first").stdout == b"out of first"
+            utils.exec_cmd("oc get secret password", secrets=["password"])
+            with patch.object(cmd_trace, "log"), patch.object(utils, "log"):
+                with pytest.raises(CommandFailed):
+                    utils.exec_cmd("oc get unknown")
+        run.assert_not_called()
+        assert trace.commands == 5
+        assert trace.missing == 1
@@ -0,0 +1,85 @@
+# -*- coding: utf8 -*-
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from ocs_ci.utility import fake_api_server
+
+
+def pod(name, app, namespace="openshift-storage"):
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {"name": name, "namespace": namespace, "labels": {"app": app}},
+        "status": {"phase": "Running"},
+    }
+
+
+def get(server, path):
+    with urllib.request.urlopen(server.url + path, timeout=10) as response:
+        return json.loads(response.read())
+
+
+@pytest.fixture
+def server(tmp_path):
+    pods_file = tmp_path / "pods.yaml"
+    pods_file.write_text(
+        json.dumps(
+            {
+                "apiVersion": "v1",
+                "kind": "List",
+                "items": [pod("osd-0", "rook-ceph-osd"), pod("mon-a", "rook-ceph-mon")],
+            }
+        )
+    )
+    with fake_api_server.FakeAPIServer() as server:
+        assert server.load(str(pods_file)) == 2
+        server.add(
+            {
+                "apiVersion": "storage.k8s.io/v1",
+                "kind": "StorageClass",
+                "metadata": {"name": "ocs-storagecluster-ceph-rbd"},
+            }
+        )
+        yield server
+
+
+def test_discovery(server):
+    resources = get(server, "/api/v1")["resources"]
+    assert [(r["name"], r["namespaced"]) for r in resources] == [("pods", True)]
+    groups = get(server, "/apis")["groups"]
+    assert groups[0]["preferredVersion"]["groupVersion"] == "storage.k8s.io/v1"
+    resources = get(server, "/apis/storage.k8s.io/v1")["resources"]
+    assert resources[0]["name"] == "storageclasses"
+    assert not resources[0]["namespaced"]
+
+
+def test_get_and_list(server):
+    pods = get(server, "/api/v1/namespaces/openshift-storage/pods")
+    assert [item["metadata"]["name"] for item in pods["items"]] == ["mon-a", "osd-0"]
+    pods = get(server, "/api/v1/pods?labelSelector=app%3Drook-ceph-osd")
+    assert [item["metadata"]["name"] for item in pods["items"]] == ["osd-0"]
+    assert get(server, "/api/v1/namespaces/openshift-storage/pods/mon-a")["status"]
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(server, "/api/v1/namespaces/openshift-storage/pods/osd-1")
+    assert error.value.code == 404
+
+
+def test_watch(server):
+    version = get(server, "/api/v1/pods")["metadata"]["resourceVersion"]
+    server.add(pod("osd-1", "rook-ceph-osd"))
+    server.add(pod("mon-b", "rook-ceph-mon"))
+    server.delete(pod("osd-0", "rook-ceph-osd"))
+    url = (
+        f"{server.url}/api/v1/pods?watch=true&labelSelector=app%3Drook-ceph-osd"
+        f"&resourceVersion={version}&timeoutSeconds=1"
+    )
+    with urllib.request.urlopen(url, timeout=10) as response:
+        events = [json.loads(line) for line in response]
+    assert [(e["type"], e["object"]["metadata"]["name"]) for e in events] == [
+        ("ADDED", "osd-1"),
+        ("DELETED", "osd-0"),
+    ]
@@ -0,0 +1,121 @@
+# -*- coding: utf8 -*-
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ocs_ci.utility import measurement_store, workloadfixture
+
+
+def alert(name, state):
+    return {"labels": {"alertname": name}, "state": state, "activeAt": "0"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with patch.object(measurement_store, "get_cluster_id", return_value="c1"):
+        yield measurement_store.MeasurementStore(str(tmp_path / "m.jsonl"))
+
+
+def test_store_reload(store):
+    measurement = store.start("measure_a", metadata={"pod": "a"})
+    store.add_alerts(measurement, [alert("A", "pending")])
+    store.add_alerts(measurement, [alert("A", "pending"), alert("A", "firing")])
+    store.operation_done(measurement, 10, {"osd": 1})
+    assert not measurement.done
+    store.stop(measurement, 20, pagerduty_incidents=[])
+
+    reloaded = measurement_store.MeasurementStore(store.path)
+    loaded = reloaded.get("measure_a", cluster_id="c1")
+    assert loaded.done
+    assert loaded.results == {
+        "start": 10,
+        "stop": 20,
+        "result": {"osd": 1},
+        "metadata": {"pod": "a"},
+        "prometheus_alerts": [alert("A", "pending"), alert("A", "firing")],
+        "pagerduty_incidents": [],
+    }
+    assert reloaded.get("measure_a", cluster_id="c2") is None
+
+
+def test_store_interrupted_write(store):
+    measurement = store.start("measure_a")
+    with open(store.path, "a") as store_file:
+        store_file.write('{"name": "measure_a", "clus')
+    store.operation_done(measurement, 10, None)
+    reloaded = measurement_store.MeasurementStore(store.path)
+    with patch.object(measurement_store, "log"):
+        assert reloaded.get("measure_a", cluster_id="c1").operation_done
+
+
+def test_measure_operation_resume(tmp_path, store):
+    result_file = str(tmp_path / "measure_a.json")
+    operation = Mock(return_value="done")
+    recorder = Mock()
+    recorder.get_alerts.return_value = [alert("A", "firing")]
+    with patch.object(
+        workloadfixture,
+        "get_measurement_store",
+        return_value=store,
+    ), patch.object(workloadfixture, "metrics_recorder", recorder):
+        # measurement interrupted after the operation
+        measurement = store.start("measure_a")
+        store.operation_done(measurement, 10, "interrupted")
+        results = workloadfixture.measure_operation(operation, result_file)
+        operation.assert_not_called()
+        assert results["result"] == "interrupted"
+        assert results["first_run"]
+        assert results["resumed"]
+        assert results["prometheus_alerts"] == [alert("A", "firing")]
+        with open(result_file) as open_file:
+            assert json.load(open_file)["result"] == "interrupted"
+
+        assert workloadfixture.is_measurement_done(result_file)
+        results = workloadfixture.measure_operation(operation, result_file)
+        assert not results["first_run"]
+        operation.assert_not_called()
+
+
+def test_measure_operation_first_run(tmp_path, store):
+    result_file = str(tmp_path / "measure_b.json")
+    operation = Mock(return_value="done")
+    recorder = Mock()
+    recorder.get_alerts.return_value = []
+    with patch.object(
+        workloadfixture,
+        "get_measurement_store",
+        return_value=store,
+    ), patch.object(workloadfixture, "metrics_recorder", recorder):
+        results = workloadfixture.measure_operation(operation, result_file)
+        operation.assert_called_once()
+        assert results["first_run"]
+        assert not results["resumed"]
+        with open(result_file) as open_file:
+            assert "first_run" not in json.load(open_file)
+        assert store.get("measure_b", cluster_id="c1").done
+
+
+def test_measure_operation_failed_not_resumed(tmp_path, store):
+    result_file = str(tmp_path / "measure_c.json")
+    operation = Mock(return_value="done")
+    recorder = Mock()
+    recorder.get_alerts.return_value = []
+    with patch.object(
+        workloadfixture,
+        "get_measurement_store",
+        return_value=store,
+    ), patch.object(workloadfixture, "metrics_recorder", recorder):
+        # measurement interrupted after the operation failed
+        measurement = store.start("measure_c")
+        store.operation_done(measurement, 10, None, error="ValueError()")
+        reloaded = measurement_store.MeasurementStore(store.path)
+        loaded = reloaded.get("measure_c", cluster_id="c1")
+        assert not loaded.operation_done
+        assert loaded.error == "ValueError()"
+
+        results = workloadfixture.measure_operation(operation, result_file)
+        operation.assert_called_once()
+        assert results["result"] == "done"
+        assert not results["resumed"]
@@ -0,0 +1,66 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ocs_ci.utility import metrics_recorder as metrics_recorder_module
+from ocs_ci.utility.metrics_recorder import MetricsRecorder, SeriesStore
+
+
+def alert(name, state, value="1"):
+    return {
+        "labels": {"alertname": name},
+        "state": state,
+        "activeAt": "2022-01-01T00:00:00Z",
+        "value": value,
+    }
+
+
+@pytest.fixture
+def recorder():
+    with patch.object(metrics_recorder_module, "log"):
+        yield MetricsRecorder()
+
+
+def test_series_store_window():
+    store = SeriesStore()
+    for timestamp in range(10):
+        store.append("iops", {"pool": "a"}, timestamp, 1)
+        store.append("iops", {"pool": "b"}, timestamp, 2)
+    times, values = store.get_values("iops", 3, 5)
+    assert times == [3, 4, 5]
+    assert values == [3, 3, 3]
+    series = store.get_series("iops", start=8)
+    assert series[(("pool", "a"),)] == ([8, 9], [1, 1])
+    assert store.get_values("latency") == ([], [])
+
+
+def test_alerts_deduplication(recorder):
+    recorder.add_alerts([alert("CephMonDown", "pending")], 10)
+    recorder.add_alerts(
+        [alert("CephMonDown", "pending", value="2"), alert("CephMonDown", "firing")],
+        13,
+    )
+    recorder.add_alerts([alert("CephMonDown", "firing")], 16)
+    alerts = recorder.get_alerts()
+    assert [a["state"] for a in alerts] == ["pending", "firing"]
+    assert [a["state"] for a in recorder.get_alerts(start=14)] == ["firing"]
+    assert recorder.get_alerts(stop=9) == []
+
+
+def test_poll(recorder):
+    prometheus = Mock()
+    prometheus.query.return_value = [{"metric": {}, "value": [0, "42.5"]}]
+    prometheus.get.return_value.json.return_value = {
+        "data": {"alerts": [alert("CephOSDDiskNotResponding", "firing")]}
+    }
+    recorder._prometheus = prometheus
+    with patch.dict(
+        metrics_recorder_module.config.RUN, {"metrics_recorder_queries": {"iops": "q"}}
+    ):
+        recorder.poll()
+        times, values = recorder.get_values("iops")
+        assert values == [42.5]
+        assert recorder.get_latest("q") is None  # recorder is not running
+    assert len(recorder.get_alerts()) == 1
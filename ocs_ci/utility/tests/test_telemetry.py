@@ -0,0 +1,49 @@
+# -*- coding: utf8 -*-
+
+import json
+
+import pytest
+
+from ocs_ci.utility import telemetry, utils
+
+
+@pytest.fixture(autouse=True)
+def reset_telemetry():
+    telemetry.reset()
+    yield
+    telemetry.reset()
+
+
+def test_record_per_test():
+    telemetry.set_current_test("tests/test_a.py::test_a")
+    telemetry.record(telemetry.CMD, "oc get", 0.5, 100)
+    telemetry.record(telemetry.CMD, "oc get", 1.5, 300)
+    telemetry.record(telemetry.SLEEP, "check_status", 3)
+    telemetry.add_test_duration("tests/test_a.py::test_a", 10)
+    telemetry.set_current_test(None)
+    telemetry.record(telemetry.PROMETHEUS, "query", 1, 10)
+
+    summary = telemetry.get_test_summary("tests/test_a.py::test_a")
+    assert summary["forks"] == 2
+    assert summary["sleep"] == 3
+    assert summary["python_time"] == 10 - 2 - 3
+    assert summary["top"][0] == {
+        "category": telemetry.SLEEP,
+        "name": "check_status",
+        "calls": 1,
+        "duration": 3,
+        "bytes": 0,
+    }
+    assert summary["categories"][telemetry.CMD]["bytes"] == 400
+    assert len(telemetry.CALLS) == 4
+    assert telemetry.CALLS[-1][-1] == telemetry.SESSION
+
+
+def test_exec_cmd_and_dump(tmp_path):
+    utils.run_cmd("echo hello")
+    summary_file = tmp_path / "telemetry.json"
+    telemetry.dump_summary(str(summary_file), top=1)
+    summary = json.loads(summary_file.read_text())
+    assert summary["forks"] == 1
+    assert summary["top"][0]["name"] == "echo hello"
+    assert summary["tests"][telemetry.SESSION]["forks"] == 1
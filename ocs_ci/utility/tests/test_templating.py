@@ -0,0 +1,79 @@
+# -*- coding: utf8 -*-
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from ocs_ci.utility import templating
+
+
+@pytest.fixture
+def yaml_file(tmp_path):
+    templating.clear_yaml_cache()
+    path = tmp_path / "pod.yaml"
+    path.write_text("metadata:\n  name: pod\n  labels: [a, b]\n")
+    yield str(path)
+    templating.clear_yaml_cache()
+
+
+def test_load_yaml_returns_copies(yaml_file):
+    data = templating.load_yaml(yaml_file)
+    data["metadata"]["name"] = "changed"
+    data["metadata"]["labels"].append("c")
+    assert templating.load_yaml(yaml_file) == {
+        "metadata": {"name": "pod", "labels": ["a", "b"]}
+    }
+
+
+def test_load_yaml_file_modified(yaml_file):
+    assert templating.load_yaml(yaml_file)["metadata"]["name"] == "pod"
+    with open(yaml_file, "w") as f:
+        f.write("metadata:\n  name: another-pod\n")
+    stat = os.stat(yaml_file)
+    os.utime(yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert templating.load_yaml(yaml_file)["metadata"]["name"] == "another-pod"
+
+
+def test_load_yaml_multi_document(tmp_path):
+    path = tmp_path / "docs.yaml"
+    path.write_text("a: 1\n---\nb: 2\n")
+    for _ in range(2):
+        docs = templating.load_yaml(str(path), multi_document=True)
+        assert templating.get_n_document_from_yaml(docs, 1) == {"b": 2}
+    templating.clear_yaml_cache()
+
+
+def test_censor_yaml():
+    data = {
+        "stringData": {"password": "x" * 200, "user": "admin"},
+        "items": [{"token": "multi\nline\n", "name": "a"}],
+        "secretKeyRef": {"key": "k", "name": "s"},
+    }
+    censored = templating.censor_yaml(templating.dump_data_to_yaml(data, False))
+    assert "x" * 10 not in censored
+    assert "line" not in censored
+    assert yaml.safe_load(censored) == {
+        "stringData": {"password": "*****", "user": "admin"},
+        "items": [{"token": "*****", "name": "a"}],
+        "secretKeyRef": {"key": "*****", "name": "s"},
+    }
+
+
+def test_dump_data_to_temp_yaml_summary(tmp_path):
+    pvcs = [
+        {"kind": "PersistentVolumeClaim", "metadata": {"name": f"pvc-{i}"}}
+        for i in range(100)
+    ]
+    temp_yaml = str(tmp_path / "pvcs.yaml")
+    with patch.dict(templating.config.RUN, {"manifest_log_limit": 100}), patch.object(
+        templating, "logger"
+    ) as logger:
+        yaml_data = templating.dump_data_to_temp_yaml(pvcs, temp_yaml)
+    with open(temp_yaml) as f:
+        assert f.read() == yaml_data
+    assert list(yaml.safe_load_all(yaml_data)) == pvcs
+    message = logger.info.call_args[0][0]
+    assert "100 resource(s) {'PersistentVolumeClaim': 100}" in message
+    assert "... and 90 more" in message
@@ -6,6 +6,7 @@ from sys import platform
 
 import pytest
 
+from ocs_ci import framework
 from ocs_ci.ocs.exceptions import CommandFailed
 from ocs_ci.utility import utils
 
@@ -139,6 +140,40 @@ def test_run_cmd_simple_negative_ignoreerror(caplog):
     assert caplog.records[3].message == f"Command return code: {return_code}"
 
 
+def test_mask_secret_overlapping():
+    """
+    Checking that longer secrets are masked even if they contain shorter one.
+    """
+    assert utils.mask_secrets("token abcdef", ["abc", "abcdef"]) == "token *****"
+
+
+def test_run_cmd_output_stats():
+    """
+    Checking that exec_cmd counts the commands and size of their output.
+    """
+    before = utils.get_cmd_output_stats().get("echo hello", {"calls": 0})["calls"]
+    utils.run_cmd("echo hello")
+    stats = utils.get_cmd_output_stats()["echo hello"]
+    assert stats["calls"] == before + 1
+    assert stats["stdout_bytes"] >= 5
+    assert utils.get_cmd_stats_key(["oc", "-n", "ns", "get", "pods"]) == "oc get"
+
+
+def test_truncate_cmd_output(tmp_path, monkeypatch):
+    """
+    Checking that long command output is truncated and stored to a file.
+    """
+    monkeypatch.setitem(utils.config.RUN, "cmd_output_log_limit", 10)
+    monkeypatch.setitem(utils.config.RUN, "log_dir", str(tmp_path))
+    monkeypatch.setitem(utils.config.RUN, "run_id", "1")
+    assert utils.truncate_cmd_output("short", ["oc", "get"]) == "short"
+    message = utils.truncate_cmd_output("x" * 25, ["oc", "get"])
+    assert message.startswith("x" * 10 + "\n... (15 more characters")
+    output_file = message.split("full output: ")[1][:-1]
+    with open(output_file) as fd:
+        assert fd.read() == "x" * 25
+
+
 class A:
     def __init__(self, amount):
         self.num = amount
@@ -166,3 +201,32 @@ def test_get_none_obj_attr():
 
 def test_get_empty_attr():
     assert utils.get_attr_chain(A(1), "") is None
+
+
+@pytest.fixture
+def multicluster_config():
+    framework.config.nclusters = 3
+    framework.config.init_cluster_configs()
+    for index, cluster in enumerate(framework.config.clusters):
+        cluster.ENV_DATA["cluster_name"] = f"cluster{index}"
+    yield framework.config
+    framework.config.nclusters = 1
+    framework.config.clusters.clear()
+    framework.config._single_cluster_init_cluster_configs()
+
+
+def test_run_func_multicluster(multicluster_config):
+    def get_cluster_name(suffix):
+        if multicluster_config.cur_index == 0:
+            raise CommandFailed("unreachable")
+        return multicluster_config.current_cluster_name() + suffix
+
+    with pytest.raises(CommandFailed):
+        utils.run_func_multicluster(get_cluster_name, "-x")
+    results = utils.run_func_multicluster(get_cluster_name, "-x", raise_on_error=False)
+    assert [result.index for result in results] == [0, 1, 2]
+    assert isinstance(results[0].error, CommandFailed)
+    assert [result.result for result in results[1:]] == ["cluster1-x", "cluster2-x"]
+    results = utils.run_func_multicluster(get_cluster_name, "-y", skip_index=0)
+    assert [result.cluster_name for result in results] == ["cluster1", "cluster2"]
+    assert multicluster_config.cur_index == 0
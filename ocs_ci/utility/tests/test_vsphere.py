@@ -0,0 +1,75 @@
+# -*- coding: utf8 -*-
+
+from unittest.mock import patch
+
+import pytest
+from pyVmomi import vim
+
+from ocs_ci.utility import vsphere
+
+DC = vim.Datacenter("datacenter-1")
+CLUSTER = vim.ClusterComputeResource("domain-c1")
+ROOT_POOL = vim.ResourcePool("resgroup-1")
+POOL = vim.ResourcePool("resgroup-2")
+NESTED_POOL = vim.ResourcePool("resgroup-3")
+VM = vim.VirtualMachine("vm-1")
+
+INVENTORY = {
+    "Datacenter": {DC: {"name": "dc"}},
+    "ClusterComputeResource": {CLUSTER: {"name": "cluster", "parent": DC}},
+    "ResourcePool": {
+        ROOT_POOL: {"name": "Resources", "parent": CLUSTER},
+        POOL: {"name": "ocs-ci", "parent": ROOT_POOL},
+        NESTED_POOL: {"name": "nested", "parent": POOL},
+    },
+}
+
+
+@pytest.fixture
+def vsphere_obj():
+    def get_inventory(vimtype, **kwargs):
+        if vimtype == [vim.VirtualMachine]:
+            return dict(vms)
+        return dict(INVENTORY[vimtype[0].__name__.split(".")[-1]])
+
+    vms = {}
+    with patch.object(vsphere.VSPHERE, "_get_service_instance"):
+        vsphere_obj = vsphere.VSPHERE("host", "user", "password")
+    with patch.object(
+        vsphere_obj, "get_inventory", side_effect=get_inventory
+    ) as get_inventory_mock:
+        vsphere_obj.vms = vms
+        vsphere_obj.get_inventory_mock = get_inventory_mock
+        yield vsphere_obj
+
+
+def test_get_pool(vsphere_obj):
+    assert vsphere_obj.get_pool("ocs-ci", "dc", "cluster") == POOL
+    # only direct children of the cluster root pool
+    assert vsphere_obj.get_pool("nested", "dc", "cluster") is None
+    assert vsphere_obj.is_resource_pool_prefix_exist("ocs", "dc", "cluster")
+    calls = vsphere_obj.get_inventory_mock.call_count
+    assert vsphere_obj.get_pool("ocs-ci", "dc", "cluster") == POOL
+    assert vsphere_obj.get_inventory_mock.call_count == calls
+
+
+def test_get_pool_vm_names_refresh(vsphere_obj):
+    assert vsphere_obj.get_pool_vm_names("ocs-ci", "dc", "cluster") == {}
+    vsphere_obj.vms[VM] = {"name": "compute-0"}
+    assert vsphere_obj.get_pool_vm_names("ocs-ci", "dc", "cluster") == {}
+    assert vsphere_obj.get_pool_vm_names("ocs-ci", "dc", "cluster", refresh=True) == {
+        VM: "compute-0"
+    }
+    assert vsphere_obj.get_compute_vms_in_pool("ocs-ci", "dc", "cluster") == [VM]
+
+
+def test_get_vm_in_pool_by_name_refresh(vsphere_obj):
+    assert (
+        vsphere_obj.get_vm_in_pool_by_name("compute-0", "dc", "cluster", "ocs-ci")
+        is None
+    )
+    # VM created after the VMs of the pool were cached
+    vsphere_obj.vms[VM] = {"name": "compute-0"}
+    assert (
+        vsphere_obj.get_vm_in_pool_by_name("compute-0", "dc", "cluster", "ocs-ci") == VM
+    )
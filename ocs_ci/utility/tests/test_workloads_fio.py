@@ -0,0 +1,116 @@
+# -*- coding: utf8 -*-
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility.workloads import fio
+
+
+def fio_report(iops, total_ios, clat_mean, clat_p99):
+    """
+    Minimal fio json report with one job doing only writes.
+    """
+    return {
+        "fio version": "fio-3.7",
+        "jobs": [
+            {
+                "jobname": "fio-rand-write",
+                "read": {"iops": 0, "bw": 0, "total_ios": 0},
+                "write": {
+                    "iops": iops,
+                    "bw": iops * 4,
+                    "total_ios": total_ios,
+                    "clat_ns": {
+                        "mean": clat_mean,
+                        "percentile": {"50.000000": clat_mean, "99.000000": clat_p99},
+                    },
+                },
+            }
+        ],
+    }
+
+
+def test_parse_results_single():
+    report = fio_report(100, 1000, 500, 900)
+    assert fio.parse_results(json.dumps(report, indent=2)) == report
+
+
+def test_parse_results_with_status_interval():
+    interim = fio_report(50, 500, 400, 800)
+    final = fio_report(100, 1000, 500, 900)
+    output = (
+        "fio: this platform does not support process shared mutexes\n"
+        + json.dumps(interim, indent=2)
+        + "\n"
+        + json.dumps(final, indent=2)
+        + "\n"
+    )
+    assert fio.parse_all_results(output) == [interim, final]
+    assert fio.parse_results(output) == final
+
+
+def test_parse_results_no_json():
+    with pytest.raises(ValueError):
+        fio.parse_results("fio: pid=0, err=28/file:io_u.c")
+
+
+def test_aggregate_results():
+    results = [fio_report(100, 1000, 500, 900), fio_report(300, 3000, 1000, 2000)]
+    report = fio.aggregate_results(results)
+    assert report["jobs"] == 2
+    assert report["write"]["iops"] == 400
+    assert report["write"]["bw_kib"] == 1600
+    assert report["write"]["total_ios"] == 4000
+    assert report["write"]["clat_mean_ns"] == pytest.approx(875)
+    assert report["write"]["clat_percentiles_ns"]["99.000000"] == 2000
+    assert report["read"]["total_ios"] == 0
+
+
+def app_pod(name, image, fio_installed):
+    """
+    Mock of app pod object, running ``fio --version`` succeeds only when
+    fio_installed is True.
+    """
+
+    def exec_cmd_on_pod(command, **kwargs):
+        if command.startswith("fio --version") and not fio_installed:
+            raise CommandFailed("fio: command not found")
+        return ""
+
+    pod = Mock(pod_data={"spec": {"containers": [{"image": image}]}})
+    pod.name = name
+    pod.exec_cmd_on_pod.side_effect = exec_cmd_on_pod
+    return pod
+
+
+@pytest.fixture
+def fio_setup_cache():
+    with patch.dict(fio.FIO_SETUP_CACHE, clear=True):
+        yield fio.FIO_SETUP_CACHE
+
+
+def test_setup_fio_preinstalled(fio_setup_cache):
+    pod1 = app_pod("pod1", "quay.io/ocsci/nginx:fio", fio_installed=True)
+    pod2 = app_pod("pod2", "quay.io/ocsci/nginx:fio", fio_installed=True)
+    assert fio.setup(pod=pod1)
+    assert fio.setup(pod=pod2)
+    pod1.exec_cmd_on_pod.assert_called_once()
+    # detection is skipped for the pod of the same image
+    pod2.exec_cmd_on_pod.assert_not_called()
+    assert fio_setup_cache["quay.io/ocsci/nginx:fio"]["preinstalled"]
+
+
+def test_setup_fio_install_remembers_distro(fio_setup_cache):
+    pod1 = app_pod("pod1", "nginx", fio_installed=False)
+    pod2 = app_pod("pod2", "nginx", fio_installed=False)
+    with patch.object(fio, "find_distro", return_value="RHEL") as find_distro:
+        assert fio.setup(pod=pod1) == ""
+        assert fio.setup(pod=pod2) == ""
+    find_distro.assert_called_once_with(pod1)
+    pod2.exec_cmd_on_pod.assert_called_once_with(
+        "yum -y install fio", out_yaml_format=False
+    )
+    assert fio_setup_cache["nginx"] == {"preinstalled": False, "distro": "RHEL"}
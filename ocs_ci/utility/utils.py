@@ -1,6 +1,9 @@
-from functools import reduce
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, reduce
 import base64
 import io
+import itertools
 import json
 import logging
 import os
@@ -11,6 +14,7 @@ import shlex
 import smtplib
 import string
 import subprocess
+import threading
 import time
 import traceback
 import stat
@@ -18,17 +22,10 @@ import shutil
 from copy import deepcopy
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from scipy.stats import tmean, scoreatpercentile
 from shutil import which, move, rmtree
-import pexpect
 
-import hcl2
 import requests
 import yaml
-import git
-from bs4 import BeautifulSoup
-from paramiko import SSHClient, AutoAddPolicy
-from paramiko.auth_handler import AuthenticationException, SSHException
 from semantic_version import Version
 from tempfile import NamedTemporaryFile, mkdtemp
 
@@ -47,13 +44,20 @@ from ocs_ci.ocs.exceptions import (
     UnsupportedOSType,
     InteractivePromptException,
 )
-from ocs_ci.utility import version as version_module
+from ocs_ci.utility import cmd_trace, telemetry, version as version_module
 from ocs_ci.utility.flexy import load_cluster_info
 from ocs_ci.utility.retry import retry
 
 
 log = logging.getLogger(__name__)
 
+# {command key: {"calls": int, "stdout_bytes": int, "stderr_bytes": int}}
+CMD_OUTPUT_STATS = {}
+_cmd_output_stats_lock = threading.Lock()
+_cmd_output_counter = itertools.count()
+# options of oc/kubectl whose value is not a sub-command
+CMD_STATS_OPTIONS_WITH_VALUE = ("-n", "--namespace", "--kubeconfig", "--context")
+
 # variables
 mounting_dir = "/mnt/cephfs/"
 clients = []
@@ -417,6 +421,25 @@ def custom_ceph_config(suite_config, custom_config, custom_config_file):
     return full_custom_config
 
 
+@lru_cache(maxsize=64)
+def _get_secrets_pattern(secrets):
+    """
+    Compile regular expression matching any of the secrets, the longest
+    secrets are matched first
+
+    Args:
+        secrets (tuple): Secret strings
+
+    Returns:
+        re.Pattern: compiled pattern, None if there is no non empty secret
+
+    """
+    secrets = sorted({secret for secret in secrets if secret}, key=len, reverse=True)
+    if not secrets:
+        return None
+    return re.compile("|".join(re.escape(secret) for secret in secrets))
+
+
 def mask_secrets(plaintext, secrets):
     """
     Replace secrets in plaintext with asterisks
@@ -430,13 +453,14 @@ def mask_secrets(plaintext, secrets):
         str: The censored version of plaintext
 
     """
-    if secrets:
-        for secret in secrets:
-            if isinstance(plaintext, list):
-                plaintext = [string.replace(secret, "*" * 5) for string in plaintext]
-            else:
-                plaintext = plaintext.replace(secret, "*" * 5)
-    return plaintext
+    if not secrets:
+        return plaintext
+    pattern = _get_secrets_pattern(tuple(secrets))
+    if pattern is None:
+        return plaintext
+    if isinstance(plaintext, list):
+        return [pattern.sub("*" * 5, string) for string in plaintext]
+    return pattern.sub("*" * 5, plaintext)
 
 
 def run_cmd(
@@ -466,7 +490,7 @@ def run_cmd(
     completed_process = exec_cmd(
         cmd, secrets, timeout, ignore_error, threading_lock, **kwargs
     )
-    return mask_secrets(completed_process.stdout.decode(), secrets)
+    return get_masked_output(completed_process, "stdout", secrets)
 
 
 def run_cmd_interactive(cmd, prompts_answers, timeout=300):
@@ -482,6 +506,8 @@ def run_cmd_interactive(cmd, prompts_answers, timeout=300):
         InteractivePromptException: in case something goes wrong
 
     """
+    import pexpect
+
     child = pexpect.spawn(cmd)
     for prompt, answer in prompts_answers.items():
         if child.expect(prompt, timeout=timeout):
@@ -491,12 +517,90 @@ def run_cmd_interactive(cmd, prompts_answers, timeout=300):
             raise InteractivePromptException("Failed to provide answer to the prompt")
 
 
+# Result of function run on one cluster by run_func_multicluster()
+MulticlusterResult = namedtuple(
+    "MulticlusterResult",
+    [
+        "index",
+        "cluster_name",
+        "result",
+        "error",
+        "duration",
+    ],
+)
+
+
+def run_func_multicluster(
+    func,
+    *args,
+    indexes=None,
+    skip_index=None,
+    max_workers=None,
+    raise_on_error=True,
+    **kwargs,
+):
+    """
+    Run function against multiple clusters in parallel. Each call runs in its
+    own thread within config.cluster_context() of the cluster, so config and
+    oc commands of the thread are bound to the cluster (and its kubeconfig)
+    without switching the global context.
+
+    Args:
+        func (function): function to run, called as func(*args, **kwargs)
+        indexes (list of int): Indexes of the clusters to run the function
+            against, all the clusters by default
+        skip_index (int): Index of the cluster to skip (e.g. ACM cluster)
+        max_workers (int): Maximal number of clusters to run the function
+            against concurrently, all of them by default
+        raise_on_error (bool): True if the first error (in index order) should
+            be raised once all the calls are finished
+
+    Returns:
+        list: MulticlusterResult (index, cluster_name, result, error, duration)
+            for each cluster, in index order
+
+    """
+    if indexes is None:
+        indexes = range(len(config.clusters))
+    indexes = [index for index in indexes if index != skip_index]
+    if skip_index is not None:
+        log.info(f"skipping index = {skip_index}")
+
+    def run_on_cluster(index):
+        start = time.time()
+        with config.cluster_context(index):
+            cluster_name = config.current_cluster_name()
+            try:
+                result, error = func(*args, **kwargs), None
+            except Exception as ex:
+                result, error = None, ex
+        return MulticlusterResult(
+            index, cluster_name, result, error, time.time() - start
+        )
+
+    if not indexes:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or len(indexes)) as executor:
+        results = list(executor.map(run_on_cluster, indexes))
+    for result in results:
+        log.info(
+            f"{getattr(func, '__name__', func)} on cluster {result.cluster_name} "
+            f"took {result.duration:.2f}s"
+            f"{f' and failed: {result.error}' if result.error else ''}"
+        )
+    if raise_on_error:
+        for result in results:
+            if result.error:
+                raise result.error
+    return results
+
+
 def run_cmd_multicluster(
     cmd, secrets=None, timeout=600, ignore_error=False, skip_index=None, **kwargs
 ):
     """
-    Run command on multiple clusters. Useful in multicluster scenarios
-    This is wrapper around exec_cmd
+    Run command on multiple clusters in parallel. Useful in multicluster
+    scenarios. This is wrapper around exec_cmd
 
     Args:
         cmd (str): command to be run
@@ -517,37 +621,25 @@ def run_cmd_multicluster(
             if command execution skipped on a particular cluster then corresponding entry will have None
 
     """
-    # Skip indexed cluster while running commands
-    # Useful to skip operations on ACM cluster
-    restore_ctx_index = config.cur_index
     completed_process = [None] * len(config.clusters)
-    for cluster in config.clusters:
-        if cluster.MULTICLUSTER["multicluster_index"] == skip_index:
-            log.warning(f"skipping index = {skip_index}")
-            continue
-        else:
-            config.switch_ctx(cluster.MULTICLUSTER["multicluster_index"])
-            log.info(
-                f"Switched the context to cluster:{cluster.ENV_DATA['cluster_name']}"
+    results = run_func_multicluster(
+        exec_cmd,
+        cmd,
+        skip_index=skip_index,
+        raise_on_error=False,
+        secrets=secrets,
+        timeout=timeout,
+        ignore_error=ignore_error,
+        **kwargs,
+    )
+    for result in results:
+        if result.error:
+            log.error(
+                f"Command {mask_secrets(cmd, secrets)} execution failed on "
+                f"cluster {result.cluster_name}"
             )
-            try:
-                completed_process[
-                    cluster.MULTICLUSTER["multicluster_index"]
-                ] = exec_cmd(
-                    cmd,
-                    secrets=secrets,
-                    timeout=timeout,
-                    ignore_error=ignore_error,
-                    **kwargs,
-                )
-            except CommandFailed:
-                # In case of failure, restore the cluster context to where we started
-                config.switch_ctx(restore_ctx_index)
-                log.error(
-                    f"Command {cmd} execution failed on cluster {cluster.ENV_DATA['cluster_name']} "
-                )
-                raise
-    config.switch_ctx(restore_ctx_index)
+            raise result.error
+        completed_process[result.index] = result.result
     return completed_process
 
 
@@ -567,6 +659,8 @@ def exec_cmd(
             raise the exception.
         threading_lock (threading.Lock): threading.Lock object that is used
             for handling concurrent oc commands
+        **kwargs: passed to subprocess.run, e.g. input (bytes) which is
+            passed to stdin of the command
 
     Raises:
         CommandFailed: In case the command execution fails
@@ -584,38 +678,194 @@ def exec_cmd(
     log.info(f"Executing command: {masked_cmd}")
     if isinstance(cmd, str):
         cmd = shlex.split(cmd)
+    kubeconfig = config.get_kubeconfig()
+    if "env" not in kwargs and kubeconfig and kubeconfig != os.getenv("KUBECONFIG"):
+        # cluster activated only for this thread by config.cluster_context()
+        kwargs["env"] = dict(os.environ, KUBECONFIG=kubeconfig)
     if threading_lock and cmd[0] == "oc":
         threading_lock.acquire()
-    completed_process = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        stdin=subprocess.PIPE,
-        timeout=timeout,
-        **kwargs,
-    )
+    trace = cmd_trace.get_active()
+    start = time.perf_counter()
+    if "input" not in kwargs:
+        kwargs["stdin"] = subprocess.PIPE
+    if trace and trace.mode == cmd_trace.REPLAY:
+        completed_process = trace.replay(cmd, secrets)
+    else:
+        completed_process = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout,
+            **kwargs,
+        )
+    duration = time.perf_counter() - start
+    if trace and trace.mode == cmd_trace.RECORD:
+        trace.record(cmd, completed_process, duration, secrets)
     if threading_lock and cmd[0] == "oc":
         threading_lock.release()
-    masked_stdout = mask_secrets(completed_process.stdout.decode(), secrets)
-    if len(completed_process.stdout) > 0:
-        log.debug(f"Command stdout: {masked_stdout}")
-    else:
-        log.debug("Command stdout is empty")
+    cmd_key = get_cmd_stats_key(cmd)
+    update_cmd_output_stats(
+        cmd_key, len(completed_process.stdout), len(completed_process.stderr)
+    )
+    telemetry.record(
+        telemetry.CMD,
+        cmd_key,
+        duration,
+        len(completed_process.stdout) + len(completed_process.stderr),
+    )
+    if log.isEnabledFor(logging.DEBUG):
+        if len(completed_process.stdout) > 0:
+            log.debug(
+                "Command stdout: %s",
+                truncate_cmd_output(
+                    get_masked_output(completed_process, "stdout", secrets), cmd
+                ),
+            )
+        else:
+            log.debug("Command stdout is empty")
 
-    masked_stderr = mask_secrets(completed_process.stderr.decode(), secrets)
     if len(completed_process.stderr) > 0:
-        log.warning(f"Command stderr: {masked_stderr}")
+        log.warning(
+            "Command stderr: %s",
+            truncate_cmd_output(
+                get_masked_output(completed_process, "stderr", secrets), cmd
+            ),
+        )
     else:
         log.debug("Command stderr is empty")
-    log.debug(f"Command return code: {completed_process.returncode}")
+    log.debug("Command return code: %s", completed_process.returncode)
     if completed_process.returncode and not ignore_error:
         raise CommandFailed(
             f"Error during execution of command: {masked_cmd}."
-            f"\nError is {masked_stderr}"
+            f"\nError is {get_masked_output(completed_process, 'stderr', secrets)}"
         )
     return completed_process
 
 
+def get_masked_output(completed_process, stream, secrets=None):
+    """
+    Get decoded output of the command with masked secrets. The result is
+    cached on the completed process, so the output is decoded and masked
+    only once even if it's used for logging and returned by run_cmd.
+
+    Args:
+        completed_process (CompletedProcess): The executed command
+        stream (str): stdout or stderr
+        secrets (list): A list of secrets to be masked with asterisks
+
+    Returns:
+        str: Decoded and masked output
+
+    """
+    cache = completed_process.__dict__.setdefault("_masked_output", {})
+    if stream not in cache:
+        cache[stream] = mask_secrets(
+            getattr(completed_process, stream).decode(), secrets
+        )
+    return cache[stream]
+
+
+def get_cmd_stats_key(cmd):
+    """
+    Get key which identifies the command in the output stats, e.g. "oc get"
+    for "oc -n openshift-storage get pods"
+
+    Args:
+        cmd (list): Command split to arguments
+
+    Returns:
+        str: The executable with the first sub-command
+
+    """
+    args = iter(cmd[1:])
+    for arg in args:
+        if arg in CMD_STATS_OPTIONS_WITH_VALUE:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return f"{os.path.basename(cmd[0])} {arg}"
+    return os.path.basename(cmd[0]) if cmd else ""
+
+
+def update_cmd_output_stats(key, stdout_bytes, stderr_bytes):
+    """
+    Count executed command and the size of its output
+
+    Args:
+        key (str): Key of the command, see get_cmd_stats_key()
+        stdout_bytes (int): Size of the standard output
+        stderr_bytes (int): Size of the standard error output
+
+    """
+    with _cmd_output_stats_lock:
+        stats = CMD_OUTPUT_STATS.setdefault(
+            key, {"calls": 0, "stdout_bytes": 0, "stderr_bytes": 0}
+        )
+        stats["calls"] += 1
+        stats["stdout_bytes"] += stdout_bytes
+        stats["stderr_bytes"] += stderr_bytes
+
+
+def get_cmd_output_stats():
+    """
+    Get number of calls and output sizes of the commands executed by exec_cmd
+
+    Returns:
+        dict: {command key: {"calls": int, "stdout_bytes": int,
+            "stderr_bytes": int}}, sorted by the stdout size
+
+    """
+    with _cmd_output_stats_lock:
+        return {
+            key: dict(stats)
+            for key, stats in sorted(
+                CMD_OUTPUT_STATS.items(),
+                key=lambda item: item[1]["stdout_bytes"],
+                reverse=True,
+            )
+        }
+
+
+def truncate_cmd_output(output, cmd):
+    """
+    Truncate command output for logging. If the output is longer than
+    RUN['cmd_output_log_limit'], the full output is written to a file in the
+    cmd_output directory of the ocs-ci log directory.
+
+    Args:
+        output (str): Masked output of the command
+        cmd (list): Command split to arguments
+
+    Returns:
+        str: The output, or its beginning with the path to the full output
+
+    """
+    limit = config.RUN.get("cmd_output_log_limit")
+    if not limit or len(output) <= limit:
+        return output
+    message = f"{output[:limit]}\n... ({len(output) - limit} more characters"
+    if not config.RUN.get("run_id"):
+        return f"{message})"
+    test_name = (
+        os.environ.get("PYTEST_CURRENT_TEST", "session")
+        .split(" ")[0]
+        .replace("/", "_")
+        .replace("::", "-")
+    )
+    output_file = os.path.join(
+        ocsci_log_path(),
+        "cmd_output",
+        f"{test_name}-{next(_cmd_output_counter)}-"
+        f"{get_cmd_stats_key(cmd).replace(' ', '_')}.log",
+    )
+    try:
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        with open(output_file, "w") as fd:
+            fd.write(output)
+    except OSError as ex:
+        return f"{message}, failed to store full output: {ex})"
+    return f"{message}, full output: {output_file})"
+
+
 def download_file(url, filename, **kwargs):
     """
     Download a file from a specified url
@@ -1155,6 +1405,9 @@ class TimeoutSampler(object):
                 raise self.timeout_exc_cls(*self.timeout_exc_args)
             log.info("Going to sleep for %d seconds before next iteration", self.sleep)
             time.sleep(self.sleep)
+            telemetry.record(
+                telemetry.SLEEP, getattr(self.func, "__name__", "func"), self.sleep
+            )
 
     def wait_for_func_value(self, value):
         """
@@ -1528,6 +1781,8 @@ def email_reports(session):
     Email results of test run
 
     """
+    from bs4 import BeautifulSoup
+
     # calculate percentage pass
     # reporter = session.config.pluginmanager.get_plugin("terminalreporter")
     # passed = len(reporter.stats.get("passed", []))
@@ -2360,6 +2615,9 @@ def upload_file(server, localpath, remotepath, user=None, password=None, key_fil
         user (str): User to use for the remote connection
 
     """
+    from paramiko import SSHClient, AutoAddPolicy
+    from paramiko.auth_handler import AuthenticationException, SSHException
+
     if not user:
         user = "root"
     try:
@@ -2591,6 +2849,8 @@ def remove_keys_from_tf_variable_file(tf_file, keys):
         keys (list): list of keys to remove
 
     """
+    import hcl2
+
     # importing here to avoid dependencies
     from ocs_ci.utility.templating import dump_data_to_json
 
@@ -2645,7 +2905,7 @@ def get_cluster_name(cluster_path):
     return metadata["clusterName"]
 
 
-def skipif_ocp_version(expressions):
+def skipif_ocp_version(expressions, ocp_version=None):
     """
     This function evaluates the condition for test skip
     based on expression
@@ -2654,12 +2914,14 @@ def skipif_ocp_version(expressions):
         expressions (str OR list): condition for which we need to check,
         eg: A single expression string '>=4.2' OR
             A list of expressions like ['<4.3', '>4.2'], ['<=4.3', '>=4.2']
+        ocp_version (str): running OCP version (e.g. from cluster facts),
+            queried from the cluster if not provided
 
     Return:
         'True' if test needs to be skipped else 'False'
 
     """
-    ocp_version = get_running_ocp_version()
+    ocp_version = ocp_version or get_running_ocp_version()
     expr_list = [expressions] if isinstance(expressions, str) else expressions
     return any(
         version_module.compare_versions(ocp_version + expr) for expr in expr_list
@@ -2686,13 +2948,15 @@ def skipif_ocs_version(expressions):
     )
 
 
-def skipif_ui_not_support(ui_test):
+def skipif_ui_not_support(ui_test, ocp_version=None):
     """
     This function evaluates the condition for ui test skip
     based on ui_test expression
 
     Args:
         ui_test (str): condition for which we need to check,
+        ocp_version (str): running OCP version (e.g. from cluster facts),
+            queried from the cluster if not provided
 
     Return:
         'True' if test needs to be skipped else 'False'
@@ -2700,7 +2964,7 @@ def skipif_ui_not_support(ui_test):
     """
     from ocs_ci.ocs.ui.views import locators
 
-    ocp_version = get_running_ocp_version()
+    ocp_version = ocp_version or get_running_ocp_version()
     if (
         config.ENV_DATA["platform"].lower() == constants.IBMCLOUD_PLATFORM
         or config.ENV_DATA["platform"].lower() == constants.OPENSHIFT_DEDICATED_PLATFORM
@@ -3080,6 +3344,8 @@ def get_trim_mean(values, percentage=20):
             the regular mean average is returned
 
     """
+    from scipy.stats import tmean, scoreatpercentile
+
     lower_limit = scoreatpercentile(values, percentage)
     upper_limit = scoreatpercentile(values, 100 - percentage)
     try:
@@ -3455,6 +3721,8 @@ def download_file_from_git_repo(git_repo_url, path_to_file_in_git, filename):
         filename (str): Name of the file to write the download to
 
     """
+    import git
+
     log.debug(
         f"Download file '{path_to_file_in_git}' from "
         f"git repository {git_repo_url} to local file '{filename}'."
@@ -3465,13 +3733,15 @@ def download_file_from_git_repo(git_repo_url, path_to_file_in_git, filename):
     rmtree(temp_dir)
 
 
-def skipif_upgraded_from(version_list):
+def skipif_upgraded_from(version_list, prev_version=None):
     """
     This function evaluates the condition to skip a test if the cluster
     is upgraded from a particular OCS version
 
     Args:
         version_list (list): List of versions to check
+        prev_version (str): name of the CSV replaced by the current OCS CSV
+            (e.g. from cluster facts), queried from the cluster if not provided
 
     Return:
         (bool): True if test needs to be skipped else False
@@ -3482,9 +3752,10 @@ def skipif_upgraded_from(version_list):
 
         skip_this = False
         version_list = [version_list] if isinstance(version_list, str) else version_list
-        ocs_csv = get_ocs_csv()
-        csv_info = ocs_csv.get()
-        prev_version = csv_info.get("spec").get("replaces", "")
+        if prev_version is None:
+            ocs_csv = get_ocs_csv()
+            csv_info = ocs_csv.get()
+            prev_version = csv_info.get("spec").get("replaces", "")
         for version in version_list:
             if f".v{version}" in prev_version:
                 skip_this = True
@@ -4,6 +4,8 @@ This module contains the vSphere related methods
 import logging
 import os
 import ssl
+import threading
+import time
 
 import atexit
 
@@ -11,6 +13,7 @@ from copy import deepcopy
 from pyVmomi import vim, vmodl
 from pyVim.task import WaitForTask, WaitForTasks
 from pyVim.connect import Disconnect, SmartStubAdapter, VimSessionOrientedStub
+from ocs_ci.ocs import defaults
 from ocs_ci.ocs.exceptions import VMMaxDisksReachedException, ResourcePoolNotFound
 from ocs_ci.ocs.constants import (
     GB2KB,
@@ -49,6 +52,11 @@ class VSPHERE(object):
         self._port = port
         self.sslContext = ssl._create_unverified_context()
         self._si = self._get_service_instance()
+        # (types, container, recurse) -> (fetch time, {moref: properties})
+        self._inventory_cache = {}
+        # moref -> name of all the objects seen in the inventory
+        self._names = {}
+        self._inventory_lock = threading.Lock()
 
     def _get_service_instance(self):
         """
@@ -100,6 +108,230 @@ class VSPHERE(object):
         """
         return self.get_content.searchIndex
 
+    @staticmethod
+    def _collect_properties(collector, filter_spec):
+        """
+        Retrieve the properties selected by the filter spec, page by page
+
+        Args:
+            collector (vmodl.query.PropertyCollector): Property collector
+            filter_spec (vmodl.query.PropertyCollector.FilterSpec): Filter spec
+
+        Returns:
+            dict: Managed object refs and dicts of their properties, unset
+                properties are missing
+
+        """
+        options = vmodl.query.PropertyCollector.RetrieveOptions()
+        result = collector.RetrievePropertiesEx([filter_spec], options)
+        objects = {}
+        while result:
+            for object_content in result.objects:
+                objects[object_content.obj] = {
+                    prop.name: prop.val for prop in object_content.propSet
+                }
+            if not result.token:
+                break
+            result = collector.ContinueRetrievePropertiesEx(result.token)
+        return objects
+
+    def get_inventory(
+        self,
+        vimtype,
+        properties=None,
+        folder=None,
+        recurse=True,
+        content=None,
+    ):
+        """
+        Fetch properties of all objects of the type in one PropertyCollector
+        call, instead of one round trip per object and property
+
+        Args:
+            vimtype (list): List of vim.type
+                (e.g: For VM's, type is vim.VirtualMachine
+                For Hosts, type is vim.HostSystem)
+            properties (list): Property paths to fetch, e.g.
+                "runtime.powerState", name and parent if not provided
+            folder (vim.ManagedEntity): Container to search in, root folder
+                if not provided
+            recurse (bool): True for recursive search
+            content (vim.ServiceInstanceContent): Service Instance Content
+
+        Returns:
+            dict: Managed object refs and dicts of their properties, e.g.
+                {'vim.VirtualMachine:vm-1': {'name': 'compute-0', ...}}
+
+        """
+        if not isinstance(vimtype, list):
+            vimtype = [vimtype]
+        properties = properties or defaults.VSPHERE_INVENTORY_PROPERTIES
+        content = content or self.get_content
+        collector_cls = vmodl.query.PropertyCollector
+        view = content.viewManager.CreateContainerView(
+            folder or content.rootFolder, vimtype, recurse
+        )
+        try:
+            traversal_spec = collector_cls.TraversalSpec(
+                name="traverseEntities",
+                path="view",
+                skip=False,
+                type=vim.view.ContainerView,
+            )
+            object_spec = collector_cls.ObjectSpec(
+                obj=view, skip=True, selectSet=[traversal_spec]
+            )
+            property_specs = [
+                collector_cls.PropertySpec(type=t, pathSet=properties, all=False)
+                for t in vimtype
+            ]
+            filter_spec = collector_cls.FilterSpec(
+                objectSet=[object_spec], propSet=property_specs
+            )
+            objects = self._collect_properties(content.propertyCollector, filter_spec)
+        finally:
+            view.Destroy()
+        self._remember_names(objects)
+        return objects
+
+    def get_objects_properties(self, objs, properties):
+        """
+        Fetch properties of the given objects in one PropertyCollector call
+
+        Args:
+            objs (list): Managed object refs, e.g. vim.VirtualMachine
+            properties (list): Property paths to fetch, e.g.
+                ["runtime.powerState", "guest.ipAddress"]
+
+        Returns:
+            dict: Managed object refs and dicts of their properties
+
+        """
+        if not objs:
+            return {}
+        collector_cls = vmodl.query.PropertyCollector
+        types = {type(obj) for obj in objs}
+        filter_spec = collector_cls.FilterSpec(
+            objectSet=[collector_cls.ObjectSpec(obj=obj, skip=False) for obj in objs],
+            propSet=[
+                collector_cls.PropertySpec(type=t, pathSet=properties, all=False)
+                for t in types
+            ],
+        )
+        objects = self._collect_properties(
+            self.get_content.propertyCollector, filter_spec
+        )
+        self._remember_names(objects)
+        return objects
+
+    def _remember_names(self, objects):
+        with self._inventory_lock:
+            for obj, props in objects.items():
+                if "name" in props:
+                    self._names[obj] = props["name"]
+
+    def get_cached_inventory(self, vimtype, folder=None, recurse=True, refresh=False):
+        """
+        Get names and parents of all objects of the type, the inventory is
+        fetched once and reused for VSPHERE_INVENTORY_CACHE_TTL seconds
+
+        Args:
+            vimtype (list): List of vim.type
+            folder (vim.ManagedEntity): Container to search in, root folder
+                if not provided
+            recurse (bool): True for recursive search
+            refresh (bool): Fetch the inventory even if it's cached
+
+        Returns:
+            dict: Managed object refs and dicts with name and parent
+
+        """
+        if not isinstance(vimtype, list):
+            vimtype = [vimtype]
+        key = (
+            tuple(sorted(t.__name__ for t in vimtype)),
+            folder._moId if folder else None,
+            recurse,
+        )
+        with self._inventory_lock:
+            cached = self._inventory_cache.get(key)
+        if (
+            refresh
+            or cached is None
+            or time.time() - cached[0] > defaults.VSPHERE_INVENTORY_CACHE_TTL
+        ):
+            cached = (
+                time.time(),
+                self.get_inventory(vimtype, folder=folder, recurse=recurse),
+            )
+            with self._inventory_lock:
+                self._inventory_cache[key] = cached
+        return cached[1]
+
+    def clear_inventory_cache(self):
+        """
+        Drop the cached inventories, called when objects are created or
+        removed
+        """
+        with self._inventory_lock:
+            self._inventory_cache = {}
+
+    def find_cached_object(self, name, vimtype, folder=None, recurse=True, parent=None):
+        """
+        Find object by name in the cached inventory. The inventory is fetched
+        again if the object is not found in it, as it may be created meanwhile.
+
+        Args:
+            name (str): Name of the object
+            vimtype (list): List of vim.type
+            folder (vim.ManagedEntity): Container to search in, root folder
+                if not provided
+            recurse (bool): True for recursive search
+            parent (function): Filter called with the parent of the object
+                and the inventory, e.g. to find only children of a container
+
+        Returns:
+            vim.ManagedEntity: The object, None if it doesn't exist
+
+        """
+        for refresh in (False, True):
+            inventory = self.get_cached_inventory(
+                vimtype, folder=folder, recurse=recurse, refresh=refresh
+            )
+            for obj, props in inventory.items():
+                if props.get("name") == name and (
+                    parent is None or parent(props.get("parent"), inventory)
+                ):
+                    return obj
+
+    def get_names(self, objs):
+        """
+        Get names of the objects, names of the objects seen in an inventory
+        are not fetched again
+
+        Args:
+            objs (list): Managed object refs
+
+        Returns:
+            list: Names of the objects
+
+        """
+        with self._inventory_lock:
+            missing = [obj for obj in objs if obj not in self._names]
+        if missing:
+            try:
+                self.get_objects_properties(missing, ["name"])
+            except vmodl.fault.ManagedObjectNotFound:
+                # some of the objects were removed, names of the rest are
+                # fetched one by one
+                for obj in missing:
+                    try:
+                        self.get_objects_properties([obj], ["name"])
+                    except vmodl.fault.ManagedObjectNotFound:
+                        pass
+        with self._inventory_lock:
+            return [self._names.get(obj) for obj in objs]
+
     def get_all_objs(self, content, vimtype, folder=None, recurse=True):
         """
         Generate objects of type vimtype
@@ -120,15 +352,14 @@ class VSPHERE(object):
                    }
 
         """
-        if not folder:
-            folder = content.rootFolder
-
-        obj = {}
-        container = content.viewManager.CreateContainerView(folder, vimtype, recurse)
-        for managed_object_ref in container.view:
-            obj.update({managed_object_ref: managed_object_ref.name})
-        container.Destroy()
-        return obj
+        objects = self.get_inventory(
+            vimtype,
+            properties=["name"],
+            folder=folder,
+            recurse=recurse,
+            content=content,
+        )
+        return {obj: props.get("name") for obj, props in objects.items()}
 
     def find_object_by_name(self, content, name, obj_type, folder=None, recurse=True):
         """
@@ -148,15 +379,7 @@ class VSPHERE(object):
             None: If vim.type doesn't exists
 
         """
-        if not isinstance(obj_type, list):
-            obj_type = [obj_type]
-
-        objects = self.get_all_objs(content, obj_type, folder=folder, recurse=recurse)
-        for obj in objects:
-            if obj.name == name:
-                return obj
-
-        return None
+        return self.find_cached_object(name, obj_type, folder=folder, recurse=recurse)
 
     def get_vm_by_ip(self, ip, dc, vm_search=True):
         """
@@ -186,9 +409,7 @@ class VSPHERE(object):
             vim.Datacenter: Datacenter instance
 
         """
-        for dc in self.get_content.rootFolder.childEntity:
-            if dc.name == name:
-                return dc
+        return self.find_cached_object(name, [vim.Datacenter])
 
     def get_cluster(self, name, dc):
         """
@@ -202,9 +423,9 @@ class VSPHERE(object):
             vim.ClusterComputeResource: Cluster instance
 
         """
-        for cluster in self.get_dc(dc).hostFolder.childEntity:
-            if cluster.name == name:
-                return cluster
+        return self.find_cached_object(
+            name, [vim.ClusterComputeResource], folder=self.get_dc(dc)
+        )
 
     def get_pool(self, name, dc, cluster):
         """
@@ -219,10 +440,65 @@ class VSPHERE(object):
             vim.ResourcePool: Resource pool instance
 
         """
-        cluster_obj = self.get_cluster(cluster, dc)
-        for rp in cluster_obj.resourcePool.resourcePool:
-            if rp.name == name:
-                return rp
+        return self.find_cached_object(
+            name,
+            [vim.ResourcePool],
+            folder=self.get_cluster(cluster, dc),
+            parent=self._is_cluster_root_pool,
+        )
+
+    @staticmethod
+    def _is_cluster_root_pool(pool, inventory):
+        """
+        Check if the pool is the root resource pool of a cluster, the root
+        pool is the only pool in the cluster inventory not owned by a pool
+        """
+        props = inventory.get(pool)
+        return props is not None and not isinstance(
+            props.get("parent"), vim.ResourcePool
+        )
+
+    def get_pool_vm_names(self, name, dc, cluster, refresh=False):
+        """
+        Gets names of all VM's in Resource pool
+
+        Args:
+            name (str): Resource pool name
+            dc (str): Datacenter name
+            cluster (str): Cluster name
+            refresh (bool): Fetch the VMs even if they are cached
+
+        Returns:
+            dict: VM instances (vim.VirtualMachine) and their names
+
+        Raises:
+            ResourcePoolNotFound: when Resource pool doesn't exist
+
+        """
+        rp = self.get_pool(name, dc, cluster)
+        if not rp:
+            raise ResourcePoolNotFound
+        inventory = self.get_cached_inventory(
+            [vim.VirtualMachine], folder=rp, refresh=refresh
+        )
+        return {vm: props.get("name") for vm, props in inventory.items()}
+
+    def get_dc_vm_names(self, dc, refresh=False):
+        """
+        Gets names of all VM's in Datacenter
+
+        Args:
+            dc (str): Datacenter name
+            refresh (bool): Fetch the VMs even if they are cached
+
+        Returns:
+            dict: VM instances (vim.VirtualMachine) and their names
+
+        """
+        inventory = self.get_cached_inventory(
+            [vim.VirtualMachine], folder=self.get_dc(dc).vmFolder, refresh=refresh
+        )
+        return {vm: props.get("name") for vm, props in inventory.items()}
 
     def get_all_vms_in_pool(self, name, dc, cluster):
         """
@@ -241,7 +517,7 @@ class VSPHERE(object):
 
         """
         rp = self.get_pool(name, dc, cluster)
-        if not self.is_resource_pool_exist(name, dc, cluster):
+        if not rp:
             raise ResourcePoolNotFound
         return [vm for vm in rp.vm]
 
@@ -256,13 +532,16 @@ class VSPHERE(object):
             pool (str): pool name
 
         Returns:
-            vim.VirtualMachine: VM instances
+            vim.VirtualMachine: VM instances, None if it doesn't exist
 
         """
-        vms = self.get_all_vms_in_pool(pool, dc, cluster)
-        for vm in vms:
-            if vm.name == name:
-                return vm
+        # the cached VM names are refreshed if the VM is not found, it may be
+        # created meanwhile
+        for refresh in (False, True):
+            vms = self.get_pool_vm_names(pool, dc, cluster, refresh=refresh)
+            for vm, vm_name in vms.items():
+                if vm_name == name:
+                    return vm
 
     def get_controllers(self, vm):
         """
@@ -485,7 +764,22 @@ class VSPHERE(object):
             list: VMs IPs
 
         """
-        return [vm.summary.guest.ipAddress for vm in vms]
+        vms_properties = self.get_objects_properties(vms, ["guest.ipAddress"])
+        return [vms_properties.get(vm, {}).get("guest.ipAddress") for vm in vms]
+
+    def get_vms_power_status(self, vms):
+        """
+        Get the VMs power status in one call
+
+        Args:
+            vms (list): VM (vm) objects
+
+        Returns:
+            list: VMs power status
+
+        """
+        vms_properties = self.get_objects_properties(vms, ["runtime.powerState"])
+        return [vms_properties.get(vm, {}).get("runtime.powerState") for vm in vms]
 
     def stop_vms(self, vms, force=True, wait=True):
         """
@@ -498,25 +792,23 @@ class VSPHERE(object):
             wait (bool): Wait for the VMs to stop
 
         """
+        vm_names = self.get_names(vms)
         if force:
-            logger.info(f"Powering off VMs: {[vm.name for vm in vms]}")
+            logger.info(f"Powering off VMs: {vm_names}")
             tasks = [vm.PowerOff() for vm in vms]
             WaitForTasks(tasks, self._si)
 
         else:
-            logger.info(f"Gracefully shutting down VMs: {[vm.name for vm in vms]}")
+            logger.info(f"Gracefully shutting down VMs: {vm_names}")
 
             # Can't use WaitForTasks as it requires VMWare tools installed
             # on the guests to check for Shutdown task completion
             _ = [vm.ShutdownGuest() for vm in vms]
 
-            def get_vms_power_status(vms):
-                return [self.get_vm_power_status(vm) for vm in vms]
-
             if wait:
-                for statuses in TimeoutSampler(600, 5, get_vms_power_status, vms):
+                for statuses in TimeoutSampler(600, 5, self.get_vms_power_status, vms):
                     logger.info(
-                        f"Waiting for VMs {[vm.name for vm in vms]} to power off. "
+                        f"Waiting for VMs {vm_names} to power off. "
                         f"Current VMs statuses: {statuses}"
                     )
                     if all(status == VM_POWERED_OFF for status in statuses):
@@ -532,14 +824,15 @@ class VSPHERE(object):
             wait (bool): Wait for VMs to start
 
         """
-        logger.info(f"Powering on VMs: {[vm.name for vm in vms]}")
+        vm_names = self.get_names(vms)
+        logger.info(f"Powering on VMs: {vm_names}")
         tasks = [vm.PowerOn() for vm in vms]
         WaitForTasks(tasks, self._si)
 
         if wait:
             for ips in TimeoutSampler(240, 3, self.get_vms_ips, vms):
                 logger.info(
-                    f"Waiting for VMs {[vm.name for vm in vms]} to power on "
+                    f"Waiting for VMs {vm_names} to power on "
                     f"based on network connectivity. Current VMs IPs: {ips}"
                 )
                 if not (None in ips or "<unset>" in ips):
@@ -568,7 +861,7 @@ class VSPHERE(object):
                 False for Soft reboot(Guest Reboot)
 
         """
-        logger.info(f"Rebooting VMs: {[vm.name for vm in vms]}")
+        logger.info(f"Rebooting VMs: {self.get_names(vms)}")
         if force:
             tasks = [vm.ResetVM_Task() for vm in vms]
             WaitForTasks(tasks, self._si)
@@ -603,11 +896,14 @@ class VSPHERE(object):
             bool: True if a resource pool with the same name prefix exists, False otherwise
 
         """
-        cluster_obj = self.get_cluster(cluster, dc)
-        for rp in cluster_obj.resourcePool.resourcePool:
-            if rp.name.startswith(pool_prefix):
-                return True
-        return False
+        inventory = self.get_cached_inventory(
+            [vim.ResourcePool], folder=self.get_cluster(cluster, dc)
+        )
+        return any(
+            props.get("name", "").startswith(pool_prefix)
+            and self._is_cluster_root_pool(props.get("parent"), inventory)
+            for props in inventory.values()
+        )
 
     def poweroff_vms(self, vms):
         """
@@ -618,12 +914,12 @@ class VSPHERE(object):
 
         """
         to_poweroff_vms = []
-        for vm in vms:
-            status = self.get_vm_power_status(vm)
-            logger.info(f"power state of {vm.name}: {status}")
+        vm_names = self.get_names(vms)
+        for vm, vm_name, status in zip(vms, vm_names, self.get_vms_power_status(vms)):
+            logger.info(f"power state of {vm_name}: {status}")
             if status == "poweredOn":
                 to_poweroff_vms.append(vm)
-        logger.info(f"Powering off VMs: {[vm.name for vm in to_poweroff_vms]}")
+        logger.info(f"Powering off VMs: {self.get_names(to_poweroff_vms)}")
         tasks = [vm.PowerOff() for vm in to_poweroff_vms]
         WaitForTasks(tasks, self._si)
 
@@ -636,12 +932,12 @@ class VSPHERE(object):
 
         """
         to_poweron_vms = []
-        for vm in vms:
-            status = self.get_vm_power_status(vm)
-            logger.info(f"power state of {vm.name}: {status}")
+        vm_names = self.get_names(vms)
+        for vm, vm_name, status in zip(vms, vm_names, self.get_vms_power_status(vms)):
+            logger.info(f"power state of {vm_name}: {status}")
             if status == "poweredOff":
                 to_poweron_vms.append(vm)
-        logger.info(f"Powering on VMs: {[vm.name for vm in to_poweron_vms]}")
+        logger.info(f"Powering on VMs: {self.get_names(to_poweron_vms)}")
         tasks = [vm.PowerOn() for vm in to_poweron_vms]
         WaitForTasks(tasks, self._si)
 
@@ -654,9 +950,10 @@ class VSPHERE(object):
 
         """
         self.poweroff_vms(vms)
-        logger.info(f"Destroying VM's: {[vm.name for vm in vms]}")
+        logger.info(f"Destroying VM's: {self.get_names(vms)}")
         tasks = [vm.Destroy_Task() for vm in vms]
         WaitForTasks(tasks, self._si)
+        self.clear_inventory_cache()
 
     def remove_vms_from_inventory(self, vms):
         """
@@ -667,9 +964,10 @@ class VSPHERE(object):
 
         """
         self.poweroff_vms(vms)
-        for vm in vms:
-            logger.info(f"Removing VM from inventory: {vm.name}")
+        for vm, vm_name in zip(vms, self.get_names(vms)):
+            logger.info(f"Removing VM from inventory: {vm_name}")
             vm.UnregisterVM()
+        self.clear_inventory_cache()
 
     def destroy_pool(self, pool, dc, cluster):
         """
@@ -682,12 +980,13 @@ class VSPHERE(object):
 
         """
         vms_in_pool = self.get_all_vms_in_pool(pool, dc, cluster)
-        logger.info(f"VM's in resource pool {pool}: {[vm.name for vm in vms_in_pool]}")
+        logger.info(f"VM's in resource pool {pool}: {self.get_names(vms_in_pool)}")
         self.destroy_vms(vms_in_pool)
 
         # get resource pool instance
         pi = self.get_pool(pool, dc, cluster)
         WaitForTask(pi.Destroy())
+        self.clear_inventory_cache()
         logger.info(f"Successfully deleted resource pool {pool}")
 
     def remove_disk(self, vm, identifier, key="unit_number", datastore=True):
@@ -802,6 +1101,7 @@ class VSPHERE(object):
                         self.poweroff_vms([dvm])
                     logger.info(f"Destroying folder {name} in templates")
                     WaitForTask(vm.Destroy())
+                    self.clear_inventory_cache()
         else:
             logger.info(f"Folder {name} doesn't exist in templates")
 
@@ -1053,15 +1353,7 @@ class VSPHERE(object):
             vim.HostSystem: Host instance
 
         """
-        content = self.get_content
-        host_view = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.HostSystem], True
-        )
-        host_obj = [host for host in host_view.view]
-        host_view.Destroy()
-        for host in host_obj:
-            if host.name == host_name:
-                return host
+        return self.find_cached_object(host_name, [vim.HostSystem])
 
     def get_used_devices(self, host):
         """
@@ -1302,6 +1594,7 @@ class VSPHERE(object):
         task = template.Clone(folder=vm_folder, name=vm_name, spec=clonespec)
         logger.debug("waiting for cloning to complete")
         self.wait_for_task(task)
+        self.clear_inventory_cache()
 
     def wait_for_task(self, task):
         """
@@ -1376,11 +1669,15 @@ class VSPHERE(object):
             datacenter_name,
             cluster_name,
         )
-        for vm in all_vms:
-            logger.info(f"vm name: {vm.name} , IP: {vm.summary.guest.ipAddress}")
-        vms_without_ip = [vm for vm in all_vms if not vm.summary.guest.ipAddress]
-        for vm in vms_without_ip:
-            logger.info(f"VM: {vm.name} doesn't have IP")
+        vm_names = self.get_names(all_vms)
+        vms_ips = self.get_vms_ips(all_vms)
+        for vm_name, vm_ip in zip(vm_names, vms_ips):
+            logger.info(f"vm name: {vm_name} , IP: {vm_ip}")
+        vms_without_ip = []
+        for vm, vm_name, vm_ip in zip(all_vms, vm_names, vms_ips):
+            if not vm_ip:
+                logger.info(f"VM: {vm_name} doesn't have IP")
+                vms_without_ip.append(vm)
         if vms_without_ip:
             return vms_without_ip
 
@@ -1450,8 +1747,11 @@ class VSPHERE(object):
             list: VM instances (vim.VirtualMachine)
 
         """
-        vms = self.get_all_vms_in_pool(name, dc, cluster)
-        return [vm for vm in vms if vm.name.startswith("compute")]
+        return [
+            vm
+            for vm, vm_name in self.get_pool_vm_names(name, dc, cluster).items()
+            if vm_name.startswith("compute")
+        ]
 
     def is_template_exist(self, template_name, dc):
         """
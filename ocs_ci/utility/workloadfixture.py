@@ -11,21 +11,29 @@ fixtures in ocs-ci.
 import json
 import logging
 import os
-import threading
 import time
 
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants
-from ocs_ci.utility.pagerduty import PagerDutyAPI
-from ocs_ci.utility.prometheus import PrometheusAPI
+from ocs_ci.utility.measurement_store import get_measurement_store
+from ocs_ci.utility.metrics_recorder import metrics_recorder
 
 
 logger = logging.getLogger(__name__)
 
+# progress of the measurement is stored every this number of seconds while
+# waiting for the minimal time of the measurement
+MEASUREMENT_CHECKPOINT_INTERVAL = 60
+
+
+def _get_measurement_name(result_file):
+    return os.path.splitext(os.path.basename(result_file))[0]
+
 
 def is_measurement_done(result_file):
     """
-    Has the measurement been already performed and stored in a result file?
+    Has the measurement been already performed and stored in a result file
+    or in the measurement store of the directory of the result file?
 
     Returns:
       bool: True if the measurement has been already performed.
@@ -33,6 +41,11 @@ def is_measurement_done(result_file):
     if os.path.isfile(result_file) and os.access(result_file, os.R_OK):
         logger.info("Measurements file %s is already created.", result_file)
         return True
+    store = get_measurement_store(os.path.dirname(result_file))
+    measurement = store.get(_get_measurement_name(result_file))
+    if measurement is not None and measurement.done:
+        logger.info("Measurement %s is already stored.", measurement.name)
+        return True
     return False
 
 
@@ -52,8 +65,10 @@ def measure_operation(
     Args:
         operation (function): Function to be performed
         result_file (str): File name that should contain measurement results
-            including logs in json format. If this file exists then it is
-            used for test.
+            in json format, its directory contains the measurement store and
+            the base name of the file is name of the measurement in the store.
+            If this file exists (or the measurement is already stored) then
+            it is used for test.
         minimal_time (int): Minimal number of seconds to monitor a system.
             If provided then monitoring of system continues even when
             operation is finshed. If not specified then measurement is finished
@@ -69,7 +84,10 @@ def measure_operation(
 
     Returns:
         dict: contains information about `start` and `stop` time of given
-            function and its `result` and provided `metadata`
+            function and its `result` and provided `metadata`, `first_run`
+            is False if the measurement was loaded from an earlier run,
+            `resumed` is True if the measurement was interrupted after the
+            operation and finished by this run
             Example::
 
                 {
@@ -82,34 +100,9 @@ def measure_operation(
 
     """
 
-    def prometheus_log(info, prometheus_alert_list):
-        """
-        Log all alerts from Prometheus API every 3 seconds.
-
-        Args:
-            info (dict): Contains run key attribute that controls thread.
-                If `info['run'] == False` then thread will stop
-            prometheus_alert_list (list): List to be populated with alerts
-
-        """
-        prometheus = PrometheusAPI()
-        logger.info("Logging of all prometheus alerts started")
-        while info.get("run"):
-            alerts_response = prometheus.get(
-                "alerts", payload={"silenced": False, "inhibited": False}
-            )
-            msg = f"Request {alerts_response.request.url} failed"
-            assert alerts_response.ok, msg
-            for alert in alerts_response.json().get("data").get("alerts"):
-                if alert not in prometheus_alert_list:
-                    logger.info(f"Adding {alert} to alert list")
-                    prometheus_alert_list.append(alert)
-            time.sleep(3)
-        logger.info("Logging of all prometheus alerts stopped")
-
     # check if file with results for this operation already exists
     # if it exists then use it
-    if is_measurement_done(result_file):
+    if os.path.isfile(result_file) and os.access(result_file, os.R_OK):
         with open(result_file) as open_file:
             results = json.load(open_file)
             # indicate that we are not going to execute the workload, but
@@ -117,90 +110,119 @@ def measure_operation(
             results["first_run"] = False
         logger.info("Measurement file %s loaded.", result_file)
         logger.debug("Content of measurement file:\n%s", results)
-
-    # if there is no file with results from previous run
-    # then perform operation measurement
+        return results
+
+    store = get_measurement_store(os.path.dirname(result_file))
+    name = _get_measurement_name(result_file)
+    measurement = store.get(name)
+    if measurement is not None and measurement.done:
+        results = measurement.results
+        results["first_run"] = False
+        logger.info("Measurement %s loaded from %s.", name, store.path)
+        logger.debug("Content of measurement:\n%s", results)
+        return results
+
+    # measurement interrupted after the operation was finished is resumed,
+    # when it was interrupted during the operation, the operation is repeated
+    resume = measurement is not None and measurement.operation_done
+    if resume:
+        logger.info(f"Resuming measurement {name} interrupted after the operation")
     else:
-        if config.ENV_DATA["platform"].lower() in constants.MANAGED_SERVICE_PLATFORMS:
-            logger.info("Starting PagerDuty periodical update of pagerduty secret")
-            config.RUN["thread_pagerduty_secret_update"] = "required"
-        logger.info(f"File {result_file} not created yet. Starting measurement...")
-        if not measure_after:
-            start_time = time.time()
-
-        # init logging thread that checks for Prometheus alerts
-        # while workload is running
-        # based on https://docs.python.org/3/howto/logging-cookbook.html#logging-from-multiple-threads
-        info = {"run": True}
-        prometheus_alert_list = []
-
-        logging_thread_prometheus = threading.Thread(
-            target=prometheus_log, args=(info, prometheus_alert_list)
-        )
-        logging_thread_prometheus.start()
-
-        try:
-            result = operation()
-        except Exception as ex:
-            # When the operation (which is being measured) fails, we need to
-            # make sure that alert harvesting thread ends and (at least)
-            # alerting data are saved into measurement dump file.
-            result = None
-            logger.error("exception raised during measured operation: %s", ex)
-            # Additional waiting for the measurement purposes is no longer
-            # necessary, and would only confuse anyone observing the failure.
-            minimal_time = 0
-            # And make sure the exception is properly processed by pytest (it
-            # would make the fixture fail).
-            raise (ex)
-        finally:
+        logger.info(f"Measurement {name} not stored yet. Starting measurement...")
+        measurement = store.start(name, metadata=metadata)
+
+    if config.ENV_DATA["platform"].lower() in constants.MANAGED_SERVICE_PLATFORMS:
+        logger.info("Starting PagerDuty periodical update of pagerduty secret")
+        config.RUN["thread_pagerduty_secret_update"] = "required"
+
+    def checkpoint_alerts(alerts, timestamp):
+        store.add_alerts(measurement, alerts)
+
+    # alerts are recorded by the session wide metrics recorder (started
+    # here if it's not running yet) while workload is running and stored
+    # as soon as they appear
+    recording_start = time.time()
+    metrics_recorder.add_listener(checkpoint_alerts)
+    metrics_recorder.start()
+    error = None
+    try:
+        if resume:
+            start_time = measurement.start
+            result = measurement.result
+        else:
+            if not measure_after:
+                start_time = time.time()
+            try:
+                result = operation()
+            except Exception as ex:
+                # When the operation (which is being measured) fails, we need
+                # to make sure that (at least) alerting data are stored.
+                result = None
+                error = ex
+                logger.error("exception raised during measured operation: %s", ex)
+                # Additional waiting for the measurement purposes is no longer
+                # necessary, and would only confuse anyone observing the
+                # failure.
+                minimal_time = 0
             if measure_after:
                 start_time = time.time()
-            passed_time = time.time() - start_time
-            if minimal_time:
-                additional_time = minimal_time - passed_time
-                if additional_time > 0:
-                    logger.info(
-                        f"Starting {additional_time}s sleep for the purposes of measurement."
-                    )
-                    time.sleep(additional_time)
-            # Dumping measurement results into result file.
-            stop_time = time.time()
-            info["run"] = False
-            logging_thread_prometheus.join()
-            results = {
-                "start": start_time,
-                "stop": stop_time,
-                "result": result,
-                "metadata": metadata,
-                "prometheus_alerts": prometheus_alert_list,
-                "first_run": True,
-            }
-            if (
-                config.ENV_DATA["platform"].lower()
-                in constants.MANAGED_SERVICE_PLATFORMS
-            ):
-                # During testing of ODF Managed Service are also collected alerts
-                # in PagerDuty, Sendgrid and Dead Man's Snith systems
-                pagerduty = PagerDutyAPI()
-                logger.info("Logging all PagerDuty incidents")
-                incidents_response = pagerduty.get(
-                    "incidents",
-                    payload={
-                        "service_ids[]": pagerduty_service,
-                        "since": time.strftime(
-                            "%Y-%m-%d %H:%M:%S", time.gmtime(start_time)
-                        ),
-                        "time_zone": "UTC",
-                    },
+            store.operation_done(
+                measurement,
+                start_time,
+                result,
+                error=None if error is None else repr(error),
+            )
+        if minimal_time:
+            additional_time = minimal_time - (time.time() - start_time)
+            if additional_time > 0:
+                logger.info(
+                    f"Starting {additional_time}s sleep for the purposes of measurement."
                 )
-                incidents_response.raise_for_status()
-                pagerduty_incidents = incidents_response.json().get("incidents")
-                results["pagerduty_incidents"] = pagerduty_incidents
-                logger.info("Stopping PagerDuty periodical update of pagerduty secret")
-                config.RUN["thread_pagerduty_secret_update"] = "required"
-            logger.info(f"Results of measurement: {results}")
-            with open(result_file, "w") as outfile:
-                logger.info(f"Dumping results of measurement into {result_file}")
-                json.dump(results, outfile)
+            while additional_time > 0:
+                time.sleep(min(additional_time, MEASUREMENT_CHECKPOINT_INTERVAL))
+                additional_time = minimal_time - (time.time() - start_time)
+                store.checkpoint(measurement, remaining_time=max(additional_time, 0))
+    finally:
+        metrics_recorder.stop()
+        metrics_recorder.remove_listener(checkpoint_alerts)
+
+    # Storing the rest of measurement results.
+    stop_time = time.time()
+    store.add_alerts(
+        measurement, metrics_recorder.get_alerts(recording_start, stop_time)
+    )
+    extra = {}
+    if config.ENV_DATA["platform"].lower() in constants.MANAGED_SERVICE_PLATFORMS:
+        # During testing of ODF Managed Service are also collected alerts
+        # in PagerDuty, Sendgrid and Dead Man's Snith systems
+        from ocs_ci.utility.pagerduty import PagerDutyAPI
+
+        pagerduty = PagerDutyAPI()
+        logger.info("Logging all PagerDuty incidents")
+        incidents_response = pagerduty.get(
+            "incidents",
+            payload={
+                "service_ids[]": pagerduty_service,
+                "since": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start_time)),
+                "time_zone": "UTC",
+            },
+        )
+        incidents_response.raise_for_status()
+        extra["pagerduty_incidents"] = incidents_response.json().get("incidents")
+        logger.info("Stopping PagerDuty periodical update of pagerduty secret")
+        config.RUN["thread_pagerduty_secret_update"] = "required"
+    logger.info(f"Storing results of measurement {name} into {store.path}")
+    store.stop(measurement, stop_time, **extra)
+    results = measurement.results
+    logger.info(f"Results of measurement: {results}")
+    with open(result_file, "w") as outfile:
+        logger.info(f"Dumping results of measurement into {result_file}")
+        json.dump(results, outfile)
+    results["first_run"] = True
+    # the operation of a resumed measurement was performed by an earlier run
+    results["resumed"] = resume
+    if error is not None:
+        # make sure the exception is properly processed by pytest (it would
+        # make the fixture fail)
+        raise error
     return results
@@ -7,27 +7,110 @@ This module implements few functions::
     setup(): for setting up fio utility on the pod and any necessary
         environmental params.
     run(): for running fio on pod on specified mount point
+    parse_results(): for parsing the json output of fio run
+    aggregate_results(): for merging results of fio runs from several pods
 
 Note: The above mentioned functions will be invoked from Workload.setup()
 and Workload.run() methods along with user provided parameters.
 """
+import json
 import logging
+import os
 from time import sleep
 
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
 from ocs_ci.ocs.exceptions import CommandFailed
 from ocs_ci.utility.retry import retry
+from ocs_ci.utility.utils import run_cmd
 from ocs_ci.utility.workloads.helpers import find_distro, DISTROS
 
 log = logging.getLogger(__name__)
 
+# Results of fio detection per pod image, e.g.
+# {"<image>": {"preinstalled": False, "static_binary": True, "distro": "RHEL"}}
+FIO_SETUP_CACHE = {}
+
+# Latency percentiles reported in aggregated results
+FIO_AGGREGATE_PERCENTILES = ("50.000000", "90.000000", "99.000000", "99.900000")
+
+
+def get_pod_image(io_pod):
+    """
+    Get image of the first container of the pod, used as a key of the fio
+    setup cache
+
+    Args:
+        io_pod (Pod): app pod object
+
+    Returns:
+        str: image of the pod, None if not found
+
+    """
+    try:
+        return io_pod.pod_data["spec"]["containers"][0]["image"]
+    except (AttributeError, KeyError, IndexError, TypeError):
+        return None
+
+
+def is_fio_installed(io_pod, fio_binary="fio"):
+    """
+    Check if fio binary can be executed on the pod
+
+    Args:
+        io_pod (Pod): app pod object
+        fio_binary (str): fio binary name or path on the pod
+
+    Returns:
+        bool: True if fio is installed on the pod else False
+
+    """
+    try:
+        io_pod.exec_cmd_on_pod(f"{fio_binary} --version", out_yaml_format=False)
+    except CommandFailed:
+        return False
+    return True
+
+
+def copy_static_fio(io_pod, local_binary):
+    """
+    Copy static fio binary from local cache into the pod
+
+    Args:
+        io_pod (Pod): app pod object
+        local_binary (str): path of static fio binary on the local host
+
+    Returns:
+        str: path of the fio binary on the pod, None if copy failed
+
+    """
+    remote_binary = constants.FIO_STATIC_BINARY_POD_PATH
+    log.info(f"Copying static fio binary {local_binary} to pod {io_pod.name}")
+    try:
+        run_cmd(
+            f"oc -n {io_pod.namespace} cp {os.path.expanduser(local_binary)} "
+            f"{io_pod.name}:{remote_binary}"
+        )
+        io_pod.exec_cmd_on_pod(f"chmod +x {remote_binary}", out_yaml_format=False)
+    except CommandFailed as ex:
+        log.warning(f"Failed to copy static fio binary to {io_pod.name}: {ex}")
+        return None
+    if not is_fio_installed(io_pod, remote_binary):
+        log.warning(f"Static fio binary can't be executed on pod {io_pod.name}")
+        return None
+    return remote_binary
+
 
-# Adding retry here to make this more stable for dpkg lock issues and network
-# issues when installing some packages.
-@retry(CommandFailed, tries=10, delay=10, backoff=1)
 def setup(**kwargs):
     """
     setup fio workload
 
+    Installation is skipped when fio is already present in the pod image.
+    When a static fio binary is configured (RUN['fio_static_binary']), it is
+    copied into the pod instead of installing fio via package manager.
+    Results of the checks are remembered per image in FIO_SETUP_CACHE, so
+    pods from the same image skip the detection.
+
     Args:
         **kwargs (dict): fio setup configuration.
             At this point in time only argument present in kwargs will be
@@ -38,8 +121,51 @@ def setup(**kwargs):
         bool: True if setup succeeds else False
     """
     io_pod = kwargs["pod"]
+    image = get_pod_image(io_pod)
+    cached = FIO_SETUP_CACHE.get(image, {}) if image else {}
+
+    if cached.get("preinstalled") or (
+        "preinstalled" not in cached and is_fio_installed(io_pod)
+    ):
+        log.info(f"fio is already installed on pod {io_pod.name}")
+        if image:
+            FIO_SETUP_CACHE.setdefault(image, {})["preinstalled"] = True
+        return True
+    if image:
+        FIO_SETUP_CACHE.setdefault(image, {})["preinstalled"] = False
+
+    local_binary = config.RUN.get("fio_static_binary")
+    if local_binary and cached.get("static_binary", True):
+        fio_binary = copy_static_fio(io_pod, local_binary)
+        if image:
+            FIO_SETUP_CACHE[image]["static_binary"] = bool(fio_binary)
+        if fio_binary:
+            io_pod.fio_binary = fio_binary
+            return True
+
+    return install_fio(io_pod, distro=cached.get("distro"))
+
+
+# Adding retry here to make this more stable for dpkg lock issues and network
+# issues when installing some packages.
+@retry(CommandFailed, tries=10, delay=10, backoff=1)
+def install_fio(io_pod, distro=None):
+    """
+    Install fio on the pod via package manager
+
+    Args:
+        io_pod (Pod): app pod object
+        distro (str): distro of the pod (if known), when not provided it is
+            detected by find_distro()
+
+    Returns:
+        bool: True if install succeeds else False
+    """
     # For first cut doing simple fio install
-    distro = find_distro(io_pod)
+    distro = distro or find_distro(io_pod)
+    image = get_pod_image(io_pod)
+    if image and distro:
+        FIO_SETUP_CACHE.setdefault(image, {})["distro"] = distro
     pkg_mgr = DISTROS[distro]
 
     if distro == "Debian":
@@ -70,7 +196,7 @@ def run(**kwargs):
     path = kwargs.pop("path")
     timeout = 600  # default timeout for the FIO test
 
-    fio_cmd = "fio"
+    fio_cmd = getattr(io_pod, "fio_binary", None) or "fio"
     args = ""
     for k, v in kwargs.items():
         if k == "filename":
@@ -88,3 +214,118 @@ def run(**kwargs):
     log.info(f"Running cmd: {fio_cmd}")
 
     return io_pod.exec_cmd_on_pod(fio_cmd, out_yaml_format=False, timeout=timeout)
+
+
+def parse_results(output):
+    """
+    Parse the json output of fio. When fio runs with --status-interval, the
+    output contains several json reports one after another, the last one is
+    the final report of the run.
+
+    Args:
+        output (str): Output of the fio command
+
+    Returns:
+        dict: The final fio report
+
+    Raises:
+        ValueError: In case there is no json report in the output
+
+    """
+    return parse_all_results(output)[-1]
+
+
+def parse_all_results(output):
+    """
+    Parse all the json reports (interim status reports and the final one)
+    from output of fio.
+
+    Args:
+        output (str): Output of the fio command
+
+    Returns:
+        list: List of dicts, the fio reports in order they were printed
+
+    Raises:
+        ValueError: In case there is no json report in the output
+
+    """
+    decoder = json.JSONDecoder()
+    reports = []
+    index = output.find("{")
+    while index != -1:
+        try:
+            report, end = decoder.raw_decode(output, index)
+        except json.JSONDecodeError:
+            # not a start of json document (eg. fio warning message), skip it
+            index = output.find("{", index + 1)
+            continue
+        reports.append(report)
+        index = output.find("{", end)
+    if not reports:
+        raise ValueError(f"No json report found in fio output: {output}")
+    return reports
+
+
+def aggregate_results(results):
+    """
+    Merge fio reports of several pods into one report. IOPS and bandwidth are
+    summed over all the jobs, mean latency is weighted by number of IOs of
+    each job and the latency percentiles are the worst value seen in any job
+    (fio percentiles can't be merged exactly without the histograms).
+
+    Args:
+        results (list): List of fio reports (dicts)
+
+    Returns:
+        dict: Aggregated report, e.g.::
+
+            {
+                "jobs": 10,
+                "read": {
+                    "iops": 1000.0,
+                    "bw_kib": 4000,
+                    "total_ios": 60000,
+                    "clat_mean_ns": 1200.5,
+                    "clat_percentiles_ns": {"99.000000": 4000, ...},
+                },
+                "write": {...},
+            }
+
+    """
+    report = {"jobs": 0}
+    for direction in ("read", "write"):
+        report[direction] = {
+            "iops": 0.0,
+            "bw_kib": 0,
+            "total_ios": 0,
+            "clat_mean_ns": 0.0,
+            "clat_percentiles_ns": {},
+        }
+    for result in results:
+        for job in result.get("jobs", []):
+            report["jobs"] += 1
+            for direction in ("read", "write"):
+                stats = job.get(direction, {})
+                total_ios = stats.get("total_ios", 0)
+                if not total_ios:
+                    continue
+                merged = report[direction]
+                merged["iops"] += stats.get("iops", 0)
+                merged["bw_kib"] += stats.get("bw", 0)
+                clat = stats.get("clat_ns", {})
+                # running mean weighted by the number of IOs
+                merged["clat_mean_ns"] += (
+                    (clat.get("mean", 0) - merged["clat_mean_ns"])
+                    * total_ios
+                    / (merged["total_ios"] + total_ios)
+                )
+                merged["total_ios"] += total_ios
+                percentiles = merged["clat_percentiles_ns"]
+                for percentile in FIO_AGGREGATE_PERCENTILES:
+                    value = clat.get("percentile", {}).get(percentile)
+                    if value is not None:
+                        percentiles[percentile] = max(
+                            value, percentiles.get(percentile, 0)
+                        )
+    return report
@@ -89,12 +89,14 @@ from ocs_ci.utility import (
     users,
     version,
 )
+from ocs_ci.utility.artifact_collector import artifact_collector
+from ocs_ci.utility.metrics_recorder import metrics_recorder
 from ocs_ci.utility.environment_check import (
     get_status_before_execution,
     get_status_after_execution,
 )
 from ocs_ci.utility.flexy import load_cluster_info
-from ocs_ci.utility.kms import is_kms_enabled
+from ocs_ci.utility.cluster_facts import cluster_facts
 from ocs_ci.utility.prometheus import PrometheusAPI
 from ocs_ci.utility.reporting import update_live_must_gather_image
 from ocs_ci.utility.retry import retry
@@ -197,82 +199,126 @@ def pytest_collection_modifyitems(session, items):
                     break
 
     if not (teardown or deploy or (deploy and skip_ocs_deployment)):
-        for item in items[:]:
-            skipif_ocp_version_marker = item.get_closest_marker("skipif_ocp_version")
-            skipif_ocs_version_marker = item.get_closest_marker("skipif_ocs_version")
-            skipif_upgraded_from_marker = item.get_closest_marker(
-                "skipif_upgraded_from"
-            )
-            skipif_no_kms_marker = item.get_closest_marker("skipif_no_kms")
-            skipif_ui_not_support_marker = item.get_closest_marker(
-                "skipif_ui_not_support"
-            )
-            skipif_lvm_not_installed_marker = item.get_closest_marker(
-                "skipif_lvm_not_installed"
-            )
-            if skipif_lvm_not_installed_marker and "lvm" in config.RUN:
-                if not config.RUN["lvm"]:
-                    log.info(f"Test {item} will be removed due to lvm not installed")
-                    items.remove(item)
-                    continue
-            if skipif_ocp_version_marker:
-                skip_condition = skipif_ocp_version_marker.args
-                # skip_condition will be a tuple
-                # and condition will be first element in the tuple
-                if skipif_ocp_version(skip_condition[0]):
-                    log.debug(
-                        f"Test: {item} will be skipped due to OCP {skip_condition}"
-                    )
-                    items.remove(item)
-                    continue
-            if skipif_ocs_version_marker:
-                skip_condition = skipif_ocs_version_marker.args
-                # skip_condition will be a tuple
-                # and condition will be first element in the tuple
-                if skipif_ocs_version(skip_condition[0]):
-                    log.debug(f"Test: {item} will be skipped due to {skip_condition}")
-                    items.remove(item)
-                    continue
-            if skipif_upgraded_from_marker:
-                skip_args = skipif_upgraded_from_marker.args
-                if skipif_upgraded_from(skip_args[0]):
-                    log.debug(
-                        f"Test: {item} will be skipped because the OCS cluster is"
-                        f" upgraded from one of these versions: {skip_args[0]}"
-                    )
-                    items.remove(item)
-            if skipif_no_kms_marker:
-                try:
-                    if not is_kms_enabled(dont_raise=True):
-                        log.debug(
-                            f"Test: {item} it will be skipped because the OCS cluster"
-                            f" has not configured cluster-wide encryption with KMS"
-                        )
-                        items.remove(item)
-                except KeyError:
-                    log.warning(
-                        "Cluster is not yet installed. Skipping skipif_no_kms check."
-                    )
-            if skipif_ui_not_support_marker:
-                skip_condition = skipif_ui_not_support_marker
-                if skipif_ui_not_support(skip_condition.args[0]):
-                    log.debug(
-                        f"Test: {item} will be skipped due to UI test {skip_condition.args} is not available"
-                    )
-                    items.remove(item)
-                    continue
+        # query all the cluster facts needed by the collected tests at once
+        needed_facts = set()
+        for item in items:
+            for marker_name, facts in SKIPIF_MARKER_FACTS.items():
+                if item.get_closest_marker(marker_name):
+                    needed_facts.update(facts)
+        cluster_facts.load(needed_facts)
+        selected_items = [item for item in items if not is_skipped_by_marker(item)]
+    else:
+        selected_items = items
     # skip UI test on openshift dedicated ODF-MS platform
-    if (
-        config.ENV_DATA["platform"].lower() == constants.OPENSHIFT_DEDICATED_PLATFORM
-        or config.ENV_DATA["platform"].lower() == constants.ROSA_PLATFORM
+    if cluster_facts.platform in (
+        constants.OPENSHIFT_DEDICATED_PLATFORM,
+        constants.ROSA_PLATFORM,
     ):
-        for item in items.copy():
-            if "/ui/" in str(item.fspath):
+        selected_items = [
+            item for item in selected_items if not is_ui_test_removed(item)
+        ]
+    items[:] = selected_items
+
+
+# cluster facts needed for evaluation of skipif markers
+SKIPIF_MARKER_FACTS = {
+    "skipif_ocp_version": ["ocp_version"],
+    "skipif_upgraded_from": ["upgraded_from"],
+    "skipif_no_kms": ["kms_enabled"],
+    "skipif_ui_not_support": ["ocp_version"],
+}
+
+
+def is_skipped_by_marker(item):
+    """
+    Evaluate skipif_* markers of the test item against cluster facts
+
+    Args:
+        item: collected test item
+
+    Returns:
+        bool: True if the test item should be removed from collected items
+
+    """
+    skipif_ocp_version_marker = item.get_closest_marker("skipif_ocp_version")
+    skipif_ocs_version_marker = item.get_closest_marker("skipif_ocs_version")
+    skipif_upgraded_from_marker = item.get_closest_marker("skipif_upgraded_from")
+    skipif_no_kms_marker = item.get_closest_marker("skipif_no_kms")
+    skipif_ui_not_support_marker = item.get_closest_marker("skipif_ui_not_support")
+    skipif_lvm_not_installed_marker = item.get_closest_marker(
+        "skipif_lvm_not_installed"
+    )
+    if skipif_lvm_not_installed_marker and "lvm" in config.RUN:
+        if not cluster_facts.lvm:
+            log.info(f"Test {item} will be removed due to lvm not installed")
+            return True
+    if skipif_ocp_version_marker:
+        skip_condition = skipif_ocp_version_marker.args
+        # skip_condition will be a tuple
+        # and condition will be first element in the tuple
+        if skipif_ocp_version(skip_condition[0], cluster_facts.ocp_version):
+            log.debug(f"Test: {item} will be skipped due to OCP {skip_condition}")
+            return True
+    if skipif_ocs_version_marker:
+        skip_condition = skipif_ocs_version_marker.args
+        # skip_condition will be a tuple
+        # and condition will be first element in the tuple
+        if skipif_ocs_version(skip_condition[0]):
+            log.debug(f"Test: {item} will be skipped due to {skip_condition}")
+            return True
+    if skipif_upgraded_from_marker:
+        skip_args = skipif_upgraded_from_marker.args
+        try:
+            upgraded_from = cluster_facts.upgraded_from
+        except Exception as err:
+            log.error(str(err))
+            upgraded_from = None
+        if upgraded_from is not None and skipif_upgraded_from(
+            skip_args[0], upgraded_from
+        ):
+            log.debug(
+                f"Test: {item} will be skipped because the OCS cluster is"
+                f" upgraded from one of these versions: {skip_args[0]}"
+            )
+            return True
+    if skipif_no_kms_marker:
+        try:
+            if not cluster_facts.kms_enabled:
                 log.debug(
-                    f"Test {item} is removed from the collected items"
-                    f" UI is not supported on {config.ENV_DATA['platform'].lower()}"
+                    f"Test: {item} it will be skipped because the OCS cluster"
+                    f" has not configured cluster-wide encryption with KMS"
                 )
-                items.remove(item)
+                return True
+        except KeyError:
+            log.warning("Cluster is not yet installed. Skipping skipif_no_kms check.")
+    if skipif_ui_not_support_marker:
+        skip_condition = skipif_ui_not_support_marker
+        if skipif_ui_not_support(skip_condition.args[0], cluster_facts.ocp_version):
+            log.debug(
+                f"Test: {item} will be skipped due to UI test {skip_condition.args} is not available"
+            )
+            return True
+    return False
+
+
+def is_ui_test_removed(item):
+    """
+    Check if the test item is UI test, which is not supported on the platform
+
+    Args:
+        item: collected test item
+
+    Returns:
+        bool: True if the test item should be removed from collected items
+
+    """
+    if "/ui/" in str(item.fspath):
+        log.debug(
+            f"Test {item} is removed from the collected items"
+            f" UI is not supported on {cluster_facts.platform}"
+        )
+        return True
+    return False
 
 
 @pytest.fixture()
@@ -314,6 +360,22 @@ def threading_lock():
     return threading.Lock()
 
 
+@pytest.fixture(scope="session")
+def metrics_recorder_session(request):
+    """
+    Keep the session wide recorder of prometheus metrics and alerts running
+    till the end of the session, tests can query windows of the recorded data
+    instead of polling prometheus themselves.
+
+    Returns:
+        MetricsRecorder: the running recorder
+
+    """
+    metrics_recorder.start()
+    request.addfinalizer(metrics_recorder.stop)
+    return metrics_recorder
+
+
 @pytest.fixture(scope="session", autouse=True)
 def auto_load_auth_config():
     try:
@@ -1456,6 +1518,11 @@ def cluster(
     if teardown:
 
         def cluster_teardown_finalizer():
+            # Artifacts of failed tests have to be collected before the
+            # cluster is destroyed
+            artifact_collector.drain(
+                timeout=config.RUN.get("failure_artifacts_drain_timeout")
+            )
             # If KMS is configured, clean up the backend resources
             # we are doing it before OCP cleanup
             if config.DEPLOYMENT.get("kms_deployment"):